@@ -3,6 +3,7 @@
 import ctypes
 import faulthandler
 import logging
+import multiprocessing
 import os
 import sys
 import threading
@@ -224,6 +225,10 @@ def main() -> None:
     ``--eeg`` routes to the EEG Annotator: it is a mode of this single binary,
     run in its own process (see ``smacc.eeg.launch``), not a separate program.
     """
+    # A frozen build's worker processes (the EEG detectors' process pool) re-run
+    # this exe; freeze_support turns such a run into the worker and never
+    # returns. A no-op everywhere else.
+    multiprocessing.freeze_support()
     if "--eeg" in sys.argv[1:]:
         # Hand off to the Annotator's entry point, which parses the rest
         # (--selftest, --version, --log, --rater, --blind, the recording path).
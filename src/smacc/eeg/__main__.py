@@ -14,6 +14,12 @@ round-trips a synthetic recording through MNE, the slice filters, and the
 annotation sidecar, headless, and is what the release workflow runs (via
 ``SMACC.exe --eeg --selftest``). The exe is built ``--noconsole`` (no stdout),
 so the check is the exit code, not the output.
+
+``--detect spindles,k-complexes night1.edf`` also runs without a window: it
+runs the named detectors (:mod:`smacc.eeg.detect`) over the whole recording
+across ``--workers`` processes (default: one per core), writes each one's
+``auto-<name>`` rater sidecar next to the recording, and exits — for batch
+runs over a study's nights. Ctrl+C cancels (exit code 130).
 """
 
 from __future__ import annotations
@@ -32,7 +38,7 @@ from ..fonts import apply_app_font
 from .window import EegAnnotatorWindow
 
 # Flags that take a following value, so the recording-path scan skips that value.
-_VALUE_FLAGS = ("--rater", "--blind", "--log")
+_VALUE_FLAGS = ("--rater", "--blind", "--log", "--detect", "--workers")
 
 
 def pick_recording_path(args: list[str]) -> str | None:
@@ -101,6 +107,78 @@ def pick_log_path(args: list[str]) -> str | None:
     return _flag_value(args, "--log")
 
 
+def pick_detector_specs(args: list[str]) -> list[str] | None:
+    """Return the ``--detect`` names (comma-separated), or ``None`` without it."""
+    value = _flag_value(args, "--detect")
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def pick_workers(args: list[str]) -> int | None:
+    """Return the ``--workers`` count, or ``None`` (one per core).
+
+    Raises ``ValueError`` for anything but a positive integer.
+    """
+    value = _flag_value(args, "--workers")
+    if value is None:
+        return None
+    workers = int(value)
+    if workers < 1:
+        raise ValueError(f"--workers must be at least 1 (got {workers})")
+    return workers
+
+
+def run_detection(args: list[str]) -> int:
+    """Run ``--detect`` headless; 0 on success, 2 for bad arguments, 1 on errors.
+
+    Progress goes to stderr, one line per detector's sidecar to stdout. An
+    interrupted run (Ctrl+C) drops its queued chunks, writes nothing, and
+    returns 130, the shell's code for it.
+    """
+    from . import detect
+    from .io import open_recording
+
+    path = pick_recording_path(args)
+    try:
+        specs = pick_detector_specs(args) or []
+        detectors = [detect.resolve_detector(spec) for spec in specs]
+        workers = pick_workers(args)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    if path is None or not detectors:
+        print(
+            "usage: --detect NAME[,NAME…] [--workers N] RECORDING "
+            f"(built in: {', '.join(detect.BUILTIN)})",
+            file=sys.stderr,
+        )
+        return 2
+    try:
+        recording = open_recording(path)
+    except (ValueError, OSError, RuntimeError) as exc:
+        print(f"Could not open {path}: {exc}", file=sys.stderr)
+        return 1
+
+    def report(fraction: float) -> None:
+        print(f"\rDetecting… {fraction:.0%}", end="", file=sys.stderr, flush=True)
+
+    try:
+        found = detect.run_detectors(
+            recording, detectors, path=recording.path, workers=workers, report=report
+        )
+    except KeyboardInterrupt:
+        print("\nCancelled.", file=sys.stderr)
+        return 130
+    print(file=sys.stderr)
+    written = detect.write_detections(
+        recording.path, found, meas_date=recording.meas_date
+    )
+    for (name, events), sidecar in zip(found.items(), written, strict=True):
+        print(f"{name}: {len(events)} events -> {sidecar}")
+    return 0
+
+
 def selftest() -> int:
     """Exercise the full non-GUI stack on a synthetic recording; 0 on success.
 
@@ -243,6 +321,9 @@ def main() -> None:
         except Exception:
             traceback.print_exc()
             sys.exit(1)
+    if pick_detector_specs(sys.argv) is not None:
+        # Headless, like --selftest: the results are sidecars, not a window.
+        sys.exit(run_detection(sys.argv))
     set_taskbar_app_id()  # share SMACC's taskbar identity (one app, not two)
     app = QApplication(sys.argv)
     app.setApplicationName("SMACC EEG Annotator")
@@ -14,15 +14,20 @@ opening a file inside a real BIDS dataset must never clobber the dataset's own
 events file. The JSON sidecar documents the columns and records provenance
 (source file, measurement date, app version).
 
-Pure functions and frozen dataclasses, no GUI and no MNE — directly
+Pure functions and frozen dataclasses (plus :class:`AnnotationIndex`, the
+window lookup the trace view scrolls with), no GUI and no MNE — directly
 unit-testable, mirroring :mod:`smacc.bids`.
 """
 
 from __future__ import annotations
 
+import bisect
 import csv
+import heapq
 import json
+import math
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -105,6 +110,96 @@ def replace(
     return insert(out, annotation)
 
 
+class AnnotationIndex:
+    """The annotations overlapping a time window, by binary search.
+
+    A mark overlaps ``[lo, hi]`` when it starts by ``hi`` and ends from ``lo`` on.
+    Sorting by onset bounds the first condition with one bisect, but not the
+    second: a long mark that started well before ``lo`` can still reach into
+    the window. So marks are binned by duration — points in one bin, then one
+    bin per power of two of seconds — and each bin is searched from ``lo`` minus
+    its longest possible duration. Every mark found that way ends within one bin
+    width of ``lo``, so a query costs a bisect per bin plus the marks returned
+    (a night's marks, from 1 ms clicks to 8 h spans, fill ~25 bins at most).
+
+    Updated in place by :meth:`insert`, :meth:`remove` and :meth:`replace` —
+    an edit touches one bin, never rebuilds the index.
+    """
+
+    def __init__(self, annotations: Iterable[Annotation] = ()) -> None:
+        # Bin key → (sorted marks, their onsets): the onsets are the bisect keys.
+        self._bins: dict[int | None, tuple[list[Annotation], list[float]]] = {}
+        self._count = 0
+        for annotation in sorted(annotations):
+            marks, onsets = self._bin(annotation)
+            marks.append(annotation)
+            onsets.append(annotation.onset)
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _key(duration: float) -> int | None:
+        """The bin of a duration: None for a point, else ``k`` with 2**k >= it."""
+        if duration <= 0:
+            return None
+        key = math.ceil(math.log2(duration))
+        return key + 1 if 2.0**key < duration else key  # log2 rounding
+
+    def _bin(self, annotation: Annotation) -> tuple[list[Annotation], list[float]]:
+        return self._bins.setdefault(self._key(annotation.duration), ([], []))
+
+    def insert(self, annotation: Annotation) -> None:
+        """Add ``annotation`` (after any equal one, as :func:`insert` sorts it)."""
+        marks, onsets = self._bin(annotation)
+        at = bisect.bisect_right(marks, annotation)
+        marks.insert(at, annotation)
+        onsets.insert(at, annotation.onset)
+        self._count += 1
+
+    def remove(self, annotation: Annotation) -> None:
+        """Drop one mark equal to ``annotation``; ValueError if there is none."""
+        marks, onsets = self._bins.get(self._key(annotation.duration), ([], []))
+        at = bisect.bisect_left(marks, annotation)
+        if at == len(marks) or marks[at] != annotation:
+            raise ValueError(f"{annotation!r} is not in the index")
+        del marks[at]
+        del onsets[at]
+        self._count -= 1
+
+    def replace(self, old: Annotation, new: Annotation) -> None:
+        """Swap ``old`` for ``new`` (an edited mark may move bins)."""
+        self.remove(old)
+        self.insert(new)
+
+    def overlapping(self, lo: float, hi: float) -> list[Annotation]:
+        """The marks that overlap ``[lo, hi]`` (ends inclusive), in sorted order."""
+        found: list[list[Annotation]] = []
+        for key, (marks, onsets) in self._bins.items():
+            reach = 0.0 if key is None else 2.0**key  # the bin's longest duration
+            start = bisect.bisect_left(onsets, lo - reach)
+            stop = bisect.bisect_right(onsets, hi)
+            hits = [a for a in marks[start:stop] if a.onset + a.duration >= lo]
+            if hits:
+                found.append(hits)
+        if len(found) == 1:
+            return found[0]
+        return list(heapq.merge(*found))
+
+    def onsets_between(self, lo: float, hi: float) -> list[float]:
+        """The onsets within ``[lo, hi]``, unsorted: one bisected slice per bin.
+
+        Cheaper than :meth:`overlapping` — no mark objects, no merge — for the
+        zoomed-out view, which only counts marks per pixel column by onset.
+        """
+        found: list[float] = []
+        for _marks, onsets in self._bins.values():
+            start = bisect.bisect_left(onsets, lo)
+            found += onsets[start : bisect.bisect_right(onsets, hi, lo=start)]
+        return found
+
+
 def sidecar_paths(source: str | Path) -> tuple[Path, Path]:
     """Return the (TSV, JSON) sidecar paths for a source recording.
 
@@ -205,6 +300,26 @@ def discover_rater_sidecars(source: str | Path) -> dict[str, Path]:
     return out
 
 
+def read_rater_sidecars(
+    source: str | Path, *, exclude: str | None = None
+) -> dict[str, list[Annotation]]:
+    """Return ``{rater_id: annotations}`` for every readable per-rater sidecar.
+
+    The peer overlay's input: :func:`discover_rater_sidecars`, minus the
+    ``exclude`` rater (the reviewer's own, editable file), each one parsed. A
+    sidecar that won't parse is skipped, not fatal — it is someone else's work.
+    """
+    out: dict[str, list[Annotation]] = {}
+    for rater_id, path in discover_rater_sidecars(source).items():
+        if rater_id == exclude:
+            continue
+        try:
+            out[rater_id] = read_annotations_tsv(path)
+        except (OSError, ValueError):
+            continue
+    return out
+
+
 def write_annotations_tsv(annotations: list[Annotation], path: str | Path) -> None:
     """Write ``annotations`` (sorted) to ``path`` as a tab-separated values file."""
     with Path(path).open("w", encoding="utf-8", newline="") as stream:
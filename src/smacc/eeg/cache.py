@@ -0,0 +1,61 @@
+"""Where the EEG Annotator keeps data it derives from a recording.
+
+Some views of a night are too slow to compute per scroll but never change for a
+given file — a whole-night overview pyramid is the first. Those results are
+cached on disk, one folder per recording under :data:`smacc.paths.EEG_CACHE_DIR`,
+so reopening the file next week reuses them.
+
+The folder is keyed by the recording's resolved path *and* its size and
+modification time: a re-exported or re-recorded file under the same name gets a
+fresh folder rather than a stale overview. The recording itself is never
+written — like the sidecars, everything here lives beside it, not in it — and
+the cache is disposable: deleting it only costs a rebuild.
+
+Pure pathlib/hashlib, no GUI and no MNE.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+
+# Anything outside this class in a recording's stem collapses to "_" so the
+# folder name is safe on every filesystem (the hash carries the identity).
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]+")
+# Hex digits of the key kept in the folder name: plenty to never collide across
+# one lab's recordings, short enough to read in a file browser.
+_KEY_LENGTH = 16
+
+
+def recording_key(path: str | Path, *segments: str | Path) -> str:
+    """Return a stable key for ``path``'s current contents (path, size, mtime).
+
+    A night joined from several files (``segments`` after the first) is keyed
+    by all of them, so replacing any one gives the night a fresh key.
+
+    Raises:
+        OSError: if a file can't be stat'ed.
+    """
+    identities = []
+    for part in (path, *segments):
+        src = Path(part).resolve()
+        stat = src.stat()
+        identities.append(f"{src}|{stat.st_size}|{stat.st_mtime_ns}")
+    identity = "\n".join(identities)
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:_KEY_LENGTH]
+
+
+def recording_cache_dir(
+    root: str | Path, path: str | Path, *segments: str | Path
+) -> Path:
+    """Return the cache folder for ``path`` under ``root`` (not created here).
+
+    ``night1.edf`` maps to ``<root>/night1-<key>``: readable at a glance, unique
+    per file version via :func:`recording_key`. A night joined from it and two
+    more ``segments`` maps to ``<root>/night1+2-<key>``.
+    """
+    stem = _UNSAFE.sub("_", Path(path).stem).strip("_") or "recording"
+    if segments:
+        stem += f"+{len(segments)}"
+    return Path(root) / f"{stem}-{recording_key(path, *segments)}"
@@ -0,0 +1,456 @@
+"""Automatic event detectors run over whole nights: spindles, slow waves, K-complexes.
+
+A detector is a plain function ``detect(data, sfreq)`` over one block of
+``(n_channels, n_samples)`` samples in volts, returning :class:`Detection`\\ s
+(seconds from the block's first sample, length, row). :class:`Detector` wraps
+one with its name and label, the channel types it reads, and the margin it
+needs; three are built in (:data:`BUILTIN`) and any importable
+``"package.module:function"`` works the same way (:func:`resolve_detector`).
+
+A night is far too long to hold in memory, so :func:`run_detectors` splits it
+into :data:`CHUNK_SECONDS` chunks (:func:`plan_chunks`) and reads each one with
+``detector.margin`` seconds of context on both sides (:func:`detect_chunk`).
+A chunk keeps exactly the events whose onset falls inside it, so every event
+belongs to one chunk — never duplicated at a boundary, never lost in one —
+provided the margin covers the longest event plus its filter's settling time
+(see :data:`DEFAULT_MARGIN`). Chunks are independent, so they run across a
+:class:`~concurrent.futures.ProcessPoolExecutor`, each worker process opening
+its own :class:`smacc.eeg.io.Recording` once (readers are neither picklable nor
+thread-safe); with one worker, or no file to reopen, they run in-process.
+
+Results are per-detector :class:`smacc.eeg.annotations.Annotation` lists, and
+:func:`write_detections` saves each as its own rater sidecar
+(``night1.annotations.auto-spindles.tsv``), so the Annotator overlays them like
+a peer rater's marks, with their own show/hide toggle. ``python -m smacc.eeg
+--detect spindles night1.edf`` runs the same pass headless.
+
+Pure numpy/scipy, no GUI: it reads through the view's ``SliceProvider``
+contract, and only the worker processes import :mod:`smacc.eeg.io` (MNE).
+"""
+
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import signal
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from scipy.ndimage import uniform_filter1d
+
+from . import dsp
+from .annotations import (
+    Annotation,
+    rater_sidecar_paths,
+    sanitize_rater_id,
+    write_annotations_json,
+    write_annotations_tsv,
+)
+from .jobs import check_cancelled
+
+if TYPE_CHECKING:
+    from .view import SliceProvider
+
+# Seconds of recording each task covers: 5 min makes ~100 tasks of an 8 h
+# night per detector — plenty to keep every core busy to the end — while the
+# margin read around each stays a small fraction of it.
+CHUNK_SECONDS = 300.0
+# Context read on each side of a chunk unless a detector asks for more: longer
+# than any event the built-ins report, plus the settling time of their filters
+# (a 0.3 Hz highpass rings for ~7 s; see smacc.eeg.dsp.pad_seconds).
+DEFAULT_MARGIN = 30.0
+# Detector sidecars are rater sidecars under this prefix: ``auto-spindles``.
+RATER_PREFIX = "auto-"
+# How often the pool loop wakes to check for cancellation, in seconds.
+_POLL_SECONDS = 0.2
+
+# Spindles: sigma-band (11–16 Hz) bursts lasting 0.5–3 s (AASM). A burst must be
+# large in absolute terms and carry a good share of the 4.5–30 Hz power, which
+# keeps broadband muscle and alpha-free noise from passing as spindles.
+SPINDLE_BAND = dsp.FilterSpec(highpass=11.0, lowpass=16.0)
+_SPINDLE_BROADBAND = dsp.FilterSpec(highpass=4.5, lowpass=30.0)
+SPINDLE_RMS_SECONDS = 0.3
+SPINDLE_MIN_RMS = 5e-6  # V: a ~7 µV-amplitude sigma burst
+SPINDLE_MIN_RELATIVE_POWER = 0.3
+SPINDLE_DURATION = (0.5, 3.0)
+
+# Slow oscillations: a negative then positive half-wave between two downward
+# zero crossings of the 0.3–1.5 Hz band, 0.8–2 s long, with a deep trough and a
+# large swing (after Massimini et al. 2004, at AASM's 75 µV slow-wave amplitude).
+SLOW_OSCILLATION_BAND = dsp.FilterSpec(highpass=0.3, lowpass=1.5)
+SLOW_OSCILLATION_DURATION = (0.8, 2.0)
+SLOW_OSCILLATION_TROUGH = 40e-6  # V below zero
+SLOW_OSCILLATION_PTP = 75e-6  # V, trough to peak
+
+# K-complexes: the same wave shape, sharper (a wider band) and shorter, but
+# isolated — no other large wave within a few seconds either side, which is
+# what separates a K-complex from a run of slow-wave sleep.
+K_COMPLEX_BAND = dsp.FilterSpec(highpass=0.3, lowpass=3.0)
+K_COMPLEX_DURATION = (0.5, 2.0)
+K_COMPLEX_TROUGH = 50e-6
+K_COMPLEX_PTP = 75e-6
+K_COMPLEX_ISOLATION = 3.0  # s either side without another large wave
+
+
+class Detection(NamedTuple):
+    """One detected event in a block: seconds from its first sample, length, row."""
+
+    onset: float
+    duration: float
+    row: int
+
+
+# The detector function: a block of samples and its rate in, events out.
+DetectFunction = Callable[[np.ndarray, float], Iterable[Detection]]
+
+
+@dataclass(frozen=True)
+class Detector:
+    """A named detector: the function, what it reads, and how it labels events.
+
+    ``name`` keys its results and sidecar (``auto-<name>``); each event is
+    labelled ``"<label> <channel>"``. ``function`` must be a module-level
+    function (worker processes receive it by reference). ``margin`` must cover
+    its longest event plus filter settling — see the module docstring.
+    """
+
+    name: str
+    label: str
+    function: DetectFunction
+    channel_types: tuple[str, ...] = ("eeg",)
+    margin: float = DEFAULT_MARGIN
+
+    def picks(self, ch_types: Sequence[str]) -> list[int]:
+        """The channel positions this detector reads, in recording order."""
+        return [i for i, kind in enumerate(ch_types) if kind in self.channel_types]
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start and stop (exclusive) sample of every run of ``True`` in ``mask``."""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _moving_power(data: np.ndarray, width: int) -> np.ndarray:
+    return uniform_filter1d(np.square(data, dtype=np.float64), width, axis=-1)
+
+
+def detect_spindles(data: np.ndarray, sfreq: float) -> list[Detection]:
+    """Sigma bursts: moving RMS over absolute and relative thresholds, 0.5–3 s."""
+    width = max(1, int(round(SPINDLE_RMS_SECONDS * sfreq)))
+    sigma = _moving_power(dsp.apply(data, sfreq, SPINDLE_BAND), width)
+    broad = _moving_power(dsp.apply(data, sfreq, _SPINDLE_BROADBAND), width)
+    mask = (sigma >= SPINDLE_MIN_RMS**2) & (sigma >= SPINDLE_MIN_RELATIVE_POWER * broad)
+    shortest, longest = SPINDLE_DURATION
+    found: list[Detection] = []
+    for row in range(mask.shape[0]):
+        starts, stops = _runs(mask[row])
+        for start, stop in zip(starts, stops, strict=True):
+            duration = (stop - start) / sfreq
+            if shortest <= duration <= longest:
+                found.append(Detection(start / sfreq, duration, row))
+    return found
+
+
+def _waves(x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Every wave between consecutive downward zero crossings of ``x``.
+
+    Returns start and stop samples and each wave's trough and peak value.
+    """
+    down = np.flatnonzero((x[:-1] >= 0) & (x[1:] < 0)) + 1
+    if down.size < 2:
+        empty = np.empty(0)
+        return empty.astype(np.intp), empty.astype(np.intp), empty, empty
+    starts, stops = down[:-1], down[1:]
+    span = x[: stops[-1]]
+    return (
+        starts,
+        stops,
+        np.minimum.reduceat(span, starts),
+        np.maximum.reduceat(span, starts),
+    )
+
+
+def _large_waves(
+    data: np.ndarray,
+    sfreq: float,
+    durations: tuple[float, float],
+    trough: float,
+    ptp: float,
+) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Per row: every wave's start and stop, and whether it is large enough."""
+    shortest, longest = durations
+    out = []
+    for x in data:
+        starts, stops, troughs, peaks = _waves(x)
+        seconds = (stops - starts) / sfreq
+        large = (
+            (seconds >= shortest)
+            & (seconds <= longest)
+            & (troughs <= -trough)
+            & (peaks - troughs >= ptp)
+        )
+        out.append((starts, stops, large))
+    return out
+
+
+def detect_slow_oscillations(data: np.ndarray, sfreq: float) -> list[Detection]:
+    """Large 0.3–1.5 Hz waves between downward zero crossings, 0.8–2 s long."""
+    filtered = dsp.apply(data, sfreq, SLOW_OSCILLATION_BAND)
+    waves = _large_waves(
+        filtered,
+        sfreq,
+        SLOW_OSCILLATION_DURATION,
+        SLOW_OSCILLATION_TROUGH,
+        SLOW_OSCILLATION_PTP,
+    )
+    return [
+        Detection(start / sfreq, (stop - start) / sfreq, row)
+        for row, (starts, stops, large) in enumerate(waves)
+        for start, stop in zip(starts[large], stops[large], strict=True)
+    ]
+
+
+def detect_k_complexes(data: np.ndarray, sfreq: float) -> list[Detection]:
+    """Large sharp waves with no other large wave within the isolation window."""
+    filtered = dsp.apply(data, sfreq, K_COMPLEX_BAND)
+    waves = _large_waves(
+        filtered, sfreq, K_COMPLEX_DURATION, K_COMPLEX_TROUGH, K_COMPLEX_PTP
+    )
+    gap = K_COMPLEX_ISOLATION * sfreq
+    found: list[Detection] = []
+    for row, (starts, stops, large) in enumerate(waves):
+        big_starts, big_stops = starts[large], stops[large]
+        for index, (start, stop) in enumerate(zip(big_starts, big_stops, strict=True)):
+            before = index > 0 and start - big_stops[index - 1] < gap
+            after = index + 1 < big_starts.size and big_starts[index + 1] - stop < gap
+            if not (before or after):
+                found.append(Detection(start / sfreq, (stop - start) / sfreq, row))
+    return found
+
+
+BUILTIN: dict[str, Detector] = {
+    detector.name: detector
+    for detector in (
+        Detector("spindles", "Spindle", detect_spindles),
+        Detector("slow-oscillations", "SlowOscillation", detect_slow_oscillations),
+        Detector("k-complexes", "KComplex", detect_k_complexes),
+    )
+}
+
+
+def resolve_detector(spec: str) -> Detector:
+    """The detector named by ``spec``: a :data:`BUILTIN` name or ``"module:function"``.
+
+    A user function gets the default channel types and margin, and is named
+    after itself. Raises ``ValueError`` for an unknown name or a target that
+    does not import.
+    """
+    spec = spec.strip()
+    if spec in BUILTIN:
+        return BUILTIN[spec]
+    module_name, sep, attribute = spec.partition(":")
+    if not sep or not module_name or not attribute:
+        known = ", ".join(BUILTIN)
+        raise ValueError(
+            f"Unknown detector {spec!r} (built in: {known}; or give a module:function)"
+        )
+    try:
+        function = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"Could not load detector {spec!r}: {exc}") from exc
+    if not callable(function):
+        raise ValueError(f"Detector {spec!r} is not a function")
+    name = sanitize_rater_id(attribute)
+    return Detector(name, name, function)
+
+
+class Chunk(NamedTuple):
+    """The span of a recording, in seconds, whose events one task reports."""
+
+    start: float
+    stop: float
+
+
+def plan_chunks(duration: float, chunk_seconds: float = CHUNK_SECONDS) -> list[Chunk]:
+    """Back-to-back chunks covering ``[0, duration)``; the last may be shorter."""
+    count = max(1, int(np.ceil(duration / chunk_seconds)))
+    return [
+        Chunk(i * chunk_seconds, min(duration, (i + 1) * chunk_seconds))
+        for i in range(count)
+    ]
+
+
+def detect_chunk(
+    provider: SliceProvider,
+    detector: Detector,
+    picks: Sequence[int],
+    chunk: Chunk,
+) -> list[Annotation]:
+    """Run ``detector`` on ``chunk`` of ``provider``, read with its margin.
+
+    Keeps only the events whose onset lies in ``[chunk.start, chunk.stop)``,
+    so back-to-back chunks report each event exactly once.
+    """
+    low = max(0.0, chunk.start - detector.margin)
+    high = min(provider.duration, chunk.stop + detector.margin)
+    times, data = provider.get_slice(low, high, picks, cache=False)
+    data = np.asarray(data)
+    if data.shape[-1] == 0:
+        return []
+    origin = float(times[0])
+    names = provider.ch_names
+    found: list[Annotation] = []
+    for relative, duration, row in detector.function(data, float(provider.sfreq)):
+        onset = origin + float(relative)
+        if chunk.start <= onset < chunk.stop:
+            channel = names[picks[int(row)]]
+            found.append(
+                Annotation(onset, float(duration), f"{detector.label} {channel}")
+            )
+    return found
+
+
+def default_workers() -> int:
+    """Worker processes to use when none are asked for: one per usable core."""
+    return os.process_cpu_count() or 1
+
+
+# The recording a pool worker opened in _open_worker_recording; one per process.
+_worker_recording: SliceProvider | None = None
+
+
+def _open_worker_recording(path: str) -> None:
+    global _worker_recording
+    # Ctrl+C is the parent's to handle (it cancels the pool); a worker that also
+    # caught it would die mid-chunk with a traceback of its own.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from .io import open_recording
+
+    _worker_recording = open_recording(path)
+
+
+def _detect_in_worker(
+    detector: Detector, picks: Sequence[int], chunk: Chunk
+) -> list[Annotation]:
+    assert _worker_recording is not None, "worker started without a recording"
+    return detect_chunk(_worker_recording, detector, picks, chunk)
+
+
+class _Task(NamedTuple):
+    detector: Detector
+    picks: list[int]
+    chunk: Chunk
+
+
+def run_detectors(
+    provider: SliceProvider,
+    detectors: Sequence[Detector],
+    *,
+    path: str | Path | None = None,
+    workers: int | None = None,
+    chunk_seconds: float = CHUNK_SECONDS,
+    report: Callable[[float], None] | None = None,
+    cancelled: threading.Event | None = None,
+) -> dict[str, list[Annotation]]:
+    """Run every detector over the whole of ``provider``; events per detector name.
+
+    With ``path`` (the file ``provider`` was opened from) and more than one
+    worker (default: :func:`default_workers`), chunks run in a pool of worker
+    processes that each reopen ``path``; otherwise they run here, one after
+    another, on ``provider``. Either way ``report(fraction)`` follows the
+    chunks done, ``cancelled`` is polled between them (raising
+    :class:`smacc.eeg.jobs.JobCancelled`, with queued chunks dropped), and each
+    list comes back sorted. A detector with no channels to read finds nothing.
+    """
+    chunks = plan_chunks(provider.duration, chunk_seconds)
+    tasks = [
+        _Task(detector, picks, chunk)
+        for detector in detectors
+        if (picks := detector.picks(provider.ch_types))
+        for chunk in chunks
+    ]
+    found: dict[str, list[Annotation]] = {d.name: [] for d in detectors}
+    count = workers if workers is not None else default_workers()
+    count = min(count, len(tasks))
+
+    def record(task: _Task, events: list[Annotation], done: int) -> None:
+        found[task.detector.name].extend(events)
+        if report is not None:
+            report(done / len(tasks))
+
+    if path is None or count <= 1:
+        for done, task in enumerate(tasks, start=1):
+            check_cancelled(cancelled)
+            record(task, detect_chunk(provider, *task), done)
+    else:
+        _run_in_pool(str(path), tasks, count, record, cancelled)
+    return {name: sorted(events) for name, events in found.items()}
+
+
+def _run_in_pool(
+    path: str,
+    tasks: list[_Task],
+    workers: int,
+    record: Callable[[_Task, list[Annotation], int], None],
+    cancelled: threading.Event | None,
+) -> None:
+    # "spawn", not the platform default: forking a process that runs Qt and
+    # reader threads can deadlock the child, and it is the only method on
+    # Windows anyway, so every platform behaves the same.
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_open_worker_recording,
+        initargs=(path,),
+    )
+    try:
+        pending: dict[Future[list[Annotation]], _Task] = {
+            pool.submit(_detect_in_worker, *task): task for task in tasks
+        }
+        done = 0
+        while pending:
+            check_cancelled(cancelled)
+            finished, _ = wait(pending, _POLL_SECONDS, FIRST_COMPLETED)
+            for future in finished:
+                done += 1
+                record(pending.pop(future), future.result(), done)
+    except BaseException:
+        # Cancelled, failed or interrupted: drop the queued chunks and return
+        # now; the running ones finish in the background and their workers exit.
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+
+def write_detections(
+    source: str | Path,
+    detections: dict[str, list[Annotation]],
+    *,
+    meas_date: datetime | None,
+) -> list[Path]:
+    """Save each detector's events as its ``auto-<name>`` rater sidecar pair.
+
+    Overwrites an earlier run's sidecars of the same detectors; returns the
+    TSV paths written.
+    """
+    written: list[Path] = []
+    for name, events in detections.items():
+        rater_id = f"{RATER_PREFIX}{name}"
+        tsv, sidecar = rater_sidecar_paths(source, rater_id)
+        write_annotations_tsv(events, tsv)
+        write_annotations_json(
+            sidecar,
+            source_name=Path(source).name,
+            meas_date=meas_date,
+            rater_id=rater_id,
+        )
+        written.append(tsv)
+    return written
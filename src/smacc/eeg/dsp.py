@@ -15,6 +15,18 @@ order IIR over a few seconds of slice is microseconds of work. This is a
 *display* filter; it feeds nothing downstream, so publication-grade filter
 choice is out of scope.
 
+For the same reason the viewer filters in float32 (half the memory traffic of
+float64, and far more precision than a pixel can show): :func:`apply` keeps a
+float32 slice float32, running float32 coefficients where quantizing them
+provably leaves the filter intact (:func:`_design_float32`) and the float64
+design otherwise.
+
+A wide window has far more samples than the screen has pixels, so before
+filtering the view may first :func:`decimate` it by an integer factor chosen
+from its pixel width and the effective lowpass (:func:`decimation_factor`):
+filtering and drawing then both work on a few points per pixel, and nothing
+below the lowpass — the band the reviewer asked to see — is lost.
+
 Pure numpy/scipy (already core dependencies), no MNE, no GUI.
 """
 
@@ -35,6 +47,22 @@ _NOTCH_Q = 30.0
 # designed: scipy raises on >= Nyquist, and a 70 Hz lowpass on a 128 Hz file
 # should simply mean "no lowpass", not a crash (see effective_spec).
 _NYQUIST_FRACTION = 0.99
+# Largest deviation of a float32-quantized filter's frequency response from the
+# float64 design that still counts as the same filter: 0.1 % of the unit
+# passband gain, far below a pixel of lane height. A very low highpass at a high
+# rate (0.1 Hz at 1 kHz) puts its poles so close to the unit circle that float32
+# rounding moves them visibly — or outside it — and fails this check.
+_FLOAT32_RESPONSE_TOLERANCE = 1e-3
+# Decimated points per pixel of trace width: two, what pyqtgraph's own peak
+# downsampling would keep anyway.
+_POINTS_PER_PIXEL = 2.0
+# The decimated rate stays at least this multiple of the lowpass, so its
+# Nyquist (1.5× the lowpass) leaves the anti-alias filter's transition band
+# above everything the display filter passes.
+_LOWPASS_HEADROOM = 3.0
+# Stopband attenuation of the decimation FIR: an aliased component comes back at
+# 0.1 % of its amplitude, the same "below a pixel" bar as the float32 check.
+_DECIMATION_ATTENUATION_DB = 60.0
 
 
 @dataclass(frozen=True)
@@ -131,6 +159,27 @@ def _design(spec: FilterSpec, sfreq: float) -> np.ndarray:
     return np.vstack(sections)
 
 
+@lru_cache(maxsize=8)
+def _design_float32(spec: FilterSpec, sfreq: float) -> np.ndarray | None:
+    """``spec``'s SOS in float32, or ``None`` where float32 can't hold it.
+
+    Safe means every quantized section is still stable and the cascade's
+    frequency response stays within :data:`_FLOAT32_RESPONSE_TOLERANCE` of the
+    float64 design; checked once per design, like :func:`_design` is cached.
+    """
+    sos = _design(spec, sfreq)
+    quantized = sos.astype(np.float32)
+    if any(np.any(np.abs(np.roots(section[3:])) >= 1.0) for section in quantized):
+        return None
+    with np.errstate(divide="ignore", invalid="ignore"):
+        _, exact = signal.sosfreqz(sos, worN=2048)
+        _, rounded = signal.sosfreqz(quantized.astype(float), worN=2048)
+    error = np.abs(exact - rounded)
+    if not np.all(np.isfinite(error)) or error.max() > _FLOAT32_RESPONSE_TOLERANCE:
+        return None
+    return quantized
+
+
 def apply(data: np.ndarray, sfreq: float, spec: FilterSpec) -> np.ndarray:
     """Zero-phase filter ``data`` (``(n_channels, n_samples)``) per ``spec``.
 
@@ -138,16 +187,99 @@ def apply(data: np.ndarray, sfreq: float, spec: FilterSpec) -> np.ndarray:
     return ``data`` unchanged — same array, no copy. Slices too short to pad
     (a sliver at the end of a file) also pass through unfiltered rather than
     raising; a few unfilterable samples aren't worth crashing the view over.
+
+    float32 ``data`` comes back float32 (see the module docstring); anything
+    else is filtered in float64, as before.
+
+    A gap (NaN samples — a joined night's missing stretch, see
+    :class:`smacc.eeg.io.ConcatRecording`) splits the slice: each run between
+    gaps is filtered on its own, so one gap doesn't turn the whole window NaN.
     """
     spec = effective_spec(spec, sfreq)
     if spec.is_identity or data.size == 0:
         return data
+    gaps = np.isnan(data).any(axis=0)
+    if gaps.any():
+        out = data.copy()
+        edges = np.flatnonzero(
+            np.diff(np.concatenate([[1], gaps, [1]]).astype(np.int8))
+        )
+        for start, stop in zip(edges[::2], edges[1::2], strict=True):
+            out[:, start:stop] = apply(data[:, start:stop], sfreq, spec)
+        return out
     sos = _design(spec, sfreq)
     # sosfiltfilt's default pad length; inputs shorter than it can't be padded.
     padlen = 3 * (2 * len(sos) + 1)
     if data.shape[-1] <= padlen:
         return data
-    return signal.sosfiltfilt(sos, data, axis=-1)
+    if data.dtype != np.float32:
+        return signal.sosfiltfilt(sos, data, axis=-1)
+    sos32 = _design_float32(spec, sfreq)
+    if sos32 is None:  # filter in float64, hand back float32
+        return signal.sosfiltfilt(sos, data, axis=-1).astype(np.float32)
+    return signal.sosfiltfilt(sos32, data, axis=-1)
+
+
+def decimation_factor(
+    sfreq: float, seconds: float, pixels: int, lowpass: float | None
+) -> int:
+    """The integer factor to decimate a ``seconds``-long window by (1: none).
+
+    The decimated rate is the higher of a couple of points per pixel and a
+    safe margin over ``lowpass`` (the *effective* lowpass — see
+    :func:`effective_spec`). Without a lowpass every frequency up to Nyquist is
+    on display, so nothing can be dropped and the factor is 1.
+    """
+    if lowpass is None or seconds <= 0 or pixels <= 0:
+        return 1
+    target = max(_POINTS_PER_PIXEL * pixels / seconds, _LOWPASS_HEADROOM * lowpass)
+    return max(1, int(sfreq // target))
+
+
+@lru_cache(maxsize=8)
+def _decimation_fir(factor: int) -> np.ndarray:
+    """The anti-alias FIR for decimating by ``factor`` (odd length, zero phase).
+
+    The display lowpass still runs after decimation, at most a third of the
+    decimated rate (:data:`_LOWPASS_HEADROOM`), so only what would fold back
+    *below* it has to go: a component at ``f`` lands at ``rate - f``, so the
+    stopband starts at two thirds of the decimated rate and the transition band
+    can be a third of it wide — a filter about half as long as a
+    :func:`scipy.signal.resample_poly` default, which must be flat up to the new
+    Nyquist.
+    """
+    width = 2.0 / (_LOWPASS_HEADROOM * factor)  # a third of the new rate, in Nyquists
+    taps, beta = signal.kaiserord(_DECIMATION_ATTENUATION_DB, width)
+    taps |= 1  # odd: a whole-sample delay, which resample_poly undoes
+    return signal.firwin(taps, 1.0 / factor, window=("kaiser", beta))
+
+
+def decimate(data: np.ndarray, factor: int, peaks: bool = False) -> np.ndarray:
+    """Reduce ``data`` (``(n_channels, n_samples)``) to every ``factor``-th sample.
+
+    Output sample ``k`` stands for input sample ``k * factor``; a trailing
+    partial bucket is dropped, so ``n_samples // factor`` samples come back in
+    ``data``'s dtype. By default this is an anti-aliased polyphase decimation
+    (a zero-phase FIR, :func:`_decimation_fir`, run in ``data``'s dtype by
+    :func:`scipy.signal.resample_poly`). ``peaks=True``
+    instead keeps, per bucket of ``factor`` samples, the one furthest from the
+    bucket mean — so a spike narrower than a bucket still reaches full height
+    on screen, at the price of the aliasing the FIR would have removed.
+    """
+    if factor <= 1 or data.size == 0:
+        return data
+    n = data.shape[-1] // factor
+    buckets = data[..., : n * factor]
+    if not peaks:
+        fir = _decimation_fir(factor).astype(data.dtype, copy=False)
+        out = signal.resample_poly(
+            buckets, 1, factor, axis=-1, window=fir, padtype="line"
+        )
+        return out[..., :n].astype(data.dtype, copy=False)
+    buckets = buckets.reshape(*data.shape[:-1], n, factor)
+    deviation = np.abs(buckets - buckets.mean(axis=-1, keepdims=True))
+    pick = deviation.argmax(axis=-1)[..., np.newaxis]
+    return np.take_along_axis(buckets, pick, axis=-1)[..., 0]
 
 
 def pad_seconds(spec: FilterSpec) -> float:
@@ -0,0 +1,346 @@
+"""Whole-night filtered cache: the recording streamed once through a display filter.
+
+Once a reviewer settles on a montage filter (HP 0.3 / LP 35 / notch 60, say),
+every scroll still fetches a padded slice and reruns :func:`smacc.eeg.dsp.apply`
+on it — the same samples through the same filter, again and again. This module
+runs that filter *once*, over the whole recording, in overlapping blocks, into a
+float32 memory map; the view then serves any window the cache covers as a plain
+slice of it (:meth:`FilteredCache.window`), with no read and no filtering.
+
+A cache belongs to one recording, one channel set, and one filter per channel,
+and is keyed by all three: it lives in the recording's cache folder
+(:mod:`smacc.eeg.cache`) under ``filtered/<key>`` (:func:`cache_key`). A window
+is served only if every channel it shows is in the cache *with the same
+effective filter*, so a changed filter simply misses, like the read-ahead cache
+(:class:`smacc.eeg.prefetch.WindowCache`); hiding or reordering channels still
+hits.
+
+Each block is filtered through :func:`smacc.eeg.prefetch.filter_window` — the
+view's own path, with its filter margin on both sides — so a cached window is
+what the view would have drawn, up to the margin's residual transient at block
+seams (well under 1 % of the signal, as for a slid window). Blocks are written
+in order and :attr:`FilteredCache.filled` advances behind them, so the part
+already streamed serves windows while the rest is still being built.
+
+A whole-night float32 copy is as large as the channels it holds (8 h × 32 ch ×
+512 Hz ≈ 1.9 GB), so the filtered caches of every recording share a disk cap:
+:func:`evict` deletes the least recently used ones until a new one fits. The
+manifest is written last, as for the pyramid (:mod:`smacc.eeg.pyramid`), so an
+interrupted build is never loaded; a cancelled one removes its folder.
+
+Pure numpy plus :mod:`smacc.eeg.dsp`/:mod:`smacc.eeg.prefetch`, no GUI and no
+MNE: it reads through the view's ``SliceProvider`` contract.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import dsp, prefetch
+from .jobs import check_cancelled
+from .prefetch import FilteredWindow, WindowKey
+
+if TYPE_CHECKING:
+    from .view import SliceProvider
+
+# The folder, inside a recording's cache folder, holding its filtered caches.
+FOLDER_NAME = "filtered"
+# Disk shared by every recording's filtered caches before the least recently
+# used are evicted: a handful of whole nights at typical PSG sizes.
+DEFAULT_DISK_CAP = 20 * 1024**3
+# Samples filtered per streaming block (~8.5 min at 512 Hz): long enough that
+# the filter margin fetched around each block is a few percent extra, short
+# enough that a block of a dense recording stays a few hundred MB.
+_BLOCK_SAMPLES = 2**18
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "data.npy"
+_FORMAT_VERSION = 1
+
+
+def cache_key(channels: Sequence[int], specs: Sequence[dsp.FilterSpec]) -> str:
+    """A folder-safe key for ``channels`` filtered by ``specs`` (same order)."""
+    identity = json.dumps(
+        [[int(c), *_spec_to_json(s)] for c, s in zip(channels, specs, strict=True)]
+    )
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def _spec_to_json(spec: dsp.FilterSpec) -> list[float | None]:
+    return [spec.highpass, spec.lowpass, spec.notch]
+
+
+def _spec_from_json(values: list[float | None]) -> dsp.FilterSpec:
+    highpass, lowpass, notch = values
+    return dsp.FilterSpec(highpass=highpass, lowpass=lowpass, notch=notch)
+
+
+class FilteredCache:
+    """One recording's channels, filtered whole, as a ``(n_channels, n_times)`` map.
+
+    ``filled`` is how many samples from the start are written: the full length
+    for a loaded cache, advancing block by block while :func:`build_filtered_cache`
+    runs — only that prefix is ever served.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        data: np.ndarray,
+        *,
+        sfreq: float,
+        channels: tuple[int, ...],
+        specs: tuple[dsp.FilterSpec, ...],
+        filled: int,
+    ) -> None:
+        self.directory = directory
+        self.sfreq = sfreq
+        self.channels = channels
+        self.specs = specs
+        self.filled = filled
+        self._data = data
+        self._row_of = {
+            (channel, spec): row
+            for row, (channel, spec) in enumerate(zip(channels, specs, strict=True))
+        }
+
+    @property
+    def n_times(self) -> int:
+        return int(self._data.shape[-1])
+
+    @property
+    def complete(self) -> bool:
+        return self.filled >= self.n_times
+
+    @classmethod
+    def load(cls, directory: str | Path) -> FilteredCache | None:
+        """Open the complete cache in ``directory``, or ``None`` if there is none.
+
+        Loading marks the cache as just used for :func:`evict`. Like
+        :meth:`smacc.eeg.pyramid.Pyramid.load`, anything missing or foreign
+        reads as "no cache" (never an error) and the caller rebuilds.
+        """
+        folder = Path(directory)
+        manifest_path = folder / MANIFEST_NAME
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("version") != _FORMAT_VERSION:
+                return None
+            data = np.load(folder / DATA_NAME, mmap_mode="r")
+            channels = tuple(int(c) for c in manifest["channels"])
+            specs = tuple(_spec_from_json(s) for s in manifest["specs"])
+            if data.shape != (len(channels), int(manifest["n_times"])):
+                return None
+            os.utime(manifest_path)  # the LRU clock
+            return cls(
+                folder,
+                data,
+                sfreq=float(manifest["sfreq"]),
+                channels=channels,
+                specs=specs,
+                filled=data.shape[-1],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def matches(self, provider: SliceProvider) -> bool:
+        """True if this cache was built from a recording shaped like ``provider``."""
+        return (
+            self.sfreq == float(provider.sfreq)
+            and self.n_times == _n_times(provider)
+            and all(c < len(provider.ch_names) for c in self.channels)
+        )
+
+    def covers(self, channels: Sequence[int], specs: Sequence[dsp.FilterSpec]) -> bool:
+        """Whether every channel in ``channels`` is cached under its spec."""
+        return all(pair in self._row_of for pair in zip(channels, specs, strict=True))
+
+    def serves(self, key: WindowKey) -> bool:
+        """Whether :meth:`window` would serve ``key`` (cheap: reads nothing)."""
+        return self._span(key) is not None
+
+    def window(self, key: WindowKey) -> FilteredWindow | None:
+        """``key``'s window as a slice of the cache, or ``None`` if it can't serve it.
+
+        Served only when every visible channel is cached under its spec in
+        ``key`` and the whole window (clamped to the recording) is already
+        filled. A decimated key takes every ``key.factor``-th sample on the
+        same recording-fixed grid as :func:`smacc.eeg.prefetch.filter_window`;
+        the cache is filtered at the full rate, lowpass included, so a plain
+        stride needs no anti-aliasing of its own (``peaks`` keeps each bucket's
+        extreme as usual).
+        """
+        span = self._span(key)
+        if span is None:
+            return None
+        rows, first, last = span
+        factor = key.factor
+        if factor > 1 and key.peaks:
+            n = (last - first) // factor
+            block = self._data[rows, first : first + n * factor]
+            data = dsp.decimate(block, factor, peaks=True)
+        else:
+            data = self._data[rows, first:last:factor]
+        times = np.arange(first, first + data.shape[-1] * factor, factor) / self.sfreq
+        return FilteredWindow(times, np.asarray(data))
+
+    def _span(self, key: WindowKey) -> tuple[list[int], int, int] | None:
+        """Cache rows and the ``[first, last)`` samples of ``key``, if served."""
+        rows = [
+            self._row_of.get(pair) for pair in zip(key.visible, key.specs, strict=True)
+        ]
+        if None in rows:
+            return None
+        # The samples filter_window keeps: times within [start, start + seconds].
+        first = max(0, int(np.ceil(key.start * self.sfreq - 1e-6)))
+        last = min(
+            self.n_times,
+            int(np.floor((key.start + key.seconds) * self.sfreq + 1e-6)) + 1,
+        )
+        if last > self.filled:
+            return None
+        first += -first % max(1, key.factor)  # onto the recording-fixed grid
+        return [r for r in rows if r is not None], first, max(first, last)
+
+
+def _n_times(provider: SliceProvider) -> int:
+    return int(round(provider.duration * provider.sfreq))
+
+
+def expected_size(provider: SliceProvider, channels: Sequence[int]) -> int:
+    """The bytes a cache of ``channels`` of ``provider`` takes on disk (float32)."""
+    return 4 * len(channels) * _n_times(provider)
+
+
+def create_filtered_cache(
+    provider: SliceProvider,
+    directory: str | Path,
+    channels: Sequence[int],
+    specs: Sequence[dsp.FilterSpec],
+) -> FilteredCache:
+    """An empty (``filled == 0``) cache in ``directory``, ready to build into.
+
+    Split from :func:`build_filtered_cache` so the caller can hand the cache to
+    the view on the GUI thread while the build runs on a worker: the view then
+    serves whatever prefix is already filled. A stale or partial folder is
+    replaced.
+    """
+    folder = Path(directory)
+    if folder.exists():
+        shutil.rmtree(folder)
+    folder.mkdir(parents=True)
+    data = np.lib.format.open_memmap(
+        folder / DATA_NAME,
+        mode="w+",
+        dtype=np.float32,
+        shape=(len(channels), _n_times(provider)),
+    )
+    return FilteredCache(
+        folder,
+        data,
+        sfreq=float(provider.sfreq),
+        channels=tuple(int(c) for c in channels),
+        specs=tuple(specs),
+        filled=0,
+    )
+
+
+def build_filtered_cache(
+    provider: SliceProvider,
+    filtered: FilteredCache,
+    *,
+    report: Callable[[float], None] | None = None,
+    cancelled: threading.Event | None = None,
+) -> FilteredCache:
+    """Stream ``provider`` through ``filtered``'s filters into its memory map.
+
+    Each block is fetched and filtered with its filter margin on both sides and
+    written at its offset; ``filtered.filled`` advances after every write. The
+    manifest goes last. A cancelled (:class:`smacc.eeg.jobs.JobCancelled`) or
+    failed build removes the folder so nothing half-written is ever loaded.
+    """
+    sfreq = filtered.sfreq
+    n_times = filtered.n_times
+    folder = filtered.directory
+    data = filtered._data
+    try:
+        for start in range(0, n_times, _BLOCK_SAMPLES):
+            check_cancelled(cancelled)
+            stop = min(n_times, start + _BLOCK_SAMPLES)
+            # Half a sample either side, so the trim keeps exactly start..stop-1
+            # whatever the rounding of the provider's times.
+            key = WindowKey(
+                (start - 0.5) / sfreq,
+                (stop - start) / sfreq,
+                filtered.channels,
+                filtered.specs,
+            )
+            block = prefetch.filter_window(provider, key, cache=False).data
+            count = min(stop - start, block.shape[-1])
+            data[:, start : start + count] = block[:, :count]
+            filtered.filled = start + count
+            if report is not None:
+                report(stop / n_times)
+        if isinstance(data, np.memmap):
+            data.flush()
+        manifest = {
+            "version": _FORMAT_VERSION,
+            "sfreq": sfreq,
+            "n_times": n_times,
+            "channels": list(filtered.channels),
+            "specs": [_spec_to_json(s) for s in filtered.specs],
+        }
+        (folder / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+    except BaseException:
+        filtered.filled = 0  # a view still holding it stops reading it
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+    return filtered
+
+
+def cache_folders(root: str | Path) -> list[Path]:
+    """Every filtered cache folder under the cache ``root``, across recordings."""
+    return sorted(Path(root).glob(f"*/{FOLDER_NAME}/*"))
+
+
+def _folder_size(folder: Path) -> int:
+    return sum(f.stat().st_size for f in folder.iterdir() if f.is_file())
+
+
+def evict(root: str | Path, cap: int, keep: Iterable[Path] = ()) -> list[Path]:
+    """Delete the least recently used filtered caches until they fit in ``cap``.
+
+    Recency is the manifest's modification time (touched by
+    :meth:`FilteredCache.load`); a folder without a manifest — an interrupted
+    build — is oldest of all. Folders in ``keep`` (a cache in use or being
+    built) are counted but never deleted. Returns the folders removed.
+    """
+    kept = {Path(k).resolve() for k in keep}
+    entries: list[tuple[float, int, Path]] = []
+    for folder in cache_folders(root):
+        try:
+            size = _folder_size(folder)
+            manifest = folder / MANIFEST_NAME
+            used = manifest.stat().st_mtime if manifest.exists() else 0.0
+        except OSError:
+            continue
+        entries.append((used, size, folder))
+    total = sum(size for _, size, _ in entries)
+    removed: list[Path] = []
+    for _, size, folder in sorted(entries, key=lambda e: e[0]):
+        if total <= cap:
+            break
+        if folder.resolve() in kept:
+            continue
+        shutil.rmtree(folder, ignore_errors=True)
+        total -= size
+        removed.append(folder)
+    return removed
@@ -0,0 +1,120 @@
+"""Per-recording header cache: what opening a file learns, kept for the next open.
+
+Opening a night costs more than the header parse. The embedded events are
+converted, the native EDF/BDF path (:mod:`smacc.eeg.io`) checks its decoding
+against MNE's on the first record, and auto-align's trigger list needs a scan
+of the *whole* stim channel (seconds on a cold file). None of it changes while
+the file doesn't, so the results are kept in the
+recording's cache folder (:mod:`smacc.eeg.cache`, keyed by path, size and
+mtime) as one small ``header.npz``. The next open reuses them once the file's
+header still agrees: the channel names and types, rate, length and start time.
+
+The triggers are ``None`` until something first asks for them (the open
+itself never scans the stim channel); that scan then writes them back. The
+file is replaced atomically, so a crash mid-write leaves the old header or
+none, never half of one. Like every cache there, it is disposable.
+
+Pure numpy, no GUI and no MNE.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from .annotations import Annotation
+
+# The file's name inside a recording's cache folder, and its layout version; a
+# changed layout bumps the version so an old header is ignored, not misread.
+FILE_NAME = "header.npz"
+_FORMAT_VERSION = 1
+
+
+class RecordingHeader(NamedTuple):
+    """What an open learned about one recording (see the module docstring)."""
+
+    ch_names: tuple[str, ...]
+    ch_types: tuple[str, ...]
+    sfreq: float
+    n_times: int
+    meas_date: datetime | None
+    native: bool  # the EDF/BDF memory map decodes as MNE does
+    annotations: tuple[Annotation, ...]
+    triggers: tuple[tuple[float, int], ...] | None  # None until first scanned
+
+
+def load_header(folder: str | Path) -> RecordingHeader | None:
+    """The header cached in ``folder``, or ``None`` if there is none (or a foreign one).
+
+    An unreadable file reads as "no header", never an error: the caller just
+    builds a fresh one from the recording.
+    """
+    try:
+        with np.load(Path(folder) / FILE_NAME, allow_pickle=False) as stored:
+            if int(stored["version"]) != _FORMAT_VERSION:
+                return None
+            date = str(stored["meas_date"])
+            triggers = None
+            if bool(stored["scanned"]):
+                triggers = tuple(
+                    (float(t), int(c))
+                    for t, c in zip(
+                        stored["trigger_times"], stored["trigger_codes"], strict=True
+                    )
+                )
+            return RecordingHeader(
+                ch_names=tuple(str(name) for name in stored["ch_names"]),
+                ch_types=tuple(str(kind) for kind in stored["ch_types"]),
+                sfreq=float(stored["sfreq"]),
+                n_times=int(stored["n_times"]),
+                meas_date=datetime.fromisoformat(date) if date else None,
+                native=bool(stored["native"]),
+                annotations=tuple(
+                    Annotation(float(onset), float(duration), str(description))
+                    for onset, duration, description in zip(
+                        stored["onsets"],
+                        stored["durations"],
+                        stored["descriptions"],
+                        strict=True,
+                    )
+                ),
+                triggers=triggers,
+            )
+    except (OSError, ValueError, KeyError, TypeError, EOFError):
+        return None
+
+
+def save_header(folder: str | Path, header: RecordingHeader) -> None:
+    """Write ``header`` to ``folder`` (created if needed), replacing any old one.
+
+    Raises:
+        OSError: if the folder or file can't be written.
+    """
+    target = Path(folder) / FILE_NAME
+    target.parent.mkdir(parents=True, exist_ok=True)
+    triggers = header.triggers or ()
+    partial = target.with_name(f"{FILE_NAME}.partial")
+    with partial.open("wb") as stream:
+        np.savez(
+            stream,
+            version=_FORMAT_VERSION,
+            ch_names=np.array(header.ch_names, dtype=str),
+            ch_types=np.array(header.ch_types, dtype=str),
+            sfreq=header.sfreq,
+            n_times=header.n_times,
+            meas_date="" if header.meas_date is None else header.meas_date.isoformat(),
+            native=header.native,
+            onsets=np.array([a.onset for a in header.annotations], dtype=float),
+            durations=np.array([a.duration for a in header.annotations], dtype=float),
+            descriptions=np.array(
+                [a.description for a in header.annotations], dtype=str
+            ),
+            scanned=header.triggers is not None,
+            trigger_times=np.array([t for t, _ in triggers], dtype=float),
+            trigger_codes=np.array([c for _, c in triggers], dtype=np.int64),
+        )
+    os.replace(partial, target)
@@ -0,0 +1,96 @@
+"""Background work for the EEG Annotator: whole-recording passes off the GUI thread.
+
+Anything that streams an entire night (building an overview, precomputing a
+cache) takes seconds to minutes on an 8 h file, and the Annotator must stay
+scrollable meanwhile. :class:`BackgroundJob` runs one such pass on a daemon
+thread — the :class:`smacc.updates.UpdateChecker` pattern — and reports back
+through Qt signals, which Qt delivers as queued calls on the receiver's (GUI)
+thread, so the slots may touch widgets.
+
+The work itself is a plain function ``work(report, cancelled)``: it calls
+``report(fraction)`` as it goes and polls ``cancelled`` (a
+:class:`threading.Event`) between blocks, raising :class:`JobCancelled` to stop
+early. Keeping the work a pure function keeps it unit-testable without a thread
+or an event loop.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from PyQt6 import QtCore
+
+# The work callable: report progress in [0, 1], poll the cancel flag, return a result.
+Work = Callable[[Callable[[float], None], threading.Event], Any]
+
+
+class JobCancelled(Exception):
+    """Raised by a job's work function when its cancel flag is set."""
+
+
+def check_cancelled(cancelled: threading.Event | None) -> None:
+    """Raise :class:`JobCancelled` if ``cancelled`` is set (``None`` never is)."""
+    if cancelled is not None and cancelled.is_set():
+        raise JobCancelled
+
+
+class BackgroundJob(QtCore.QObject):
+    """Runs one ``work`` function on a daemon thread and signals the outcome.
+
+    ``finished`` fires once with the work's return value; ``failed`` fires once
+    with a message if it raised. A cancelled job fires neither — whoever cancelled
+    it has already moved on. The thread is a daemon so an abandoned pass over a
+    slow network share can never keep the Annotator from exiting.
+
+    Keep a reference to the job (not a Qt parent): the worker emits on this
+    object, so it must outlive the window that started it.
+    """
+
+    progressed = QtCore.pyqtSignal(float)  # fraction done, 0..1
+    finished = QtCore.pyqtSignal(object)  # the work's return value
+    failed = QtCore.pyqtSignal(str)  # the error, for the status bar
+
+    def __init__(self, name: str, work: Work) -> None:
+        super().__init__()
+        self._name = name
+        self._work = work
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the work (once); the signals fire from the worker thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Ask the work to stop at its next check; returns without waiting."""
+        self._cancelled.set()
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until the worker thread ends (tests and benchmarks only)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            result = self._work(self.progressed.emit, self._cancelled)
+        except JobCancelled:
+            return
+        except Exception as exc:  # reported, never raised into a bare thread
+            if not self._cancelled.is_set():
+                self.failed.emit(str(exc) or type(exc).__name__)
+            return
+        if not self._cancelled.is_set():
+            self.finished.emit(result)
@@ -0,0 +1,384 @@
+"""Read-ahead for the trace view: adjacent windows fetched and filtered in advance.
+
+Scoring a night is paging: the next window is almost always the next 30 s, and
+the one after a step back is the one just left. Fetching and filtering a window
+costs tens of milliseconds locally and far more from a network share, all of it
+on the GUI thread. :class:`Prefetcher` moves that work onto a daemon thread for
+the windows the view predicts next (:func:`neighbours`), so the page turn itself
+is a dictionary lookup in :class:`WindowCache`.
+
+What is cached is the *filtered, trimmed* window (:class:`FilteredWindow`) — the
+slow part — not the lane-scaled curves: the amplitude scale changes far more
+often than the filter and costs one multiply to reapply. A window is keyed by
+everything that shapes it (:class:`WindowKey`: start, length, the visible
+channels and each one's filter), so a changed filter or montage simply misses
+and never serves stale data.
+
+A small scroll (the wheel, a fine nudge) is the other common move, and there
+most of the new window is already on hand: :func:`slide_window` keeps the
+overlap of the previous window and fetches and filters only the newly exposed
+edge, with the same filter margin, so the cost follows the new data rather than
+the window length.
+
+Filtering itself is spread over cores: scipy's ``sosfiltfilt`` releases the GIL,
+so the channel groups of a window (one per distinct filter, split into a few
+rows each) run as tasks on one shared thread pool (:func:`parallel_map`), sized
+to the machine and reused across refreshes rather than spun up per window.
+
+Pure numpy plus :mod:`smacc.eeg.dsp`, no GUI: the worker must never touch Qt.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from . import dsp
+
+if TYPE_CHECKING:
+    from .view import SliceProvider
+
+# Windows kept: the current one, both neighbours, and a few recently left — enough
+# for the back-and-forth of comparing two epochs without holding much memory (a
+# 30 s × 64 ch × 1 kHz window is ~8 MB as float32, ~15 MB as float64).
+DEFAULT_CAPACITY = 8
+# Rows filtered per pool task: a handful of channels keeps each task's working
+# set in cache and gives even a single-filter montage enough tasks to spread.
+_ROWS_PER_TASK = 8
+
+# The shared compute pool (see parallel_map) and the worker count it is built
+# with; None means one per core the process may run on.
+_pool: ThreadPoolExecutor | None = None
+_pool_workers: int | None = None
+_pool_lock = threading.Lock()
+
+
+class WindowKey(NamedTuple):
+    """Everything that determines a filtered window's contents.
+
+    ``specs`` holds the effective filter of each channel in ``visible``, in the
+    same order, so a per-type override change is a different key. ``factor``
+    is the decimation applied before filtering (:func:`smacc.eeg.dsp.decimate`;
+    1 for none) and ``peaks`` its peak-preserving variant.
+    """
+
+    start: float
+    seconds: float
+    visible: tuple[int, ...]
+    specs: tuple[dsp.FilterSpec, ...]
+    factor: int = 1
+    peaks: bool = False
+
+
+class FilteredWindow(NamedTuple):
+    """A fetched, filtered window trimmed to ``[start, start + seconds]``.
+
+    ``data`` is ``(len(visible), n_samples)`` in the file's units, one row per
+    visible channel in display order — float32 unless the view runs in float64.
+    """
+
+    times: np.ndarray
+    data: np.ndarray
+
+
+def set_compute_workers(workers: int | None) -> None:
+    """Size the shared compute pool: ``None`` for one thread per core, 1 for none.
+
+    Mostly for the benchmark's serial-vs-parallel rows; the pool in use is shut
+    down (without waiting) and the next :func:`parallel_map` builds the new one.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+        _pool_workers = workers
+
+
+def _compute_pool() -> ThreadPoolExecutor | None:
+    """The shared pool, created on first use; ``None`` on a single core."""
+    global _pool
+    with _pool_lock:
+        workers = _pool_workers or os.process_cpu_count() or 1
+        if workers <= 1:
+            return None
+        if _pool is None:
+            _pool = ThreadPoolExecutor(workers, thread_name_prefix="eeg-compute")
+        return _pool
+
+
+def parallel_map[T, R](fn: Callable[[T], R], items: Sequence[T]) -> list[R]:
+    """``[fn(item) for item in items]``, run on the shared compute pool.
+
+    For numpy/scipy work that releases the GIL (filtering, scaling long rows).
+    Runs inline when there is only one item or one core — a pool round trip
+    would only add latency. ``fn`` must not itself call :func:`parallel_map`:
+    a task waiting on tasks queued behind it could deadlock a busy pool.
+    """
+    pool = _compute_pool() if len(items) > 1 else None
+    if pool is None:
+        return [fn(item) for item in items]
+    return list(pool.map(fn, items))
+
+
+def filter_window(
+    provider: SliceProvider,
+    key: WindowKey,
+    dtype: DTypeLike = np.float32,
+    *,
+    cache: bool = True,
+) -> FilteredWindow:
+    """Fetch ``key``'s window with a filter margin, filter it, and trim the margin.
+
+    Only the visible channels are read (``picks``), so I/O and filtering scale
+    with the lanes on screen, not the channels recorded. Channels sharing a spec
+    are filtered together — one designed filter per distinct spec (the dsp cache
+    keys on it), not one per channel. The margin is wide enough for the longest
+    transient across every active spec, and is cut off after filtering so edge
+    artifacts never reach the screen.
+
+    ``data`` is copied only where a stage has to write: a slice already in
+    ``dtype`` isn't cast, an unfiltered one is never copied, and the trim is a
+    view (times are sorted, so the kept span is contiguous). ``cache=False``
+    reads past the recording's block cache, for a whole-night pass.
+    """
+    lo = key.start
+    hi = key.start + key.seconds
+    times, data = _fetch_filtered(provider, key, lo, hi, dtype, cache)
+    first = int(np.searchsorted(times, lo, side="left"))
+    last = int(np.searchsorted(times, hi, side="right"))
+    return FilteredWindow(times[first:last], data[:, first:last])
+
+
+def slide_window(
+    provider: SliceProvider,
+    previous: WindowKey,
+    window: FilteredWindow,
+    key: WindowKey,
+    dtype: DTypeLike = np.float32,
+) -> FilteredWindow | None:
+    """``key``'s window built from the overlapping ``previous`` one, or ``None``.
+
+    Only the newly exposed edge is fetched and filtered — with the full filter
+    margin on both of its sides, so the seam carries no transient — and joined
+    to the part of ``window`` still in view. ``None`` when the two windows
+    can't share data (a different length, montage or filter) or don't overlap;
+    the caller then filters the window whole. A decimated window slides on the
+    same sample grid (see :func:`_fetch_filtered`), so the two parts interleave
+    exactly.
+
+    The result is a new array: windows are shared with the read-ahead cache,
+    so the kept part is copied across (one memcpy) rather than shifted inside
+    ``window``.
+    """
+    if (
+        key._replace(start=previous.start) != previous
+        or key.start == previous.start
+        or window.times.size == 0
+    ):
+        return None
+    times = window.times
+    lo = key.start
+    hi = key.start + key.seconds
+    half = 0.5 / provider.sfreq  # between two samples: no sample on both sides
+    forward = key.start > previous.start
+    if forward:  # keep the tail, add on the right
+        keep = slice(int(np.searchsorted(times, lo, side="left")), None)
+        edge_lo, edge_hi = times[-1] + half, hi
+    else:  # keep the head, add on the left
+        keep = slice(None, int(np.searchsorted(times, hi, side="right")))
+        edge_lo, edge_hi = lo, times[0] - half
+    if times[keep].size == 0:
+        return None
+    edge_times, edge = _fetch_filtered(provider, key, edge_lo, edge_hi, dtype)
+    new = slice(
+        int(np.searchsorted(edge_times, edge_lo, side="left")),
+        int(np.searchsorted(edge_times, edge_hi, side="right")),
+    )
+    kept = (times[keep], window.data[:, keep])
+    added = (edge_times[new], edge[:, new])
+    head, tail = (kept, added) if forward else (added, kept)
+    return FilteredWindow(
+        np.concatenate([head[0], tail[0]]), np.concatenate([head[1], tail[1]], axis=1)
+    )
+
+
+def _fetch_filtered(
+    provider: SliceProvider,
+    key: WindowKey,
+    lo: float,
+    hi: float,
+    dtype: DTypeLike,
+    cache: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """``[lo, hi]`` of ``key``'s channels plus filter margin, filtered, untrimmed.
+
+    A decimated key keeps the samples whose index in the recording is a
+    multiple of ``key.factor`` — a grid fixed to the file, not to the fetch, so
+    every window and every slid edge lands on the same points.
+    """
+    sfreq = provider.sfreq
+    pad = max((dsp.pad_seconds(s) for s in key.specs), default=1.0)
+    times, raw = provider.get_slice(lo - pad, hi + pad, key.visible, cache=cache)
+    times = np.asarray(times)
+    data = np.asarray(raw).astype(dtype, copy=False)
+    if key.factor > 1 and times.size:
+        phase = -int(round(times[0] * sfreq)) % key.factor
+        data = dsp.decimate(data[:, phase:], key.factor, key.peaks)
+        times = times[phase :: key.factor][: data.shape[1]]
+        sfreq /= key.factor
+    groups: dict[dsp.FilterSpec, list[int]] = {}
+    for row, spec in enumerate(key.specs):
+        groups.setdefault(spec, []).append(row)
+    tasks = [
+        (spec, rows[i : i + _ROWS_PER_TASK])
+        for spec, rows in groups.items()
+        if not spec.is_identity
+        for i in range(0, len(rows), _ROWS_PER_TASK)
+    ]
+    if tasks and np.may_share_memory(data, raw):
+        data = data.copy()  # filtered rows are written back: not into the source
+
+    def run(task: tuple[dsp.FilterSpec, list[int]]) -> None:
+        spec, rows = task
+        data[rows] = dsp.apply(data[rows], sfreq, spec)  # disjoint rows per task
+
+    parallel_map(run, tasks)
+    return times, data
+
+
+def neighbours(
+    start: float, seconds: float, step: float, duration: float
+) -> list[float]:
+    """The window starts to read ahead: one ``step`` forward and one back.
+
+    ``step`` is signed — the last move — so the window in the paging direction
+    comes first; a zero step (nothing moved yet) reads a full window each way.
+    Starts are clamped to the recording like the view clamps its own, and a
+    neighbour that clamps onto the current window is dropped.
+    """
+    step = step if step else seconds
+    latest = max(0.0, duration - seconds)
+    out: list[float] = []
+    for candidate in (start + step, start - step):
+        clamped = min(max(0.0, candidate), latest)
+        if clamped != start and clamped not in out:
+            out.append(clamped)
+    return out
+
+
+class WindowCache:
+    """A bounded, thread-safe LRU of filtered windows with hit/miss counters.
+
+    :meth:`get` counts a hit or a miss — the numbers that show whether read-ahead
+    is keeping up on a slow share; :meth:`__contains__` peeks without counting,
+    for the worker deciding whether a window still needs computing.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._capacity = max(1, capacity)
+        self._entries: OrderedDict[WindowKey, FilteredWindow] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: WindowKey) -> FilteredWindow | None:
+        with self._lock:
+            window = self._entries.get(key)
+            if window is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return window
+
+    def put(self, key: WindowKey, window: FilteredWindow) -> None:
+        with self._lock:
+            self._entries[key] = window
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every window (the counters keep running)."""
+        with self._lock:
+            self._entries.clear()
+
+
+class Prefetcher:
+    """Computes requested windows into a :class:`WindowCache` on a daemon thread.
+
+    :meth:`request` *replaces* the pending list rather than queueing behind it:
+    while the user holds a key the predictions go stale faster than they can be
+    filled, and only the latest ones are worth the I/O. Windows already cached
+    are skipped. A failing read is dropped silently — the view simply misses and
+    reads the window itself, surfacing any real error on the GUI thread.
+    """
+
+    def __init__(
+        self,
+        cache: WindowCache,
+        compute: Callable[[WindowKey], FilteredWindow],
+        name: str = "eeg-prefetch",
+    ) -> None:
+        self._cache = cache
+        self._compute = compute
+        self._pending: list[WindowKey] = []
+        self._busy = False
+        self._stopped = False
+        self._wake = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def request(self, keys: list[WindowKey]) -> None:
+        """Read ahead ``keys`` (most wanted first), dropping older requests."""
+        with self._wake:
+            self._pending = [k for k in keys if k not in self._cache]
+            self._wake.notify()
+
+    def stop(self) -> None:
+        """Stop after the window in progress; returns without waiting."""
+        with self._wake:
+            self._stopped = True
+            self._pending = []
+            self._wake.notify()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until nothing is pending or in progress (tests and benchmarks)."""
+        with self._wake:
+            return self._wake.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                self._wake.wait_for(lambda: self._pending or self._stopped)
+                if self._stopped:
+                    return
+                key = self._pending.pop(0)
+                self._busy = True
+            try:
+                if key not in self._cache:
+                    self._cache.put(key, self._compute(key))
+            except Exception:  # the view re-reads it on demand and reports there
+                pass
+            finally:
+                with self._wake:
+                    self._busy = False
+                    self._wake.notify_all()
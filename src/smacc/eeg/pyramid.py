@@ -0,0 +1,254 @@
+"""Multi-resolution min/max/mean pyramid for whole-night trace overviews.
+
+The trace view fetches only the visible window, which is cheap for a 30 s page
+and ruinous for a whole night: an 8 h × 64 ch × 1 kHz file is ~15 GB as
+float64, read and filtered just so pyqtgraph can peak-downsample it to ~1500
+pixel columns. The pyramid precomputes that downsampling once. Level ``f``
+summarizes every run of ``f`` samples as its minimum, maximum and mean, for
+``f`` = 2, 4, … 4096, so a zoomed-out window reads at most a few thousand
+buckets per channel from the level that still gives one bucket per pixel
+(:meth:`Pyramid.factor_for`) — milliseconds instead of a full-file read.
+
+Min/max rather than a plain average is what keeps the overview honest: like the
+view's own peak downsampling, a spindle or an artifact stays visible at any
+zoom. The mean track rides along so the view can apply the display highpass to
+the envelope (drift removal matters even zoomed out; see
+:class:`smacc.eeg.view.TraceView`), and so later consumers have a true average.
+
+Built by one streaming pass over the recording (:func:`build_pyramid`, run off
+the GUI thread by :class:`smacc.eeg.jobs.BackgroundJob`) into the recording's
+cache folder (:mod:`smacc.eeg.cache`): one float32 ``.npy`` per level, memory-
+mapped on load, plus a manifest written *last* — so a build that was cancelled
+or crashed halfway is simply not a pyramid, and is rebuilt next time.
+
+Pure numpy, no GUI and no MNE: it reads through the view's ``SliceProvider``
+contract, so a synthetic provider builds one in tests.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .jobs import check_cancelled
+
+if TYPE_CHECKING:
+    from .view import SliceProvider
+
+# Bucket sizes, finest first: 2× … 4096×. The finest level halves a full-rate
+# read; the coarsest puts an 8 h, 1 kHz night in ~7000 buckets — about one
+# screen's width, so even the whole night is a single small read.
+FACTORS: tuple[int, ...] = tuple(2**k for k in range(1, 13))
+# Samples read per streaming block, a whole number of the coarsest buckets so
+# every level's buckets tile the block exactly (only the last block is ragged).
+_BLOCK_SAMPLES = FACTORS[-1] * 16
+# The manifest's name and format version; a changed layout bumps the version so
+# an old cache is ignored (and rebuilt) instead of misread. Version 2: the
+# ragged last bucket's mean no longer averages in padding.
+MANIFEST_NAME = "manifest.json"
+_FORMAT_VERSION = 2
+# Row order inside each level's (3, n_channels, n_buckets) array.
+_MIN, _MAX, _MEAN = 0, 1, 2
+
+
+def _level_path(directory: Path, factor: int) -> Path:
+    return directory / f"level-{factor}.npy"
+
+
+def _bucket_count(n_times: int, factor: int) -> int:
+    return -(-n_times // factor)  # ceil: a ragged last bucket still counts
+
+
+class Pyramid:
+    """A loaded, memory-mapped pyramid for one recording (read-only)."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        sfreq: float,
+        n_times: int,
+        n_channels: int,
+        factors: tuple[int, ...],
+    ) -> None:
+        self.directory = directory
+        self.sfreq = sfreq
+        self.n_times = n_times
+        self.n_channels = n_channels
+        self.factors = factors
+        self._levels = {
+            factor: np.load(_level_path(directory, factor), mmap_mode="r")
+            for factor in factors
+        }
+
+    @classmethod
+    def load(cls, directory: str | Path) -> Pyramid | None:
+        """Open the pyramid in ``directory``, or ``None`` if none is complete there.
+
+        A missing/foreign manifest or a missing level file reads as "no pyramid"
+        (never an error): the cache is disposable and the caller just rebuilds.
+        """
+        folder = Path(directory)
+        try:
+            manifest = json.loads((folder / MANIFEST_NAME).read_text(encoding="utf-8"))
+            if manifest.get("version") != _FORMAT_VERSION:
+                return None
+            return cls(
+                folder,
+                sfreq=float(manifest["sfreq"]),
+                n_times=int(manifest["n_times"]),
+                n_channels=int(manifest["n_channels"]),
+                factors=tuple(int(f) for f in manifest["factors"]),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def matches(self, provider: SliceProvider) -> bool:
+        """True if this pyramid was built from a recording shaped like ``provider``."""
+        return (
+            self.n_channels == len(provider.ch_names)
+            and self.sfreq == float(provider.sfreq)
+            and self.n_times == _n_times(provider)
+        )
+
+    def factor_for(self, samples_per_pixel: float) -> int | None:
+        """The coarsest level that still gives at least one bucket per pixel.
+
+        ``None`` when even the finest level would be coarser than a pixel — the
+        window is narrow enough that full-rate samples are the right source.
+        """
+        usable = [f for f in self.factors if f <= samples_per_pixel]
+        return max(usable) if usable else None
+
+    def get_envelope(
+        self,
+        factor: int,
+        start_s: float,
+        stop_s: float,
+        picks: list[int] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(times, mins, maxs, means)`` for the buckets covering the span.
+
+        ``times`` are bucket centres in data seconds; the three arrays are
+        ``(n_picked, n_buckets)`` float32 in the file's units, in ``picks`` order
+        (all channels when ``None``). Clamped to the recording like
+        ``get_slice``: a span entirely outside it yields empty arrays.
+        """
+        level = self._levels[factor]
+        n_buckets = level.shape[-1]
+        first = max(0, int(np.floor(max(0.0, start_s) * self.sfreq / factor)))
+        last = min(n_buckets, int(np.ceil(stop_s * self.sfreq / factor)))
+        rows = list(range(self.n_channels)) if picks is None else list(picks)
+        if last <= first:
+            empty = np.empty((len(rows), 0), dtype=np.float32)
+            return np.empty(0), empty, empty, empty
+        block = np.asarray(level[:, rows, first:last])
+        centres = (np.arange(first, last) * factor + factor / 2.0) / self.sfreq
+        return centres, block[_MIN], block[_MAX], block[_MEAN]
+
+
+def _n_times(provider: SliceProvider) -> int:
+    return int(round(provider.duration * provider.sfreq))
+
+
+def _reduce(
+    mins: np.ndarray, maxs: np.ndarray, means: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Halve a level: pairwise min of mins, max of maxs, mean of means.
+
+    Even/odd strided views and elementwise ufuncs rather than a ``.min(axis=-1)``
+    over a length-2 axis: same result, several times faster on long blocks.
+    """
+    return (
+        np.minimum(mins[:, 0::2], mins[:, 1::2]),
+        np.maximum(maxs[:, 0::2], maxs[:, 1::2]),
+        (means[:, 0::2] + means[:, 1::2]) * np.float32(0.5),
+    )
+
+
+def build_pyramid(
+    provider: SliceProvider,
+    directory: str | Path,
+    *,
+    report: Callable[[float], None] | None = None,
+    cancelled: threading.Event | None = None,
+) -> Pyramid:
+    """Stream ``provider`` once and write its pyramid into ``directory``.
+
+    Each block is reduced level by level (each level from the one below it, so
+    the whole ladder costs about two passes over the block), and written at its
+    bucket offset into every level's memory-mapped file. The manifest goes last;
+    a cancelled build (:class:`smacc.eeg.jobs.JobCancelled`) removes the partial
+    folder so nothing half-written is ever loaded.
+    """
+    folder = Path(directory)
+    if folder.exists():
+        shutil.rmtree(folder)  # a stale or partial build; start clean
+    folder.mkdir(parents=True)
+    sfreq = float(provider.sfreq)
+    n_times = _n_times(provider)
+    n_channels = len(provider.ch_names)
+    try:
+        levels = {
+            factor: np.lib.format.open_memmap(
+                _level_path(folder, factor),
+                mode="w+",
+                dtype=np.float32,
+                shape=(3, n_channels, _bucket_count(n_times, factor)),
+            )
+            for factor in FACTORS
+        }
+        for start in range(0, n_times, _BLOCK_SAMPLES):
+            check_cancelled(cancelled)
+            stop = min(n_times, start + _BLOCK_SAMPLES)
+            _times, data = provider.get_slice(start / sfreq, stop / sfreq, cache=False)
+            data = np.asarray(data, dtype=np.float32)
+            length = data.shape[-1]
+            if length == 0:
+                break
+            # Pad the ragged last block up to whole coarsest buckets: with its
+            # last sample for the min/max (a repeat never moves either), with
+            # zeros for the mean, so a part-filled bucket averages to its sum
+            # over the whole bucket and is rescaled to its real samples below.
+            # The padded buckets past the end are simply not written.
+            mins = maxs = means = data
+            padding = ((0, 0), (0, _BLOCK_SAMPLES - length))
+            if length < _BLOCK_SAMPLES:
+                mins = maxs = np.pad(data, padding, mode="edge")
+                means = np.pad(data, padding)
+            for factor in FACTORS:
+                mins, maxs, means = _reduce(mins, maxs, means)
+                first = start // factor
+                count = _bucket_count(length, factor)
+                level = levels[factor]
+                level[_MIN, :, first : first + count] = mins[:, :count]
+                level[_MAX, :, first : first + count] = maxs[:, :count]
+                level[_MEAN, :, first : first + count] = means[:, :count]
+                real = length - (count - 1) * factor
+                if real < factor:
+                    level[_MEAN, :, first + count - 1] *= np.float32(factor / real)
+            if report is not None:
+                report(stop / n_times)
+        for level in levels.values():
+            level.flush()
+        del level, levels  # release the write maps before the manifest marks completion
+        manifest = {
+            "version": _FORMAT_VERSION,
+            "sfreq": sfreq,
+            "n_times": n_times,
+            "n_channels": n_channels,
+            "factors": list(FACTORS),
+        }
+        (folder / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+    pyramid = Pyramid.load(folder)
+    assert pyramid is not None  # the manifest was just written
+    return pyramid
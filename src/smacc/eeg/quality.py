@@ -0,0 +1,321 @@
+"""Per-epoch signal-quality map: flat, clipped, noisy and mains-ridden channels.
+
+A lead that came off at 3 am, an amplifier pinned at its rail, a channel
+drowning in 50 Hz: each spoils scoring and analysis of the epochs it touches,
+and finding them used to mean scrolling the whole night. This module computes
+five statistics for every channel in every 30 s epoch in one streaming pass
+and classifies each (channel, epoch) cell (:meth:`QualityMap.issues`); the
+Annotator draws the result as a strip under the traces
+(:class:`smacc.eeg.view.QualityStrip`) and jumps between flagged epochs.
+
+The statistics (:data:`STATS`, computed by :func:`epoch_stats` over a whole
+block of epochs at once, channels × epochs × samples):
+
+- ``rms`` — root mean square about the epoch's mean;
+- ``ptp`` — peak-to-peak amplitude;
+- ``flat`` — the fraction of samples equal to the one before, away from the
+  epoch's extremes (a dead lead; a constant epoch is all flat);
+- ``clipped`` — how many samples repeat the epoch's own maximum or minimum
+  (a signal pinned at the converter's rail);
+- ``line`` — the share of the epoch's power within 1 Hz of 50 or 60 Hz.
+
+Built like the spectrogram (:mod:`smacc.eeg.spectrogram`): created empty,
+handed to the strip, filled off the GUI thread by
+:class:`smacc.eeg.jobs.BackgroundJob` with :attr:`QualityMap.filled` advancing
+behind the writes, manifest written last. The cache is a ``(5, n_channels,
+n_epochs)`` float32 map — about 5 MB for a 256-channel night.
+
+Pure numpy/scipy, no GUI and no MNE: it reads through the view's
+``SliceProvider`` contract.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy import fft
+
+from .jobs import check_cancelled
+
+if TYPE_CHECKING:
+    from .view import SliceProvider
+
+# The folder, inside a recording's cache folder, holding the quality map.
+FOLDER_NAME = "quality"
+# One column per scoring-length epoch, like the spectrogram's, so the strips line
+# up and a flagged cell is the epoch a scorer would be looking at.
+EPOCH_SECONDS = 30.0
+STATS: tuple[str, ...] = ("rms", "ptp", "flat", "clipped", "line")
+RMS, PTP, FLAT, CLIPPED, LINE = range(len(STATS))
+# Mains frequencies checked, and the band either side counted as "at" them.
+LINE_FREQS: tuple[float, ...] = (50.0, 60.0)
+_LINE_HALF_WIDTH = 1.0
+# Thresholds for the issues. A flat epoch repeats its previous sample over half
+# the time; a clipped one sits on its extreme for 1 % of its samples; a mains-
+# ridden one has half its power at 50/60 Hz; a noisy one has five times the
+# channel's typical (median) RMS over the night.
+FLAT_FRACTION = 0.5
+CLIPPED_FRACTION = 0.01
+LINE_RATIO = 0.5
+NOISY_RMS_RATIO = 5.0
+# Issue codes, in rising priority: a cell showing several is labelled by the
+# highest (a dead lead is usually also far from its typical RMS).
+GOOD, NOISY, MAINS, CLIPPING, FLATLINE = range(5)
+ISSUE_NAMES: tuple[str, ...] = ("", "noisy", "line noise", "clipped", "flat")
+# Samples held per streaming block across all channels (~32 MB as float32): a
+# 4-channel night reads many epochs at a time, a 256-channel one a few.
+_BLOCK_VALUES = 2**23
+MANIFEST_NAME = "manifest.json"
+STATS_NAME = "stats.npy"
+_FORMAT_VERSION = 1
+
+
+def default_channels(ch_types: Sequence[str]) -> list[int]:
+    """Every channel but trigger (``stim``) ones, which are flat by design."""
+    return [i for i, kind in enumerate(ch_types) if kind != "stim"]
+
+
+def _n_times(provider: SliceProvider) -> int:
+    return int(round(provider.duration * provider.sfreq))
+
+
+def epoch_stats(data: np.ndarray, sfreq: float, epoch_samples: int) -> np.ndarray:
+    """:data:`STATS` for every whole epoch of ``data`` ``(n_channels, n_samples)``.
+
+    The epochs are reshaped onto an axis of their own, so each statistic is one
+    vectorized reduction over the block. Returns ``(5, n_channels, n_epochs)``
+    float32.
+    """
+    n_channels = data.shape[0]
+    n_epochs = data.shape[-1] // epoch_samples
+    epochs = np.asarray(data[:, : n_epochs * epoch_samples], dtype=np.float32)
+    epochs = epochs.reshape(n_channels, n_epochs, epoch_samples)
+    stats = np.zeros((len(STATS), n_channels, n_epochs), dtype=np.float32)
+    if n_epochs == 0:
+        return stats
+    centred = epochs - epochs.mean(axis=-1, keepdims=True)
+    stats[RMS] = np.sqrt(np.mean(np.square(centred), axis=-1))
+    high = epochs.max(axis=-1, keepdims=True)
+    low = epochs.min(axis=-1, keepdims=True)
+    stats[PTP] = (high - low)[..., 0]
+    previous = epochs[..., :-1]
+    repeats = epochs[..., 1:] == previous
+    at_rail = (previous == high) | (previous == low)
+    # A repeat on the epoch's extreme is clipping, anywhere else a dead lead —
+    # unless the epoch is constant, where its one value is both extremes.
+    constant = high == low
+    stats[FLAT] = np.mean(repeats & (~at_rail | constant), axis=-1)
+    stats[CLIPPED] = np.count_nonzero(repeats & at_rail & ~constant, axis=-1)
+    power = np.square(np.abs(fft.rfft(centred, axis=-1)))
+    freqs = np.fft.rfftfreq(epoch_samples, 1.0 / sfreq)
+    total = power[..., 1:].sum(axis=-1)
+    mains = np.zeros_like(total)
+    for line in LINE_FREQS:
+        band = np.abs(freqs - line) <= _LINE_HALF_WIDTH
+        if line + _LINE_HALF_WIDTH < sfreq / 2.0 and band.any():
+            mains = np.maximum(mains, power[..., band].sum(axis=-1))
+    stats[LINE] = np.divide(mains, total, out=np.zeros_like(total), where=total > 0)
+    return stats
+
+
+class QualityMap:
+    """One recording's :data:`STATS` per channel and epoch.
+
+    ``filled`` is how many epochs from the start are written: all of them for a
+    loaded map, advancing block by block while :func:`build_quality_map` runs.
+    Only whole epochs are columns; a trailing fragment is left out.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        stats: np.ndarray,
+        *,
+        sfreq: float,
+        n_times: int,
+        channels: tuple[int, ...],
+        epoch_seconds: float,
+        filled: int,
+    ) -> None:
+        self.directory = directory
+        self.sfreq = sfreq
+        self.n_times = n_times
+        self.channels = channels
+        self.epoch_seconds = epoch_seconds
+        self.filled = filled
+        self._stats = stats
+
+    @property
+    def n_epochs(self) -> int:
+        return int(self._stats.shape[-1])
+
+    @property
+    def complete(self) -> bool:
+        return self.filled >= self.n_epochs
+
+    @property
+    def stats(self) -> np.ndarray:
+        """The filled epochs' statistics, ``(5, n_channels, filled)`` (a view)."""
+        return self._stats[..., : self.filled]
+
+    def issues(self) -> np.ndarray:
+        """Each filled cell's issue code (:data:`GOOD` … :data:`FLATLINE`).
+
+        ``(n_channels, filled)`` uint8; where several thresholds are crossed
+        the highest code wins. "Noisy" is relative to the channel's median RMS
+        over the epochs computed so far, so it needs no unit or channel type.
+        An epoch touching a joined night's gap has NaN stats: it is never
+        flagged, nor counted in the median.
+        """
+        stats = np.asarray(self.stats)
+        codes = np.zeros(stats.shape[1:], dtype=np.uint8)
+        if codes.size == 0:
+            return codes
+        rms = stats[RMS]
+        if np.isnan(rms).all(axis=-1).any():  # nanmedian warns on an all-gap row
+            rms = np.where(np.isnan(rms).all(axis=-1, keepdims=True), 0.0, rms)
+        typical = np.nanmedian(rms, axis=-1, keepdims=True)
+        epoch_samples = round(self.epoch_seconds * self.sfreq)
+        codes[(stats[RMS] > NOISY_RMS_RATIO * typical) & (typical > 0)] = NOISY
+        codes[stats[LINE] > LINE_RATIO] = MAINS
+        codes[stats[CLIPPED] > CLIPPED_FRACTION * epoch_samples] = CLIPPING
+        codes[stats[FLAT] > FLAT_FRACTION] = FLATLINE
+        return codes
+
+    def bad_epochs(self) -> np.ndarray:
+        """Indices of the filled epochs with an issue on any channel, ascending."""
+        return np.flatnonzero(self.issues().any(axis=0))
+
+    @classmethod
+    def load(cls, directory: str | Path) -> QualityMap | None:
+        """Open the complete map in ``directory``, or ``None`` if there is none.
+
+        Like :meth:`smacc.eeg.pyramid.Pyramid.load`, anything missing or
+        foreign reads as "no map" (never an error) and the caller rebuilds.
+        """
+        folder = Path(directory)
+        try:
+            manifest = json.loads((folder / MANIFEST_NAME).read_text(encoding="utf-8"))
+            if manifest.get("version") != _FORMAT_VERSION:
+                return None
+            stats = np.load(folder / STATS_NAME, mmap_mode="r")
+            channels = tuple(int(c) for c in manifest["channels"])
+            shape = (len(STATS), len(channels), int(manifest["n_epochs"]))
+            if stats.shape != shape:
+                return None
+            return cls(
+                folder,
+                stats,
+                sfreq=float(manifest["sfreq"]),
+                n_times=int(manifest["n_times"]),
+                channels=channels,
+                epoch_seconds=float(manifest["epoch_seconds"]),
+                filled=stats.shape[-1],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def matches(self, provider: SliceProvider) -> bool:
+        """True if this map was built from a recording shaped like ``provider``."""
+        return (
+            self.sfreq == float(provider.sfreq)
+            and self.n_times == _n_times(provider)
+            and all(c < len(provider.ch_names) for c in self.channels)
+        )
+
+
+def create_quality_map(
+    provider: SliceProvider,
+    directory: str | Path,
+    channels: Sequence[int],
+    epoch_seconds: float = EPOCH_SECONDS,
+) -> QualityMap:
+    """An empty (``filled == 0``) map in ``directory``, ready to build.
+
+    Split from :func:`build_quality_map` so the caller can hand it to the strip
+    on the GUI thread while the build runs on a worker. A stale or partial
+    folder is replaced.
+    """
+    folder = Path(directory)
+    if folder.exists():
+        shutil.rmtree(folder)
+    folder.mkdir(parents=True)
+    sfreq = float(provider.sfreq)
+    n_times = _n_times(provider)
+    n_epochs = n_times // int(round(epoch_seconds * sfreq))
+    stats = np.lib.format.open_memmap(
+        folder / STATS_NAME,
+        mode="w+",
+        dtype=np.float32,
+        shape=(len(STATS), len(channels), n_epochs),
+    )
+    return QualityMap(
+        folder,
+        stats,
+        sfreq=sfreq,
+        n_times=n_times,
+        channels=tuple(int(c) for c in channels),
+        epoch_seconds=float(epoch_seconds),
+        filled=0,
+    )
+
+
+def build_quality_map(
+    provider: SliceProvider,
+    quality: QualityMap,
+    *,
+    report: Callable[[float], None] | None = None,
+    cancelled: threading.Event | None = None,
+) -> QualityMap:
+    """Stream ``provider`` once, writing every epoch's :data:`STATS` into ``quality``.
+
+    Blocks of whole epochs are read for the map's channels and written at
+    their epoch offset; ``quality.filled`` advances after every write. The
+    manifest goes last. A cancelled (:class:`smacc.eeg.jobs.JobCancelled`) or
+    failed build removes the folder so nothing half-written is ever loaded.
+    """
+    sfreq = quality.sfreq
+    epoch_samples = int(round(quality.epoch_seconds * sfreq))
+    n_epochs = quality.n_epochs
+    folder = quality.directory
+    stats = quality._stats
+    picks = list(quality.channels)
+    per_block = max(1, _BLOCK_VALUES // max(1, len(picks) * epoch_samples))
+    try:
+        for first in range(0, n_epochs, per_block):
+            check_cancelled(cancelled)
+            last = min(n_epochs, first + per_block)
+            _times, data = provider.get_slice(
+                first * epoch_samples / sfreq,
+                last * epoch_samples / sfreq,
+                picks,
+                cache=False,
+            )
+            block = epoch_stats(np.asarray(data), sfreq, epoch_samples)
+            count = min(last - first, block.shape[-1])
+            stats[..., first : first + count] = block[..., :count]
+            quality.filled = first + count
+            if report is not None:
+                report(last / max(1, n_epochs))
+        if isinstance(stats, np.memmap):
+            stats.flush()
+        manifest = {
+            "version": _FORMAT_VERSION,
+            "sfreq": sfreq,
+            "n_times": quality.n_times,
+            "n_epochs": n_epochs,
+            "channels": list(quality.channels),
+            "epoch_seconds": quality.epoch_seconds,
+        }
+        (folder / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+    except BaseException:
+        quality.filled = 0  # a strip still holding it stops drawing it
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+    return quality
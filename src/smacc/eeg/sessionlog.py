@@ -23,6 +23,7 @@ raises against a naive log.
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -205,6 +206,13 @@ class LogTimeline:
         """The first entry's timestamp — data-second 0 for standalone placement."""
         return self._entries[0].timestamp if self._entries else None
 
-    def get_slice(self, start_s: float, stop_s: float) -> tuple[np.ndarray, np.ndarray]:
+    def get_slice(
+        self,
+        start_s: float,
+        stop_s: float,
+        picks: Sequence[int] | None = None,
+        *,
+        cache: bool = True,
+    ) -> tuple[np.ndarray, np.ndarray]:
         """No channels, so every slice is empty (the view draws no curves)."""
         return np.empty(0), np.empty((0, 0))
@@ -0,0 +1,288 @@
+"""Whole-night compressed spectral array (CSA): power per epoch and frequency.
+
+Scorers read a night's structure off its spectrum as much as off the traces:
+slow-wave sleep is a band of delta power, REM a drop in it with the spindle
+band gone quiet, an arousal a vertical stripe through everything. The CSA shows
+that at a glance — one column per 30 s epoch, one row per frequency up to
+:data:`MAX_FREQ` — in a strip under the traces
+(:class:`smacc.eeg.view.SpectrogramStrip`).
+
+Computing it means reading the whole recording, seconds to minutes for an 8 h
+file, so it is built like the pyramid (:mod:`smacc.eeg.pyramid`): one streaming
+pass off the GUI thread (:class:`smacc.eeg.jobs.BackgroundJob`) into the
+recording's cache folder (:mod:`smacc.eeg.cache`), manifest written last. The
+pass reads blocks of whole epochs through ``get_slice`` and runs Welch's method
+on every epoch of a block at once (the epochs are a reshaped axis, not a loop).
+Each epoch's power is averaged over a few central EEG channels
+(:func:`default_channels`) and stored as an ``(n_epochs, n_freqs)`` float32
+memory map. As with the filtered cache (:mod:`smacc.eeg.filtercache`),
+:attr:`Spectrogram.filled` advances behind the writes, so the strip draws the
+part already computed while the rest is still streaming.
+
+Pure numpy/scipy, no GUI and no MNE: it reads through the view's
+``SliceProvider`` contract.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import threading
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy import signal
+
+from .jobs import check_cancelled
+
+if TYPE_CHECKING:
+    from .view import SliceProvider
+
+# The folder, inside a recording's cache folder, holding its spectrograms.
+FOLDER_NAME = "spectrogram"
+# One column per scoring-length epoch: a night is ~1 000 columns, about a
+# screen's width, and each column lines up with a hypnogram cell.
+EPOCH_SECONDS = 30.0
+# Welch segment length: 4 s gives 0.25 Hz bins, fine enough to separate delta
+# from theta and the spindle band, with 14 half-overlapping segments averaged
+# per 30 s epoch.
+SEGMENT_SECONDS = 4.0
+# The top row: everything sleep scoring reads (delta to beta) sits below 30 Hz;
+# above it is mostly muscle, which would only compress the bands that matter.
+MAX_FREQ = 30.0
+# Channels averaged into the CSA: a few central derivations are the standard
+# scoring view, and more only costs reads without changing the picture.
+MAX_CHANNELS = 4
+# Epochs read per streaming block (16 min at 30 s): one read and one vectorized
+# Welch per block, and a progress step the strip can show.
+_EPOCHS_PER_BLOCK = 32
+MANIFEST_NAME = "manifest.json"
+POWER_NAME = "power.npy"
+_FORMAT_VERSION = 1
+
+
+def default_channels(ch_names: Sequence[str], ch_types: Sequence[str]) -> list[int]:
+    """Up to :data:`MAX_CHANNELS` EEG channels, central (``C…``) ones first.
+
+    Empty when the recording has no EEG channel (the CSA has nothing to show).
+    """
+    eeg = [i for i, kind in enumerate(ch_types) if kind == "eeg"]
+    central = [i for i in eeg if ch_names[i].upper().startswith("C")]
+    rest = [i for i in eeg if i not in central]
+    return (central + rest)[:MAX_CHANNELS]
+
+
+def cache_key(channels: Sequence[int], epoch_seconds: float = EPOCH_SECONDS) -> str:
+    """A folder-safe key for a CSA of ``channels`` in ``epoch_seconds`` columns."""
+    identity = json.dumps([[int(c) for c in channels], float(epoch_seconds)])
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def _segment_samples(sfreq: float, epoch_samples: int) -> int:
+    return max(1, min(epoch_samples, int(round(SEGMENT_SECONDS * sfreq))))
+
+
+def frequencies(sfreq: float, epoch_seconds: float = EPOCH_SECONDS) -> np.ndarray:
+    """The CSA's row frequencies in Hz, lowest first (DC excluded)."""
+    epoch_samples = int(round(epoch_seconds * sfreq))
+    freqs = np.fft.rfftfreq(_segment_samples(sfreq, epoch_samples), 1.0 / sfreq)
+    return freqs[(freqs > 0) & (freqs <= MAX_FREQ)]
+
+
+def _n_times(provider: SliceProvider) -> int:
+    return int(round(provider.duration * provider.sfreq))
+
+
+class Spectrogram:
+    """One recording's CSA: mean power per epoch and frequency, in V²/Hz.
+
+    ``filled`` is how many epochs from the start are written: all of them for a
+    loaded spectrogram, advancing block by block while :func:`build_spectrogram`
+    runs. Only whole epochs are columns; a trailing fragment is left out.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        power: np.ndarray,
+        *,
+        sfreq: float,
+        n_times: int,
+        channels: tuple[int, ...],
+        epoch_seconds: float,
+        filled: int,
+    ) -> None:
+        self.directory = directory
+        self.sfreq = sfreq
+        self.n_times = n_times
+        self.channels = channels
+        self.epoch_seconds = epoch_seconds
+        self.freqs = frequencies(sfreq, epoch_seconds)
+        self.filled = filled
+        self._power = power
+
+    @property
+    def n_epochs(self) -> int:
+        return int(self._power.shape[0])
+
+    @property
+    def complete(self) -> bool:
+        return self.filled >= self.n_epochs
+
+    @property
+    def power(self) -> np.ndarray:
+        """The filled epochs' rows, ``(filled, n_freqs)`` (a view of the map)."""
+        return self._power[: self.filled]
+
+    @classmethod
+    def load(cls, directory: str | Path) -> Spectrogram | None:
+        """Open the complete spectrogram in ``directory``, or ``None`` if none.
+
+        Like :meth:`smacc.eeg.pyramid.Pyramid.load`, anything missing or
+        foreign reads as "no spectrogram" (never an error) and the caller
+        rebuilds.
+        """
+        folder = Path(directory)
+        try:
+            manifest = json.loads((folder / MANIFEST_NAME).read_text(encoding="utf-8"))
+            if manifest.get("version") != _FORMAT_VERSION:
+                return None
+            power = np.load(folder / POWER_NAME, mmap_mode="r")
+            sfreq = float(manifest["sfreq"])
+            epoch_seconds = float(manifest["epoch_seconds"])
+            n_freqs = frequencies(sfreq, epoch_seconds).size
+            if power.shape != (int(manifest["n_epochs"]), n_freqs):
+                return None
+            return cls(
+                folder,
+                power,
+                sfreq=sfreq,
+                n_times=int(manifest["n_times"]),
+                channels=tuple(int(c) for c in manifest["channels"]),
+                epoch_seconds=epoch_seconds,
+                filled=power.shape[0],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def matches(self, provider: SliceProvider) -> bool:
+        """True if this CSA was built from a recording shaped like ``provider``."""
+        return (
+            self.sfreq == float(provider.sfreq)
+            and self.n_times == _n_times(provider)
+            and all(c < len(provider.ch_names) for c in self.channels)
+        )
+
+
+def create_spectrogram(
+    provider: SliceProvider,
+    directory: str | Path,
+    channels: Sequence[int],
+    epoch_seconds: float = EPOCH_SECONDS,
+) -> Spectrogram:
+    """An empty (``filled == 0``) spectrogram in ``directory``, ready to build.
+
+    Split from :func:`build_spectrogram` so the caller can hand it to the strip
+    on the GUI thread while the build runs on a worker, as for
+    :func:`smacc.eeg.filtercache.create_filtered_cache`. A stale or partial
+    folder is replaced.
+    """
+    folder = Path(directory)
+    if folder.exists():
+        shutil.rmtree(folder)
+    folder.mkdir(parents=True)
+    sfreq = float(provider.sfreq)
+    n_times = _n_times(provider)
+    n_epochs = n_times // int(round(epoch_seconds * sfreq))
+    power = np.lib.format.open_memmap(
+        folder / POWER_NAME,
+        mode="w+",
+        dtype=np.float32,
+        shape=(n_epochs, frequencies(sfreq, epoch_seconds).size),
+    )
+    return Spectrogram(
+        folder,
+        power,
+        sfreq=sfreq,
+        n_times=n_times,
+        channels=tuple(int(c) for c in channels),
+        epoch_seconds=float(epoch_seconds),
+        filled=0,
+    )
+
+
+def epoch_power(data: np.ndarray, sfreq: float, epoch_samples: int) -> np.ndarray:
+    """Welch power of every whole epoch in ``data``, averaged over its channels.
+
+    ``data`` is ``(n_channels, n_samples)``; the epochs are reshaped onto an
+    axis of their own so one ``welch`` call covers them all. Returns
+    ``(n_epochs, n_freqs)`` float32 over :func:`frequencies`' rows.
+    """
+    n_channels = data.shape[0]
+    n_epochs = data.shape[-1] // epoch_samples
+    epochs = data[:, : n_epochs * epoch_samples].reshape(
+        n_channels, n_epochs, epoch_samples
+    )
+    freqs, psd = signal.welch(
+        epochs, fs=sfreq, nperseg=_segment_samples(sfreq, epoch_samples), axis=-1
+    )
+    keep = (freqs > 0) & (freqs <= MAX_FREQ)
+    return psd[..., keep].mean(axis=0).astype(np.float32)
+
+
+def build_spectrogram(
+    provider: SliceProvider,
+    spectrogram: Spectrogram,
+    *,
+    report: Callable[[float], None] | None = None,
+    cancelled: threading.Event | None = None,
+) -> Spectrogram:
+    """Stream ``provider`` through Welch's method into ``spectrogram``'s map.
+
+    Each block of :data:`_EPOCHS_PER_BLOCK` epochs is read for the CSA's
+    channels only and written at its epoch offset; ``spectrogram.filled``
+    advances after every write. The manifest goes last. A cancelled
+    (:class:`smacc.eeg.jobs.JobCancelled`) or failed build removes the folder
+    so nothing half-written is ever loaded.
+    """
+    sfreq = spectrogram.sfreq
+    epoch_samples = int(round(spectrogram.epoch_seconds * sfreq))
+    n_epochs = spectrogram.n_epochs
+    folder = spectrogram.directory
+    power = spectrogram._power
+    picks = list(spectrogram.channels)
+    try:
+        for first in range(0, n_epochs, _EPOCHS_PER_BLOCK):
+            check_cancelled(cancelled)
+            last = min(n_epochs, first + _EPOCHS_PER_BLOCK)
+            _times, data = provider.get_slice(
+                first * epoch_samples / sfreq,
+                last * epoch_samples / sfreq,
+                picks,
+                cache=False,
+            )
+            block = epoch_power(np.asarray(data), sfreq, epoch_samples)
+            count = min(last - first, block.shape[0])
+            power[first : first + count] = block[:count]
+            spectrogram.filled = first + count
+            if report is not None:
+                report(last / max(1, n_epochs))
+        if isinstance(power, np.memmap):
+            power.flush()
+        manifest = {
+            "version": _FORMAT_VERSION,
+            "sfreq": sfreq,
+            "n_times": spectrogram.n_times,
+            "n_epochs": n_epochs,
+            "channels": list(spectrogram.channels),
+            "epoch_seconds": spectrogram.epoch_seconds,
+        }
+        (folder / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+    except BaseException:
+        spectrogram.filled = 0  # a strip still holding it stops drawing it
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+    return spectrogram
@@ -24,19 +24,31 @@ no MNE and nothing from the wider app.
 from __future__ import annotations
 
 import bisect
+import functools
+import logging
 import math
+from collections.abc import Callable, Sequence
 from datetime import datetime, timedelta
-from typing import Any, NamedTuple, Protocol
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol
 
 import numpy as np
 import pyqtgraph as pg
 from PyQt6 import QtCore, QtGui, QtWidgets
 
-from . import dsp
-from .annotations import Annotation
+from . import dsp, prefetch, quality, spectrogram
+from .annotations import Annotation, AnnotationIndex
+from .prefetch import FilteredWindow, Prefetcher, WindowCache, WindowKey
+from .quality import QualityMap
 from .snapshot import Snapshot, SnapshotEpoch, SnapshotMark, SnapshotTrace
+from .spectrogram import Spectrogram
 from .staging import StageEpoch
 
+if TYPE_CHECKING:  # the pyramid and filtered cache are handed in by the window
+    from .filtercache import FilteredCache
+    from .pyramid import Pyramid
+
+_logger = logging.getLogger("smacc")
+
 # Bioelectric channels are recorded in volts and displayed in microvolts.
 # Other kinds (stim/misc/…) carry arbitrary units — a trigger channel holds
 # integer event codes like 255, which on a 100 µV lane scale would paint
@@ -46,6 +58,28 @@ _MICROVOLT_TYPES = {"eeg", "eog", "emg", "ecg", "seeg", "ecog", "dbs", "bio"}
 _VOLTS_TO_MICROVOLTS = 1e6
 # Lane-units excursion an auto-fit (non-bioelectric) channel is normalized to.
 _AUTOFIT_EXCURSION = 0.4
+# Windows longer than this are neither read ahead nor cached: a zoomed-out view
+# is the overview pyramid's job, and a few cached multi-minute slices of a dense
+# montage would pin hundreds of megabytes for a page turn nobody makes.
+_PREFETCH_MAX_SECONDS = 300.0
+# Plot width assumed before the widget has been laid out (tests, offscreen
+# export): a typical maximized trace area, so level choice stays sensible.
+_FALLBACK_PLOT_PIXELS = 1500
+# The independently redrawn layers, in redraw order: the traces (and the x
+# range), the editable and peer marks, the epoch grid with the stage bands and
+# focus bracket, and the session log. A state change marks the ones it stales.
+_LAYERS = ("data", "marks", "epochs", "log")
+# Display refresh rate assumed when the screen doesn't report one (offscreen).
+_FALLBACK_REFRESH_HZ = 60.0
+# Progressive refresh (see set_progressive_refresh): input this recent counts
+# as still scrolling, and this long without any ends the burst and refines the
+# previews to the full render.
+_REFINE_IDLE_MS = 100
+# Weight of the latest full refresh in the running estimate of its cost.
+_REFRESH_COST_SMOOTHING = 0.3
+# Lanes one wheel notch moves a virtualized montage (Shift+wheel; see
+# set_lanes_shown) — a text view's three lines per notch.
+_LANES_PER_NOTCH = 3
 
 # Default amplitude (µV per channel lane) and the per-type overrides applied on
 # top of it. EMG rides hotter than EEG on most montages, so it defaults to a
@@ -65,6 +99,8 @@ _REGION_BRUSH_SELECTED = (70, 130, 180, 110)
 _REGION_PEN = (70, 130, 180, 160)
 _LINE_PEN = (178, 34, 34, 160)  # firebrick for instantaneous marks
 _LINE_PEN_SELECTED = (178, 34, 34, 255)
+# Point marks are batched (see _TickLayer): style 0 is a mark, 1 the selected one.
+_POINT_PENS = [pg.mkPen(_LINE_PEN, width=1), pg.mkPen(_LINE_PEN_SELECTED, width=2)]
 
 # Other raters' marks (#181d) are drawn read-only *behind* the editable layer,
 # one distinct colour per rater (Okabe–Ito, chosen to avoid the steel-blue/
@@ -85,6 +121,10 @@ _OVERLAY_Z = 5
 # scaffolding behind the traces, never competing with the firebrick marks.
 _EPOCH_PEN = pg.mkPen((128, 128, 128, 110), width=1, style=QtCore.Qt.PenStyle.DashLine)
 _EPOCH_LABEL_COLOR = (128, 128, 128, 200)
+# At most this many gridlines per window. A zoomed-out overview spans hundreds of
+# epochs, and a labelled line per epoch is both an unreadable comb and hundreds
+# of scene items per scroll; past the cap only every n-th epoch is drawn.
+_MAX_EPOCH_LINES = 24
 # The standard polysomnography scoring epoch; the sleep default everywhere.
 DEFAULT_EPOCH_SECONDS = 30.0
 
@@ -121,6 +161,27 @@ _LOG_LEVEL_COLORS: dict[str, tuple[int, int, int]] = {
 }
 _LOG_DEFAULT_COLOR = (70, 90, 130)
 _LOG_Z = 4
+# The log ticks are drawn in batches, one pen per level: a mark's level index
+# is its level's position here, unknown levels taking the default at the end.
+_LOG_LEVELS = tuple(_LOG_LEVEL_COLORS)
+_LOG_PENS = [
+    pg.mkPen(color, width=2)
+    for color in (*_LOG_LEVEL_COLORS.values(), _LOG_DEFAULT_COLOR)
+]
+# Hovering within this many pixels of a batched tick shows its tooltip.
+_TICK_HOVER_PIXELS = 4
+
+# Zoomed out, marks crowd together: past this many per pixel column on average
+# (one in five columns), a layer stops drawing each mark and shows a density
+# track instead — marks per pixel column, one row per rater or log level (see
+# _DensityLayer). Zooming back in restores the per-mark drawing. The editable
+# and peer marks share a track in a bottom lane as thin as the log's, behind the
+# traces; the log's track stays in the log lane.
+_DENSITY_MARKS_PER_PIXEL = 0.2
+_DENSITY_LANE_FRAC = 1.0 - _LOG_LANE_FRAC
+_DENSITY_MIN_ALPHA = 70  # a lone mark's column; the busiest one is opaque
+_RGBA8888 = QtGui.QImage.Format.Format_RGBA8888
+_DENSITY_Z = _STAGE_BAND_Z + 1
 
 
 class LogMark(NamedTuple):
@@ -203,7 +264,11 @@ class TimeAxis(pg.AxisItem):
 
 
 class SliceProvider(Protocol):
-    """What the view needs from a recording (satisfied by ``io.Recording``)."""
+    """What the view needs from a recording (satisfied by ``io.Recording``).
+
+    ``get_slice(…, cache=False)`` marks a whole-night pass's read, which a
+    caching provider serves without keeping; a provider with no cache ignores it.
+    """
 
     @property
     def ch_names(self) -> list[str]: ...
@@ -217,7 +282,14 @@ class SliceProvider(Protocol):
     @property
     def duration(self) -> float: ...
 
-    def get_slice(self, start_s: float, stop_s: float) -> tuple[Any, Any]: ...
+    def get_slice(
+        self,
+        start_s: float,
+        stop_s: float,
+        picks: Sequence[int] | None = None,
+        *,
+        cache: bool = True,
+    ) -> tuple[Any, Any]: ...
 
 
 class _AnnotateViewBox(pg.ViewBox):
@@ -339,6 +411,320 @@ class _LaneTrace(NamedTuple):
     scale_uv: float | None
 
 
+class _ItemPool[T: QtWidgets.QGraphicsItem]:
+    """One overlay layer's scene items, kept across refreshes and reused.
+
+    Rebuilding a layer on every scroll — removing each mark, gridline or band
+    from the scene and constructing a new one — is a scene-graph insertion and a
+    Python allocation per item per page turn. A refresh instead calls
+    :meth:`reset`, :meth:`take` s an item per thing to draw (moved and restyled
+    by the caller) and :meth:`hide_rest`; an item is created and added to the
+    plot only when the pool runs out, and unused ones are hidden, not removed.
+    """
+
+    def __init__(self, plot_item: pg.PlotItem, make: Callable[[], T]) -> None:
+        self._plot_item = plot_item
+        self._make = make
+        self._items: list[T] = []
+        self._taken = 0
+
+    def reset(self) -> None:
+        """Start a refresh: every item is free again."""
+        self._taken = 0
+
+    def take(self) -> T:
+        """The next free item, shown (a new one only if the pool is exhausted)."""
+        if self._taken == len(self._items):
+            item = self._make()
+            self._plot_item.addItem(item)
+            self._items.append(item)
+        item = self._items[self._taken]
+        self._taken += 1
+        if not item.isVisible():
+            item.show()
+        return item
+
+    def hide_rest(self) -> list[T]:
+        """End a refresh: hide the items not taken, return those that were."""
+        for item in self._items[self._taken :]:
+            if item.isVisible():
+                item.hide()
+        return self._items[: self._taken]
+
+
+class _SpanLayer(pg.GraphicsObject):
+    """A batched overlay drawn as one cached ``QPicture`` across a band of the view.
+
+    ``span`` is the part of the view height the layer covers, bottom to top,
+    like InfiniteLine's. A subclass says which seconds it covers
+    (:meth:`_x_range`) and records its shapes for a y extent (:meth:`_record`);
+    the picture is replayed on paint and re-recorded only when the subclass
+    drops it (:meth:`_invalidate`) or the view's vertical extent changes.
+    """
+
+    def __init__(self, span: tuple[float, float] = (0.0, 1.0)) -> None:
+        super().__init__()
+        self._span = span
+        self._picture: QtGui.QPicture | None = None
+        self._picture_extent: tuple[float, float] | None = None
+        self._bounds: QtCore.QRectF | None = None
+        self._last_bounds = QtCore.QRectF()
+        self.setAcceptHoverEvents(True)
+
+    def _x_range(self) -> tuple[float, float] | None:
+        """The seconds the layer draws across, or None when it is empty."""
+        raise NotImplementedError
+
+    def _record(self, painter: QtGui.QPainter, y0: float, y1: float) -> None:
+        """Draw the layer between data heights ``y0`` and ``y1``."""
+        raise NotImplementedError
+
+    def _invalidate(self) -> None:
+        """The contents changed: re-record the picture, recompute the bounds."""
+        self._picture = None
+        self._bounds = None
+        self.update()
+
+    def _extent(self) -> tuple[float, float] | None:
+        """The y range the layer spans, in data units, from the current view."""
+        view = self.viewRect()
+        if view is None:
+            return None
+        bottom, height = view.top(), view.height()  # y grows upward: top() is min
+        return bottom + self._span[0] * height, bottom + self._span[1] * height
+
+    def viewTransformChanged(self) -> None:
+        self._bounds = None  # the span follows the view's height
+        super().viewTransformChanged()
+
+    def boundingRect(self) -> QtCore.QRectF:
+        # Computed lazily, as InfiniteLine does: the scene learns of a new
+        # extent through prepareGeometryChange the first time it asks.
+        if self._bounds is None:
+            extent = self._extent()
+            x_range = self._x_range()
+            bounds = QtCore.QRectF()
+            if extent is not None and x_range is not None:
+                pad = 2 * (self.pixelWidth() or 0.0)  # covers the widest pen
+                lo, hi = x_range
+                bounds = QtCore.QRectF(
+                    lo - pad, extent[0], hi - lo + 2 * pad, extent[1] - extent[0]
+                )
+            if bounds != self._last_bounds:
+                self.prepareGeometryChange()
+                self._last_bounds = bounds
+            self._bounds = bounds
+        return self._bounds
+
+    def paint(self, painter: QtGui.QPainter, *args: Any) -> None:
+        extent = self._extent()
+        if extent is None or self._x_range() is None:
+            return
+        if self._picture is None or self._picture_extent != extent:
+            picture = QtGui.QPicture()
+            recorder = QtGui.QPainter(picture)
+            self._record(recorder, *extent)
+            recorder.end()
+            self._picture, self._picture_extent = picture, extent
+        self._picture.play(painter)
+
+
+class _TickLayer(_SpanLayer):
+    """Many vertical ticks — log entries or point marks — drawn as one item.
+
+    An InfiniteLine per tick is a scene item, a bounding-rect computation and a
+    paint call each; a dense overnight log (a cue every 3 s) puts hundreds in a
+    ten-minute window. Here every tick in view is one line in the layer's single
+    picture. Each tick has a style (an index into ``pens``) and a tooltip, found
+    on hover by bisecting the sorted tick times rather than carried by per-tick
+    items.
+    """
+
+    def __init__(self, span: tuple[float, float] = (0.0, 1.0)) -> None:
+        super().__init__(span)
+        self._seconds = np.empty(0)
+        self._styles = np.empty(0, dtype=np.intp)
+        self._tips: list[str] = []
+        self._pens: Sequence[QtGui.QPen] = ()
+
+    @property
+    def seconds(self) -> np.ndarray:
+        """The tick times drawn, sorted."""
+        return self._seconds
+
+    def set_ticks(
+        self,
+        seconds: np.ndarray,
+        styles: np.ndarray,
+        tips: Sequence[str],
+        pens: Sequence[QtGui.QPen],
+    ) -> None:
+        """Draw a tick at each of ``seconds`` in ``pens[style]``, with its tip."""
+        order = np.argsort(seconds, kind="stable")
+        self._seconds = np.asarray(seconds, dtype=float)[order]
+        self._styles = np.asarray(styles, dtype=np.intp)[order]
+        self._tips = [tips[i] for i in order]
+        self._pens = pens
+        self._invalidate()
+
+    def _x_range(self) -> tuple[float, float] | None:
+        if not self._seconds.size:
+            return None
+        return float(self._seconds[0]), float(self._seconds[-1])
+
+    def _record(self, painter: QtGui.QPainter, y0: float, y1: float) -> None:
+        for style, pen in enumerate(self._pens):
+            xs = self._seconds[self._styles == style]
+            if xs.size:
+                painter.setPen(pen)
+                painter.drawLines(*[QtCore.QLineF(x, y0, x, y1) for x in xs])
+
+    def tooltip_at(self, seconds: float) -> str:
+        """The tooltips of the ticks within a few pixels of ``seconds``."""
+        reach = _TICK_HOVER_PIXELS * (self.pixelWidth() or 0.0)
+        start = bisect.bisect_left(self._seconds, seconds - reach)
+        stop = bisect.bisect_right(self._seconds, seconds + reach)
+        return "\n".join(self._tips[start:stop])
+
+    def hoverEvent(self, ev: Any) -> None:
+        self.setToolTip("" if ev.isExit() else self.tooltip_at(ev.pos().x()))
+
+
+class _DensityRow(NamedTuple):
+    """One source's marks in a :class:`_DensityLayer`: a rater, a log level."""
+
+    name: str
+    color: tuple[int, int, int]
+    counts: np.ndarray  # marks per pixel column
+
+
+class _DensityLayer(_SpanLayer):
+    """Marks counted per pixel column, for a window too crowded to draw them singly.
+
+    Zoomed out over a night, thousands of ticks and spans land a few to a pixel
+    — a solid smear that still costs a line or a region apiece. Instead the
+    window is binned one column per screen pixel and each source (a rater, a
+    log level) gets a row of the span, stacked top to bottom, shaded more
+    opaque the more marks a column holds against the row's busiest one. The
+    whole layer is one image, a texel per row and column, stretched over the
+    span: a single blit however many marks it stands for. Hovering a column
+    shows the source and its count.
+    """
+
+    def __init__(self, span: tuple[float, float] = (0.0, 1.0)) -> None:
+        super().__init__(span)
+        self._edges = np.empty(0)
+        self._rows: list[_DensityRow] = []
+
+    @property
+    def rows(self) -> list[_DensityRow]:
+        """The rows drawn, top to bottom (empty when the layer is off)."""
+        return self._rows
+
+    def set_rows(self, edges: np.ndarray, rows: Sequence[_DensityRow]) -> None:
+        """Draw ``rows`` of counts binned between the column ``edges`` (seconds)."""
+        self._edges = edges
+        self._rows = list(rows)
+        self._invalidate()
+
+    def clear(self) -> None:
+        """Draw nothing (the marks are back to one item each)."""
+        if self._rows:
+            self.set_rows(np.empty(0), [])
+
+    def _x_range(self) -> tuple[float, float] | None:
+        if not self._rows:
+            return None
+        return float(self._edges[0]), float(self._edges[-1])
+
+    def _record(self, painter: QtGui.QPainter, y0: float, y1: float) -> None:
+        counts = np.stack([row.counts for row in self._rows])
+        peaks = np.maximum(counts.max(axis=1, keepdims=True), 1)
+        alpha = _DENSITY_MIN_ALPHA + (255 - _DENSITY_MIN_ALPHA) * counts / peaks
+        rgba = np.zeros((*counts.shape, 4), dtype=np.uint8)
+        rgba[..., :3] = np.array([row.color for row in self._rows])[:, None, :]
+        rgba[..., 3] = np.where(counts > 0, alpha, 0)
+        # Image rows run down from the rect's y, which is the data bottom: the
+        # top row goes last. The picture keeps its own copy of the image.
+        pixels = rgba[::-1].tobytes()
+        columns = int(counts.shape[1])
+        image = QtGui.QImage(pixels, columns, len(self._rows), 4 * columns, _RGBA8888)
+        x0, x1 = float(self._edges[0]), float(self._edges[-1])
+        painter.drawImage(QtCore.QRectF(x0, y0, x1 - x0, y1 - y0), image)
+
+    def tooltip_at(self, seconds: float, y: float) -> str:
+        """The source and count of the column under ``(seconds, y)``, if any."""
+        extent = self._extent()
+        if extent is None or not self._rows:
+            return ""
+        y0, y1 = extent
+        height = (y1 - y0) / len(self._rows)
+        row = int((y1 - y) // height) if height else -1
+        column = int(np.searchsorted(self._edges, seconds, side="right")) - 1
+        if not (0 <= row < len(self._rows) and 0 <= column < self._edges.size - 1):
+            return ""
+        name, _, counts = self._rows[row]
+        count = int(counts[column])
+        if not count:
+            return ""
+        return f"{name}: {count} mark{'' if count == 1 else 's'}"
+
+    def hoverEvent(self, ev: Any) -> None:
+        if ev.isExit():
+            self.setToolTip("")
+            return
+        pos = ev.pos()
+        self.setToolTip(self.tooltip_at(pos.x(), pos.y()))
+
+
+def _smoothed(estimate: float | None, sample: float) -> float:
+    """``estimate`` moved toward the latest ``sample`` (the sample, if the first)."""
+    if estimate is None:
+        return sample
+    return estimate + _REFRESH_COST_SMOOTHING * (sample - estimate)
+
+
+def _column_counts(
+    onsets: Sequence[float] | np.ndarray, edges: np.ndarray
+) -> np.ndarray:
+    """How many of ``onsets`` fall in each column between the evenly spaced ``edges``."""
+    # An int bin count over a range takes np.histogram's uniform-bin fast path.
+    counts, _ = np.histogram(onsets, bins=edges.size - 1, range=(edges[0], edges[-1]))
+    return counts
+
+
+def _region_pool(
+    plot_item: pg.PlotItem, z: float, pen: Any = None
+) -> _ItemPool[pg.LinearRegionItem]:
+    """A pool of fixed (non-movable) regions at depth ``z``."""
+
+    def make() -> pg.LinearRegionItem:
+        region = pg.LinearRegionItem(movable=False, pen=pen)
+        region.setZValue(z)
+        return region
+
+    return _ItemPool(plot_item, make)
+
+
+def _line_pool(
+    plot_item: pg.PlotItem, z: float, **options: Any
+) -> _ItemPool[pg.InfiniteLine]:
+    """A pool of fixed vertical lines at depth ``z`` (``options`` as InfiniteLine)."""
+
+    def make() -> pg.InfiniteLine:
+        line = pg.InfiniteLine(angle=90, movable=False, **options)
+        line.setZValue(z)
+        return line
+
+    return _ItemPool(plot_item, make)
+
+
+def _set_region_pen(region: pg.LinearRegionItem, pen: Any) -> None:
+    """Restyle a region's two edge lines (LinearRegionItem has no setPen)."""
+    for edge in region.lines:
+        edge.setPen(pen)
+
+
 class TraceView(pg.PlotWidget):
     """Stacked-channel trace display with drag-to-annotate.
 
@@ -355,6 +741,8 @@ class TraceView(pg.PlotWidget):
       slid the overlay by ``delta`` seconds (#125 manual alignment).
     * ``timePicked(seconds)`` — a click while in pick mode chose this time (used
       to pair a log entry with the EEG feature it produced).
+    * ``lanesChanged()`` — the lanes on screen changed (a vertical scroll, the
+      lane count, or the montage), so the window can sync its lane scrollbar.
     """
 
     regionDrawn = QtCore.pyqtSignal(float, float)
@@ -366,6 +754,7 @@ class TraceView(pg.PlotWidget):
     logSlideMoved = QtCore.pyqtSignal(float)
     logSlideFinished = QtCore.pyqtSignal(float)
     timePicked = QtCore.pyqtSignal(float)
+    lanesChanged = QtCore.pyqtSignal()
 
     def __init__(self) -> None:
         self._viewbox = _AnnotateViewBox()
@@ -385,31 +774,79 @@ class TraceView(pg.PlotWidget):
         # Channel indices to draw, in display order; all channels until set_provider
         # (or a view profile) narrows or reorders them (#177).
         self._visible: list[int] = []
+        # Lane virtualization (see set_lanes_shown): at most ``_lanes_shown`` of
+        # the visible channels are on screen (None: all of them), starting at
+        # display position ``_lane_offset``. Only those are read, filtered and
+        # drawn, by a pool of that many curves rebound as the lanes scroll.
+        self._lanes_shown: int | None = None
+        self._lane_offset = 0
         # Epoch model (#173): the scoring epoch is separate from the on-screen
         # window. Boundaries fall at anchor + k·epoch for integer k, so anchoring
         # on a feature back/front-fills the whole grid from that point.
         self._epoch_seconds = DEFAULT_EPOCH_SECONDS
         self._epoch_anchor = 0.0
         self._show_epochs = True
+        # Every overlay layer draws from its own item pool (see _ItemPool); the
+        # ``_*_items`` lists are the items the last refresh showed.
+        plot_item = self.getPlotItem()
+        assert plot_item is not None
+        self._epoch_pool = _line_pool(
+            plot_item,
+            2,  # above the curves, below the annotations
+            pen=_EPOCH_PEN,
+            label="",
+            labelOpts={"position": 0.96, "color": _EPOCH_LABEL_COLOR},
+        )
         self._epoch_items: list[pg.InfiniteLine] = []
         # Sleep-staging overlay (#182): the scored epochs and their per-stage
         # colours paint as backdrop bands; ``_stage_focus_active`` brackets the
         # left-edge epoch (the scoring target) while a staging sweep is on.
         self._stage_epochs: list[StageEpoch] = []
         self._stage_colors: dict[str, tuple[int, int, int]] = {}
+        self._stage_band_pool = _region_pool(
+            plot_item,
+            _STAGE_BAND_Z,
+            pg.mkPen((0, 0, 0, 0)),  # no border, just a wash
+        )
         self._stage_band_items: list[pg.LinearRegionItem] = []
         self._stage_focus_active = False
+        self._focus_pool = _region_pool(plot_item, _FOCUS_Z, _FOCUS_PEN)
         self._focused_epoch_item: pg.LinearRegionItem | None = None
         self._annotations: list[Annotation] = []
+        # The same marks indexed by time, so a scroll draws the ones in the window
+        # without scanning a night of detector output (see set_annotations).
+        self._annotation_index = AnnotationIndex()
         self._selected = -1
+        self._annotation_region_pool = _region_pool(plot_item, 10, _REGION_PEN)
+        self._annotation_ticks = _TickLayer()  # the point marks (zero duration)
+        self._annotation_ticks.setZValue(10)
+        plot_item.addItem(self._annotation_ticks)
         self._annotation_items: list[pg.LinearRegionItem | pg.InfiniteLine] = []
-        # Other raters' read-only marks, drawn behind the editable layer (#181d).
+        # Other raters' read-only marks, drawn behind the editable layer (#181d),
+        # each with its own index (kept while the rater's mark list is the same).
         self._overlays: list[RaterOverlay] = []
+        self._overlay_indexes: dict[str, tuple[list[Annotation], AnnotationIndex]] = {}
+        self._overlay_region_pool = _region_pool(plot_item, _OVERLAY_Z)
+        self._overlay_ticks = _TickLayer()
+        self._overlay_ticks.setZValue(_OVERLAY_Z)
+        plot_item.addItem(self._overlay_ticks)
         self._overlay_items: list[pg.LinearRegionItem | pg.InfiniteLine] = []
+        # Both marks layers, counted per pixel when zoomed out too far to draw.
+        self._mark_density = _DensityLayer(span=(0.0, _DENSITY_LANE_FRAC))
+        self._mark_density.setZValue(_DENSITY_Z)
+        plot_item.addItem(self._mark_density)
         # Session-log overlay (#125): read-only ticks in the top lane, kept sorted
-        # by time so only the visible window is drawn on each scroll.
+        # by time so only the visible window is drawn on each scroll; the times
+        # and level indices are arrays built once per set_log_marks.
         self._log_marks: list[LogMark] = []
-        self._log_items: list[pg.InfiniteLine] = []
+        self._log_seconds = np.empty(0)
+        self._log_levels = np.empty(0, dtype=np.intp)
+        self._log_ticks = _TickLayer(span=(_LOG_LANE_FRAC, 1.0))  # the top lane only
+        self._log_ticks.setZValue(_LOG_Z)
+        plot_item.addItem(self._log_ticks)
+        self._log_density = _DensityLayer(span=(_LOG_LANE_FRAC, 1.0))
+        self._log_density.setZValue(_LOG_Z)
+        plot_item.addItem(self._log_density)
         # Pick mode: a click reports its time (to pair a log entry to an EEG
         # feature) instead of selecting an annotation.
         self._pick_mode = False
@@ -417,6 +854,55 @@ class TraceView(pg.PlotWidget):
         # which has no recording clock to reconcile against (#125d).
         self._log_alignable = True
         self._curves: list[pg.PlotDataItem] = []
+        # Whole-night overview pyramid for the loaded recording, once the window's
+        # background build has one; wide windows draw from it instead of full-rate
+        # samples (see _overview_factor).
+        self._pyramid: Pyramid | None = None
+        # Whole-night filtered cache for the loaded recording (opt-in, built by
+        # the window): windows it covers are sliced from it, not read and
+        # filtered (see _filtered_window).
+        self._filtered_cache: FilteredCache | None = None
+        # Read-ahead of the adjacent windows (off until the window enables it):
+        # a per-recording cache of filtered windows and the worker filling it.
+        # ``_last_step`` is the latest move, so the paging direction reads first.
+        self._prefetch_enabled = False
+        self._window_cache: WindowCache | None = None
+        self._prefetcher: Prefetcher | None = None
+        self._last_step = 0.0
+        # Sample dtype of the fetch → filter → scale pipeline (see
+        # set_float32_enabled): float32 halves the memory traffic of every stage.
+        self._dtype: np.dtype[Any] = np.dtype(np.float32)
+        # The last full-rate window drawn, for sliding into the next one on a
+        # small scroll (prefetch.slide_window) instead of refiltering it whole.
+        self._last_window: tuple[WindowKey, FilteredWindow] | None = None
+        # Decimate wide windows to a few points per pixel before filtering (see
+        # _decimation_factor); the peak-preserving variant is opt-in.
+        self._decimation_enabled = True
+        self._peak_decimation = False
+        # Refresh scheduling (see set_refresh_coalescing): the layers a state
+        # change has left stale, redrawn together on the next display frame when
+        # coalescing, at once otherwise; and the requests and refreshes counted.
+        self._coalesce_refreshes = False
+        self._dirty: set[str] = set()
+        self._refresh_requests = 0
+        self._refresh_runs = 0
+        self._pending_requests = 0
+        self._refresh_clock = QtCore.QElapsedTimer()
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.flush_refresh)
+        # Progressive refresh: the measured cost of a full data refresh (ms,
+        # smoothed; None until one has run), when the last data refresh ended,
+        # and the timer that refines a burst's previews once input goes idle.
+        self._progressive = False
+        self._full_refresh_ms: float | None = None
+        self._preview_ms: float | None = None
+        self._data_clock = QtCore.QElapsedTimer()
+        self._previews = 0
+        self._refine_timer = QtCore.QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(_REFINE_IDLE_MS)
+        self._refine_timer.timeout.connect(self._refine)
 
         self._viewbox.dragFinished.connect(self._on_drag_finished)
         self._viewbox.clicked.connect(self._on_clicked)
@@ -485,25 +971,229 @@ class TraceView(pg.PlotWidget):
         self._window_start = 0.0
         self._epoch_anchor = 0.0  # a new recording starts epoch 1 at its start
         self._overlays = []  # peers belong to the previous recording; window reloads
+        self._overlay_indexes = {}
         self._log_marks = []  # the log belongs to the previous recording too
+        self._log_seconds = np.empty(0)
+        self._log_levels = np.empty(0, dtype=np.intp)
         self._stage_epochs = []  # the hypnogram belongs to the previous recording
+        self._pyramid = None  # so does its overview pyramid
+        self._filtered_cache = None  # and its filtered cache
+        self._last_step = 0.0
+        self._last_window = None
+        self._full_refresh_ms = None  # a refresh costs what this recording costs
+        self._preview_ms = None
+        self._restart_prefetch()  # cached windows are the previous recording's
         self._viewbox.set_log_lane_active(False)
         # Show every channel in file order by default; a profile may narrow this.
         self._visible = list(range(len(provider.ch_names))) if provider else []
+        self._lane_offset = 0
         self._build_curves()
-        self._refresh_data()
-        self._refresh_annotations()
-        self._refresh_epoch_layer()
-        self._refresh_log_marks()
+        self._request_refresh(*_LAYERS)
 
     def set_spec(self, spec: dsp.FilterSpec) -> None:
         self._spec = spec
-        self._refresh_data()
+        self._request_refresh("data")
+
+    def set_pyramid(self, pyramid: Pyramid | None) -> None:
+        """Use ``pyramid`` for zoomed-out windows (``None`` drops it).
+
+        Ignored unless it was built from a recording shaped like the loaded one —
+        a build that finishes after the user opened another file must not paint
+        the previous night's envelope.
+        """
+        if pyramid is not None and (
+            self._provider is None or not pyramid.matches(self._provider)
+        ):
+            return
+        self._pyramid = pyramid
+        self._request_refresh("data")
+
+    @property
+    def filtered_cache(self) -> FilteredCache | None:
+        return self._filtered_cache
+
+    def set_filtered_cache(self, cache: FilteredCache | None) -> None:
+        """Serve windows from ``cache`` where it covers them (``None`` drops it).
+
+        ``cache`` may still be building: only its filled part is used, and the
+        rest reads and filters as usual. Ignored unless it was built from a
+        recording shaped like the loaded one, as for :meth:`set_pyramid`.
+        """
+        if cache is not None and (
+            self._provider is None or not cache.matches(self._provider)
+        ):
+            return
+        self._filtered_cache = cache
+        self._request_refresh("data")
+
+    def set_prefetch_enabled(self, enabled: bool) -> None:
+        """Read the windows either side of the current one ahead, off-thread.
+
+        Off by default so a bare view (tests, the export path) never spawns a
+        thread; the Annotator window turns it on. Disabling stops the worker.
+        """
+        self._prefetch_enabled = bool(enabled)
+        self._restart_prefetch()
+        self._schedule_prefetch()
+
+    def set_float32_enabled(self, enabled: bool) -> None:
+        """Run the trace pipeline in float32 (the default) or float64.
+
+        float32 carries ~7 significant digits — orders of magnitude more than a
+        lane of pixels can show — at half the memory and bandwidth; float64 is
+        kept for comparison (the benchmark) and for anyone chasing a numerical
+        doubt. Cached windows are in the old dtype, so the cache starts over.
+        """
+        self._dtype = np.dtype(np.float32 if enabled else np.float64)
+        self._last_window = None
+        self._restart_prefetch()
+        self._request_refresh("data")
+
+    def set_decimation_enabled(self, enabled: bool) -> None:
+        """Decimate windows wider than the screen can show before filtering.
+
+        On by default: a 2-minute window of a 2 kHz file is 240 000 samples per
+        lane for ~1 500 pixels, and filtering or drawing the excess only for
+        pyqtgraph to discard it is most of a refresh. Off reads every sample.
+        """
+        self._decimation_enabled = bool(enabled)
+        self._request_refresh("data")
+
+    def set_peak_decimation(self, enabled: bool) -> None:
+        """Keep each decimation bucket's extreme sample instead of anti-aliasing.
+
+        For spike review: a transient narrower than a bucket still shows at full
+        height, where the anti-aliasing filter would have smoothed it away — at
+        the cost of the aliasing that filter exists to prevent.
+        """
+        self._peak_decimation = bool(enabled)
+        self._request_refresh("data")
+
+    def set_refresh_coalescing(self, enabled: bool) -> None:
+        """Redraw at most once per display frame, however many changes arrive.
+
+        Holding an arrow key, dragging the scrollbar or spinning a spinbox sends
+        a change per event, each of which used to redraw on the spot — dozens of
+        full refreshes queued behind one another, every one stale before it was
+        painted. With coalescing a change only updates the state and marks the
+        layers it affects; one refresh per frame (a timer paced to the screen's
+        refresh rate) redraws the layers marked since, from the latest state.
+        Off by default, as for :meth:`set_prefetch_enabled`, so a bare view
+        (tests, the export path) draws synchronously; the Annotator window turns
+        it on. Turning it off redraws anything pending.
+        """
+        self._coalesce_refreshes = bool(enabled)
+        if not enabled:
+            self.flush_refresh()
+
+    def flush_refresh(self) -> None:
+        """Redraw every layer marked stale now, rather than on the next frame."""
+        self._refresh_timer.stop()
+        dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return
+        requests, self._pending_requests = self._pending_requests, 0
+        if requests > 1:
+            # Every request after the first only moved the state the refresh
+            # draws: its own intermediate frame was never drawn.
+            _logger.debug(
+                "Trace view: %d refresh requests coalesced into one (%d frames "
+                "dropped; layers %s)",
+                requests,
+                requests - 1,
+                ", ".join(layer for layer in _LAYERS if layer in dirty),
+            )
+        self._refresh_runs += 1
+        self._refresh_clock.start()
+        if "data" in dirty:
+            self._refresh_data(preview=self._preview_due())
+        if "marks" in dirty:
+            self._refresh_annotations()
+        if "epochs" in dirty:
+            self._refresh_epoch_layer()
+        if "log" in dirty:
+            self._refresh_log_marks()
+
+    def set_progressive_refresh(self, enabled: bool) -> None:
+        """Draw a cheap preview while scrolling fast, the full render once idle.
+
+        Applies when refreshes are coalesced (:meth:`set_refresh_coalescing`)
+        and a full data refresh, as measured on this machine and montage, costs
+        more than a display frame: then a refresh arriving within 100 ms of the
+        last — a held key, a scrollbar drag — draws a preview from an unfiltered
+        slice decimated to the screen, and the full filtered window follows once
+        input has been idle that long. A single page turn, or a refresh fast
+        enough for the frame, always draws in full. Off by default.
+        """
+        self._progressive = bool(enabled)
+        if not enabled and self._refine_timer.isActive():
+            self._refine_timer.stop()
+            self._request_refresh("data")
+
+    @property
+    def refresh_pending(self) -> bool:
+        """Whether changes wait for the next frame, or a preview for its refine."""
+        return bool(self._dirty) or self._refine_timer.isActive()
+
+    @property
+    def refresh_stats(self) -> tuple[int, int]:
+        """``(requested, run)`` refreshes since the view was made."""
+        return self._refresh_requests, self._refresh_runs
+
+    def _request_refresh(self, *layers: str) -> None:
+        """Mark ``layers`` stale: redraw them now, or on the next frame if coalescing."""
+        self._dirty.update(layers)
+        self._refresh_requests += 1
+        self._pending_requests += 1
+        if not self._coalesce_refreshes:
+            self.flush_refresh()
+        elif not self._refresh_timer.isActive():
+            # Pace to the display: run once the last refresh is a frame old
+            # (at once after an idle spell); later requests ride this one.
+            elapsed = (
+                self._refresh_clock.elapsed() if self._refresh_clock.isValid() else 0
+            )
+            self._refresh_timer.start(max(0, round(self._frame_ms() - elapsed)))
+
+    def _refine(self) -> None:
+        """Input went idle after previews: redraw the window in full."""
+        self._data_clock.invalidate()  # no longer scrolling, whatever the timing
+        self._request_refresh("data")
+
+    def _preview_due(self) -> bool:
+        """Whether this data refresh should be a preview (see progressive refresh)."""
+        return (
+            self._progressive
+            and self._coalesce_refreshes
+            and self._full_refresh_ms is not None
+            and self._full_refresh_ms > self._frame_ms()
+            # A small scroll slides the last window (only the edge is read), so
+            # the full render can be the cheaper one: then it's drawn instead.
+            and (self._preview_ms is None or self._preview_ms < self._full_refresh_ms)
+            and self._data_clock.isValid()
+            and self._data_clock.elapsed() < _REFINE_IDLE_MS
+        )
+
+    def _frame_ms(self) -> float:
+        """One frame of the screen the view is on, in milliseconds."""
+        screen = self.screen()
+        hertz = screen.refreshRate() if screen is not None else 0.0
+        return 1000.0 / (hertz if hertz > 0 else _FALLBACK_REFRESH_HZ)
+
+    @property
+    def float32_enabled(self) -> bool:
+        return self._dtype == np.float32
+
+    @property
+    def prefetch_stats(self) -> tuple[int, int]:
+        """``(hits, misses)`` of the window cache for the loaded recording."""
+        cache = self._window_cache
+        return (cache.hits, cache.misses) if cache is not None else (0, 0)
 
     def set_scale(self, microvolts: float) -> None:
         """Set the base lane height in µV (smaller value → visually bigger traces)."""
         self._scale_uv = max(1e-9, microvolts)
-        self._refresh_data()
+        self._request_refresh("data")
 
     # ----- per-type display + channel selection (#177) ----------------------
 
@@ -535,7 +1225,7 @@ class TraceView(pg.PlotWidget):
             self._type_specs.pop(ch_type, None)
         else:
             self._type_specs[ch_type] = spec
-        self._refresh_data()
+        self._request_refresh("data")
 
     def set_type_scale(self, ch_type: str, microvolts: float | None) -> None:
         """Override (or clear, with ``None``) the lane height for one type."""
@@ -543,17 +1233,17 @@ class TraceView(pg.PlotWidget):
             self._type_scales.pop(ch_type, None)
         else:
             self._type_scales[ch_type] = max(1e-9, microvolts)
-        self._refresh_data()
+        self._request_refresh("data")
 
     def set_type_scales(self, scales: dict[str, float]) -> None:
         """Replace every per-type amplitude override (when applying a profile)."""
         self._type_scales = {k: max(1e-9, v) for k, v in scales.items()}
-        self._refresh_data()
+        self._request_refresh("data")
 
     def set_type_specs(self, specs: dict[str, dsp.FilterSpec]) -> None:
         """Replace every per-type filter override (when applying a profile)."""
         self._type_specs = dict(specs)
-        self._refresh_data()
+        self._request_refresh("data")
 
     @property
     def channel_names(self) -> list[str]:
@@ -574,6 +1264,59 @@ class TraceView(pg.PlotWidget):
         names = self.channel_names
         return [names[i] for i in self._visible]
 
+    @property
+    def on_screen_indices(self) -> list[int]:
+        """The visible channels whose lanes are on screen now, in display order.
+
+        All of :attr:`visible_indices` unless lanes are virtualized
+        (:meth:`set_lanes_shown`), then the window of them the vertical scroll
+        shows.
+        """
+        if self._lanes_shown is None:
+            return list(self._visible)
+        return self._visible[self._lane_offset : self._lane_offset + self._lanes_shown]
+
+    @property
+    def lanes_shown(self) -> int | None:
+        return self._lanes_shown
+
+    @property
+    def lane_offset(self) -> int:
+        return self._lane_offset
+
+    def set_lanes_shown(self, count: int | None) -> None:
+        """Show at most ``count`` lanes at a time (``None`` or 0: every lane).
+
+        A 256-channel montage squeezes every lane to a couple of pixels and pays
+        to read, filter and draw all of them; with a lane count set, only the
+        lanes on screen are fetched (``picks``), filtered and drawn, and the
+        rest are a vertical scroll away (:meth:`set_lane_offset`), so a refresh
+        costs the same whatever the montage size.
+        """
+        self._lanes_shown = count if count else None
+        self._lane_offset = min(self._lane_offset, self._max_lane_offset())
+        self._build_curves()
+        self._request_refresh("data")
+
+    def set_lane_offset(self, offset: int) -> None:
+        """Scroll the lanes so display position ``offset`` is the top lane."""
+        offset = min(max(0, int(offset)), self._max_lane_offset())
+        if offset == self._lane_offset:
+            return
+        self._lane_offset = offset
+        self._label_lanes()  # the curve pool is reused: only the data moves
+        self._request_refresh("data")
+        self.lanesChanged.emit()
+
+    def scroll_lanes(self, count: int) -> None:
+        """Scroll the lanes by ``count`` (positive: down the montage)."""
+        self.set_lane_offset(self._lane_offset + count)
+
+    def _max_lane_offset(self) -> int:
+        if self._lanes_shown is None:
+            return 0
+        return max(0, len(self._visible) - self._lanes_shown)
+
     def set_visible_channels(self, indices: list[int]) -> None:
         """Show exactly ``indices`` (channel positions), in the given order.
 
@@ -591,11 +1334,9 @@ class TraceView(pg.PlotWidget):
         if not seen:
             return
         self._visible = seen
+        self._lane_offset = min(self._lane_offset, self._max_lane_offset())
         self._build_curves()
-        self._refresh_data()
-        self._refresh_annotations()
-        self._refresh_epoch_layer()
-        self._refresh_log_marks()
+        self._request_refresh(*_LAYERS)
 
     def build_snapshot(
         self,
@@ -611,7 +1352,9 @@ class TraceView(pg.PlotWidget):
         window chooses which annotations to include and how to relabel them.
         Times come back window-relative. Reuses :meth:`_lane_traces` and
         :meth:`_epoch_boundaries`, so the figure is the same picture as the
-        screen. Safe with no recording loaded (returns empty traces).
+        screen — but of every visible channel, not only the lanes scrolled into
+        view when they are virtualized (:meth:`set_lanes_shown`). Safe with no
+        recording loaded (returns empty traces).
         """
         lo = self._window_start
         hi = lo + self._window_seconds
@@ -619,7 +1362,7 @@ class TraceView(pg.PlotWidget):
             return Snapshot(
                 times=np.empty(0), window_seconds=self._window_seconds, traces=()
             )
-        times, lanes = self._lane_traces()
+        times, lanes = self._lane_traces(self.visible_indices)
         names = self.channel_names
         traces = tuple(
             SnapshotTrace(
@@ -664,23 +1407,20 @@ class TraceView(pg.PlotWidget):
     def set_window_seconds(self, seconds: float) -> None:
         self._window_seconds = max(1.0, seconds)
         self._clamp_window_start()
-        self._refresh_data()
-        self._refresh_annotations()
-        self._refresh_epoch_layer()
-        self._refresh_log_marks()
+        self._request_refresh(*_LAYERS)
 
     def set_window_start(self, seconds: float) -> None:
+        previous = self._window_start
         self._window_start = seconds
         self._clamp_window_start()
-        self._refresh_data()
-        self._refresh_annotations()
-        self._refresh_epoch_layer()
-        self._refresh_log_marks()
+        if self._window_start != previous:
+            self._last_step = self._window_start - previous
+        self._request_refresh(*_LAYERS)
 
     def set_epoch_seconds(self, seconds: float) -> None:
         """Set the scoring-epoch length (≥ 1 s); redraws the epoch grid."""
         self._epoch_seconds = max(1.0, float(seconds))
-        self._refresh_epoch_layer()
+        self._request_refresh("epochs")
 
     def set_epoch_anchor(self, seconds: float) -> None:
         """Set the time at which an epoch boundary falls (epoch 1 starts here).
@@ -689,11 +1429,11 @@ class TraceView(pg.PlotWidget):
         (e.g. the start of an LRLR) lets the signal sit cleanly inside one epoch.
         """
         self._epoch_anchor = max(0.0, float(seconds))
-        self._refresh_epoch_layer()
+        self._request_refresh("epochs")
 
     def set_epochs_visible(self, visible: bool) -> None:
         self._show_epochs = bool(visible)
-        self._refresh_epoch_layer()
+        self._request_refresh("epochs")
 
     def set_time_axis_mode(self, mode: str) -> None:
         """Label the time axis with ``"clock"`` wall time or ``"elapsed"`` seconds."""
@@ -721,10 +1461,34 @@ class TraceView(pg.PlotWidget):
     def set_annotations(
         self, annotations: list[Annotation], selected: int = -1
     ) -> None:
-        """Replace the displayed annotations (and selection) — no refilter."""
-        self._annotations = list(annotations)
+        """Replace the displayed annotations (and selection) — no refilter.
+
+        The window hands over its whole (sorted) list after every edit, so the
+        time index is brought up to date from the difference: the entries
+        between the longest common prefix and suffix (by identity) are removed
+        and the new ones inserted — one or two for an insert, delete or
+        relabel, none for a selection change.
+        """
+        old = self._annotations
+        new = list(annotations)
+        head = 0
+        limit = min(len(old), len(new))
+        while head < limit and old[head] is new[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] is new[-1 - tail]:
+            tail += 1
+        for gone in old[head : len(old) - tail]:
+            self._annotation_index.remove(gone)
+        for added in new[head : len(new) - tail]:
+            self._annotation_index.insert(added)
+        self._annotations = new
         self._selected = selected
-        self._refresh_annotations()
+        self._request_refresh("marks")
+
+    def annotations_between(self, lo: float, hi: float) -> list[Annotation]:
+        """The displayed annotations overlapping ``[lo, hi]`` seconds, sorted."""
+        return self._annotation_index.overlapping(lo, hi)
 
     def set_overlays(self, overlays: list[RaterOverlay]) -> None:
         """Replace the other-rater overlays drawn behind the editable layer (#181d).
@@ -733,7 +1497,17 @@ class TraceView(pg.PlotWidget):
         annotations — so a peer rater's marks are visible context, not editable.
         """
         self._overlays = list(overlays)
-        self._refresh_overlays()
+        indexes = {}
+        for overlay in self._overlays:
+            kept = self._overlay_indexes.get(overlay.rater_id)
+            if kept is not None and kept[0] is overlay.annotations:
+                indexes[overlay.rater_id] = kept  # a visibility toggle: same marks
+            else:
+                index = AnnotationIndex(overlay.annotations)
+                indexes[overlay.rater_id] = (overlay.annotations, index)
+        self._overlay_indexes = indexes
+        # With the editable layer: the peers count towards its density switch.
+        self._request_refresh("marks")
 
     def set_hypnogram(
         self, epochs: list[StageEpoch], colors: dict[str, tuple[int, int, int]]
@@ -746,12 +1520,12 @@ class TraceView(pg.PlotWidget):
         """
         self._stage_epochs = list(epochs)
         self._stage_colors = dict(colors)
-        self._refresh_stage_bands()
+        self._request_refresh("epochs")
 
     def set_stage_focus(self, active: bool) -> None:
         """Bracket the left-edge epoch (the scoring target) while staging (#182)."""
         self._stage_focus_active = bool(active)
-        self._refresh_focused_epoch()
+        self._request_refresh("epochs")
 
     def set_log_marks(self, marks: list[LogMark]) -> None:
         """Replace the read-only session-log overlay in the top lane (#125).
@@ -763,8 +1537,17 @@ class TraceView(pg.PlotWidget):
         disables it; an empty list always disarms.
         """
         self._log_marks = sorted(marks, key=lambda m: m.seconds)
+        self._log_seconds = np.array([m.seconds for m in self._log_marks], dtype=float)
+        default = len(_LOG_LEVELS)
+        self._log_levels = np.array(
+            [
+                _LOG_LEVELS.index(m.level) if m.level in _LOG_LEVELS else default
+                for m in self._log_marks
+            ],
+            dtype=np.intp,
+        )
         self._viewbox.set_log_lane_active(bool(self._log_marks) and self._log_alignable)
-        self._refresh_log_marks()
+        self._request_refresh("log")
 
     def set_log_alignable(self, enabled: bool) -> None:
         """Allow (or forbid) sliding the log lane — off when there is no recording.
@@ -814,7 +1597,7 @@ class TraceView(pg.PlotWidget):
             return
         index = self._annotation_at(seconds)
         self._selected = index
-        self._refresh_annotations()
+        self._request_refresh("marks")
         self.annotationSelected.emit(index)
 
     def _annotation_at(self, seconds: float) -> int:
@@ -825,14 +1608,19 @@ class TraceView(pg.PlotWidget):
         marks get a small symmetric tolerance.
         """
         tolerance = self._window_seconds * _CLICK_TOLERANCE_FRACTION
-        hit = -1
-        for index, a in enumerate(self._annotations):
+        hit: Annotation | None = None
+        near = self._annotation_index.overlapping(
+            seconds - tolerance, seconds + tolerance
+        )
+        for a in near:  # sorted, so the last hit starts latest
             lo, hi = a.onset, a.onset + a.duration
             if a.duration == 0:
                 lo, hi = lo - tolerance, hi + tolerance
             if lo <= seconds <= hi:
-                hit = index
-        return hit
+                hit = a
+        if hit is None:
+            return -1
+        return bisect.bisect_right(self._annotations, hit) - 1
 
     def _on_mouse_moved(self, scene_pos: Any) -> None:
         plot_item = self.getPlotItem()
@@ -842,11 +1630,19 @@ class TraceView(pg.PlotWidget):
             self.cursorMoved.emit(float(self._viewbox.mapSceneToView(scene_pos).x()))
 
     def wheelEvent(self, ev: QtGui.QWheelEvent | None) -> None:
-        """Wheel scrolls time (a tenth of a window per notch), never zooms."""
+        """Wheel scrolls time (a tenth of a window per notch), never zooms.
+
+        Shift+wheel scrolls a virtualized montage's lanes instead. Some
+        platforms turn a Shift+wheel into a horizontal one, so either axis counts.
+        """
         if ev is None:
             return
-        notches = ev.angleDelta().y() / 120.0
-        self.scroll_by(-0.1 * notches)
+        delta = ev.angleDelta()
+        if ev.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier:
+            notches = (delta.y() or delta.x()) / 120.0
+            self.scroll_lanes(-round(notches * _LANES_PER_NOTCH))
+        else:
+            self.scroll_by(-0.1 * delta.y() / 120.0)
         ev.accept()
 
     # ----- drawing ---------------------------------------------------------------
@@ -859,18 +1655,21 @@ class TraceView(pg.PlotWidget):
         self._window_start = min(max(0.0, self._window_start), latest)
 
     def _build_curves(self) -> None:
-        """Recreate one curve per *visible* channel (on open/clear), tuned for speed."""
+        """Size the curve pool to the lanes on screen, tuned for speed.
+
+        One curve per lane on screen, not per channel: curves are added or
+        removed only when the lane count changes, and a vertical scroll rebinds
+        the same ones to other channels.
+        """
         plot_item = self.getPlotItem()
         assert plot_item is not None
-        for curve in self._curves:
-            plot_item.removeItem(curve)
-        self._curves = []
-        if self._provider is None:
-            plot_item.getAxis("left").setTicks([[]])
-            return
+        wanted = len(self.on_screen_indices) if self._provider is not None else 0
+        while len(self._curves) > wanted:
+            plot_item.removeItem(self._curves.pop())
         pen = pg.mkPen(self.palette().color(QtGui.QPalette.ColorRole.Text), width=1)
-        names = self._provider.ch_names
-        for _ in self._visible:
+        for curve in self._curves:
+            curve.setData([], [])  # the next refresh fills them
+        while len(self._curves) < wanted:
             curve = pg.PlotDataItem(pen=pen)
             # Peak (min/max) downsampling keeps extremes visible at any zoom;
             # clip-to-view skips offscreen points when a margin is set.
@@ -878,14 +1677,29 @@ class TraceView(pg.PlotWidget):
             curve.setClipToView(True)
             plot_item.addItem(curve)
             self._curves.append(curve)
-        # Lanes follow display order: the channel at display position ``lane`` is
-        # centered at y = -lane, labelled with its name.
+        self._label_lanes()
+        self.setYRange(-wanted + 0.4, 0.6, padding=0)
+        self.lanesChanged.emit()
+
+    def _label_lanes(self) -> None:
+        """Name the lanes on screen on the left axis.
+
+        Lanes follow display order: the ``lane``-th channel on screen is centered
+        at y = -lane, labelled with its name.
+        """
+        plot_item = self.getPlotItem()
+        assert plot_item is not None
+        if self._provider is None:
+            plot_item.getAxis("left").setTicks([[]])
+            return
+        names = self._provider.ch_names
         plot_item.getAxis("left").setTicks(
-            [[(-lane, names[i]) for lane, i in enumerate(self._visible)]]
+            [[(-lane, names[i]) for lane, i in enumerate(self.on_screen_indices)]]
         )
-        self.setYRange(-len(self._visible) + 0.4, 0.6, padding=0)
 
-    def _lane_traces(self) -> tuple[np.ndarray, list[_LaneTrace]]:
+    def _lane_traces(
+        self, channels: list[int] | None = None
+    ) -> tuple[np.ndarray, list[_LaneTrace]]:
         """Fetch, filter, trim, and scale the visible window into lane-unit traces.
 
         The single source of truth for both :meth:`_refresh_data` (which draws
@@ -893,170 +1707,474 @@ class TraceView(pg.PlotWidget):
         the figure are guaranteed to be the same picture. ``times`` is in data
         seconds, trimmed to the window; each :class:`_LaneTrace` carries the
         lane-unit ``values`` (centered on 0; draw ``-lane + values``).
+        ``channels`` (display order, lane 0 first) defaults to the lanes on
+        screen.
+        """
+        key = self._window_key(self._window_start, channels)
+        times, data = self._filtered_window(key)
+        return times, self._scale_lanes(data, channels)
+
+    def _preview_traces(self) -> tuple[np.ndarray, list[_LaneTrace]]:
+        """A cheap stand-in for :meth:`_lane_traces` while scrolling fast.
+
+        The window read without a filter margin and thinned to every n-th
+        sample, a couple per pixel — no filter to run, no decimation filter
+        either, a fraction of the samples to scale and draw. It aliases, as a
+        glimpse in passing may; the refine puts the real window back. A
+        highpassed channel is centred on its mean in place of the filter, so a
+        drifting raw trace still sits in its lane. The caches and the window
+        the full render slides from are left alone. (A window wide enough for
+        the pyramid is drawn from it anyway, which is cheaper still.)
+        """
+        assert self._provider is not None
+        ch_types = self._provider.ch_types
+        on_screen = self.on_screen_indices
+        # No lowpass to respect: as coarse as the screen's width allows.
+        step = dsp.decimation_factor(
+            self._provider.sfreq, self._window_seconds, self._plot_pixels(), 0.0
+        )
+        lo = self._window_start
+        times, raw = self._provider.get_slice(
+            lo, lo + self._window_seconds, picks=on_screen
+        )
+        # A strided pick is a copy, so the provider's buffer is never written.
+        data = np.asarray(raw)[:, ::step].astype(self._dtype)
+        centred = [
+            row
+            for row, i in enumerate(on_screen)
+            if self.effective_spec(ch_types[i]).highpass is not None
+        ]
+        if centred and data.size:
+            rows = data[centred]
+            finite = np.isfinite(rows)  # a joined night's gap (NaN) isn't averaged
+            total = np.where(finite, rows, 0).sum(axis=1, keepdims=True)
+            data[centred] = rows - total / np.maximum(
+                finite.sum(axis=1, keepdims=True), 1
+            )
+        return np.asarray(times)[::step], self._scale_lanes(data)
+
+    def _scale_lanes(
+        self, data: np.ndarray, channels: list[int] | None = None
+    ) -> list[_LaneTrace]:
+        """Scale each row of ``data`` (``channels``, else on screen) into its lane."""
+        assert self._provider is not None
+        ch_types = self._provider.ch_types
+        # One multiply per lane, on the shared pool like the filtering: long
+        # rows release the GIL, so a dense montage scales on every core.
+        return prefetch.parallel_map(
+            lambda item: self._scale_lane(
+                item[0], item[1], ch_types[item[1]], data[item[0]]
+            ),
+            list(enumerate(self.on_screen_indices if channels is None else channels)),
+        )
+
+    def _window_key(self, start: float, channels: list[int] | None = None) -> WindowKey:
+        """The cache key of the window at ``start`` under the current display.
+
+        Of ``channels`` (display order), else of the lanes on screen.
         """
         assert self._provider is not None
         ch_types = self._provider.ch_types
+        if channels is None:
+            channels = self.on_screen_indices
+        return WindowKey(
+            start,
+            self._window_seconds,
+            tuple(channels),
+            tuple(self.effective_spec(ch_types[i]) for i in channels),
+            self._decimation_factor(channels),
+            self._peak_decimation,
+        )
+
+    def _decimation_factor(self, channels: list[int] | None = None) -> int:
+        """How far to decimate the current window before filtering (1: not at all).
+
+        Tied to the plot's pixel width and the highest effective lowpass among
+        the visible channels; a visible channel with no lowpass at all (its
+        whole band is on display) rules decimation out for the window, since
+        every lane shares one time base.
+        """
+        if not self._decimation_enabled or self._provider is None:
+            return 1
         sfreq = self._provider.sfreq
-        # Each visible channel filters by its type's effective spec; fetch a
-        # margin wide enough for the longest transient across all active specs.
-        specs = {i: self.effective_spec(ch_types[i]) for i in self._visible}
+        ch_types = self._provider.ch_types
+        if channels is None:
+            channels = self.on_screen_indices
+        lowpasses = [
+            dsp.effective_spec(self.effective_spec(ch_types[i]), sfreq).lowpass
+            for i in channels
+        ]
+        if not lowpasses or None in lowpasses:
+            return 1
+        return dsp.decimation_factor(
+            sfreq,
+            self._window_seconds,
+            self._plot_pixels(),
+            max(lp for lp in lowpasses if lp is not None),
+        )
+
+    def _filtered_window(self, key: WindowKey) -> FilteredWindow:
+        """The filtered window for ``key``: cached where possible, else read now.
+
+        Cached means sliced from the whole-night filtered cache when it covers
+        the window, else looked up in the read-ahead cache. Read now means slid
+        from the last window drawn when the two overlap (a wheel step fetches
+        only the exposed edge), else fetched whole.
+        """
+        assert self._provider is not None
+        if self._filtered_cache is not None:
+            sliced = self._filtered_cache.window(key)
+            if sliced is not None:
+                sliced = sliced._replace(
+                    data=sliced.data.astype(self._dtype, copy=False)
+                )
+                self._last_window = (key, sliced)
+                return sliced
+        cache = self._window_cache
+        cacheable = cache is not None and key.seconds <= _PREFETCH_MAX_SECONDS
+        window = cache.get(key) if cache is not None and cacheable else None
+        if window is None:
+            if self._last_window is not None:
+                window = prefetch.slide_window(
+                    self._provider, *self._last_window, key, self._dtype
+                )
+            if window is None:
+                window = prefetch.filter_window(self._provider, key, self._dtype)
+            if cache is not None and cacheable:
+                cache.put(key, window)
+        self._last_window = (key, window)
+        return window
+
+    def _restart_prefetch(self) -> None:
+        """Stop the current worker and, if enabled, start a fresh one and cache.
+
+        A new cache per recording (and a new worker bound to it), so a read still
+        in flight for the previous file can only land in a cache nobody reads.
+        """
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+        if self._window_cache is not None:
+            hits, misses = self.prefetch_stats
+            _logger.debug("EEG read-ahead: %d hits, %d misses", hits, misses)
+        self._prefetcher = None
+        self._window_cache = None
+        if self._prefetch_enabled and self._provider is not None:
+            self._window_cache = WindowCache()
+            self._prefetcher = Prefetcher(
+                self._window_cache,
+                functools.partial(
+                    prefetch.filter_window, self._provider, dtype=self._dtype
+                ),
+            )
+
+    def _schedule_prefetch(self) -> None:
+        """Ask the worker for the windows a page turn is likely to show next."""
+        if (
+            self._prefetcher is None
+            or self._provider is None
+            or self._window_seconds > _PREFETCH_MAX_SECONDS
+            or self._overview_factor() is not None
+        ):
+            return
+        starts = prefetch.neighbours(
+            self._window_start,
+            self._window_seconds,
+            self._last_step,
+            self._provider.duration,
+        )
+        keys = [self._window_key(start) for start in starts]
+        if self._filtered_cache is not None:  # already a slice away
+            keys = [k for k in keys if not self._filtered_cache.serves(k)]
+        self._prefetcher.request(keys)
+
+    def _scale_lane(
+        self, lane: int, channel: int, ch_type: str, trace: np.ndarray
+    ) -> _LaneTrace:
+        """Scale one channel's trimmed trace into lane units."""
+        scale_uv: float | None = None
+        if ch_type in _MICROVOLT_TYPES:
+            scale_uv = self.effective_scale(ch_type)
+            scaled = trace * (_VOLTS_TO_MICROVOLTS / scale_uv)
+        else:
+            # Unit-less channel (stim/misc/…): fit it to its own lane per
+            # visible slice. Absolute amplitude is meaningless for these;
+            # the edges (a trigger firing) are what a reviewer looks for.
+            peak = float(np.max(np.abs(trace), initial=0.0, where=~np.isnan(trace)))
+            scaled = trace * (_AUTOFIT_EXCURSION / peak) if peak else trace
+        return _LaneTrace(lane, channel, ch_type, scaled, scale_uv)
+
+    def _plot_pixels(self) -> int:
+        """The trace area's width in device pixels (a fallback before layout)."""
+        width = int(self._viewbox.width())
+        return width if width > 1 else _FALLBACK_PLOT_PIXELS
+
+    def _overview_factor(self) -> int | None:
+        """The pyramid level to draw this window from, or ``None`` for full rate."""
+        if self._pyramid is None or self._provider is None:
+            return None
+        samples = self._window_seconds * self._provider.sfreq
+        return self._pyramid.factor_for(samples / self._plot_pixels())
+
+    def _overview_traces(self, factor: int) -> tuple[np.ndarray, list[_LaneTrace]]:
+        """Lane traces for a zoomed-out window, read from a pyramid level.
+
+        Each bucket contributes its minimum and maximum as two consecutive points
+        at the bucket centre, so the curve sweeps the envelope exactly the way
+        pyqtgraph's peak downsampling would have drawn the full-rate data. The
+        display filter is applied to the bucket *means* at the level's rate and
+        the envelope rides on the result (``min - mean + filtered(mean)``): the
+        highpass still strips drift from a whole-night view, while stages the
+        level's rate can't carry (a 35 Hz lowpass at 2 Hz) drop out the same way
+        :func:`smacc.eeg.dsp.effective_spec` drops them for a low-rate file.
+        """
+        assert self._provider is not None and self._pyramid is not None
+        ch_types = self._provider.ch_types
+        rate = self._provider.sfreq / factor
+        on_screen = self.on_screen_indices
+        specs = {i: self.effective_spec(ch_types[i]) for i in on_screen}
         pad = max((dsp.pad_seconds(s) for s in specs.values()), default=1.0)
         lo = self._window_start
         hi = self._window_start + self._window_seconds
-        times, raw = self._provider.get_slice(lo - pad, hi + pad)
-        raw = np.asarray(raw)
-        times = np.asarray(times)
-        data = raw.astype(float, copy=True)
-        # Filter each group of like-spec channels together — one designed filter
-        # per distinct spec (the dsp cache keys on it), not one per channel.
+        times, mins, maxs, means = self._pyramid.get_envelope(
+            factor, lo - pad, hi + pad, on_screen
+        )
+        # get_envelope's row pick already copied out of the map, so the arrays
+        # are ours to shift in place; cast only when running in float64.
+        mins = mins.astype(self._dtype, copy=False)
+        maxs = maxs.astype(self._dtype, copy=False)
+        rows = {i: row for row, i in enumerate(on_screen)}
         groups: dict[dsp.FilterSpec, list[int]] = {}
         for i, spec in specs.items():
-            groups.setdefault(spec, []).append(i)
+            groups.setdefault(spec, []).append(rows[i])
         for spec, idx in groups.items():
-            if not spec.is_identity:
-                data[idx] = dsp.apply(raw[idx], sfreq, spec)
-        # Trim the filter margin so its edge transients never reach the screen.
+            if spec.is_identity:
+                continue
+            mean = means[idx].astype(self._dtype, copy=False)
+            shift = dsp.apply(mean, rate, spec) - mean
+            mins[idx] += shift
+            maxs[idx] += shift
         keep = (times >= lo) & (times <= hi)
-        times = times[keep]
+        times = np.repeat(times[keep], 2)
         lanes: list[_LaneTrace] = []
-        for lane, i in enumerate(self._visible):
-            trace = data[i][keep]
-            if ch_types[i] in _MICROVOLT_TYPES:
-                scale_uv: float | None = self.effective_scale(ch_types[i])
-                scaled = trace * _VOLTS_TO_MICROVOLTS / scale_uv
-            else:
-                # Unit-less channel (stim/misc/…): fit it to its own lane per
-                # visible slice. Absolute amplitude is meaningless for these;
-                # the edges (a trigger firing) are what a reviewer looks for.
-                scale_uv = None
-                peak = float(np.max(np.abs(trace))) if trace.size else 0.0
-                scaled = trace * (_AUTOFIT_EXCURSION / peak) if peak else trace
-            lanes.append(_LaneTrace(lane, i, ch_types[i], scaled, scale_uv))
+        for lane, i in enumerate(on_screen):
+            envelope = np.empty(times.size, self._dtype)
+            envelope[0::2] = mins[rows[i]][keep]
+            envelope[1::2] = maxs[rows[i]][keep]
+            lanes.append(self._scale_lane(lane, i, ch_types[i], envelope))
         return times, lanes
 
-    def _refresh_data(self) -> None:
-        """Draw the visible slice of every shown channel."""
+    def _refresh_data(self, preview: bool = False) -> None:
+        """Draw the visible slice of every shown channel (or its ``preview``).
+
+        Either kind's cost is measured into the running estimates that decide
+        when to preview; a preview also (re)arms the refine timer.
+        """
         if self._provider is None:
             return
-        times, lanes = self._lane_traces()
+        clock = QtCore.QElapsedTimer()
+        clock.start()
+        factor = self._overview_factor()
+        preview = preview and factor is None  # a pyramid window is cheap already
+        if factor is not None:
+            times, lanes = self._overview_traces(factor)
+        elif preview:
+            times, lanes = self._preview_traces()
+        else:
+            times, lanes = self._lane_traces()
         for entry in lanes:
             self._curves[entry.lane].setData(times, -entry.lane + entry.values)
         lo = self._window_start
         self.setXRange(lo, lo + self._window_seconds, padding=0)
+        elapsed_ms = clock.nsecsElapsed() / 1e6
+        if preview:
+            self._preview_ms = _smoothed(self._preview_ms, elapsed_ms)
+            self._previews += 1
+            self._refine_timer.start()
+        else:
+            self._full_refresh_ms = _smoothed(self._full_refresh_ms, elapsed_ms)
+            if self._previews:
+                _logger.debug(
+                    "Trace view: previews while scrolling: %d, refined in %.0f ms "
+                    "(frame budget %.0f ms)",
+                    self._previews,
+                    elapsed_ms,
+                    self._frame_ms(),
+                )
+                self._previews = 0
+            self._refine_timer.stop()
+            self._schedule_prefetch()
+        self._data_clock.start()
+
+    def _density_edges(self, count: int) -> np.ndarray | None:
+        """Pixel-column edges across the window if ``count`` marks would crowd it.
+
+        None while the marks are sparse enough to draw one by one.
+        """
+        pixels = self._plot_pixels()
+        if count <= _DENSITY_MARKS_PER_PIXEL * pixels:
+            return None
+        lo = self._window_start
+        return np.linspace(lo, lo + self._window_seconds, pixels + 1)
+
+    def _refresh_mark_density(self) -> bool:
+        """Show the editable and peer marks as a density track if they crowd.
+
+        Counts the marks starting in the window — the editable ones and each
+        visible rater's, straight from their indexes' onset lists — and returns
+        whether the density track is up, in which case neither marks layer
+        draws its marks one by one.
+        """
+        sources: list[tuple[str, tuple[int, int, int], list[float]]] = []
+        if self._provider is not None:
+            lo = self._window_start
+            hi = self._window_start + self._window_seconds
+            own = self._annotation_index.onsets_between(lo, hi)
+            sources.append(("Annotations", _REGION_PEN[:3], own))
+            for overlay in self._overlays:
+                if overlay.visible:
+                    _, index = self._overlay_indexes[overlay.rater_id]
+                    onsets = index.onsets_between(lo, hi)
+                    sources.append((overlay.rater_id, overlay.color, onsets))
+        edges = self._density_edges(sum(len(onsets) for _, _, onsets in sources))
+        if edges is None:
+            self._mark_density.clear()
+            return False
+        self._mark_density.set_rows(
+            edges,
+            [
+                _DensityRow(name, color, _column_counts(onsets, edges))
+                for name, color, onsets in sources
+                if onsets
+            ],
+        )
+        return True
 
     def _refresh_annotations(self) -> None:
         """Redraw the annotation overlay for the visible window (cheap)."""
-        plot_item = self.getPlotItem()
-        assert plot_item is not None
-        for old in self._annotation_items:
-            plot_item.removeItem(old)
+        dense = self._refresh_mark_density()
+        regions = self._annotation_region_pool
+        regions.reset()
         self._annotation_items = []
-        if self._provider is None:
-            return
-        lo = self._window_start
-        hi = self._window_start + self._window_seconds
-        for index, a in enumerate(self._annotations):
-            if a.onset + a.duration < lo or a.onset > hi:
-                continue
-            selected = index == self._selected
-            item: pg.LinearRegionItem | pg.InfiniteLine
-            if a.duration > 0:
-                item = pg.LinearRegionItem(
-                    values=(a.onset, a.onset + a.duration),
-                    movable=False,
-                    brush=_REGION_BRUSH_SELECTED if selected else _REGION_BRUSH,
-                    pen=_REGION_PEN,
-                )
-            else:
-                item = pg.InfiniteLine(
-                    pos=a.onset,
-                    angle=90,
-                    movable=False,
-                    pen=pg.mkPen(
-                        _LINE_PEN_SELECTED if selected else _LINE_PEN,
-                        width=2 if selected else 1,
-                    ),
-                )
-            item.setToolTip(a.description)
-            item.setZValue(10)
-            plot_item.addItem(item)
-            self._annotation_items.append(item)
-        self._refresh_overlays()  # peers redraw with the editable layer on scroll
+        points: list[Annotation] = []
+        selected_point = -1
+        if self._provider is not None and not dense:
+            lo = self._window_start
+            hi = self._window_start + self._window_seconds
+            chosen = (
+                self._annotations[self._selected]
+                if 0 <= self._selected < len(self._annotations)
+                else None
+            )
+            for a in self._annotation_index.overlapping(lo, hi):
+                selected = a is chosen
+                if a.duration > 0:
+                    region = regions.take()
+                    region.setRegion((a.onset, a.onset + a.duration))
+                    region.setBrush(
+                        _REGION_BRUSH_SELECTED if selected else _REGION_BRUSH
+                    )
+                    region.setToolTip(a.description)
+                    self._annotation_items.append(region)
+                else:
+                    if selected:
+                        selected_point = len(points)
+                    points.append(a)
+        regions.hide_rest()
+        styles = np.zeros(len(points), dtype=np.intp)
+        if selected_point >= 0:
+            styles[selected_point] = 1
+        self._annotation_ticks.set_ticks(
+            np.array([a.onset for a in points], dtype=float),
+            styles,
+            [a.description for a in points],
+            _POINT_PENS,
+        )
+        self._refresh_overlays(dense)  # peers redraw with the editable layer
 
-    def _refresh_overlays(self) -> None:
+    def _refresh_overlays(self, dense: bool) -> None:
         """Redraw the read-only other-rater overlays for the visible window (#181d).
 
         Each visible rater's marks paint in that rater's colour, below the
         editable layer and with no selection styling — visible context only.
+        Nothing is drawn mark by mark while the ``dense`` track stands in.
         """
-        plot_item = self.getPlotItem()
-        assert plot_item is not None
-        for old in self._overlay_items:
-            plot_item.removeItem(old)
+        regions = self._overlay_region_pool
+        regions.reset()
         self._overlay_items = []
-        if self._provider is None:
-            return
         lo = self._window_start
         hi = self._window_start + self._window_seconds
-        for overlay in self._overlays:
-            if not overlay.visible:
+        pens: list[QtGui.QPen] = []  # one style per rater for the point marks
+        points: list[float] = []
+        styles: list[int] = []
+        tips: list[str] = []
+        for overlay in self._overlays if self._provider is not None else []:
+            if not overlay.visible or dense:
                 continue
             red, green, blue = overlay.color
-            brush = (red, green, blue, 45)
-            pen = (red, green, blue, 200)
-            for a in overlay.annotations:
-                if a.onset + a.duration < lo or a.onset > hi:
-                    continue
-                item: pg.LinearRegionItem | pg.InfiniteLine
+            brush = pg.mkBrush(red, green, blue, 45)
+            pen = pg.mkPen((red, green, blue, 200), width=1)
+            pens.append(pen)
+            _, index = self._overlay_indexes[overlay.rater_id]
+            for a in index.overlapping(lo, hi):
+                tip = f"{overlay.rater_id}: {a.description}"
                 if a.duration > 0:
-                    item = pg.LinearRegionItem(
-                        values=(a.onset, a.onset + a.duration),
-                        movable=False,
-                        brush=brush,
-                        pen=pen,
-                    )
+                    region = regions.take()
+                    region.setRegion((a.onset, a.onset + a.duration))
+                    region.setBrush(brush)
+                    _set_region_pen(region, pen)
+                    region.setToolTip(tip)
+                    self._overlay_items.append(region)
                 else:
-                    item = pg.InfiniteLine(
-                        pos=a.onset, angle=90, movable=False, pen=pg.mkPen(pen, width=1)
-                    )
-                item.setToolTip(f"{overlay.rater_id}: {a.description}")
-                item.setZValue(_OVERLAY_Z)
-                plot_item.addItem(item)
-                self._overlay_items.append(item)
+                    points.append(a.onset)
+                    styles.append(len(pens) - 1)
+                    tips.append(tip)
+        regions.hide_rest()
+        self._overlay_ticks.set_ticks(
+            np.array(points, dtype=float), np.array(styles, dtype=np.intp), tips, pens
+        )
 
     def _refresh_log_marks(self) -> None:
         """Redraw the session-log overlay ticks in the top lane (#125).
 
         Each mark is an instantaneous tick spanning only the top lane, coloured
-        by its log level. The marks are time-sorted, so a binary search bounds
-        the redraw to the entries inside the visible window — cheap on scroll
-        even for an all-night log with thousands of entries.
+        by its log level, and all of them are one batched item (_TickLayer).
+        The marks are time-sorted, so a binary search bounds the redraw to the
+        entries inside the visible window — cheap on scroll even for an
+        all-night log with thousands of entries. Too many to tell apart, they
+        are counted per pixel column instead, a row per level.
         """
-        plot_item = self.getPlotItem()
-        assert plot_item is not None
-        for old in self._log_items:
-            plot_item.removeItem(old)
-        self._log_items = []
-        if self._provider is None or not self._log_marks:
-            return
-        lo = self._window_start
-        hi = self._window_start + self._window_seconds
-        seconds = [m.seconds for m in self._log_marks]
-        start = bisect.bisect_left(seconds, lo)
-        stop = bisect.bisect_right(seconds, hi)
-        for mark in self._log_marks[start:stop]:
-            color = _LOG_LEVEL_COLORS.get(mark.level, _LOG_DEFAULT_COLOR)
-            line = pg.InfiniteLine(
-                pos=mark.seconds,
-                angle=90,
-                movable=False,
-                pen=pg.mkPen(color, width=2),
-                span=(_LOG_LANE_FRAC, 1.0),  # the top lane only
+        start = stop = 0
+        if self._provider is not None:
+            lo = self._window_start
+            hi = self._window_start + self._window_seconds
+            start = int(np.searchsorted(self._log_seconds, lo, side="left"))
+            stop = int(np.searchsorted(self._log_seconds, hi, side="right"))
+        edges = self._density_edges(stop - start)
+        if edges is None:
+            self._log_density.clear()
+        else:
+            seconds = self._log_seconds[start:stop]
+            levels = self._log_levels[start:stop]
+            names = (*_LOG_LEVELS, "Log")
+            colors = (*_LOG_LEVEL_COLORS.values(), _LOG_DEFAULT_COLOR)
+            self._log_density.set_rows(
+                edges,
+                [
+                    _DensityRow(
+                        names[level],
+                        colors[level],
+                        _column_counts(seconds[levels == level], edges),
+                    )
+                    for level in np.unique(levels)
+                ],
             )
-            line.setToolTip(mark.tooltip)
-            line.setZValue(_LOG_Z)
-            plot_item.addItem(line)
-            self._log_items.append(line)
+            stop = start  # no ticks under the density rows
+        self._log_ticks.set_ticks(
+            self._log_seconds[start:stop],
+            self._log_levels[start:stop],
+            [mark.tooltip for mark in self._log_marks[start:stop]],
+            _LOG_PENS,
+        )
 
     def _refresh_epoch_layer(self) -> None:
         """Redraw everything keyed to the epoch grid: gridlines, stage bands, focus.
@@ -1077,16 +2195,11 @@ class TraceView(pg.PlotWidget):
         hypnogram tints the trace without obscuring it. Only the handful of epochs
         inside the window are drawn, so this stays cheap on scroll.
         """
-        plot_item = self.getPlotItem()
-        assert plot_item is not None
-        for old in self._stage_band_items:
-            plot_item.removeItem(old)
-        self._stage_band_items = []
-        if self._provider is None or not self._stage_epochs:
-            return
+        pool = self._stage_band_pool
+        pool.reset()
         lo = self._window_start
         hi = self._window_start + self._window_seconds
-        for epoch in self._stage_epochs:
+        for epoch in self._stage_epochs if self._provider is not None else []:
             # Half-open overlap with [lo, hi): an epoch tiling exactly to the right
             # edge belongs to the *next* screen, not this one — so each page shows
             # exactly its own epochs rather than a sliver of the following band.
@@ -1098,15 +2211,10 @@ class TraceView(pg.PlotWidget):
             ):  # a token with no colour (foreign vocab) just tints nothing
                 continue
             red, green, blue = color
-            band = pg.LinearRegionItem(
-                values=(epoch.onset, epoch.onset + epoch.duration),
-                movable=False,
-                brush=(red, green, blue, _STAGE_BAND_ALPHA),
-                pen=pg.mkPen((red, green, blue, 0)),  # no border, just the wash
-            )
-            band.setZValue(_STAGE_BAND_Z)
-            plot_item.addItem(band)
-            self._stage_band_items.append(band)
+            band = pool.take()
+            band.setRegion((epoch.onset, epoch.onset + epoch.duration))
+            band.setBrush(pg.mkBrush(red, green, blue, _STAGE_BAND_ALPHA))
+        self._stage_band_items = pool.hide_rest()
 
     def _refresh_focused_epoch(self) -> None:
         """Bracket the left-edge epoch while a staging sweep is active (#182).
@@ -1114,53 +2222,42 @@ class TraceView(pg.PlotWidget):
         The focused epoch is the one a stage key will score — always the epoch at
         the left edge of the window, the same one the status-bar readout names.
         """
-        plot_item = self.getPlotItem()
-        assert plot_item is not None
-        if self._focused_epoch_item is not None:
-            plot_item.removeItem(self._focused_epoch_item)
-            self._focused_epoch_item = None
-        if self._provider is None or not self._stage_focus_active:
-            return
-        k = math.floor((self._window_start - self._epoch_anchor) / self._epoch_seconds)
-        onset = self._epoch_anchor + k * self._epoch_seconds
-        item = pg.LinearRegionItem(
-            values=(onset, onset + self._epoch_seconds),
-            movable=False,
-            brush=_FOCUS_BRUSH,
-            pen=_FOCUS_PEN,
-        )
-        item.setZValue(_FOCUS_Z)
-        plot_item.addItem(item)
-        self._focused_epoch_item = item
+        self._focus_pool.reset()
+        self._focused_epoch_item = None
+        if self._provider is not None and self._stage_focus_active:
+            k = math.floor(
+                (self._window_start - self._epoch_anchor) / self._epoch_seconds
+            )
+            onset = self._epoch_anchor + k * self._epoch_seconds
+            item = self._focused_epoch_item = self._focus_pool.take()
+            item.setRegion((onset, onset + self._epoch_seconds))
+            item.setBrush(_FOCUS_BRUSH)
+        self._focus_pool.hide_rest()
 
     def _refresh_epochs(self) -> None:
         """Redraw the epoch boundary gridlines for the visible window.
 
         Lines fall at ``anchor + k·epoch`` and are numbered with the epoch they
         begin (the boundary at the anchor starts epoch 1). Only the handful of
-        boundaries inside the window are drawn, so this stays cheap on scroll.
+        boundaries inside the window are drawn, so this stays cheap on scroll; a
+        zoomed-out window thins them to every n-th epoch (``_MAX_EPOCH_LINES``),
+        keyed to the epoch number so the kept lines don't jump as it scrolls.
         """
-        plot_item = self.getPlotItem()
-        assert plot_item is not None
-        for old in self._epoch_items:
-            plot_item.removeItem(old)
-        self._epoch_items = []
-        if self._provider is None or not self._show_epochs:
-            return
-        lo = self._window_start
-        hi = self._window_start + self._window_seconds
-        for boundary, number in self._epoch_boundaries(lo, hi):
-            line = pg.InfiniteLine(
-                pos=boundary,
-                angle=90,
-                movable=False,
-                pen=_EPOCH_PEN,
-                label=number,  # the epoch this boundary starts
-                labelOpts={"position": 0.96, "color": _EPOCH_LABEL_COLOR},
-            )
-            line.setZValue(2)  # above the curves, below the annotations
-            plot_item.addItem(line)
-            self._epoch_items.append(line)
+        self._epoch_pool.reset()
+        if self._provider is not None and self._show_epochs:
+            lo = self._window_start
+            hi = self._window_start + self._window_seconds
+            boundaries = self._epoch_boundaries(lo, hi)
+            stride = max(1, math.ceil(len(boundaries) / _MAX_EPOCH_LINES))
+            for boundary, number in boundaries:
+                if (int(number) - 1) % stride:
+                    continue
+                # take() shows the line before the relabel: a hidden label
+                # ignores new text (InfLineLabel.valueChanged).
+                line = self._epoch_pool.take()
+                line.setValue(boundary)
+                line.label.setFormat(number)  # the epoch this boundary starts
+        self._epoch_items = self._epoch_pool.hide_rest()
 
     def _epoch_boundaries(self, lo: float, hi: float) -> list[tuple[float, str]]:
         """``(boundary_seconds, "k+1")`` for every epoch line within ``[lo, hi]``.
@@ -1180,77 +2277,140 @@ class TraceView(pg.PlotWidget):
 # the accent used for the current-window marker (the teal of the focus bracket).
 _STRIP_HEIGHT = 30
 _STRIP_MARKER_PEN = pg.mkPen((0, 150, 136), width=2)
+# Spectrogram overview strip: taller than the hypnogram so its frequency rows
+# stay legible, coloured by viridis (dark = low power, yellow = high) as RGBA.
+_CSA_STRIP_HEIGHT = 48
+_CSA_LOOKUP = np.column_stack(
+    [
+        pg.colormap.get("viridis").getLookupTable(nPts=256, alpha=False),
+        np.full(256, 255, dtype=np.uint8),
+    ]
+).astype(np.uint8)
+# Quality strip: one row per channel, one column per epoch, coloured by issue
+# (indexed by the quality.GOOD … FLATLINE codes). Good cells are transparent so
+# a clean night is a blank strip and anything flagged stands out.
+_QUALITY_STRIP_HEIGHT = 40
+_QUALITY_LOOKUP = np.array(
+    [
+        (0, 0, 0, 0),  # good
+        (230, 140, 40, 255),  # noisy: orange
+        (240, 200, 40, 255),  # line noise: yellow
+        (210, 50, 50, 255),  # clipped: red
+        (90, 110, 160, 255),  # flat: slate blue
+    ],
+    dtype=np.uint8,
+)
 
 
-class HypnogramStrip(QtWidgets.QWidget):
-    """A whole-night hypnogram overview the operator scans and clicks to navigate.
+def _stage_runs(epochs: Sequence[StageEpoch]) -> list[tuple[float, float, str]]:
+    """``(onset, end, stage)`` runs of back-to-back epochs scored the same.
 
-    A thin strip under the trace view: the full recording mapped to its width,
-    one stage-coloured cell per scored epoch, unscored gaps left blank, and a
-    bracket marking where the trace window currently sits. Clicking jumps the view
-    there. It is the at-a-glance map of a night's scoring — where the unscored gap
-    starts, where the REM bouts are — that scoring a long recording needs and the
-    per-window bands alone can't give. Pure ``QPainter``, no pyqtgraph: a few
-    hundred filled rects redraw far faster than that many scene items.
+    A night scored in 30 s epochs is ~1 000 cells but only tens of stage
+    changes; a gap or a different stage starts a new run.
+    """
+    runs: list[tuple[float, float, str]] = []
+    for epoch in sorted(epochs, key=lambda e: e.onset):
+        end = epoch.onset + epoch.duration
+        if (
+            runs
+            and runs[-1][2] == epoch.stage
+            and math.isclose(runs[-1][1], epoch.onset, abs_tol=1e-6)
+        ):
+            runs[-1] = (runs[-1][0], end, epoch.stage)
+        else:
+            runs.append((epoch.onset, end, epoch.stage))
+    return runs
+
+
+class _OverviewStrip(QtWidgets.QWidget):
+    """A whole-night strip under the trace view: cached cells plus a window bracket.
+
+    The full recording is mapped to the strip's width. Subclasses paint their
+    cells (:meth:`_paint_cells`) once into a cached pixmap, repainted only when
+    :meth:`_invalidate` is called or the size, pixel ratio or palette changes.
+    A page turn moves just the bracket marking the trace window: it repaints the
+    strip where the bracket was and where it now is, copying the cells from the
+    pixmap underneath. Clicking jumps the view there. Pure ``QPainter``, no
+    pyqtgraph.
     """
 
     seekRequested = QtCore.pyqtSignal(float)  # data seconds to centre the view on
 
     def __init__(self) -> None:
         super().__init__()
-        self.setFixedHeight(_STRIP_HEIGHT)
-        self.setStatusTip("Hypnogram overview — click to jump the view there.")
         self._duration = 0.0
-        self._epochs: list[StageEpoch] = []
-        self._colors: dict[str, tuple[int, int, int]] = {}
         self._window_start = 0.0
         self._window_seconds = 30.0
-
-    def set_data(
-        self,
-        duration: float,
-        epochs: list[StageEpoch],
-        colors: dict[str, tuple[int, int, int]],
-    ) -> None:
-        """Replace the recording length, scored epochs, and per-stage colours."""
-        self._duration = max(0.0, duration)
-        self._epochs = list(epochs)
-        self._colors = dict(colors)
-        self.update()
+        self._cells: QtGui.QPixmap | None = None  # None: render on next paint
 
     def set_window(self, start: float, seconds: float) -> None:
         """Move the current-window marker to ``[start, start + seconds)``."""
+        before = self._marker_rect()
         self._window_start = start
         self._window_seconds = seconds
+        after = self._marker_rect()
+        if after != before:
+            # Only the old and new bracket need repainting; the cells under them
+            # come from the pixmap. The pen's half-width spills past the rect.
+            spill = math.ceil(_STRIP_MARKER_PEN.widthF())
+            for rect in (before, after):
+                self.update(rect.toAlignedRect().adjusted(-spill, -spill, spill, spill))
+
+    def _invalidate(self) -> None:
+        """The cells changed: render them afresh on the next paint."""
+        self._cells = None
         self.update()
 
+    def changeEvent(self, event: QtCore.QEvent | None) -> None:
+        if event is not None and event.type() == QtCore.QEvent.Type.PaletteChange:
+            self._cells = None  # the blank background is the palette's base
+        super().changeEvent(event)
+
     def _x(self, seconds: float) -> float:
         return seconds / self._duration * self.width()
 
+    def _marker_rect(self) -> QtCore.QRectF:
+        """The current-window bracket, in widget pixels (empty with no recording)."""
+        if self._duration <= 0 or self.width() <= 0:
+            return QtCore.QRectF()
+        left = self._x(self._window_start)
+        width = max(2.0, self._x(self._window_start + self._window_seconds) - left)
+        return QtCore.QRectF(left, 1.0, width, float(self.height() - 2))
+
+    def _paint_cells(self, painter: QtGui.QPainter) -> None:
+        raise NotImplementedError
+
+    def _render_cells(self) -> QtGui.QPixmap:
+        """The cells over the background, at the screen's pixel density."""
+        ratio = self.devicePixelRatioF()
+        cells = QtGui.QPixmap(
+            max(1, round(self.width() * ratio)), max(1, round(self.height() * ratio))
+        )
+        cells.setDevicePixelRatio(ratio)
+        cells.fill(self.palette().color(QtGui.QPalette.ColorRole.Base))
+        if self._duration <= 0 or self.width() <= 0:
+            return cells
+        painter = QtGui.QPainter(cells)
+        self._paint_cells(painter)
+        painter.end()
+        return cells
+
     def paintEvent(self, event: QtGui.QPaintEvent | None) -> None:
+        if (
+            self._cells is None
+            or self._cells.deviceIndependentSize().toSize() != self.size()
+            or self._cells.devicePixelRatio() != self.devicePixelRatioF()
+        ):
+            self._cells = self._render_cells()  # resized, or moved to another screen
         painter = QtGui.QPainter(self)
-        base = self.palette().color(QtGui.QPalette.ColorRole.Base)
-        painter.fillRect(self.rect(), base)
-        if self._duration <= 0 or self.width() <= 0:
+        painter.drawPixmap(0, 0, self._cells)  # clipped to the repainted region
+        marker = self._marker_rect()
+        if marker.isEmpty():
             return
-        height = self.height()
-        for epoch in self._epochs:
-            color = self._colors.get(epoch.stage)
-            if color is None:  # a token with no colour (foreign vocab) draws nothing
-                continue
-            red, green, blue = color
-            left = self._x(epoch.onset)
-            width = max(1.0, self._x(epoch.onset + epoch.duration) - left)
-            painter.fillRect(
-                QtCore.QRectF(left, 0.0, width, float(height)),
-                QtGui.QColor(red, green, blue),
-            )
         # The current trace window, as a bracket the eye tracks while paging.
-        left = self._x(self._window_start)
-        width = max(2.0, self._x(self._window_start + self._window_seconds) - left)
         painter.setPen(_STRIP_MARKER_PEN)
         painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
-        painter.drawRect(QtCore.QRectF(left, 1.0, width, float(height - 2)))
+        painter.drawRect(marker)
 
     def mousePressEvent(self, event: QtGui.QMouseEvent | None) -> None:
         if event is None or self._duration <= 0 or self.width() <= 0:
@@ -1258,3 +2418,219 @@ class HypnogramStrip(QtWidgets.QWidget):
         fraction = event.position().x() / self.width()
         seconds = max(0.0, min(self._duration, fraction * self._duration))
         self.seekRequested.emit(seconds)
+
+
+class HypnogramStrip(_OverviewStrip):
+    """A whole-night hypnogram overview the operator scans and clicks to navigate.
+
+    A thin strip under the trace view: one stage-coloured cell per scored epoch,
+    unscored gaps left blank, and a bracket marking where the trace window
+    currently sits. It is the at-a-glance map of a night's scoring — where the
+    unscored gap starts, where the REM bouts are — that scoring a long
+    recording needs and the per-window bands alone can't give. Runs of
+    same-stage epochs are merged into one rect each, so the cached cells are a
+    few dozen fills rather than one per epoch.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFixedHeight(_STRIP_HEIGHT)
+        self.setStatusTip("Hypnogram overview — click to jump the view there.")
+        self._epochs: list[StageEpoch] = []
+        self._colors: dict[str, tuple[int, int, int]] = {}
+
+    def set_data(
+        self,
+        duration: float,
+        epochs: list[StageEpoch],
+        colors: dict[str, tuple[int, int, int]],
+    ) -> None:
+        """Replace the recording length, scored epochs, and per-stage colours."""
+        self._duration = max(0.0, duration)
+        self._epochs = list(epochs)
+        self._colors = dict(colors)
+        self._invalidate()
+
+    def _paint_cells(self, painter: QtGui.QPainter) -> None:
+        height = float(self.height())
+        for onset, end, stage in _stage_runs(self._epochs):
+            color = self._colors.get(stage)
+            if color is None:  # a token with no colour (foreign vocab) draws nothing
+                continue
+            left = self._x(onset)
+            width = max(1.0, self._x(end) - left)
+            painter.fillRect(
+                QtCore.QRectF(left, 0.0, width, height), QtGui.QColor(*color)
+            )
+
+
+class SpectrogramStrip(_OverviewStrip):
+    """The whole night's compressed spectral array, under the trace view.
+
+    One column per epoch of a :class:`smacc.eeg.spectrogram.Spectrogram`, one
+    row per frequency (lowest at the bottom), power in dB through the viridis
+    colour map: slow-wave sleep reads as a bright delta band, REM as its
+    absence, an arousal as a vertical stripe. The colour range is the 2nd to
+    98th percentile of what is computed so far, so one artifact doesn't wash
+    the night out. While the background build runs, :meth:`refresh` redraws
+    the columns filled since the last call; the rest stays blank.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFixedHeight(_CSA_STRIP_HEIGHT)
+        self.setStatusTip(
+            f"Spectrogram overview (0–{spectrogram.MAX_FREQ:g} Hz) — click to "
+            "jump the view there."
+        )
+        self._spectrogram: Spectrogram | None = None
+        self._drawn = 0  # epochs filled when the cells were last rendered
+
+    @property
+    def spectrogram(self) -> Spectrogram | None:
+        return self._spectrogram
+
+    def set_spectrogram(self, duration: float, csa: Spectrogram | None) -> None:
+        """Show ``csa`` (``None`` clears the strip) for a ``duration`` s recording."""
+        self._duration = max(0.0, duration)
+        self._spectrogram = csa
+        self._drawn = 0
+        self._invalidate()
+
+    def refresh(self) -> None:
+        """Redraw if the spectrogram has filled more epochs since the last paint."""
+        if self._spectrogram is not None and self._spectrogram.filled != self._drawn:
+            self._invalidate()
+
+    def _paint_cells(self, painter: QtGui.QPainter) -> None:
+        csa = self._spectrogram
+        self._drawn = 0 if csa is None else csa.filled
+        if csa is None or self._drawn == 0:
+            return
+        decibels = 10.0 * np.log10(np.asarray(csa.power, dtype=np.float64) + 1e-30)
+        gaps = np.isnan(decibels)  # epochs in a joined night's gap: left blank
+        known = decibels[~gaps]
+        low, high = np.percentile(known, [2.0, 98.0]) if known.size else (0.0, 1.0)
+        scaled = (np.where(gaps, low, decibels) - low) / max(high - low, 1e-6)
+        index = np.clip(scaled * 255.0, 0.0, 255.0).astype(np.uint8)
+        rgba = _CSA_LOOKUP[index.T[::-1]]  # (freqs, epochs), highest row first
+        rgba[gaps.T[::-1]] = 0
+        rows, columns = rgba.shape[:2]
+        image = QtGui.QImage(
+            np.ascontiguousarray(rgba).tobytes(), columns, rows, 4 * columns, _RGBA8888
+        )
+        target = QtCore.QRectF(
+            0.0, 0.0, self._x(self._drawn * csa.epoch_seconds), float(self.height())
+        )
+        painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawImage(target, image)
+
+
+def _fold_max(codes: np.ndarray, rows: int, columns: int) -> np.ndarray:
+    """``codes`` shrunk to at most ``rows`` × ``columns`` by taking each group's max.
+
+    A 256-channel montage in a 40 px strip, or a 24 h night wider than the
+    strip, must not lose a flagged cell to resampling: each pixel shows the
+    worst issue of the channels and epochs it stands for.
+    """
+    for axis, limit in ((0, rows), (1, columns)):
+        size = codes.shape[axis]
+        if size > limit > 0:
+            starts = (np.arange(limit) * size) // limit
+            codes = np.maximum.reduceat(codes, starts, axis=axis)
+    return codes
+
+
+class QualityStrip(_OverviewStrip):
+    """The whole night's signal quality per channel, under the trace view.
+
+    One row per channel of a :class:`smacc.eeg.quality.QualityMap` (top to
+    bottom in recording order), one column per epoch, each flagged cell
+    coloured by its issue — flat, clipped, line noise or noisy — and good ones
+    left blank. Hovering names the channel, epoch and issue; clicking jumps
+    the view there. While the background build runs, :meth:`refresh` redraws
+    as epochs are filled in.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFixedHeight(_QUALITY_STRIP_HEIGHT)
+        self.setStatusTip(
+            "Signal quality per channel (flat, clipped, line noise, noisy) — click "
+            "to jump the view there; [ and ] step between flagged epochs."
+        )
+        self._quality: QualityMap | None = None
+        self._ch_names: list[str] = []
+        self._codes = np.zeros((0, 0), dtype=np.uint8)
+        self._drawn = 0  # epochs filled when the cells were last rendered
+
+    @property
+    def quality(self) -> QualityMap | None:
+        return self._quality
+
+    def set_quality(
+        self, duration: float, qmap: QualityMap | None, ch_names: Sequence[str] = ()
+    ) -> None:
+        """Show ``qmap`` (``None`` clears the strip) for a ``duration`` s recording.
+
+        ``ch_names`` are the recording's channel names, for the hover text.
+        """
+        self._duration = max(0.0, duration)
+        self._quality = qmap
+        self._ch_names = list(ch_names)
+        self._codes = np.zeros((0, 0), dtype=np.uint8)
+        self._drawn = 0
+        self._invalidate()
+
+    def refresh(self) -> None:
+        """Redraw if the map has filled more epochs since the last paint."""
+        if self._quality is not None and self._quality.filled != self._drawn:
+            self._invalidate()
+
+    def _paint_cells(self, painter: QtGui.QPainter) -> None:
+        qmap = self._quality
+        self._codes = qmap.issues() if qmap is not None else self._codes[:0, :0]
+        self._drawn = 0 if qmap is None else qmap.filled
+        if qmap is None or self._codes.size == 0:
+            return
+        ratio = self.devicePixelRatioF()
+        target = QtCore.QRectF(
+            0.0, 0.0, self._x(self._drawn * qmap.epoch_seconds), float(self.height())
+        )
+        folded = _fold_max(
+            self._codes,
+            max(1, round(target.height() * ratio)),
+            max(1, round(target.width() * ratio)),
+        )
+        rgba = np.ascontiguousarray(_QUALITY_LOOKUP[folded])
+        rows, columns = folded.shape
+        image = QtGui.QImage(rgba.tobytes(), columns, rows, 4 * columns, _RGBA8888)
+        painter.drawImage(target, image)  # nearest: a flagged cell stays crisp
+
+    def tooltip_at(self, x: float, y: float) -> str:
+        """``"<channel>, epoch N: <issue>"`` under widget point ``(x, y)``, or ``""``."""
+        qmap = self._quality
+        if qmap is None or self._codes.size == 0 or self._duration <= 0:
+            return ""
+        seconds = x / max(1, self.width()) * self._duration
+        epoch = int(seconds // qmap.epoch_seconds)
+        row = int(y / max(1, self.height()) * self._codes.shape[0])
+        if not (0 <= epoch < self._codes.shape[1] and 0 <= row < self._codes.shape[0]):
+            return ""
+        issue = quality.ISSUE_NAMES[self._codes[row, epoch]]
+        if not issue:
+            return ""
+        channel = qmap.channels[row]
+        name = self._ch_names[channel] if channel < len(self._ch_names) else channel
+        return f"{name}, epoch {epoch + 1}: {issue}"
+
+    def event(self, event: QtCore.QEvent | None) -> bool:
+        if event is not None and event.type() == QtCore.QEvent.Type.ToolTip:
+            assert isinstance(event, QtGui.QHelpEvent)
+            text = self.tooltip_at(event.pos().x(), event.pos().y())
+            if text:
+                QtWidgets.QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QtWidgets.QToolTip.hideText()
+            return True
+        return super().event(event)
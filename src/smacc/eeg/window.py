@@ -24,23 +24,38 @@ Annotator runs as ``SMACC.exe --eeg``, its own process).
 from __future__ import annotations
 
 import math
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 from .. import preferences, windowstate
-from ..paths import LOGO_PATH, preferences_path
-from . import align, blind, dsp, io, sessionlog, staging
+from ..paths import EEG_CACHE_DIR, LOGO_PATH, preferences_path
+from . import (
+    align,
+    blind,
+    cache,
+    detect,
+    dsp,
+    filtercache,
+    io,
+    jobs,
+    pyramid,
+    quality,
+    sessionlog,
+    spectrogram,
+    staging,
+)
 from .annotations import (
     Annotation,
     autosave_path,
-    discover_rater_sidecars,
     insert,
     rater_autosave_path,
     rater_sidecar_paths,
     read_annotations_tsv,
+    read_rater_sidecars,
     remove,
     replace,
     sanitize_rater_id,
@@ -68,7 +83,9 @@ from .view import (
     OVERLAY_COLORS,
     HypnogramStrip,
     LogMark,
+    QualityStrip,
     RaterOverlay,
+    SpectrogramStrip,
     TraceView,
 )
 
@@ -84,6 +101,15 @@ _EEG_WINDOW_ID = "eeg-annotator"
 SEED_LABELS = ["LRLR", "Arousal", "Artifact", "Cue response"]
 _MAX_RECENT_LABELS = 12
 
+# What opening a recording waits on, in order (see _load): the header on one
+# worker, then the rest on another while the recording is already on screen.
+_OPEN_STAGES = (
+    "reading the header",
+    "reading its events",
+    "scanning its triggers",
+    "finding other raters' marks",
+)
+
 # Selectable page lengths, seconds. 30 s — the sleep-scoring epoch — is the
 # default; the rest bracket it for fine inspection and context.
 WINDOW_LENGTHS = (10, 30, 60, 120)
@@ -96,6 +122,17 @@ _SCROLL_TICKS_PER_SECOND = 10
 # Autosave (#176) is debounced: each annotation change restarts this timer, so a
 # burst of edits writes the recovery file once, shortly after the last of them.
 _AUTOSAVE_DEBOUNCE_MS = 2000
+# The whole-night filtered cache restarts this long after the last filter or
+# montage change, so stepping a spin box through a few values builds only the
+# one the reviewer stops on.
+_FILTERED_CACHE_DEBOUNCE_MS = 1500
+
+# The whole-night builds' slots (see EegAnnotatorWindow._start_build); each
+# names its job "eeg-<slot>".
+_PYRAMID = "pyramid"
+_FILTERED_CACHE = "filtered-cache"
+_SPECTROGRAM = "spectrogram"
+_QUALITY = "quality"
 
 # Session-log overlay (#125). The level checkboxes default to the live preview's
 # gate (INFO and up); DEBUG is off so the lane isn't swamped by the raw-trigger
@@ -175,7 +212,7 @@ def _section_title(text: str) -> QtWidgets.QLabel:
     return label
 
 
-def wall_time(recording: io.Recording, seconds: float) -> datetime | None:
+def wall_time(recording: io.AnyRecording, seconds: float) -> datetime | None:
     """The wall-clock time at ``seconds`` into ``recording``, or ``None``.
 
     Format-aware on purpose: EDF/BrainVision start times are the tech's
@@ -192,6 +229,64 @@ def wall_time(recording: io.Recording, seconds: float) -> datetime | None:
     return start + timedelta(seconds=seconds)
 
 
+def _cache_folder(recording: io.AnyRecording) -> Path:
+    """The folder its derived views are cached in (a joined night's, all files').
+
+    Raises:
+        OSError: if a file can't be stat'ed.
+    """
+    if isinstance(recording, io.ConcatRecording):
+        return cache.recording_cache_dir(EEG_CACHE_DIR, *recording.paths)
+    return cache.recording_cache_dir(EEG_CACHE_DIR, recording.path)
+
+
+def _seed_joined_night(
+    recording: io.ConcatRecording,
+    embedded: list[Annotation],
+    sidecar_for: Callable[[Path], tuple[Path, Path]],
+) -> list[Annotation]:
+    """A joined night's seed: a segment reviewed on its own brings its marks.
+
+    A segment's sidecar already holds its embedded events (they seeded that
+    review) plus whatever the reviewer changed, so it replaces them in
+    ``embedded``; a sidecar that won't parse is passed over, as peers' are.
+    """
+    out = set(embedded)
+    for index, segment in enumerate(recording.segments):
+        tsv_path = sidecar_for(segment.path)[0]
+        if not tsv_path.is_file():
+            continue
+        try:
+            reviewed = read_annotations_tsv(tsv_path)
+        except (OSError, ValueError):
+            continue
+        out -= set(recording.to_timeline(index, io.embedded_annotations(segment)))
+        out |= set(recording.to_timeline(index, reviewed))
+    return sorted(out)
+
+
+class _Markers(NamedTuple):
+    """What an open reads after the header (see ``_read_markers``).
+
+    ``embedded`` is ``None`` when the review did not need them as a seed.
+    """
+
+    embedded: list[Annotation] | None
+    triggers: list[tuple[float, int]]
+    peers: dict[str, list[Annotation]]
+
+
+class _Build(NamedTuple):
+    """A whole-night build in its slot (see ``_start_build``)."""
+
+    job: jobs.BackgroundJob
+    label: str
+    failure: str
+    built: Callable[[Any], None]
+    progressed: Callable[[], None] | None
+    failed: Callable[[], None] | None
+
+
 class LabelDialog(QtWidgets.QDialog):
     """Ask for an annotation's label: editable dropdown of recents + free text.
 
@@ -628,7 +723,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         log_path: str | Path | None = None,
     ) -> None:
         super().__init__()
-        self._recording: io.Recording | None = None
+        self._recording: io.AnyRecording | None = None
         self._annotations: list[Annotation] = []
         self._dirty = False
         self._cursor_seconds: float | None = None  # last mouse time over the traces
@@ -678,6 +773,16 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         # "aligned"/"unverified" badge only ever describes the current offset.
         self._embedded_triggers: list[tuple[float, int]] | None = None
         self._alignment: align.Alignment | None = None
+        # A log load's auto-align that waits for the open's trigger scan.
+        self._align_on_triggers = False
+        # Opening a recording (see _load): the header read, then the events,
+        # triggers and peer sidecars read once it is on screen; and a log asked
+        # for while the header was still being read.
+        self._open_job: jobs.BackgroundJob | None = None
+        self._markers_job: jobs.BackgroundJob | None = None
+        # A fresh review's embedded events are still to be merged in when they land.
+        self._seeding = False
+        self._pending_log: Path | None = None
         # Dream-report audio playback (#125e, folds in #179). Created lazily on
         # first play and kept alive on the window so it isn't GC'd mid-clip.
         # QtMultimedia, never sounddevice/PortAudio — the Annotator process
@@ -706,6 +811,19 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         self._stage_dirty = False
         self._owns_stage_sidecar = False
         self._recovery_stages: list[StageEpoch] | None = None
+        # The whole-night builds running for the open recording, by slot (see
+        # _start_build): the overview pyramid, and the opt-in filtered cache,
+        # spectrogram and signal-quality map. A slot is empty when its cached
+        # result loaded, or nothing is building.
+        self._builds: dict[str, _Build] = {}
+        # The filtered cache is restarted (debounced) whenever the filters or
+        # montage change.
+        self._filtered_cache_timer = QtCore.QTimer(self)
+        self._filtered_cache_timer.setSingleShot(True)
+        self._filtered_cache_timer.setInterval(_FILTERED_CACHE_DEBOUNCE_MS)
+        self._filtered_cache_timer.timeout.connect(self._start_filtered_cache)
+        # A run of the event detectors over the open recording, while it runs.
+        self._detect_job: jobs.BackgroundJob | None = None
         self.setWindowTitle("SMACC EEG Annotator")
         if LOGO_PATH.is_file():
             self.setWindowIcon(QtGui.QIcon(str(LOGO_PATH)))
@@ -734,7 +852,9 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             # "open in annotator" handoff uses this). Deferred for the
             # same reason; runs after the recording load so it overlays when both
             # are given.
-            QtCore.QTimer.singleShot(0, lambda: self.load_session_log(Path(log_path)))
+            QtCore.QTimer.singleShot(
+                0, lambda: self._load_log_when_open(Path(log_path))
+            )
 
     # ----- rater identity (#181) ----------------------------------------------
 
@@ -890,11 +1010,43 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         self.view.logSlideMoved.connect(self._on_log_slide_moved)
         self.view.logSlideFinished.connect(self._on_log_slide_finished)
         self.view.timePicked.connect(self._on_time_picked)
-        viewColumn.addWidget(self.view, 1)
+        self.view.lanesChanged.connect(self._sync_lane_scrollbar)
+        # Read the neighbouring windows ahead while the reviewer looks at this one,
+        # so paging through a night (often off a network share) is a cache hit.
+        self.view.set_prefetch_enabled(True)
+        # Held keys, scrollbar drags and spinboxes redraw once per frame, from the
+        # latest state, instead of once per event.
+        self.view.set_refresh_coalescing(True)
+        # While they come faster than a full render can keep up with, a quick
+        # unfiltered preview is drawn and refined once input stops.
+        self.view.set_progressive_refresh(True)
+        # The lane scrollbar pages a virtualized montage (the "Lanes" control);
+        # hidden while every visible channel has a lane on screen.
+        lanesRow = QtWidgets.QHBoxLayout()
+        lanesRow.addWidget(self.view, 1)
+        self.laneScrollBar = QtWidgets.QScrollBar(QtCore.Qt.Orientation.Vertical, self)
+        self.laneScrollBar.setStatusTip("Scroll through the channel lanes.")
+        self.laneScrollBar.valueChanged.connect(self.view.set_lane_offset)
+        self.laneScrollBar.setVisible(False)
+        lanesRow.addWidget(self.laneScrollBar)
+        self.view.set_lanes_shown(self.lanesSpin.value())
+        viewColumn.addLayout(lanesRow, 1)
         self.scrollBar = QtWidgets.QScrollBar(QtCore.Qt.Orientation.Horizontal, self)
         self.scrollBar.setStatusTip("Scroll through the recording.")
         self.scrollBar.valueChanged.connect(self._on_scrollbar)
         viewColumn.addWidget(self.scrollBar)
+        # Spectrogram overview strip: the whole night's CSA, opt-in (the Spectrogram
+        # checkbox), filled in by a background pass. Click to jump, as below.
+        self.spectrogramStrip = SpectrogramStrip()
+        self.spectrogramStrip.seekRequested.connect(self._on_strip_seek)
+        self.spectrogramStrip.setVisible(False)
+        viewColumn.addWidget(self.spectrogramStrip)
+        # Signal-quality strip: flat/clipped/noisy channels per epoch, opt-in (the
+        # Quality checkbox); [ and ] step between the flagged epochs.
+        self.qualityStrip = QualityStrip()
+        self.qualityStrip.seekRequested.connect(self._on_strip_seek)
+        self.qualityStrip.setVisible(False)
+        viewColumn.addWidget(self.qualityStrip)
         # Hypnogram overview strip (#182c): the whole-night staircase, shown only
         # once staging is in play (hidden for pure annotation work). Click to jump.
         self.hypnogramStrip = HypnogramStrip()
@@ -989,6 +1141,15 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         for widget in (self.highpassSpin, self.lowpassSpin):
             widget.valueChanged.connect(self._on_filters_changed)
         self.notchCombo.currentIndexChanged.connect(self._on_filters_changed)
+        self.filteredCacheCheck = QtWidgets.QCheckBox("Cache", self)
+        self.filteredCacheCheck.setStatusTip(
+            "Filter the whole night once in the background and scroll from that "
+            "copy (uses disk space; rebuilt when the filters or channels change)."
+        )
+        prefs = preferences.load_preferences(preferences_path)
+        self.filteredCacheCheck.setChecked(bool(prefs.get("eeg_filtered_cache")))
+        self.filteredCacheCheck.toggled.connect(self._on_filtered_cache_toggled)
+        row.addWidget(self.filteredCacheCheck)
         row.addSpacing(12)
 
         row.addWidget(QtWidgets.QLabel("Window:", self))
@@ -1014,6 +1175,43 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         self.scaleSpin.valueChanged.connect(self._on_scale_changed)
         row.addWidget(self.scaleSpin)
 
+        # Lane virtualization: a dense montage shows this many lanes at a time
+        # and scrolls through the rest (Shift+wheel, or the lane scrollbar).
+        row.addWidget(QtWidgets.QLabel("Lanes:", self))
+        self.lanesSpin = QtWidgets.QSpinBox(self)
+        self.lanesSpin.setRange(0, 512)
+        self.lanesSpin.setSpecialValueText("All")
+        self.lanesSpin.setStatusTip(
+            "Channel lanes on screen at once; Shift+wheel scrolls through the "
+            "rest. Only the lanes on screen are read and filtered."
+        )
+        self.lanesSpin.setValue(int(prefs.get("eeg_lanes_shown") or 0))
+        self.lanesSpin.valueChanged.connect(self._on_lanes_shown_changed)
+        row.addWidget(self.lanesSpin)
+        self.spectrogramCheck = QtWidgets.QCheckBox("Spectrogram", self)
+        self.spectrogramCheck.setStatusTip(
+            "Show the whole night's spectrogram under the traces (computed once in "
+            "the background, then cached)."
+        )
+        self.spectrogramCheck.setChecked(bool(prefs.get("eeg_spectrogram")))
+        self.spectrogramCheck.toggled.connect(self._on_spectrogram_toggled)
+        row.addWidget(self.spectrogramCheck)
+        self.qualityCheck = QtWidgets.QCheckBox("Quality", self)
+        self.qualityCheck.setStatusTip(
+            "Show flat, clipped, mains-ridden and noisy channels per epoch under "
+            "the traces ([ and ] jump between them; computed once, then cached)."
+        )
+        self.qualityCheck.setChecked(bool(prefs.get("eeg_quality")))
+        self.qualityCheck.toggled.connect(self._on_quality_toggled)
+        row.addWidget(self.qualityCheck)
+        self.detectButton = QtWidgets.QPushButton("Detect…", self)
+        self.detectButton.setStatusTip(
+            "Detect spindles, slow oscillations or K-complexes over the whole "
+            "night; each shows as an auto-<name> rater overlay."
+        )
+        self.detectButton.clicked.connect(self._choose_detectors)
+        row.addWidget(self.detectButton)
+
         row.addStretch(1)
         # Blind-rater mode (#181): hide/blank marks before they render, for blind
         # scoring. Needs a rater id (so marks save to the rater's own sidecar).
@@ -1367,7 +1565,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         return group
 
     def _build_shortcuts(self) -> None:
-        """Window-wide paging on PageUp/PageDown, plus M to drop a point mark.
+        """Window-wide paging on PageUp/PageDown, M to drop a point mark, [ / ].
 
         Arrow/Home/End navigation and amplitude are handled by the application
         event filter (see :meth:`eventFilter`), which works regardless of focus;
@@ -1382,6 +1580,14 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             shortcut.activated.connect(lambda f=fraction: self.view.scroll_by(f))
         mark = QtGui.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key.Key_M), self)
         mark.activated.connect(self._mark_at_cursor)
+        # [ / ] step between epochs the quality map flags (no stage hotkey is
+        # punctuation, so these never collide with scoring).
+        for key, step in (
+            (QtCore.Qt.Key.Key_BracketRight, 1),
+            (QtCore.Qt.Key.Key_BracketLeft, -1),
+        ):
+            shortcut = QtGui.QShortcut(QtGui.QKeySequence(key), self)
+            shortcut.activated.connect(lambda s=step: self._jump_to_flagged_epoch(s))
 
     def _set_loaded(self, loaded: bool) -> None:
         for widget in (
@@ -1396,6 +1602,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             self.exportButton,
             self.stagingButton,
             self.saveStageButton,
+            self.detectButton,
         ):
             widget.setEnabled(loaded)
         for button in self._palette_buttons:  # no recording → nothing to mark
@@ -1776,8 +1983,10 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
                 self.view.set_provider(None)
                 self.fileInfoLabel.clear()
                 self._set_loaded(False)
-        if self._recording is not None:
-            self._load(self._recording.path)  # re-resolve marks under the new mode
+        if isinstance(self._recording, io.ConcatRecording):
+            self._load(*self._recording.paths)  # re-resolve marks under the new mode
+        elif self._recording is not None:
+            self._load(self._recording.path)
         self._update_log_controls()  # the Load-log button follows the blind state
         self._refresh_title()
 
@@ -1806,12 +2015,14 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
 
     # ----- other-rater overlays (#181) -------------------------------------------
 
-    def _load_overlays(self) -> None:
-        """Discover peer rater sidecars and overlay them read-only (#181d).
+    def _load_overlays(self, peers: dict[str, list[Annotation]] | None = None) -> None:
+        """Overlay peer rater sidecars read-only (#181d).
 
-        Never in a blind review — a blind rater must not see their peers — and
-        the rater's own file is excluded (it is the editable layer). A peer file
-        that won't parse is skipped, not fatal.
+        ``peers`` are the sidecars already read (by the open's worker); without
+        them they are discovered and read here. Never in a blind review — a
+        blind rater must not see their peers — and the rater's own file is
+        excluded (it is the editable layer). A peer file that won't parse is
+        skipped, not fatal.
         """
         self._clear_rater_toggles()
         self._rater_layers = []
@@ -1820,13 +2031,10 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             self.ratersGroup.setVisible(False)
             self.view.set_overlays([])
             return
-        siblings = discover_rater_sidecars(self._recording.path)
-        siblings.pop(self._rater_id or "", None)  # never overlay our own file
-        for index, (rater_id, sidecar) in enumerate(siblings.items()):
-            try:
-                marks = read_annotations_tsv(sidecar)
-            except (OSError, ValueError):
-                continue
+        if peers is None:
+            peers = read_rater_sidecars(self._recording.path, exclude=self._rater_id)
+        peers.pop(self._rater_id or "", None)  # never overlay our own file
+        for index, (rater_id, marks) in enumerate(peers.items()):
             color = OVERLAY_COLORS[index % len(OVERLAY_COLORS)]
             self._rater_layers.append((rater_id, marks, color))
         self._build_rater_toggles()
@@ -2243,6 +2451,10 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
                     "entry to a feature).",
                 )
             return
+        if self._embedded_triggers is None and self._markers_job is not None:
+            if not announce:  # the open is scanning them; align when they land
+                self._align_on_triggers = True
+                return
         if self._embedded_triggers is None:
             self._embedded_triggers = io.recorded_trigger_events(self._recording)
         origin = self._log_origin()
@@ -2413,13 +2625,14 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             return
         prefs = preferences.load_preferences(preferences_path)
         start_dir = prefs.get("eeg_last_dir") or str(Path.home())
-        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+        # Several files are the segments of one split night, joined into one.
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
             self, "Open EEG recording", str(start_dir), io.FILE_FILTER
         )
-        if path:
-            self._load(Path(path))
+        if paths:
+            self._load(*sorted(Path(path) for path in paths))
 
-    def _load(self, path: Path) -> None:
+    def _load(self, path: Path, *segments: Path) -> None:
         # Blind review must write to a rater's own sidecar, never the coordinator's
         # truth file: without a rater id the resume/save would clobber the truth.
         # Refuse before opening anything (the data-loss guard for #181c).
@@ -2431,11 +2644,69 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
                 "overwrite the coordinator's truth file.",
             )
             return
-        try:
-            recording = io.open_recording(path)
-        except (ValueError, OSError, RuntimeError) as exc:
-            self._error("Could not open the recording.", str(exc))
+        # Only the open: the current recording's markers keep arriving for it
+        # until this one lands, in case it is kept (_on_recording_opened).
+        if self._open_job is not None:
+            self._open_job.cancel()
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"Opening {path.name}… {_OPEN_STAGES[0]}")
+
+        def work(report: Any, cancelled: Any) -> io.AnyRecording:
+            if segments:
+                return io.open_concatenated([path, *segments], cache_dir=EEG_CACHE_DIR)
+            return io.open_recording(path, cache_dir=EEG_CACHE_DIR)
+
+        job = jobs.BackgroundJob("eeg-open", work)
+        job.finished.connect(self._on_recording_opened)
+        job.failed.connect(self._on_open_failed)
+        self._open_job = job
+        job.start()
+
+    def _cancel_open(self) -> None:
+        """Abandon an open still in flight (its results are dropped on arrival)."""
+        for job in (self._open_job, self._markers_job):
+            if job is not None:
+                job.cancel()
+        self._open_job = None
+        self._markers_job = None
+        self._align_on_triggers = False
+
+    def _on_open_failed(self, message: str) -> None:
+        if self.sender() is not self._open_job:
+            return
+        self._open_job = None
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.clearMessage()
+        self._error("Could not open the recording.", message)
+        self._load_pending_log()
+
+    def _on_recording_opened(self, recording: io.AnyRecording) -> None:
+        if self.sender() is not self._open_job:
             return
+        self._open_job = None
+        # The current recording stayed editable while this one opened; marks made
+        # meanwhile are asked about again, and a Cancel keeps them on screen.
+        if not self._confirm_discard():
+            status_bar = self.statusBar()
+            assert status_bar is not None
+            status_bar.clearMessage()
+            self._pending_log = None  # it was meant for the recording not shown
+            return
+        self._show_recording(recording)
+        self._load_pending_log()
+
+    def _show_recording(self, recording: io.AnyRecording) -> None:
+        """Put a freshly opened recording on screen; its markers follow.
+
+        Everything that needs only the header — the traces, the resumed or
+        seeded marks, the hypnogram — is set up here, so the reviewer can page
+        straight away. The recording's embedded events, trigger scan and peer
+        sidecars are read on a worker (:meth:`_read_markers`) and fill in
+        when they land.
+        """
+        path = recording.path
         # Opened cleanly: stop autosaving the recording we're leaving and drop its
         # recovery files — both layers (the user already saved or discarded it via
         # open_file), so a discarded staging sweep isn't re-offered on the next open.
@@ -2458,10 +2729,15 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
                 )
                 return
         else:
-            fresh = self._fresh_annotations(path, recording)
+            fresh = self._fresh_annotations(path)
             if fresh is None:  # a blind seed sidecar that won't parse
                 return
             annotations = fresh
+        # A fresh review without a truth sidecar to seed from starts from the
+        # recording's embedded events, which arrive with the markers.
+        seed_embedded = not tsv_path.is_file() and (
+            self._blind is None or not sidecar_paths(path)[0].is_file()
+        )
         self._recording = recording
         self._annotations = annotations
         self._dirty = False
@@ -2510,44 +2786,603 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             f"{path.name} — {len(recording.ch_names)} ch · "
             f"{recording.sfreq:g} Hz · {recording.duration:.0f} s{clock}"
         )
-        self._load_overlays()
+        self._load_overlays({})  # the previous recording's peers, until they land
         # A loaded log belonged to the previous recording (its origin/offset no
         # longer apply, and the view already dropped its marks); the reviewer
         # re-loads it for the new file if wanted.
         self._clear_log_overlay()
+        # Now, before an edit can arm the autosave that would overwrite it; a
+        # restore made before the seed lands drops the seed (see _on_markers_read).
+        self._seeding = seed_embedded
         self._check_for_recovery(tsv_path)
         # Re-establish staging for this recording: re-frame/lock if a sweep was on,
         # and paint the bands/readout/buttons either way.
         self._set_staging(self._staging)
+        self._start_pyramid(recording)
+        self._schedule_filtered_cache()
+        self._start_spectrogram()
+        self._start_quality()
+        self._cancel_detection()  # its results would belong to the old recording
+        self._read_markers(recording, seed_embedded)
+
+    def _read_markers(self, recording: io.AnyRecording, seed_embedded: bool) -> None:
+        """Read the open recording's events, triggers and peer sidecars off-thread.
+
+        A file with tens of thousands of markers takes seconds to convert, and
+        the trigger scan reads the whole stim channel; the reviewer pages the
+        traces meanwhile. The embedded events are read only when they seed a
+        fresh review, and peers only when overlays may be shown (not blind).
+        """
+        if self._markers_job is not None:  # the previous recording's
+            self._markers_job.cancel()
+        self._align_on_triggers = False
+        show_peers = self._blind is None
+        own_rater = self._rater_id
+        stages = len(_OPEN_STAGES)
+        sidecar_for = self._sidecar_for
+
+        def work(report: Any, cancelled: Any) -> _Markers:
+            embedded = None
+            if seed_embedded:
+                report(1 / stages)
+                embedded = io.embedded_annotations(recording)
+                if isinstance(recording, io.ConcatRecording):
+                    embedded = _seed_joined_night(recording, embedded, sidecar_for)
+            jobs.check_cancelled(cancelled)
+            report(2 / stages)
+            triggers = io.recorded_trigger_events(recording)
+            jobs.check_cancelled(cancelled)
+            report(3 / stages)
+            peers = (
+                read_rater_sidecars(recording.path, exclude=own_rater)
+                if show_peers
+                else {}
+            )
+            return _Markers(embedded, triggers, peers)
+
+        job = jobs.BackgroundJob("eeg-open-markers", work)
+        job.progressed.connect(self._on_markers_progress)
+        job.finished.connect(self._on_markers_read)
+        job.failed.connect(self._on_markers_failed)
+        self._markers_job = job
+        job.start()
+
+    def _on_markers_progress(self, fraction: float) -> None:
+        if self.sender() is not self._markers_job or self._recording is None:
+            return
+        count = len(_OPEN_STAGES)
+        stage = _OPEN_STAGES[min(count - 1, round(fraction * count))]
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"Opening {self._recording.path.name}… {stage}")
+
+    def _on_markers_read(self, markers: _Markers) -> None:
+        if self.sender() is not self._markers_job or self._recording is None:
+            return
+        self._markers_job = None
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.clearMessage()
+        if markers.embedded is not None and self._seeding:
+            self._seeding = False
+            # Through the blind filter before anything is shown (#181c).
+            seed = (
+                markers.embedded
+                if self._blind is None
+                else blind.apply_blind(markers.embedded, self._blind)
+            )
+            if seed:
+                self._annotations = sorted([*self._annotations, *seed])
+                self.view.set_annotations(self._annotations)
+                self._refresh_list()
+                if self._owns_sidecar:  # saved before they landed: save them too
+                    self._mark_dirty()
+        self._embedded_triggers = markers.triggers
+        self._load_overlays(markers.peers)
+        if self._align_on_triggers:
+            self._align_on_triggers = False
+            self._auto_align(announce=False)
+
+    def _on_markers_failed(self, message: str) -> None:
+        if self.sender() is not self._markers_job or self._recording is None:
+            return
+        self._markers_job = None
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"Could not read the recording's events: {message}")
+        self._seeding = False
+        self._load_overlays()
+        self._align_on_triggers = False  # the auto-align button reads them itself
+
+    def _load_log_when_open(self, path: Path) -> None:
+        """Load a session log now, or once the open in flight lands, to overlay it."""
+        if self._open_job is not None:
+            self._pending_log = path
+        else:
+            self.load_session_log(path)
+
+    def _load_pending_log(self) -> None:
+        path, self._pending_log = self._pending_log, None
+        if path is not None:
+            self.load_session_log(path)
+
+    def _start_pyramid(self, recording: io.AnyRecording) -> None:
+        """Hand the view this recording's overview pyramid, building it if needed.
+
+        A cached pyramid loads instantly; otherwise one streaming pass builds it
+        off the GUI thread while the view keeps drawing zoomed-out windows from
+        full-rate samples, and it takes over the moment it lands. A build still
+        running for the previous recording is cancelled first.
+        """
+        self._cancel_build(_PYRAMID)
+        try:
+            folder = _cache_folder(recording)
+        except OSError:
+            return  # nothing on disk to key a cache on; full-rate drawing only
+        folder /= "pyramid"
+        existing = pyramid.Pyramid.load(folder)
+        if existing is not None:
+            self.view.set_pyramid(existing)
+            return
+
+        def work(report: Any, cancelled: Any) -> pyramid.Pyramid:
+            return pyramid.build_pyramid(
+                recording, folder, report=report, cancelled=cancelled
+            )
+
+        # Not fatal if it fails: wide windows just read full-rate data.
+        self._start_build(
+            _PYRAMID,
+            work,
+            "Building the overview",
+            "build the overview",
+            built=self.view.set_pyramid,  # ignored if it doesn't match what's open
+        )
+
+    def _start_build(
+        self,
+        slot: str,
+        work: jobs.Work,
+        label: str,
+        failure: str,
+        *,
+        built: Callable[[Any], None],
+        progressed: Callable[[], None] | None = None,
+        failed: Callable[[], None] | None = None,
+    ) -> None:
+        """Run ``work`` off the GUI thread as the ``slot`` build, replacing any.
+
+        Progress shows as "``label``… 40%" in the status bar and a failure as
+        "Could not ``failure``: …". ``built`` gets the result; ``progressed``
+        and ``failed`` are the build's own extra steps on each report and on
+        failure. Only the build still in its slot reaches them.
+        """
+        self._cancel_build(slot)
+        job = jobs.BackgroundJob(f"eeg-{slot}", work)
+        job.progressed.connect(self._on_build_progress)
+        job.finished.connect(self._on_build_finished)
+        job.failed.connect(self._on_build_failed)
+        self._builds[slot] = _Build(job, label, failure, built, progressed, failed)
+        job.start()
+
+    def _cancel_build(self, slot: str) -> bool:
+        """Cancel the ``slot`` build; ``True`` if one was running."""
+        build = self._builds.pop(slot, None)
+        if build is not None:
+            build.job.cancel()
+        return build is not None
+
+    def _sending_build(self) -> tuple[str, _Build] | None:
+        """The slot and build whose job sent the signal being handled.
+
+        ``None`` for a build no longer in its slot: a cancelled build's last
+        signals, already queued.
+        """
+        for slot, build in self._builds.items():
+            if build.job is self.sender():
+                return slot, build
+        return None
+
+    def _on_build_progress(self, fraction: float) -> None:
+        sending = self._sending_build()
+        if sending is None:
+            return
+        build = sending[1]
+        if build.progressed is not None:
+            build.progressed()
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"{build.label}… {fraction:.0%}", 2000)
+
+    def _on_build_finished(self, result: object) -> None:
+        sending = self._sending_build()
+        if sending is None:
+            return
+        slot, build = sending
+        del self._builds[slot]
+        build.built(result)
+
+    def _on_build_failed(self, message: str) -> None:
+        sending = self._sending_build()
+        if sending is None:
+            return
+        slot, build = sending
+        del self._builds[slot]
+        if build.failed is not None:
+            build.failed()
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"Could not {build.failure}: {message}", 5000)
+
+    # ----- whole-night spectrogram ------------------------------------------------
+
+    def _on_spectrogram_toggled(self, checked: bool) -> None:
+        preferences.update_preferences(
+            preferences_path, {"eeg_spectrogram": bool(checked)}
+        )
+        self._start_spectrogram()
+
+    def _start_spectrogram(self) -> None:
+        """Show the open recording's spectrogram strip, building the CSA if needed.
+
+        A cached one loads instantly; otherwise it is created, handed to the strip
+        straight away (the epochs already computed draw as the build fills them
+        in) and built by one streaming pass off the GUI thread. A build for the
+        previous recording, or one the checkbox turned off, is cancelled first.
+        """
+        self._cancel_build(_SPECTROGRAM)
+        recording = self._recording
+        shown = recording is not None and self.spectrogramCheck.isChecked()
+        self.spectrogramStrip.setVisible(shown)
+        duration = recording.duration if recording is not None else 0.0
+        self.spectrogramStrip.set_spectrogram(duration, None)
+        if recording is None or not shown:
+            return
+        channels = spectrogram.default_channels(recording.ch_names, recording.ch_types)
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        if not channels:
+            status_bar.showMessage(
+                "No EEG channels to compute a spectrogram from.", 5000
+            )
+            return
+        try:
+            folder = _cache_folder(recording)
+            folder = folder / spectrogram.FOLDER_NAME / spectrogram.cache_key(channels)
+            existing = spectrogram.Spectrogram.load(folder)
+            if existing is not None:
+                self.spectrogramStrip.set_spectrogram(recording.duration, existing)
+                return
+            created = spectrogram.create_spectrogram(recording, folder, channels)
+        except OSError as exc:
+            status_bar.showMessage(f"Could not compute the spectrogram: {exc}", 5000)
+            return
+        self.spectrogramStrip.set_spectrogram(recording.duration, created)
+
+        def work(report: Any, cancelled: Any) -> spectrogram.Spectrogram:
+            return spectrogram.build_spectrogram(
+                recording, created, report=report, cancelled=cancelled
+            )
+
+        refresh = self.spectrogramStrip.refresh  # draw the epochs computed so far
+        self._start_build(
+            _SPECTROGRAM,
+            work,
+            "Computing the spectrogram",
+            "compute the spectrogram",
+            built=lambda built: refresh(),
+            progressed=refresh,
+            # Its folder is already gone.
+            failed=lambda: self.spectrogramStrip.set_spectrogram(duration, None),
+        )
+
+    # ----- signal-quality map ------------------------------------------------------
+
+    def _on_quality_toggled(self, checked: bool) -> None:
+        preferences.update_preferences(preferences_path, {"eeg_quality": bool(checked)})
+        self._start_quality()
+
+    def _start_quality(self) -> None:
+        """Show the open recording's quality strip, building the map if needed.
+
+        As :meth:`_start_spectrogram`: a cached map loads instantly, otherwise
+        the strip fills in while one streaming pass computes it off the GUI
+        thread. Trigger channels are left out (they are flat by design).
+        """
+        self._cancel_build(_QUALITY)
+        recording = self._recording
+        shown = recording is not None and self.qualityCheck.isChecked()
+        self.qualityStrip.setVisible(shown)
+        duration = recording.duration if recording is not None else 0.0
+        self.qualityStrip.set_quality(duration, None)
+        if recording is None or not shown:
+            return
+        channels = quality.default_channels(recording.ch_types)
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        try:
+            folder = _cache_folder(recording)
+            folder /= quality.FOLDER_NAME
+            existing = quality.QualityMap.load(folder)
+            if existing is not None and existing.channels == tuple(channels):
+                self.qualityStrip.set_quality(
+                    recording.duration, existing, recording.ch_names
+                )
+                return
+            created = quality.create_quality_map(recording, folder, channels)
+        except OSError as exc:
+            status_bar.showMessage(f"Could not check the signal quality: {exc}", 5000)
+            return
+        self.qualityStrip.set_quality(recording.duration, created, recording.ch_names)
+
+        def work(report: Any, cancelled: Any) -> quality.QualityMap:
+            return quality.build_quality_map(
+                recording, created, report=report, cancelled=cancelled
+            )
+
+        self._start_build(
+            _QUALITY,
+            work,
+            "Checking the signal quality",
+            "check the signal quality",
+            built=self._on_quality_built,
+            progressed=self.qualityStrip.refresh,  # draw the epochs checked so far
+            # Its folder is already gone.
+            failed=lambda: self.qualityStrip.set_quality(duration, None),
+        )
+
+    def _on_quality_built(self, built: quality.QualityMap) -> None:
+        self.qualityStrip.refresh()
+        flagged = built.bad_epochs().size
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(
+            f"Signal quality: {flagged} of {built.n_epochs} epochs flagged"
+            + (" — [ and ] step through them." if flagged else "."),
+            5000,
+        )
+
+    # ----- event detectors -----------------------------------------------------------
+
+    def _choose_detectors(self) -> None:
+        """Pop up the detector menu: one detector, all of them, or cancel a run."""
+        menu = QtWidgets.QMenu(self)
+        if self._detect_job is not None:
+            menu.addAction("Cancel detection", self._cancel_detection)
+        else:
+            for detector in detect.BUILTIN.values():
+                menu.addAction(
+                    detector.name,
+                    lambda chosen=detector: self._run_detectors([chosen]),
+                )
+            menu.addSeparator()
+            menu.addAction(
+                "All", lambda: self._run_detectors(list(detect.BUILTIN.values()))
+            )
+        menu.exec(self.detectButton.mapToGlobal(self.detectButton.rect().bottomLeft()))
+
+    def _cancel_detection(self) -> None:
+        if self._detect_job is not None:
+            self._detect_job.cancel()
+            self._detect_job = None
+            self.detectButton.setText("Detect…")
+
+    def _run_detectors(self, detectors: list[detect.Detector]) -> None:
+        """Run ``detectors`` over the open recording in worker processes.
+
+        The chunks fan out over one process per core (:mod:`smacc.eeg.detect`)
+        while the view stays live; the results land as ``auto-<name>`` rater
+        sidecars and show as overlays. Starting a run cancels any other.
+        """
+        self._cancel_detection()
+        recording = self._recording
+        if recording is None:
+            return
+
+        def work(report: Any, cancelled: Any) -> dict[str, list[Annotation]]:
+            return detect.run_detectors(
+                recording,
+                detectors,
+                # Pool workers reopen one file; a joined night runs in-process.
+                path=None
+                if isinstance(recording, io.ConcatRecording)
+                else recording.path,
+                report=report,
+                cancelled=cancelled,
+            )
+
+        job = jobs.BackgroundJob("eeg-detect", work)
+        job.progressed.connect(self._on_detection_progress)
+        job.finished.connect(self._on_detection_finished)
+        job.failed.connect(self._on_detection_failed)
+        self._detect_job = job
+        self.detectButton.setText("Detecting…")
+        job.start()
+
+    def _on_detection_progress(self, fraction: float) -> None:
+        if self.sender() is not self._detect_job:
+            return
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"Detecting events… {fraction:.0%}", 2000)
+
+    def _on_detection_finished(self, found: dict[str, list[Annotation]]) -> None:
+        if self.sender() is not self._detect_job:
+            return
+        self._detect_job = None
+        self.detectButton.setText("Detect…")
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        recording = self._recording
+        if recording is None:
+            return
+        try:
+            detect.write_detections(
+                recording.path, found, meas_date=recording.meas_date
+            )
+        except OSError as exc:
+            status_bar.showMessage(f"Could not save the detections: {exc}", 5000)
+            return
+        self._load_overlays()
+        counts = ", ".join(f"{len(events)} {name}" for name, events in found.items())
+        status_bar.showMessage(f"Detected {counts}.", 5000)
+
+    def _on_detection_failed(self, message: str) -> None:
+        if self.sender() is not self._detect_job:
+            return
+        self._detect_job = None
+        self.detectButton.setText("Detect…")
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        status_bar.showMessage(f"Could not run the detectors: {message}", 5000)
+
+    def _jump_to_flagged_epoch(self, step: int) -> None:
+        """Frame the next (``step`` 1) or previous (-1) epoch the quality map flags.
+
+        Measured from the epoch at the left edge of the view, so repeated presses
+        walk the flagged epochs in order.
+        """
+        qmap = self.qualityStrip.quality
+        if qmap is None or self.qualityStrip.isHidden():
+            return
+        flagged = qmap.bad_epochs()
+        current = math.floor(self.view.window_start / qmap.epoch_seconds + 1e-6)
+        if step > 0:
+            later = flagged[flagged > current]
+            target = int(later[0]) if later.size else None
+        else:
+            earlier = flagged[flagged < current]
+            target = int(earlier[-1]) if earlier.size else None
+        if target is None:
+            status_bar = self.statusBar()
+            assert status_bar is not None
+            status_bar.showMessage("No more flagged epochs that way.", 2000)
+            return
+        self._jump_to(target * qmap.epoch_seconds)
+
+    # ----- whole-night filtered cache ------------------------------------------------
+
+    def _on_filtered_cache_toggled(self, checked: bool) -> None:
+        preferences.update_preferences(
+            preferences_path, {"eeg_filtered_cache": bool(checked)}
+        )
+        self._schedule_filtered_cache()
+
+    def _schedule_filtered_cache(self) -> None:
+        """The filters or montage changed: drop the cache build, restart it soon.
+
+        A build for the old filters is cancelled at once — its output would no
+        longer match what is drawn — and the new one starts once the controls
+        have been still for :data:`_FILTERED_CACHE_DEBOUNCE_MS`.
+        """
+        self._cancel_filtered_cache()
+        if self._recording is not None and self.filteredCacheCheck.isChecked():
+            self._filtered_cache_timer.start()
+        else:
+            self.view.set_filtered_cache(None)
+
+    def _cancel_filtered_cache(self) -> None:
+        self._filtered_cache_timer.stop()
+        if self._cancel_build(_FILTERED_CACHE):
+            self.view.set_filtered_cache(None)  # it is about to be deleted
+
+    def _start_filtered_cache(self) -> None:
+        """Hand the view the filtered cache for what is shown, building it if needed.
+
+        Keyed by the recording, the visible channels and each one's effective
+        filter. A cached one loads instantly; otherwise it is created, handed to
+        the view straight away (the filled part serves windows as it grows) and
+        built by one streaming pass off the GUI thread, after evicting the least
+        recently used caches to make room under the disk cap.
+        """
+        recording = self._recording
+        if recording is None or not self.filteredCacheCheck.isChecked():
+            return
+        channels = self.view.visible_indices
+        types = self.view.channel_types
+        specs = [self.view.effective_spec(types[i]) for i in channels]
+        if all(
+            dsp.effective_spec(s, recording.sfreq).is_identity for s in specs
+        ):  # unfiltered windows are already a plain read
+            self.view.set_filtered_cache(None)
+            return
+        current = self.view.filtered_cache
+        if current is not None and current.complete and current.covers(channels, specs):
+            return  # channels hidden or reordered: the cache still holds them
+        try:
+            folder = _cache_folder(recording)
+        except OSError:
+            return
+        folder = (
+            folder / filtercache.FOLDER_NAME / filtercache.cache_key(channels, specs)
+        )
+        existing = filtercache.FilteredCache.load(folder)
+        if existing is not None:
+            self.view.set_filtered_cache(existing)
+            return
+        status_bar = self.statusBar()
+        assert status_bar is not None
+        size = filtercache.expected_size(recording, channels)
+        cap = filtercache.DEFAULT_DISK_CAP
+        if size > cap:
+            status_bar.showMessage(
+                "Too many channels to cache the filtered night — scrolling filters "
+                "each window instead.",
+                5000,
+            )
+            return
+        try:
+            keep = [current.directory] if current is not None else []
+            filtercache.evict(EEG_CACHE_DIR, cap - size, keep=keep)
+            created = filtercache.create_filtered_cache(
+                recording, folder, channels, specs
+            )
+        except OSError as exc:
+            status_bar.showMessage(f"Could not cache the filtered night: {exc}", 5000)
+            return
+        self.view.set_filtered_cache(created)
+
+        def work(report: Any, cancelled: Any) -> filtercache.FilteredCache:
+            return filtercache.build_filtered_cache(
+                recording, created, report=report, cancelled=cancelled
+            )
+
+        # Not fatal if it fails: each window is read and filtered as usual.
+        self._start_build(
+            _FILTERED_CACHE,
+            work,
+            "Caching the filtered night",
+            "cache the filtered night",
+            built=self.view.set_filtered_cache,
+            # Its folder is already gone.
+            failed=lambda: self.view.set_filtered_cache(None),
+        )
 
-    def _fresh_annotations(
-        self, path: Path, recording: io.Recording
-    ) -> list[Annotation] | None:
+    def _fresh_annotations(self, path: Path) -> list[Annotation] | None:
         """Annotations to start a fresh review from; ``None`` on a read error.
 
         A plain review starts from the events embedded in the recording (amp
-        markers, SMACC's own portcodes…). A blind review instead seeds from the
-        coordinator's truth sidecar (the plain one) when it exists — so the
-        blinding hides *its* marks — falling back to the embedded events, and
-        runs the blind filter before anything is shown. This is the load-time
-        safety invariant (#181c): the filter covers both fresh sources, so a
-        naive rater never glimpses the recording's cue/portcode markers.
+        markers, SMACC's own portcodes…), which :meth:`_read_markers` reads off
+        the GUI thread, so it starts empty here. A blind review instead seeds
+        from the coordinator's truth sidecar (the plain one) when it exists — so
+        the blinding hides *its* marks — falling back to the embedded events,
+        and runs the blind filter before anything is shown. This is the
+        load-time safety invariant (#181c): the filter covers both fresh
+        sources, so a naive rater never glimpses the recording's cue/portcode
+        markers.
         """
-        if self._blind is None:
-            return io.embedded_annotations(recording)
         truth_tsv, _ = sidecar_paths(path)
-        if truth_tsv.is_file():
-            try:
-                seed = read_annotations_tsv(truth_tsv)
-            except (OSError, ValueError) as exc:
-                self._error(
-                    "Could not read the coordinator's annotations sidecar.",
-                    f"{truth_tsv.name}: {exc}\n\nFix or rename it, then open the "
-                    "recording again.",
-                )
-                return None
-        else:
-            seed = io.embedded_annotations(recording)
+        if self._blind is None or not truth_tsv.is_file():
+            return []
+        try:
+            seed = read_annotations_tsv(truth_tsv)
+        except (OSError, ValueError) as exc:
+            self._error(
+                "Could not read the coordinator's annotations sidecar.",
+                f"{truth_tsv.name}: {exc}\n\nFix or rename it, then open the "
+                "recording again.",
+            )
+            return None
         return blind.apply_blind(seed, self._blind)
 
     # ----- annotation editing -----------------------------------------------------
@@ -2846,6 +3681,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         if self._recovery_annotations is None and self._recovery_stages is None:
             return
         if self._recovery_annotations is not None:
+            self._seeding = False  # the recovered marks were seeded in their session
             self._annotations = self._recovery_annotations
             self.view.set_annotations(self._annotations)
             self._refresh_list()
@@ -2904,6 +3740,22 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         self.scrollBar.blockSignals(False)
         self._update_epoch_readout()
 
+    def _on_lanes_shown_changed(self, value: int) -> None:
+        preferences.update_preferences(preferences_path, {"eeg_lanes_shown": value})
+        self.view.set_lanes_shown(value)
+
+    def _sync_lane_scrollbar(self) -> None:
+        """Match the lane scrollbar to the view's lanes on screen."""
+        shown = self.view.lanes_shown
+        total = len(self.view.visible_indices)
+        hidden = 0 if shown is None else max(0, total - shown)
+        self.laneScrollBar.blockSignals(True)
+        self.laneScrollBar.setRange(0, hidden)
+        self.laneScrollBar.setPageStep(shown or 1)
+        self.laneScrollBar.setValue(self.view.lane_offset)
+        self.laneScrollBar.blockSignals(False)
+        self.laneScrollBar.setVisible(hidden > 0)
+
     def _on_window_length_changed(self) -> None:
         self.view.set_window_seconds(float(self.windowCombo.currentData()))
         self._configure_scrollbar()
@@ -2930,6 +3782,8 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         # The overview strip's window marker tracks every scroll (wheel/scrollbar/
         # jump all route through here), cheaply — it only repaints the strip.
         self.hypnogramStrip.set_window(self.view.window_start, self.view.window_seconds)
+        for strip in (self.spectrogramStrip, self.qualityStrip):
+            strip.set_window(self.view.window_start, self.view.window_seconds)
         if not self.view.has_provider:
             self.epochLabel.clear()
             self.stageReadout.clear()
@@ -3149,6 +4003,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
             self.view.set_spec(spec)
         else:
             self.view.set_type_spec(scope, spec)
+        self._schedule_filtered_cache()
 
     # ----- per-type display + view profiles (#177) ------------------------------------
 
@@ -3218,6 +4073,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         )
         if result is not None:
             self.view.set_visible_channels(result)
+            self._schedule_filtered_cache()
 
     def _current_profile(self) -> ViewProfile:
         """Capture the current montage as a profile."""
@@ -3249,6 +4105,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         self._populate_scope_combo()
         self._load_scope_into_controls()
         self._update_epoch_readout()
+        self._schedule_filtered_cache()
 
     def _select_window_seconds(self, seconds: float) -> None:
         options = [float(s) for s in WINDOW_LENGTHS]
@@ -3318,8 +4175,7 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         hi = lo + self.view.window_seconds
         in_window = [
             (a.onset, a.duration, a.description)
-            for a in self._annotations
-            if not (a.onset + a.duration < lo or a.onset > hi)
+            for a in self.view.annotations_between(lo, hi)
         ]
         result = ExportDialog.get_export(
             self, self.view.channel_names, self.view.visible_indices, in_window
@@ -3420,6 +4276,12 @@ class EegAnnotatorWindow(QtWidgets.QMainWindow):
         self._clear_autosave()
         self._clear_stage_autosave()
         self._stop_player()  # don't leave a report playing after the window closes
+        self._cancel_filtered_cache()
+        for slot in list(self._builds):  # their results have no one to hand to
+            self._cancel_build(slot)
+        self._cancel_detection()
+        self._cancel_open()
+        self.view.set_prefetch_enabled(False)  # stop the read-ahead worker
         # Drop the app-level key filter before this window goes away, so a stray
         # late event can never reach a half-deleted window.
         app = QtWidgets.QApplication.instance()
@@ -59,6 +59,10 @@ BIOCALS_DIR = smacc_directory / "biocals"
 # hand, same YAML format); loaded alongside the bundled built-ins. Created lazily
 # on the first build.
 SURVEYS_DIR = smacc_directory / "surveys"
+# Derived, disposable data the EEG Annotator computes from a recording (overview
+# pyramids and the like), one folder per recording — see smacc.eeg.cache. Safe
+# to delete at any time; everything in it is rebuilt on demand.
+EEG_CACHE_DIR = smacc_directory / "cache" / "eeg"
 
 
 def resolve_biocal_voice(filename: str) -> Path:
@@ -26,11 +26,14 @@ from __future__ import annotations
 
 import gc
 import os
+import threading
+from collections.abc import Callable, Sequence
 
 # Must run before PyQt6 is imported anywhere. ``setdefault`` lets a developer
 # export QT_QPA_PLATFORM=windows (etc.) to actually watch a test render locally.
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
+import numpy as np
 import pytest
 from PyQt6 import QtCore, QtWidgets
 
@@ -167,3 +170,53 @@ def live_session(tmp_path, monkeypatch):
     session = SmaccSession(tmp_path / "data", headless=False)
     yield session
     session.close()
+
+
+class SyntheticProvider:
+    """A fake ``SliceProvider`` whose rows are ``signal(times)``, no file behind it.
+
+    ``signal`` maps an array of times (seconds) to one row per channel. Every read
+    is recorded: ``calls`` holds the requested ``(start_s, stop_s)`` and ``picks``
+    the channel indices asked for (``None`` for all), so a test can check what a
+    build or the read-ahead actually fetched.
+    """
+
+    def __init__(
+        self,
+        signal: Callable[[np.ndarray], Sequence[np.ndarray]],
+        ch_names: Sequence[str],
+        ch_types: Sequence[str],
+        n_times: int,
+        sfreq: float = 100.0,
+    ) -> None:
+        self.signal = signal
+        self.ch_names = list(ch_names)
+        self.ch_types = list(ch_types)
+        self.sfreq = sfreq
+        self.n_times = n_times
+        self.duration = n_times / sfreq
+        self.calls: list[tuple[float, float]] = []
+        self.picks: list[list[int] | None] = []
+
+    def get_slice(self, start_s: float, stop_s: float, picks=None, cache=True):
+        self.calls.append((start_s, stop_s))
+        self.picks.append(None if picks is None else list(picks))
+        start = max(0, int(round(start_s * self.sfreq)))
+        stop = min(self.n_times, int(round(stop_s * self.sfreq)))
+        times = np.arange(start, stop) / self.sfreq
+        rows = np.vstack(self.signal(times))
+        return times, rows if picks is None else rows[list(picks)]
+
+
+@pytest.fixture
+def make_provider():
+    """Build a :class:`SyntheticProvider` — the shared fake for reader-side tests."""
+    return SyntheticProvider
+
+
+@pytest.fixture
+def cancelled():
+    """A cancel flag already raised, for "a cancelled build leaves nothing" tests."""
+    flag = threading.Event()
+    flag.set()
+    return flag
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import random
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -67,6 +68,51 @@ def test_overlapping_annotations_are_allowed():
     assert len(items) == 2
 
 
+def _scan(items, lo, hi):
+    return sorted(a for a in items if not (a.onset + a.duration < lo or a.onset > hi))
+
+
+def test_index_finds_what_a_scan_finds():
+    rng = random.Random(7)
+    items = [
+        ann.Annotation(
+            rng.uniform(0, 28_800),
+            rng.choice([0.0, rng.uniform(0, 3), rng.uniform(0, 600)]),
+            f"m{i}",
+        )
+        for i in range(2_000)
+    ]
+    items.append(ann.Annotation(0.0, 28_800.0, "whole night"))
+    index = ann.AnnotationIndex(items)
+    assert len(index) == len(items)
+    for lo in [
+        0.0,
+        59.0,
+        14_400.0,
+        28_770.0,
+        *(rng.uniform(0, 28_800) for _ in range(50)),
+    ]:
+        assert index.overlapping(lo, lo + 30.0) == _scan(items, lo, lo + 30.0)
+        onsets = [a.onset for a in items if lo <= a.onset <= lo + 30.0]
+        assert sorted(index.onsets_between(lo, lo + 30.0)) == sorted(onsets)
+
+
+def test_index_edits_in_place():
+    point = ann.Annotation(10.0, 0.0, "point")
+    region = ann.Annotation(8.0, 5.0, "region")
+    index = ann.AnnotationIndex([point])
+    index.insert(region)
+    assert index.overlapping(12.0, 20.0) == [region]  # the point ended before 12 s
+    assert index.overlapping(10.0, 10.0) == [region, point]  # ends inclusive
+    moved = ann.Annotation(30.0, 5.0, "region")
+    index.replace(region, moved)
+    assert index.overlapping(0.0, 20.0) == [point]
+    index.remove(point)
+    assert len(index) == 1
+    with pytest.raises(ValueError, match="not in the index"):
+        index.remove(point)
+
+
 # ----- sidecar paths --------------------------------------------------------
 
 
@@ -170,6 +216,15 @@ def test_discover_rater_sidecars_empty_when_none(tmp_path):
     assert ann.discover_rater_sidecars(tmp_path / "night1.edf") == {}
 
 
+def test_read_rater_sidecars_skips_the_reviewer_and_unreadable_files(tmp_path):
+    src = tmp_path / "night1.edf"
+    mark = [ann.Annotation(3.0, 1.0, "Spindle")]
+    ann.write_annotations_tsv(mark, tmp_path / "night1.annotations.alice.tsv")
+    ann.write_annotations_tsv(mark, tmp_path / "night1.annotations.bob.tsv")
+    (tmp_path / "night1.annotations.carol.tsv").write_text("garbage\n", "utf-8")
+    assert ann.read_rater_sidecars(src, exclude="bob") == {"alice": mark}
+
+
 # ----- TSV round-trip -------------------------------------------------------
 
 
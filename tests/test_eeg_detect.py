@@ -0,0 +1,180 @@
+"""Tests for the whole-night event detectors and their chunked runner."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+from smacc.eeg import detect
+from smacc.eeg.annotations import discover_rater_sidecars, read_annotations_tsv
+from smacc.eeg.jobs import JobCancelled
+
+SFREQ = 100.0
+CHUNK = 60.0
+# Spindles straddle the 60 s and 120 s chunk boundaries on purpose.
+SPINDLES = [20.0, 59.6, 119.2, 200.0]
+SLOW_TRAIN = 300.0  # four slow oscillations back to back
+K_COMPLEXES = [179.5, 400.0]
+
+
+def _spindle(times: np.ndarray, onset: float) -> np.ndarray:
+    inside = (times >= onset) & (times < onset + 1.0)
+    envelope = np.sin(np.pi * (times - onset)) ** 2
+    return np.where(inside, 30e-6 * envelope * np.sin(2 * np.pi * 13 * times), 0.0)
+
+
+def _slow_wave(times: np.ndarray, onset: float, period: float) -> np.ndarray:
+    inside = (times >= onset) & (times < onset + period)
+    return np.where(inside, -90e-6 * np.sin(2 * np.pi * (times - onset) / period), 0.0)
+
+
+class NightProvider:
+    """C3 and C4 with spindles, slow oscillations and K-complexes; an EOG; 100 Hz.
+
+    The events are on C3 only; C4 and the EOG carry a little noise.
+    """
+
+    ch_names = ["C3", "C4", "EOG"]
+    ch_types = ["eeg", "eeg", "eog"]
+    sfreq = SFREQ
+    duration = 480.0
+
+    def __init__(self) -> None:
+        times = np.arange(int(self.duration * SFREQ)) / SFREQ
+        rng = np.random.default_rng(0)
+        data = 1e-6 * rng.standard_normal((3, times.size))
+        for onset in SPINDLES:
+            data[0] += _spindle(times, onset)
+        for index in range(4):
+            data[0] += _slow_wave(times, SLOW_TRAIN + 1.25 * index, 1.25)
+        for onset in K_COMPLEXES:
+            data[0] += _slow_wave(times, onset, 1.0)
+        self.data = data
+        self.calls: list[tuple[float, float, list[int] | None]] = []
+
+    def get_slice(self, start_s: float, stop_s: float, picks=None, cache=True):
+        self.calls.append((start_s, stop_s, None if picks is None else list(picks)))
+        start = max(0, int(round(start_s * SFREQ)))
+        stop = min(self.data.shape[-1], int(round(stop_s * SFREQ)))
+        rows = self.data if picks is None else self.data[list(picks)]
+        return np.arange(start, stop) / SFREQ, rows[:, start:stop]
+
+
+@pytest.fixture(scope="module")
+def night() -> NightProvider:
+    return NightProvider()
+
+
+def _run(provider, names, chunk_seconds=CHUNK, **kwargs):
+    detectors = [detect.BUILTIN[name] for name in names]
+    return detect.run_detectors(
+        provider, detectors, chunk_seconds=chunk_seconds, workers=1, **kwargs
+    )
+
+
+def test_each_detector_finds_its_events_on_the_right_channel(night):
+    found = _run(night, list(detect.BUILTIN))
+    spindles = found["spindles"]
+    assert [a.description for a in spindles] == ["Spindle C3"] * len(SPINDLES)
+    assert [a.onset for a in spindles] == pytest.approx(SPINDLES, abs=0.3)
+    assert all(0.5 <= a.duration <= 1.5 for a in spindles)
+    slow = found["slow-oscillations"]
+    assert [a.description for a in slow] == ["SlowOscillation C3"] * len(slow)
+    in_train = [a for a in slow if SLOW_TRAIN - 1 <= a.onset < SLOW_TRAIN + 5]
+    assert len(in_train) >= 3
+    kcs = found["k-complexes"]
+    assert [a.onset for a in kcs] == pytest.approx(K_COMPLEXES, abs=0.3)
+    assert [a.description for a in kcs] == ["KComplex C3"] * len(K_COMPLEXES)
+
+
+def test_chunk_boundaries_neither_duplicate_nor_lose_events(night):
+    whole = _run(night, list(detect.BUILTIN), chunk_seconds=night.duration)
+    for chunk_seconds in (CHUNK, 45.0, 119.7):
+        assert _run(night, list(detect.BUILTIN), chunk_seconds=chunk_seconds) == whole
+
+
+def test_a_chunk_keeps_only_the_events_that_start_inside_it(night):
+    spindles = detect.BUILTIN["spindles"]
+    first = detect.detect_chunk(night, spindles, [0], detect.Chunk(0.0, 59.0))
+    second = detect.detect_chunk(night, spindles, [0], detect.Chunk(59.0, 120.0))
+    assert [a.onset for a in first] == pytest.approx([20.0], abs=0.3)
+    assert [a.onset for a in second] == pytest.approx([59.6, 119.2], abs=0.3)
+    start, stop, picks = night.calls[-1]
+    assert (start, stop, picks) == (59.0 - spindles.margin, 150.0, [0])
+
+
+def test_plan_chunks_cover_the_recording_back_to_back():
+    assert detect.plan_chunks(130.0, 60.0) == [
+        (0.0, 60.0),
+        (60.0, 120.0),
+        (120.0, 130.0),
+    ]
+    assert detect.plan_chunks(0.0, 60.0) == [(0.0, 0.0)]
+
+
+def test_progress_follows_the_chunks_and_cancel_stops_the_run(night):
+    fractions: list[float] = []
+    _run(night, ["spindles", "k-complexes"], report=fractions.append)
+    assert fractions == pytest.approx([(i + 1) / 16 for i in range(16)])
+    cancelled = threading.Event()
+
+    def report(fraction: float) -> None:
+        cancelled.set()
+
+    with pytest.raises(JobCancelled):
+        _run(night, ["spindles"], report=report, cancelled=cancelled)
+
+
+def test_a_detector_without_channels_finds_nothing(night):
+    emg = detect.Detector("jaw", "Jaw", detect.detect_spindles, ("emg",))
+    before = len(night.calls)
+    assert detect.run_detectors(night, [emg], workers=1) == {"jaw": []}
+    assert len(night.calls) == before
+
+
+def test_detectors_resolve_by_name_or_import_path():
+    assert detect.resolve_detector(" spindles ") is detect.BUILTIN["spindles"]
+    custom = detect.resolve_detector("smacc.eeg.detect:detect_k_complexes")
+    assert custom.function is detect.detect_k_complexes
+    assert custom.name == custom.label == "detect_k_complexes"
+    for bad in ("arousals", "smacc.eeg.detect:missing", "no_such_module:f", ":f"):
+        with pytest.raises(ValueError):
+            detect.resolve_detector(bad)
+
+
+def test_detections_save_as_auto_rater_sidecars(tmp_path):
+    source = tmp_path / "night1.edf"
+    events = _run(NightProvider(), ["spindles"])
+    written = detect.write_detections(source, events, meas_date=None)
+    assert written == [tmp_path / "night1.annotations.auto-spindles.tsv"]
+    assert discover_rater_sidecars(source) == {"auto-spindles": written[0]}
+    assert read_annotations_tsv(written[0]) == events["spindles"]
+
+
+def test_a_process_pool_matches_the_in_process_run(tmp_path):
+    mne = pytest.importorskip("mne")
+    from smacc.eeg.io import open_recording
+
+    provider = NightProvider()
+    info = mne.create_info(
+        provider.ch_names, SFREQ, ch_types=provider.ch_types, verbose="error"
+    )
+    path = tmp_path / "night_raw.fif"
+    mne.io.RawArray(provider.data, info, verbose="error").save(path, verbose="error")
+    recording = open_recording(path)
+    detectors = [detect.BUILTIN["spindles"], detect.BUILTIN["k-complexes"]]
+    serial = detect.run_detectors(recording, detectors, workers=1, chunk_seconds=CHUNK)
+    fractions: list[float] = []
+    pooled = detect.run_detectors(
+        recording,
+        detectors,
+        path=path,
+        workers=2,
+        chunk_seconds=CHUNK,
+        report=fractions.append,
+    )
+    assert pooled == serial
+    assert len(serial["spindles"]) == len(SPINDLES)
+    assert fractions[-1] == pytest.approx(1.0)
@@ -130,6 +130,18 @@ def test_a_sliver_too_short_to_pad_passes_through():
     assert out is data
 
 
+def test_a_gap_splits_the_slice_into_runs_filtered_on_their_own():
+    spec = dsp.FilterSpec(highpass=0.3, lowpass=35.0)
+    data = np.vstack([_sine(10.0), _sine(5.0)])
+    gap = slice(2000, 3000)
+    data[:, gap] = np.nan
+    out = dsp.apply(data, SFREQ, spec)
+    assert np.isnan(out[:, gap]).all()
+    assert not np.isnan(np.delete(out, np.s_[2000:3000], axis=1)).any()
+    assert np.array_equal(out[:, :2000], dsp.apply(data[:, :2000], SFREQ, spec))
+    assert np.array_equal(out[:, 3000:], dsp.apply(data[:, 3000:], SFREQ, spec))
+
+
 def test_empty_slice_passes_through():
     data = np.empty((4, 0))
     assert dsp.apply(data, SFREQ, dsp.FilterSpec(lowpass=35.0)) is data
@@ -140,6 +152,65 @@ def test_filter_design_is_cached_per_spec_and_rate():
     assert dsp._design(spec, SFREQ) is dsp._design(dsp.FilterSpec(0.3, 35.0), SFREQ)
 
 
+def test_float32_stays_float32_and_matches_float64():
+    x = (_sine(10.0) + 5.0 * _sine(0.05))[np.newaxis, :]
+    spec = dsp.FilterSpec(highpass=0.3, lowpass=35.0, notch=60.0)
+    out = dsp.apply(x.astype(np.float32), SFREQ, spec)
+    assert out.dtype == np.float32
+    assert dsp._design_float32(spec, SFREQ) is not None  # ran in float32
+    reference = dsp.apply(x, SFREQ, spec)
+    assert np.abs(out - reference).max() < 1e-3 * np.abs(reference).max()
+
+
+def test_float32_keeps_float64_coefficients_where_rounding_breaks_the_filter():
+    # A 0.05 Hz highpass at 5 kHz: float32 rounding pushes its poles onto the
+    # unit circle, so the float64 design runs and only the output is float32.
+    spec = dsp.FilterSpec(highpass=0.05)
+    assert dsp._design_float32(spec, 5000.0) is None
+    x = _sine(10.0, seconds=4.0, sfreq=5000.0)[np.newaxis, :]
+    out = dsp.apply(x.astype(np.float32), 5000.0, spec)
+    assert out.dtype == np.float32
+    assert out == pytest.approx(dsp.apply(x, 5000.0, spec), abs=1e-5)
+
+
+# ----- decimation ----------------------------------------------------------------
+
+
+def test_decimation_follows_the_pixel_width_and_the_lowpass():
+    # 120 s on 1500 px wants 25 Hz; a 35 Hz lowpass needs 105 Hz: 2 kHz / 105.
+    assert dsp.decimation_factor(2000.0, 120.0, 1500, 35.0) == 19
+    # A 10 s window already has fewer samples than points wanted: 2000/300.
+    assert dsp.decimation_factor(2000.0, 10.0, 1500, 35.0) == 6
+    # Whole-band display, or a rate that leaves nothing to drop: no decimation.
+    assert dsp.decimation_factor(2000.0, 120.0, 1500, None) == 1
+    assert dsp.decimation_factor(100.0, 120.0, 1500, 35.0) == 1
+
+
+def test_decimate_keeps_the_band_and_removes_what_would_alias():
+    sfreq, factor = 2000.0, 20  # → 100 Hz, Nyquist 50 Hz
+    slow = _sine(5.0, seconds=10.0, sfreq=sfreq)
+    fast = _sine(430.0, seconds=10.0, sfreq=sfreq)  # would alias to 30 Hz
+    x = np.vstack([slow, fast]).astype(np.float32)
+    out = dsp.decimate(x, factor)
+    assert out.shape == (2, x.shape[1] // factor)
+    assert out.dtype == np.float32
+    inner = slice(10, -10)  # clear of the FIR's edge transient
+    assert out[0][inner] == pytest.approx(slow[::factor][inner], abs=0.01)
+    assert np.abs(out[1][inner]).max() < 0.01
+
+
+def test_peak_decimation_keeps_a_one_sample_spike_at_full_height():
+    x = np.zeros((1, 2000))
+    x[0, 1013] = 1.0
+    assert dsp.decimate(x, 20, peaks=True)[0].max() == 1.0
+    assert dsp.decimate(x, 20)[0].max() < 0.2  # anti-aliasing smears it
+
+
+def test_decimate_by_one_is_the_same_array():
+    data = _sine(10.0)[np.newaxis, :]
+    assert dsp.decimate(data, 1) is data
+
+
 # ----- pad_seconds ------------------------------------------------------------
 
 
@@ -0,0 +1,140 @@
+"""Tests for the whole-night filtered cache and its disk cap — no Qt, no MNE."""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from smacc.eeg import dsp, filtercache, prefetch
+from smacc.eeg.filtercache import FilteredCache
+from smacc.eeg.jobs import JobCancelled
+from smacc.eeg.prefetch import WindowKey
+
+SPEC = dsp.FilterSpec(highpass=0.5, lowpass=30.0)
+
+
+def _waves(times: np.ndarray) -> list[np.ndarray]:
+    """Three channels of a 0.8 Hz + 5 Hz mix, scaled per channel."""
+    wave = np.sin(2 * np.pi * 0.8 * times) + 0.5 * np.sin(2 * np.pi * 5 * times)
+    return [wave, 2 * wave, 3 * wave]
+
+
+@pytest.fixture
+def provider(make_provider):
+    return make_provider(_waves, ["A", "B", "C"], ["eeg", "eeg", "eog"], 30_000)
+
+
+@pytest.fixture
+def built(tmp_path, monkeypatch, provider):
+    # Small blocks, so a short recording still has several seams.
+    monkeypatch.setattr(filtercache, "_BLOCK_SAMPLES", 4096)
+    created = filtercache.create_filtered_cache(
+        provider, tmp_path / "filtered", (0, 2), (SPEC, SPEC)
+    )
+    return provider, filtercache.build_filtered_cache(provider, created)
+
+
+def test_a_cached_window_is_what_the_view_would_filter(built):
+    provider, cache = built
+    assert cache.complete
+    # Across a block seam (4096 samples = 40.96 s), channels reordered.
+    key = WindowKey(35.0, 10.0, (2, 0), (SPEC, SPEC))
+    window = cache.window(key)
+    assert window is not None
+    whole = prefetch.filter_window(provider, key)
+    assert window.times == pytest.approx(whole.times)
+    assert window.data.dtype == np.float32
+    # Each differs from the unfiltered truth by its own margin's residual
+    # transient, so the two agree to well under 1 % of the signal.
+    assert np.abs(window.data - whole.data).max() < 1e-2 * np.abs(whole.data).max()
+
+
+def test_only_cached_channels_with_the_same_filter_are_served(built):
+    _, cache = built
+    assert cache.serves(WindowKey(10.0, 10.0, (0,), (SPEC,)))
+    assert not cache.serves(WindowKey(10.0, 10.0, (1,), (SPEC,)))  # not cached
+    other = dsp.FilterSpec(highpass=0.3, lowpass=30.0)
+    assert cache.window(WindowKey(10.0, 10.0, (0,), (other,))) is None
+
+
+def test_a_decimated_window_comes_off_the_same_grid(built):
+    provider, cache = built
+    key = WindowKey(20.03, 10.0, (0,), (SPEC,), factor=4)
+    window = cache.window(key)
+    assert window is not None
+    assert window.times == pytest.approx(prefetch.filter_window(provider, key).times)
+    peaks = cache.window(key._replace(peaks=True))
+    assert peaks is not None
+    assert peaks.times == pytest.approx(window.times)
+
+
+def test_only_the_filled_part_is_served(tmp_path, provider):
+    cache = filtercache.create_filtered_cache(
+        provider, tmp_path / "filtered", (0,), (SPEC,)
+    )
+    cache.filled = 2000  # the first 20 s streamed so far
+    assert cache.serves(WindowKey(5.0, 10.0, (0,), (SPEC,)))
+    assert not cache.serves(WindowKey(15.0, 10.0, (0,), (SPEC,)))
+    assert FilteredCache.load(tmp_path / "filtered") is None  # no manifest yet
+
+
+def test_a_built_cache_reloads_from_its_folder(built):
+    provider, cache = built
+    loaded = FilteredCache.load(cache.directory)
+    assert loaded is not None
+    assert loaded.complete and loaded.matches(provider)
+    assert (loaded.channels, loaded.specs) == ((0, 2), (SPEC, SPEC))
+    key = WindowKey(100.0, 30.0, (0,), (SPEC,))
+    assert loaded.window(key).data == pytest.approx(cache.window(key).data)
+
+
+def test_a_cancelled_build_leaves_nothing_behind(tmp_path, provider, cancelled):
+    cache = filtercache.create_filtered_cache(
+        provider, tmp_path / "filtered", (0,), (SPEC,)
+    )
+    with pytest.raises(JobCancelled):
+        filtercache.build_filtered_cache(provider, cache, cancelled=cancelled)
+    assert not (tmp_path / "filtered").exists()
+    assert cache.filled == 0
+
+
+def test_the_key_tracks_channels_and_filters():
+    key = filtercache.cache_key((0, 1), (SPEC, SPEC))
+    assert key == filtercache.cache_key([0, 1], [SPEC, SPEC])
+    assert key != filtercache.cache_key((1, 0), (SPEC, SPEC))
+    assert key != filtercache.cache_key((0, 1), (SPEC, dsp.UNFILTERED))
+
+
+# ----- disk cap ------------------------------------------------------------------
+
+
+def _fake_cache(root, recording: str, name: str, size: int, used: float):
+    folder = root / recording / filtercache.FOLDER_NAME / name
+    folder.mkdir(parents=True)
+    (folder / filtercache.DATA_NAME).write_bytes(b"x" * size)
+    manifest = folder / filtercache.MANIFEST_NAME
+    manifest.write_text("{}", encoding="utf-8")
+    os.utime(manifest, (used, used))
+    return folder
+
+
+def test_evict_drops_the_least_recently_used_across_recordings(tmp_path):
+    old = _fake_cache(tmp_path, "night1-aaaa", "k1", 400, used=1_000)
+    newer = _fake_cache(tmp_path, "night2-bbbb", "k2", 400, used=2_000)
+    newest = _fake_cache(tmp_path, "night1-aaaa", "k3", 400, used=3_000)
+    removed = filtercache.evict(tmp_path, cap=900)
+    assert removed == [old]
+    assert newer.exists() and newest.exists()
+    # A cache in use is counted but never deleted.
+    assert filtercache.evict(tmp_path, cap=0, keep=[newer]) == [newest]
+    assert newer.exists()
+
+
+def test_evict_drops_an_interrupted_build_first(tmp_path):
+    used = _fake_cache(tmp_path, "night1-aaaa", "k1", 400, used=1_000)
+    partial = _fake_cache(tmp_path, "night1-aaaa", "k2", 400, used=5_000)
+    (partial / filtercache.MANIFEST_NAME).unlink()
+    assert filtercache.evict(tmp_path, cap=500) == [partial]
+    assert used.exists()
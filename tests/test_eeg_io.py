@@ -3,13 +3,15 @@
 These need MNE (the ``eeg`` extra), so the module skips without it — the rest
 of the eeg tests (model, dsp) stay runnable in a base dev environment.
 Recordings are synthesized as FIF (the one format MNE writes natively, so no
-extra dependency); the suffix dispatch for EDF/BrainVision is asserted against
-the reader table since their writers aren't available to round-trip.
+extra dependency); EDF/BDF are written byte-by-byte by :func:`_write_edf` to
+check the native memory-mapped path against MNE's reader; the suffix dispatch
+for BrainVision is asserted against the reader table since its writer isn't
+available to round-trip.
 """
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import numpy as np
 import pytest
@@ -72,7 +74,7 @@ def test_open_recording_rejects_unknown_suffixes(tmp_path):
 def test_reader_table_matches_real_mne_readers():
     # The non-FIF branches can't be round-tripped without their writers; at
     # minimum every name in the dispatch table must be a real mne.io reader.
-    assert set(io._READERS) == {".edf", ".vhdr", ".fif", ".cnt", ".set"}
+    assert set(io._READERS) == {".edf", ".bdf", ".vhdr", ".fif", ".cnt", ".set"}
     for reader_name in io._READERS.values():
         assert callable(getattr(mne.io, reader_name))
 
@@ -95,6 +97,14 @@ def test_get_slice_returns_data_relative_times(fif_path):
     assert times[-1] == pytest.approx(10.0 - 1 / SFREQ)
 
 
+def test_get_slice_is_float32_unless_asked_for_float64(fif_path):
+    _, data = io.open_recording(fif_path).get_slice(5.0, 10.0)
+    assert data.dtype == np.float32
+    _, wide = io.open_recording(fif_path, float32=False).get_slice(5.0, 10.0)
+    assert wide.dtype == np.float64
+    assert data == pytest.approx(wide, rel=1e-6)
+
+
 def test_get_slice_clamps_to_the_recording(fif_path):
     rec = io.open_recording(fif_path)
     times, data = rec.get_slice(-3.0, 9_999.0)
@@ -109,6 +119,364 @@ def test_get_slice_past_the_end_is_empty_not_an_error(fif_path):
     assert data.shape == (4, 0)
 
 
+def test_get_slice_reads_only_the_picked_channels_in_order(fif_path):
+    rec = io.open_recording(fif_path)
+    _, full = rec.get_slice(5.0, 10.0)
+    times, data = rec.get_slice(5.0, 10.0, picks=[2, 0])
+    assert times[0] == pytest.approx(5.0)
+    assert data == pytest.approx(full[[2, 0]])
+
+
+def test_get_slice_with_no_picks_is_empty_but_timed(fif_path):
+    rec = io.open_recording(fif_path)
+    times, data = rec.get_slice(5.0, 10.0, picks=[])
+    assert times.size == 500
+    assert data.shape == (0, 500)
+    _, past_end = rec.get_slice(100.0, 200.0, picks=[1])
+    assert past_end.shape == (1, 0)
+
+
+# ----- block cache --------------------------------------------------------------
+
+
+def test_cached_slices_match_direct_reads_across_blocks(fif_path):
+    cached = io.open_recording(fif_path)
+    direct = io.open_recording(fif_path, cache_bytes=0)
+    for start, stop, picks in [
+        (5.0, 10.0, None),
+        (8.5, 21.3, [2, 0]),
+        (0.0, 30.0, [3]),
+        (9.99, 10.01, [1, 1]),
+    ]:
+        _, want = direct.get_slice(start, stop, picks)
+        _, got = cached.get_slice(start, stop, picks)
+        assert got.dtype == want.dtype
+        assert np.array_equal(got, want)
+    assert direct.cache_stats == (0, 0, 0, 0)
+
+
+def test_a_revisited_slice_is_served_from_cached_blocks(fif_path):
+    rec = io.open_recording(fif_path)
+    _, first = rec.get_slice(5.0, 15.0, picks=[0, 1])  # blocks 0 and 1
+    assert rec.cache_stats.hits == 0
+    assert rec.cache_stats.misses == 4
+    block_bytes = int(io.BLOCK_SECONDS * SFREQ) * 4  # one float32 row
+    assert rec.cache_stats.resident_bytes == 4 * block_bytes
+    first[:] = 0.0  # the caller's copy, not the cache's
+    _, again = rec.get_slice(5.0, 15.0, picks=[0, 1])
+    assert rec.cache_stats.hits == 4
+    assert rec.cache_stats.hit_ratio == pytest.approx(0.5)
+    assert np.any(again != 0.0)
+    rec.get_slice(12.0, 18.0, picks=[0, 2])  # block 1: C3 cached, EOG missing
+    assert rec.cache_stats[:2] == (5, 5)
+
+
+def test_the_block_cache_evicts_least_recently_used_within_its_budget(fif_path):
+    block_bytes = int(io.BLOCK_SECONDS * SFREQ) * 4
+    rec = io.open_recording(fif_path, cache_bytes=2 * block_bytes)
+    rec.get_slice(0.0, 5.0, picks=[0])
+    rec.get_slice(10.0, 15.0, picks=[0])
+    rec.get_slice(0.0, 5.0, picks=[0])  # block 0 becomes the most recent
+    rec.get_slice(20.0, 25.0, picks=[0])  # evicts block 1, not block 0
+    assert rec.cache_stats.resident_bytes == 2 * block_bytes
+    hits = rec.cache_stats.hits
+    rec.get_slice(0.0, 5.0, picks=[0])
+    assert rec.cache_stats.hits == hits + 1
+    rec.get_slice(10.0, 15.0, picks=[0])
+    assert rec.cache_stats.hits == hits + 1  # reread
+    rec.set_cache_budget(0)
+    assert rec.cache_stats.resident_bytes == 0
+
+
+def test_an_uncached_slice_skips_the_block_cache(fif_path):
+    rec = io.open_recording(fif_path)
+    _, data = rec.get_slice(0.0, 30.0, picks=[0], cache=False)
+    assert data.shape == (1, 3000)
+    assert rec.cache_stats == (0, 0, 0, io.DEFAULT_CACHE_BYTES)
+    _, cached = rec.get_slice(0.0, 30.0, picks=[0])
+    assert np.array_equal(cached, data)
+    assert rec.cache_stats.resident_bytes > 0
+
+
+def test_whole_night_passes_leave_the_reviewed_blocks_resident(tmp_path):
+    from smacc.eeg import detect, dsp, filtercache, pyramid, quality, spectrogram
+
+    path = tmp_path / "night_raw.fif"
+    _make_raw(seconds=400.0).save(path, verbose="error")
+    rec = io.open_recording(path)
+    rec.get_slice(100.0, 130.0)  # the window under review
+    before = rec.cache_stats
+    pyramid.build_pyramid(rec, tmp_path / "pyramid")
+    spec = dsp.FilterSpec(highpass=0.5)
+    filtercache.build_filtered_cache(
+        rec,
+        filtercache.create_filtered_cache(rec, tmp_path / "filtered", (0,), (spec,)),
+    )
+    quality.build_quality_map(
+        rec, quality.create_quality_map(rec, tmp_path / "quality", [0, 1])
+    )
+    spectrogram.build_spectrogram(
+        rec, spectrogram.create_spectrogram(rec, tmp_path / "csa", [0, 1])
+    )
+    detect.run_detectors(rec, [detect.BUILTIN["spindles"]], workers=1)
+    assert rec.cache_stats == before
+
+
+# ----- a night joined from several files ---------------------------------------
+
+
+def _segment(tmp_path, name: str, seconds: float, start: float | None, seed: int):
+    """A segment ``seconds`` long starting ``start`` s after MEAS_DATE (undated
+    for None), with an "Arousal" and a trigger "47" 1 s in."""
+    raw = _make_raw(seconds)
+    raw._data[:] = np.random.default_rng(seed).standard_normal(raw._data.shape)
+    raw.set_meas_date(None if start is None else MEAS_DATE + timedelta(seconds=start))
+    raw.set_annotations(
+        mne.Annotations(
+            onset=[1.0, 1.0], duration=[0.5, 0.0], description=["Arousal", "47"]
+        )
+    )
+    path = tmp_path / name
+    raw.save(path, verbose="error")
+    return path
+
+
+@pytest.fixture
+def night_paths(tmp_path):
+    """A 30 s file, then a 20 s one after a 10 s gap, then a 10 s one 0.3 s on."""
+    return [
+        _segment(tmp_path, "night_c_raw.fif", 10.0, 60.3, 3),
+        _segment(tmp_path, "night_a_raw.fif", 30.0, 0.0, 1),
+        _segment(tmp_path, "night_b_raw.fif", 20.0, 40.0, 2),
+    ]
+
+
+def test_segments_join_on_their_start_times(night_paths):
+    night = io.open_concatenated(night_paths)
+    names = ["night_a_raw.fif", "night_b_raw.fif", "night_c_raw.fif"]
+    assert [path.name for path in night.paths] == names
+    assert night.path.name == "night_a_raw+2.fif" and not night.path.exists()
+    assert [night.offset(i) for i in range(3)] == [0.0, 40.0, 60.0]  # seam snapped
+    assert night.duration == pytest.approx(70.0)
+    assert night.meas_date == MEAS_DATE
+    assert night.discontinuities == [(30.0, 10.0)]
+
+
+def test_a_slice_across_a_gap_reads_each_segment_and_blanks_the_gap(night_paths):
+    night = io.open_concatenated(night_paths)
+    first, second, _ = (io.open_recording(path) for path in night.paths)
+    times, data = night.get_slice(25.0, 45.0, picks=[1, 0])
+    assert times[0] == pytest.approx(25.0) and data.shape == (2, 2000)
+    assert data.dtype == np.float32
+    assert np.array_equal(data[:, :500], first.get_slice(25.0, 30.0, [1, 0])[1])
+    assert np.isnan(data[:, 500:1500]).all()
+    assert np.array_equal(data[:, 1500:], second.get_slice(0.0, 5.0, [1, 0])[1])
+    _, seamless = night.get_slice(59.0, 61.0)
+    assert not np.isnan(seamless).any()
+    assert night.get_slice(70.0, 80.0)[1].shape == (4, 0)
+
+
+def test_a_slice_reads_only_the_segments_it_overlaps(night_paths, monkeypatch):
+    night = io.open_concatenated(night_paths, cache_bytes=0)
+    reads: list[tuple[str, int, int]] = []
+    for segment in night.segments:
+        original = segment._read
+
+        def spy(start, stop, picks, segment=segment, original=original):
+            reads.append((segment.path.name, start, stop))
+            return original(start, stop, picks)
+
+        monkeypatch.setattr(segment, "_read", spy)
+    night.get_slice(55.0, 65.0, picks=[0])
+    assert reads == [("night_b_raw.fif", 1500, 2000), ("night_c_raw.fif", 0, 500)]
+
+
+def test_a_joined_nights_events_land_on_its_timeline(night_paths):
+    night = io.open_concatenated(night_paths)
+    found = io.embedded_annotations(night)
+    assert [(a.onset, a.duration, a.description) for a in found] == [
+        (1.0, 0.0, "47"),
+        (1.0, 0.5, "Arousal"),
+        (30.0, 10.0, "Discontinuity"),
+        (41.0, 0.0, "47"),
+        (41.0, 0.5, "Arousal"),
+        (61.0, 0.0, "47"),
+        (61.0, 0.5, "Arousal"),
+    ]
+    assert io.recorded_trigger_events(night) == [(1.0, 47), (41.0, 47), (61.0, 47)]
+
+
+def test_undated_segments_join_back_to_back_in_the_given_order(tmp_path):
+    paths = [
+        _segment(tmp_path, "part2_raw.fif", 20.0, None, 2),
+        _segment(tmp_path, "part1_raw.fif", 30.0, None, 1),
+    ]
+    night = io.open_concatenated(paths)
+    assert night.paths == paths
+    assert night.offset(1) == 20.0 and night.duration == pytest.approx(50.0)
+    assert night.discontinuities == [(20.0, 0.0)]  # a seam, its gap unknown
+    assert not np.isnan(night.get_slice(0.0, 50.0)[1]).any()
+
+
+def test_segments_that_overlap_or_disagree_cannot_be_joined(tmp_path):
+    early = _segment(tmp_path, "early_raw.fif", 30.0, 0.0, 1)
+    overlapping = _segment(tmp_path, "late_raw.fif", 30.0, 20.0, 2)
+    with pytest.raises(ValueError, match="starts before"):
+        io.open_concatenated([early, overlapping])
+    other = tmp_path / "other_raw.fif"
+    raw = _make_raw()
+    raw.rename_channels({"C3": "F3"})
+    raw.save(other, verbose="error")
+    with pytest.raises(ValueError, match="can't be joined"):
+        io.open_concatenated([early, other])
+    with pytest.raises(ValueError):
+        io.open_concatenated([])
+
+
+def test_a_joined_nights_block_cache_is_shared_across_its_segments(night_paths):
+    night = io.open_concatenated(night_paths, cache_bytes=3_000_000)
+    assert [s.cache_stats.budget_bytes for s in night.segments] == [1_000_000] * 3
+    night.get_slice(25.0, 45.0, picks=[0])
+    night.get_slice(25.0, 45.0, picks=[0])
+    stats = night.cache_stats
+    assert stats.hits == stats.misses > 0
+    assert stats.budget_bytes == 3_000_000
+    night.set_cache_budget(0)
+    assert night.cache_stats.resident_bytes == 0
+
+
+# ----- native EDF/BDF path ----------------------------------------------------
+
+
+def _write_edf(
+    path,
+    digital: np.ndarray | list[np.ndarray],
+    labels: list[str],
+    per_record: list[int] | int = 100,
+    bdf: bool = False,
+    tal: list[str] | None = None,
+) -> None:
+    """Write ``digital`` (one row per signal) as a plain EDF/BDF, 1 s records.
+
+    Every signal spans ±1000 µV over its full digital range. ``tal`` adds an
+    EDF+ annotation signal whose record ``i`` carries ``tal[i]`` after the
+    mandatory timekeeping entry.
+    """
+    n_sig = len(labels) + (tal is not None)
+    counts = [per_record] * len(labels) if isinstance(per_record, int) else per_record
+    n_records = digital[0].size // counts[0]
+    dmax = 2**23 - 1 if bdf else 32767
+    tal_samples = 60
+    rows = [
+        (label, "uV", -1000, 1000, -dmax - 1, dmax, n)
+        for label, n in zip(labels, counts, strict=True)
+    ]
+    if tal is not None:
+        rows.append(("EDF Annotations", "", -1, 1, -32768, 32767, tal_samples))
+
+    def pad(value, width: int) -> bytes:
+        return str(value).ljust(width)[:width].encode("latin-1")
+
+    header = (b"\xffBIOSEMI" if bdf else pad(0, 8)) + pad("X", 80) + pad("X", 80)
+    header += pad("05.06.26", 8) + pad("22.00.00", 8) + pad(256 * (n_sig + 1), 8)
+    reserved = "24BIT" if bdf else ("EDF+C" if tal is not None else "")
+    header += pad(reserved, 44) + pad(n_records, 8) + pad(1, 8) + pad(n_sig, 4)
+    # Per-signal fields are stored field-major: every label, then every
+    # transducer, every unit, … (EDF spec §2.1.3).
+    header += b"".join(pad(row[0], 16) for row in rows) + pad("", 80) * n_sig
+    for column in range(1, 6):  # unit, physical min/max, digital min/max
+        header += b"".join(pad(row[column], 8) for row in rows)
+    header += pad("", 80) * n_sig + b"".join(pad(row[6], 8) for row in rows)
+    header += pad("", 32) * n_sig
+    with open(path, "wb") as f:
+        f.write(header)
+        for r in range(n_records):
+            for row, n in zip(digital, counts, strict=True):
+                samples = np.asarray(row[r * n : (r + 1) * n], dtype="<i4")
+                if bdf:
+                    f.write(samples.view(np.uint8).reshape(-1, 4)[:, :3].tobytes())
+                else:
+                    f.write(samples.astype("<i2").tobytes())
+            if tal is not None:
+                text = f"+{r}\x14\x14\x00{tal[r]}".encode("latin-1")
+                f.write(text.ljust(2 * tal_samples, b"\x00"))
+
+
+def _digital(n_rows: int, n_samples: int, bdf: bool = False) -> np.ndarray:
+    top = 2**23 - 1 if bdf else 32767
+    rng = np.random.default_rng(1)
+    return rng.integers(-top - 1, top, (n_rows, n_samples))
+
+
+@pytest.fixture
+def edf_path(tmp_path):
+    """A 30 s, 100 Hz EDF+C: C3, C4, EOG plus an annotation signal."""
+    path = tmp_path / "night1.edf"
+    tal = [""] * 30
+    tal[1] = "+1.5\x150.5\x14Arousal\x14\x00"
+    _write_edf(path, _digital(3, 3000), ["C3", "C4", "EOG"], tal=tal)
+    return path
+
+
+def _mne_slice(path, start: int, stop: int, picks=None) -> np.ndarray:
+    raw = mne.io.read_raw(path, preload=False, verbose="error")
+    return raw.get_data(picks=picks, start=start, stop=stop)
+
+
+def test_edf_slices_come_from_the_memory_map(edf_path):
+    rec = io.open_recording(edf_path)
+    assert rec._native is not None
+    assert rec.ch_names == ["C3", "C4", "EOG"]  # the TAL signal isn't a channel
+    times, data = rec.get_slice(5.25, 12.5)
+    assert data.dtype == np.float32
+    assert times[0] == pytest.approx(5.25)
+    expected = _mne_slice(edf_path, 525, 1250)
+    # One LSB of a ±1000 µV, 16-bit channel.
+    np.testing.assert_allclose(data, expected, rtol=0, atol=2000e-6 / 65535)
+
+
+def test_edf_native_picks_match_the_mne_rows(edf_path):
+    rec = io.open_recording(edf_path)
+    _, data = rec.get_slice(0.0, 30.0, picks=[2, 0])
+    expected = _mne_slice(edf_path, 0, 3000, picks=[2, 0])
+    np.testing.assert_allclose(data, expected, rtol=0, atol=2000e-6 / 65535)
+
+
+def test_edf_native_path_keeps_the_embedded_annotations(edf_path):
+    found = io.embedded_annotations(io.open_recording(edf_path))
+    assert [(a.onset, a.description) for a in found] == [(1.5, "Arousal")]
+
+
+def test_bdf_decodes_24_bit_samples_like_mne(tmp_path):
+    path = tmp_path / "night1.bdf"
+    digital = _digital(2, 1000, bdf=True)
+    status = np.zeros(1000, int)
+    status[[100, 400]] = [5, 7]
+    _write_edf(path, np.vstack([digital, status]), ["Fz", "Cz", "Status"], bdf=True)
+    rec = io.open_recording(path)
+    assert rec._native is not None
+    _, data = rec.get_slice(0.5, 9.5)
+    expected = _mne_slice(path, 50, 950)
+    np.testing.assert_allclose(data[:2], expected[:2], rtol=1e-6, atol=1e-9)
+    assert data[2] == pytest.approx(expected[2])  # status codes, as MNE reads them
+    assert io.recorded_trigger_events(rec) == [(1.0, 5), (4.0, 7)]
+
+
+@pytest.mark.filterwarnings("ignore:Loading an EDF with mixed sampling")
+def test_mixed_rate_edf_falls_back_to_mne(tmp_path):
+    # MNE upsamples the slower channel; the memory map can't, so it steps aside.
+    path = tmp_path / "mixed.edf"
+    fast = _digital(1, 1000)[0]
+    slow = _digital(1, 500)[0]
+    _write_edf(path, [fast, slow], ["C3", "EMG"], per_record=[100, 50])
+    rec = io.open_recording(path)
+    assert rec._native is None
+    assert rec.cache_stats.budget_bytes == 0  # MNE's reads depend on the span
+    _, data = rec.get_slice(1.0, 2.0)
+    assert data.shape == (2, 100)
+    assert data == pytest.approx(_mne_slice(path, 100, 200))
+
+
 # ----- embedded annotations ------------------------------------------------------
 
 
@@ -231,3 +599,133 @@ def test_trigger_events_data_relative_when_anonymized_with_first_samp(tmp_path):
     # Both the annotation code and the stim code land at 1.0 s — consistent, not
     # offset by first_time (2.0 s).
     assert events.count((1.0, 9)) == 2
+
+
+def _find_events_onsets(path) -> list[tuple[float, int]]:
+    raw = mne.io.read_raw(path, preload=False, verbose="error")
+    events = mne.find_events(raw, shortest_event=1, consecutive=True, verbose="error")
+    return sorted(
+        ((sample - raw.first_samp) / raw.info["sfreq"], int(code))
+        for sample, _previous, code in events
+    )
+
+
+@pytest.mark.parametrize("block_samples", [1, 2, 7, 64, 2**20])
+def test_stim_events_stream_block_by_block_like_find_events(tmp_path, block_samples):
+    # Pulses, held codes overwritten by lower ones, a code the channel starts on,
+    # one it ends on, and negative (sign-flipped) codes, across block seams.
+    rng = np.random.default_rng(3)
+    stim = np.zeros(400)
+    stim[:5] = 9  # the initial value: not an event
+    for at in rng.choice(np.arange(10, 380), 40, replace=False):
+        stim[at : at + rng.integers(1, 12)] = rng.integers(1, 256)
+    stim[150:180] = 200.0
+    stim[180:190] = 3.0  # written straight over a held code
+    stim[250:260] = -12.0
+    stim[390:] = 7  # never returns to baseline
+    info = mne.create_info(["C3", "STI 014"], sfreq=SFREQ, ch_types=["eeg", "stim"])
+    raw = mne.io.RawArray(
+        np.vstack([np.zeros(400), stim]), info, first_samp=30, verbose="error"
+    )
+    path = tmp_path / "stim_raw.fif"
+    raw.save(path, verbose="error")
+    rec = io.open_recording(path)
+    found = list(io._stim_channel_events(rec, block_samples=block_samples))
+    assert found == _find_events_onsets(path)
+    assert (1.8, 3) in found and (2.5, 12) in found and len(found) > 30
+
+
+def test_stim_events_merge_every_stim_channel_like_find_events(tmp_path):
+    info = mne.create_info(["TRIG1", "TRIG2"], sfreq=SFREQ, ch_types=["stim"] * 2)
+    data = np.zeros((2, 300))
+    data[:, 50:55] = 4  # on both: one event, not two
+    data[0, 100:120] = 6
+    data[1, 110:115] = 8
+    path = tmp_path / "two_raw.fif"
+    mne.io.RawArray(data, info, verbose="error").save(path, verbose="error")
+    expected = _find_events_onsets(path)
+    found = list(io._stim_channel_events(io.open_recording(path), block_samples=32))
+    assert found == expected == [(0.5, 4), (1.0, 6), (1.1, 8)]
+
+
+def test_stim_events_read_the_channel_a_block_at_a_time(tmp_path, monkeypatch):
+    info = mne.create_info(["C3", "STI 014"], sfreq=SFREQ, ch_types=["eeg", "stim"])
+    data = np.zeros((2, 1000))
+    data[1, 499:510] = 5  # across the seam at 500
+    path = tmp_path / "stim_raw.fif"
+    mne.io.RawArray(data, info, verbose="error").save(path, verbose="error")
+    rec = io.open_recording(path)
+    spans: list[tuple[int, int]] = []
+    read = rec._raw.get_data
+
+    def spy(picks=None, start=0, stop=None, **kwargs):
+        spans.append((start, stop))
+        return read(picks=picks, start=start, stop=stop, **kwargs)
+
+    monkeypatch.setattr(rec._raw, "get_data", spy)
+    assert list(io._stim_channel_events(rec, block_samples=100)) == [(4.99, 5)]
+    assert spans == [(start, start + 100) for start in range(0, 1000, 100)]
+
+
+# ----- the header cache -------------------------------------------------------
+
+
+def _stim_fif(path) -> None:
+    info = mne.create_info(["C3", "STI 014"], sfreq=SFREQ, ch_types=["eeg", "stim"])
+    data = np.zeros((2, int(3 * SFREQ)))
+    data[1, int(1.0 * SFREQ)] = 5
+    raw = mne.io.RawArray(data, info, verbose="error")
+    raw.set_meas_date(MEAS_DATE)
+    raw.set_annotations(
+        mne.Annotations(onset=[2.0], duration=[0.5], description=["Arousal"])
+    )
+    raw.save(path, verbose="error")
+
+
+def test_a_reopen_answers_from_the_header_cache(tmp_path, monkeypatch):
+    path = tmp_path / "night1_raw.fif"
+    _stim_fif(path)
+    first = io.open_recording(path, cache_dir=tmp_path / "cache")
+    events = io.recorded_trigger_events(first)
+    annotations = io.embedded_annotations(first)
+    assert events == [(1.0, 5)] and len(annotations) == 1
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("the stim channel was scanned again")
+
+    monkeypatch.setattr(mne, "find_events", no_scan)
+    again = io.open_recording(path, cache_dir=tmp_path / "cache")
+    assert again._header is not None and again._header.meas_date == MEAS_DATE
+    assert io.recorded_trigger_events(again) == events
+    assert io.embedded_annotations(again) == annotations
+
+
+def test_a_rewritten_recording_gets_a_fresh_header(tmp_path):
+    path = tmp_path / "night1_raw.fif"
+    _stim_fif(path)
+    io.recorded_trigger_events(io.open_recording(path, cache_dir=tmp_path / "c"))
+    raw = _make_raw(10.0)
+    raw.save(path, overwrite=True, verbose="error")
+    rec = io.open_recording(path, cache_dir=tmp_path / "c")
+    assert rec._header is not None and rec._header.triggers is None
+    assert io.recorded_trigger_events(rec) == []
+    assert io.embedded_annotations(rec) == []
+
+
+def test_a_cached_edf_header_skips_the_native_check(edf_path, tmp_path, monkeypatch):
+    io.open_recording(edf_path, cache_dir=tmp_path / "cache")
+    monkeypatch.setattr(
+        io._EdfData, "_agrees_with", lambda self, raw: pytest.fail("re-verified")
+    )
+    rec = io.open_recording(edf_path, cache_dir=tmp_path / "cache")
+    assert rec._native is not None
+    found = io.embedded_annotations(rec)
+    assert [(a.onset, a.description) for a in found] == [(1.5, "Arousal")]
+
+
+def test_an_unreadable_header_cache_reads_as_none(tmp_path):
+    from smacc.eeg import headercache
+
+    assert headercache.load_header(tmp_path) is None
+    (tmp_path / headercache.FILE_NAME).write_bytes(b"not a header")
+    assert headercache.load_header(tmp_path) is None
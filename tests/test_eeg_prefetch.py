@@ -0,0 +1,253 @@
+"""Tests for the trace view's read-ahead cache and worker — no Qt, no MNE."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+from smacc.eeg import dsp, prefetch
+from smacc.eeg.prefetch import FilteredWindow, Prefetcher, WindowCache, WindowKey
+
+SFREQ = 100.0
+
+
+CHANNELS = (["A", "B", "C"], ["eeg", "eeg", "eog"])
+
+
+def _ramps(times: np.ndarray) -> list[np.ndarray]:
+    """Three channels of the sample index, scaled per channel."""
+    samples = np.round(times * SFREQ)
+    return [samples, 2 * samples, 3 * samples]
+
+
+def _waves(times: np.ndarray) -> list[np.ndarray]:
+    """The ramp's channels replaced by a mix of a 0.8 Hz and a 5 Hz wave."""
+    wave = np.sin(2 * np.pi * 0.8 * times) + 0.5 * np.sin(2 * np.pi * 5 * times)
+    return [wave, wave, wave]
+
+
+@pytest.fixture
+def ramp(make_provider):
+    return make_provider(_ramps, *CHANNELS, 6000)  # 60 s
+
+
+@pytest.fixture
+def wave(make_provider):
+    return make_provider(_waves, *CHANNELS, 6000)
+
+
+def _key(start: float, visible=(0, 1, 2), spec=dsp.UNFILTERED) -> WindowKey:
+    return WindowKey(start, 10.0, tuple(visible), (spec,) * len(visible))
+
+
+def _window(value: float = 0.0) -> FilteredWindow:
+    return FilteredWindow(np.zeros(1), np.full((1, 1), value))
+
+
+def test_filter_window_trims_the_margin_and_keeps_visible_rows_in_order(ramp):
+    window = prefetch.filter_window(ramp, _key(20.0, visible=(2, 0)))
+    assert ramp.calls == [(19.0, 31.0)]  # the unfiltered 1 s minimum margin
+    assert ramp.picks == [[2, 0]]  # only the visible channels are read
+    assert window.times[0] == pytest.approx(20.0)
+    assert window.times[-1] == pytest.approx(30.0)
+    assert window.data.shape == (2, window.times.size)
+    assert window.data[0] == pytest.approx(3 * window.times * SFREQ)  # channel C
+    assert window.data[1] == pytest.approx(window.times * SFREQ)  # channel A
+
+
+def test_filter_window_filters_each_channel_by_its_own_spec(ramp):
+    highpass = dsp.FilterSpec(highpass=1.0)
+    key = WindowKey(20.0, 10.0, (0, 1), (dsp.UNFILTERED, highpass))
+    window = prefetch.filter_window(ramp, key)
+    assert ramp.calls[-1][0] == pytest.approx(20.0 - dsp.pad_seconds(highpass))
+    assert window.data[0] == pytest.approx(window.times * SFREQ)  # untouched ramp
+    assert np.abs(window.data[1]).max() < np.abs(window.data[0]).max()  # detrended
+
+
+def test_filter_window_is_float32_and_copies_only_to_filter(ramp):
+    raw = np.ones((1, 6000), dtype=np.float32)
+    ramp.get_slice = lambda lo, hi, picks=None, cache=True: (
+        np.arange(6000) / SFREQ,
+        raw,
+    )
+    window = prefetch.filter_window(ramp, _key(20.0, visible=(0,)))
+    assert window.data.dtype == np.float32
+    assert np.shares_memory(window.data, raw)  # unfiltered: a view, no copy
+    highpass = dsp.FilterSpec(highpass=1.0)
+    window = prefetch.filter_window(ramp, _key(20.0, visible=(0,), spec=highpass))
+    assert not np.shares_memory(window.data, raw)
+    assert np.all(raw == 1.0)  # the provider's buffer is never written
+    wide = prefetch.filter_window(ramp, _key(20.0, visible=(0,)), np.float64)
+    assert wide.data.dtype == np.float64
+
+
+@pytest.mark.parametrize("step", [3.0, -3.0])
+def test_slide_window_fetches_only_the_exposed_edge(step, ramp):
+    before = _key(20.0)
+    window = prefetch.filter_window(ramp, before)
+    ramp.calls.clear()
+    slid = prefetch.slide_window(ramp, before, window, _key(20.0 + step))
+    assert slid is not None
+    (fetch_lo, fetch_hi) = ramp.calls[-1]
+    assert fetch_hi - fetch_lo == pytest.approx(abs(step) + 2.0, abs=0.02)  # ± 1 s
+    whole = prefetch.filter_window(ramp, _key(20.0 + step))
+    assert slid.times == pytest.approx(whole.times)
+    assert slid.data == pytest.approx(whole.data)
+
+
+def test_slide_window_leaves_no_seam_in_a_filtered_window(wave):
+    spec = dsp.FilterSpec(highpass=0.5, lowpass=30.0)
+    before = _key(20.0, spec=spec)
+    window = prefetch.filter_window(wave, before)
+    slid = prefetch.slide_window(wave, before, window, _key(22.0, spec=spec))
+    assert slid is not None
+    whole = prefetch.filter_window(wave, _key(22.0, spec=spec))
+    assert slid.times == pytest.approx(whole.times)
+    # The kept part was filtered from an earlier margin, so it differs by the
+    # margin's own residual transient — as two whole fetches starting at
+    # different points would — well under 1 % of the signal.
+    assert np.abs(slid.data - whole.data).max() < 1e-2
+
+
+def test_a_decimated_window_sits_on_the_recordings_sample_grid(wave):
+    spec = dsp.FilterSpec(lowpass=10.0)
+    key = WindowKey(20.03, 10.0, (0,), (spec,), factor=4)
+    window = prefetch.filter_window(wave, key)
+    samples = np.round(window.times * SFREQ).astype(int)
+    assert np.all(samples % 4 == 0)
+    assert np.all(np.diff(samples) == 4)
+    assert window.times[0] >= 20.03
+    # Still the signal, now at 25 Hz: the 0.8 Hz + 5 Hz mix passes the 10 Hz LP.
+    whole = prefetch.filter_window(wave, key._replace(factor=1))
+    on_grid = np.isin(np.round(whole.times * SFREQ).astype(int), samples)
+    assert window.data[0] == pytest.approx(whole.data[0][on_grid], abs=0.02)
+    moved = key._replace(start=22.03)
+    slid = prefetch.slide_window(wave, key, window, moved)
+    assert slid is not None
+    assert slid.times == pytest.approx(prefetch.filter_window(wave, moved).times)
+
+
+def test_slide_window_declines_what_it_cannot_reuse(ramp):
+    before = _key(20.0)
+    window = prefetch.filter_window(ramp, before)
+    highpass = dsp.FilterSpec(highpass=0.3)
+    assert prefetch.slide_window(ramp, before, window, _key(45.0)) is None
+    assert prefetch.slide_window(ramp, before, window, _key(23.0, (0, 1))) is None
+    assert (
+        prefetch.slide_window(ramp, before, window, _key(23.0, spec=highpass)) is None
+    )
+
+
+@pytest.fixture
+def four_workers():
+    prefetch.set_compute_workers(4)  # a pool even on a single-core runner
+    yield
+    prefetch.set_compute_workers(None)
+
+
+def test_parallel_map_keeps_the_order_of_its_items(four_workers):
+    names = prefetch.parallel_map(lambda i: threading.current_thread().name, [0, 1])
+    assert all(name.startswith("eeg-compute") for name in names)
+    assert prefetch.parallel_map(lambda i: i * i, list(range(50))) == [
+        i * i for i in range(50)
+    ]
+    # A single item never pays for the round trip.
+    assert prefetch.parallel_map(lambda i: threading.current_thread().name, [0]) == [
+        threading.current_thread().name
+    ]
+
+
+def test_filtering_on_the_pool_matches_filtering_inline(four_workers, wave):
+    wave.ch_names = [f"CH{i}" for i in range(20)]
+    read = wave.get_slice
+    wave.get_slice = lambda lo, hi, picks=None, cache=True: (
+        read(lo, hi)[0],
+        np.tile(read(lo, hi)[1][:1], (len(picks), 1)),
+    )
+    specs = [dsp.FilterSpec(highpass=0.5), dsp.FilterSpec(lowpass=3.0)]
+    key = WindowKey(
+        20.0, 10.0, tuple(range(20)), tuple(specs[i % 2] for i in range(20))
+    )
+    parallel = prefetch.filter_window(wave, key)
+    prefetch.set_compute_workers(1)
+    serial = prefetch.filter_window(wave, key)
+    assert np.array_equal(parallel.data, serial.data)
+    assert not np.array_equal(parallel.data[0], parallel.data[1])  # two filters
+
+
+def test_neighbours_read_the_paging_direction_first():
+    assert prefetch.neighbours(30.0, 30.0, 30.0, 600.0) == [60.0, 0.0]
+    assert prefetch.neighbours(30.0, 30.0, -30.0, 600.0) == [0.0, 60.0]
+    # A small scroll reads ahead by the same small step.
+    assert prefetch.neighbours(30.0, 30.0, 3.0, 600.0) == [33.0, 27.0]
+    # Nothing moved yet: a full window each way.
+    assert prefetch.neighbours(100.0, 30.0, 0.0, 600.0) == [130.0, 70.0]
+
+
+def test_neighbours_clamp_to_the_recording_and_drop_the_current_window():
+    assert prefetch.neighbours(0.0, 30.0, 30.0, 600.0) == [30.0]
+    assert prefetch.neighbours(570.0, 30.0, 30.0, 600.0) == [540.0]
+    assert prefetch.neighbours(560.0, 30.0, 30.0, 600.0) == [570.0, 530.0]
+
+
+def test_cache_counts_hits_and_misses():
+    cache = WindowCache()
+    assert cache.get(_key(0.0)) is None
+    cache.put(_key(0.0), _window())
+    assert cache.get(_key(0.0)) is not None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert _key(0.0) in cache  # peeking doesn't count
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_the_least_recently_used_window():
+    cache = WindowCache(capacity=2)
+    cache.put(_key(0.0), _window())
+    cache.put(_key(10.0), _window())
+    cache.get(_key(0.0))  # touch: 10 s is now the oldest
+    cache.put(_key(20.0), _window())
+    assert _key(0.0) in cache
+    assert _key(10.0) not in cache
+    assert len(cache) == 2
+
+
+def test_a_changed_filter_or_montage_is_a_different_window():
+    cache = WindowCache()
+    cache.put(_key(0.0), _window())
+    assert _key(0.0, spec=dsp.FilterSpec(highpass=0.3)) not in cache
+    assert _key(0.0, visible=(0, 1)) not in cache
+
+
+def test_prefetcher_fills_the_cache_in_the_background(ramp):
+    cache = WindowCache()
+    worker = Prefetcher(cache, lambda key: prefetch.filter_window(ramp, key))
+    try:
+        worker.request([_key(10.0), _key(20.0)])
+        assert worker.wait_idle(timeout=5.0)
+        assert _key(10.0) in cache
+        assert _key(20.0) in cache
+        calls = len(ramp.calls)
+        worker.request([_key(10.0)])  # already cached: not read again
+        assert worker.wait_idle(timeout=5.0)
+        assert len(ramp.calls) == calls
+    finally:
+        worker.stop()
+
+
+def test_a_failing_read_is_skipped_not_raised():
+    def compute(key: WindowKey) -> FilteredWindow:
+        if key.start == 10.0:
+            raise OSError("share went away")
+        return _window()
+
+    cache = WindowCache()
+    worker = Prefetcher(cache, compute)
+    try:
+        worker.request([_key(10.0), _key(20.0)])
+        assert worker.wait_idle(timeout=5.0)
+        assert _key(10.0) not in cache
+        assert _key(20.0) in cache
+    finally:
+        worker.stop()
@@ -0,0 +1,124 @@
+"""Tests for the whole-night overview pyramid and its cache folder — no Qt, no MNE."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from smacc.eeg import cache, pyramid
+from smacc.eeg.jobs import JobCancelled
+
+SFREQ = 100.0
+
+
+def _ramp(times: np.ndarray) -> list[np.ndarray]:
+    """Two channels: a ramp (sample index) and its negation."""
+    samples = np.round(times * SFREQ)
+    return [samples, -samples]
+
+
+@pytest.fixture
+def ramp(make_provider):
+    return lambda n_times: make_provider(_ramp, ["A", "B"], ["eeg", "eeg"], n_times)
+
+
+@pytest.fixture
+def built(tmp_path, ramp):
+    # Not a multiple of any level's bucket: exercises the ragged last block.
+    provider = ramp(100_003)
+    return provider, pyramid.build_pyramid(provider, tmp_path / "pyramid")
+
+
+def test_every_level_summarizes_its_buckets(built):
+    provider, pyr = built
+    assert pyr.factors == pyramid.FACTORS
+    for factor in (2, 64, 4096):
+        times, mins, maxs, means = pyr.get_envelope(factor, 0.0, provider.duration)
+        n_buckets = -(-provider.n_times // factor)
+        assert mins.shape == (2, n_buckets)
+        first = np.arange(n_buckets) * factor
+        last = np.minimum(first + factor, provider.n_times) - 1
+        assert np.allclose(mins[0], first)
+        assert np.allclose(maxs[0], last)
+        assert np.allclose(maxs[1], -first)
+        assert times[0] == pytest.approx(factor / 2 / SFREQ)
+    _, _, _, means = pyr.get_envelope(4, 0.0, 1.0)
+    assert np.allclose(means[0], np.arange(25) * 4 + 1.5)
+
+
+def test_a_ragged_last_bucket_averages_only_its_real_samples(built):
+    provider, pyr = built  # 100_003 samples: no level's buckets tile it
+    end = provider.duration
+    for factor in pyramid.FACTORS:
+        _, _, _, means = pyr.get_envelope(factor, end - 1 / SFREQ, end)
+        first = (provider.n_times - 1) // factor * factor
+        real = np.arange(first, provider.n_times)
+        assert real.size < factor
+        assert means[:, -1] == pytest.approx([real.mean(), -real.mean()])
+
+
+def test_get_envelope_honours_picks_and_clamps(built):
+    provider, pyr = built
+    _, mins, _, _ = pyr.get_envelope(8, -5.0, 1.0, picks=[1])
+    assert mins.shape == (1, 13)  # ceil(100 samples / 8)
+    times, mins, _, _ = pyr.get_envelope(8, 5_000.0, 6_000.0)
+    assert times.size == 0 and mins.shape == (2, 0)
+
+
+def test_factor_for_picks_the_coarsest_level_with_a_bucket_per_pixel(built):
+    _, pyr = built
+    assert pyr.factor_for(1.5) is None  # narrower than the finest level
+    assert pyr.factor_for(2.0) == 2
+    assert pyr.factor_for(100.0) == 64
+    assert pyr.factor_for(1e9) == 4096
+
+
+def test_a_built_pyramid_reloads_from_its_folder(built, tmp_path, ramp):
+    provider, _ = built
+    again = pyramid.Pyramid.load(tmp_path / "pyramid")
+    assert again is not None
+    assert again.matches(provider)
+    assert not again.matches(ramp(50))
+
+
+def test_a_folder_without_a_manifest_is_no_pyramid(tmp_path):
+    assert pyramid.Pyramid.load(tmp_path) is None
+    (tmp_path / pyramid.MANIFEST_NAME).write_text("{not json", encoding="utf-8")
+    assert pyramid.Pyramid.load(tmp_path) is None
+
+
+def test_a_cancelled_build_leaves_nothing_behind(tmp_path, ramp, cancelled):
+    with pytest.raises(JobCancelled):
+        pyramid.build_pyramid(ramp(100_000), tmp_path / "pyramid", cancelled=cancelled)
+    assert not (tmp_path / "pyramid").exists()
+
+
+def test_build_reports_progress_up_to_done(tmp_path, ramp):
+    fractions: list[float] = []
+    pyramid.build_pyramid(ramp(200_000), tmp_path / "pyramid", report=fractions.append)
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == pytest.approx(1.0)
+
+
+# ----- cache folder keying --------------------------------------------------------
+
+
+def test_cache_dir_is_stable_but_tracks_the_file_version(tmp_path):
+    recording = tmp_path / "night 1.edf"
+    recording.write_bytes(b"abc")
+    first = cache.recording_cache_dir(tmp_path / "cache", recording)
+    assert first == cache.recording_cache_dir(tmp_path / "cache", recording)
+    assert first.name.startswith("night_1-")
+    recording.write_bytes(b"abcdef")  # re-exported: new size → new folder
+    assert cache.recording_cache_dir(tmp_path / "cache", recording) != first
+
+
+def test_a_joined_nights_cache_dir_tracks_every_segment(tmp_path):
+    first, second = tmp_path / "night1_a.edf", tmp_path / "night1_b.edf"
+    first.write_bytes(b"abc")
+    second.write_bytes(b"def")
+    joined = cache.recording_cache_dir(tmp_path / "cache", first, second)
+    assert joined.name.startswith("night1_a+1-")
+    assert joined != cache.recording_cache_dir(tmp_path / "cache", first)
+    second.write_bytes(b"defghi")  # one segment re-exported: the night is new
+    assert cache.recording_cache_dir(tmp_path / "cache", first, second) != joined
@@ -0,0 +1,125 @@
+"""Tests for the per-epoch signal-quality map and its cache folder — no Qt, no MNE."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from smacc.eeg import quality
+from smacc.eeg.jobs import JobCancelled
+
+SFREQ = 200.0
+EPOCH = int(quality.EPOCH_SECONDS * SFREQ)
+
+
+class FaultyProvider:
+    """Four channels of 10 Hz 'EEG', each spoiled in its own epochs, plus a trigger.
+
+    Epoch 2 of C3 is flat, epoch 3 of C4 clips, epoch 4 of Pz carries 50 Hz,
+    and epoch 5 of Oz is ten times louder; the trigger is always flat.
+    """
+
+    ch_names = ["C3", "C4", "Pz", "Oz", "STI"]
+    ch_types = ["eeg", "eeg", "eeg", "eeg", "stim"]
+    sfreq = SFREQ
+
+    def __init__(self, n_epochs: int) -> None:
+        self.duration = n_epochs * quality.EPOCH_SECONDS + 7.0  # a fragment too
+        n_times = int(round(self.duration * SFREQ))
+        times = np.arange(n_times) / SFREQ
+        rng = np.random.default_rng(1)
+        wave = np.sin(2 * np.pi * 10.0 * times)
+        data = np.vstack([wave + 0.1 * rng.standard_normal(n_times)] * 4)
+        data = np.vstack([data, np.zeros(n_times)])
+        data[0, 2 * EPOCH : 3 * EPOCH] = 0.3
+        clip = slice(3 * EPOCH, 4 * EPOCH)
+        data[1, clip] = np.clip(3 * data[1, clip], -1.0, 1.0)
+        data[2, 4 * EPOCH : 5 * EPOCH] += 5 * np.sin(
+            2 * np.pi * 50.0 * times[4 * EPOCH : 5 * EPOCH]
+        )
+        data[3, 5 * EPOCH : 6 * EPOCH] *= 10
+        self.data = data
+        self.picks: list[list[int] | None] = []
+
+    def get_slice(self, start_s: float, stop_s: float, picks=None, cache=True):
+        self.picks.append(None if picks is None else list(picks))
+        start = max(0, int(round(start_s * SFREQ)))
+        stop = min(self.data.shape[-1], int(round(stop_s * SFREQ)))
+        rows = self.data if picks is None else self.data[list(picks)]
+        return np.arange(start, stop) / SFREQ, rows[:, start:stop]
+
+
+@pytest.fixture
+def built(tmp_path):
+    provider = FaultyProvider(8)
+    channels = quality.default_channels(provider.ch_types)
+    created = quality.create_quality_map(provider, tmp_path / "quality", channels)
+    return provider, quality.build_quality_map(provider, created)
+
+
+def test_trigger_channels_are_left_out():
+    assert quality.default_channels(FaultyProvider.ch_types) == [0, 1, 2, 3]
+
+
+def test_epoch_stats_measure_each_epoch():
+    data = np.vstack([np.tile([1.0, -1.0], EPOCH), np.full(2 * EPOCH, 2.0)])
+    stats = quality.epoch_stats(data, SFREQ, EPOCH)
+    assert stats.shape == (len(quality.STATS), 2, 2)
+    assert stats[quality.RMS, 0] == pytest.approx([1.0, 1.0])
+    assert stats[quality.PTP, 0] == pytest.approx([2.0, 2.0])
+    assert stats[quality.FLAT, 0] == pytest.approx([0.0, 0.0])
+    assert stats[quality.FLAT, 1] == pytest.approx([1.0, 1.0])
+    assert stats[quality.RMS, 1] == pytest.approx([0.0, 0.0])
+    assert stats[quality.LINE, 1] == pytest.approx([0.0, 0.0])  # no power at all
+
+
+def test_each_fault_is_flagged_in_its_own_cell(built):
+    provider, qmap = built
+    assert qmap.complete and qmap.n_epochs == 8
+    issues = qmap.issues()
+    expected = np.zeros((4, 8), dtype=np.uint8)
+    expected[0, 2] = quality.FLATLINE
+    expected[1, 3] = quality.CLIPPING
+    expected[2, 4] = quality.MAINS
+    expected[3, 5] = quality.NOISY
+    assert np.array_equal(issues, expected)
+    assert list(qmap.bad_epochs()) == [2, 3, 4, 5]
+    assert all(picks == [0, 1, 2, 3] for picks in provider.picks)
+
+
+def test_epochs_in_a_gap_are_never_flagged(tmp_path):
+    provider = FaultyProvider(8)
+    provider.data[:, 6 * EPOCH : 8 * EPOCH] = np.nan  # a joined night's gap
+    provider.data[4, :] = np.nan  # and a channel that is all gap
+    created = quality.create_quality_map(provider, tmp_path / "q", [0, 1, 2, 3, 4])
+    qmap = quality.build_quality_map(provider, created)
+    assert list(qmap.bad_epochs()) == [2, 3, 4, 5]
+    assert not qmap.issues()[4].any()
+
+
+def test_a_built_map_loads_back_from_disk(built, tmp_path):
+    provider, qmap = built
+    loaded = quality.QualityMap.load(tmp_path / "quality")
+    assert loaded is not None and loaded.matches(provider)
+    assert np.array_equal(loaded.stats, qmap.stats)
+    assert loaded.channels == (0, 1, 2, 3)
+
+
+def test_a_dense_montage_reads_a_few_epochs_per_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(quality, "_BLOCK_VALUES", 3 * 4 * EPOCH)
+    provider = FaultyProvider(8)
+    created = quality.create_quality_map(provider, tmp_path / "q", [0, 1, 2, 3])
+    fractions: list[float] = []
+    quality.build_quality_map(provider, created, report=fractions.append)
+    assert len(provider.picks) == 3  # 3 + 3 + 2 epochs
+    assert fractions[-1] == pytest.approx(1.0)
+    assert created.bad_epochs().tolist() == [2, 3, 4, 5]
+
+
+def test_a_cancelled_build_leaves_no_map(tmp_path, cancelled):
+    provider = FaultyProvider(8)
+    created = quality.create_quality_map(provider, tmp_path / "q", [0])
+    with pytest.raises(JobCancelled):
+        quality.build_quality_map(provider, created, cancelled=cancelled)
+    assert created.filled == 0
+    assert quality.QualityMap.load(tmp_path / "q") is None
@@ -0,0 +1,107 @@
+"""Tests for the whole-night spectrogram (CSA) and its cache folder — no Qt, no MNE."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from smacc.eeg import spectrogram
+from smacc.eeg.jobs import JobCancelled
+
+SFREQ = 100.0
+
+
+def _rhythms(times: np.ndarray) -> list[np.ndarray]:
+    """C3 a 2 Hz wave, Cz a 10 Hz wave; the EOG and O1 flat."""
+    flat = np.zeros_like(times)
+    return [
+        flat,
+        np.sin(2 * np.pi * 2.0 * times),
+        np.sin(2 * np.pi * 10.0 * times),
+        flat,
+    ]
+
+
+@pytest.fixture
+def waves(make_provider):
+    return lambda seconds: make_provider(
+        _rhythms,
+        ["EOG", "C3", "Cz", "O1"],
+        ["eog", "eeg", "eeg", "eeg"],
+        int(round(seconds * SFREQ)),
+    )
+
+
+def test_default_channels_prefer_central_eeg(waves):
+    provider = waves(60.0)
+    assert spectrogram.default_channels(provider.ch_names, provider.ch_types) == [
+        1,
+        2,
+        3,
+    ]
+    many = [f"E{i}" for i in range(10)]
+    assert len(spectrogram.default_channels(many, ["eeg"] * 10)) == (
+        spectrogram.MAX_CHANNELS
+    )
+    assert spectrogram.default_channels(["EOG"], ["eog"]) == []
+
+
+def test_epoch_power_matches_welch_epoch_by_epoch():
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((2, 3000 * 3 + 50))  # three epochs and a fragment
+    power = spectrogram.epoch_power(data, SFREQ, 3000)
+    freqs = spectrogram.frequencies(SFREQ)
+    assert power.shape == (3, freqs.size)
+    assert power.dtype == np.float32
+    for epoch in range(3):
+        chunk = data[:, epoch * 3000 : (epoch + 1) * 3000]
+        all_freqs, psd = signal.welch(chunk, fs=SFREQ, nperseg=400)
+        keep = (all_freqs > 0) & (all_freqs <= spectrogram.MAX_FREQ)
+        assert power[epoch] == pytest.approx(psd[:, keep].mean(axis=0), rel=1e-5)
+
+
+def test_a_built_spectrogram_shows_each_channels_rhythm(tmp_path, waves):
+    provider = waves(30.0 * 70 + 12.0)  # a trailing fragment, not a column
+    channels = spectrogram.default_channels(provider.ch_names, provider.ch_types)
+    created = spectrogram.create_spectrogram(provider, tmp_path / "csa", channels)
+    assert created.n_epochs == 70 and created.filled == 0
+    fractions: list[float] = []
+    built = spectrogram.build_spectrogram(provider, created, report=fractions.append)
+    assert built.complete
+    assert fractions[-1] == pytest.approx(1.0)
+    assert len(fractions) == 3  # 32-epoch blocks
+    # Only the CSA's channels are read, a block of whole epochs at a time.
+    assert all(picks == channels for picks in provider.picks)
+    assert provider.calls[0] == (0.0, 960.0)
+    freqs = built.freqs
+    peaks = freqs[np.argsort(built.power[10])[-2:]]
+    assert sorted(peaks) == [pytest.approx(2.0), pytest.approx(10.0)]
+    loaded = spectrogram.Spectrogram.load(tmp_path / "csa")
+    assert loaded is not None and loaded.matches(provider)
+    assert np.array_equal(loaded.power, built.power)
+    assert loaded.channels == tuple(channels)
+
+
+def test_a_cancelled_build_leaves_no_spectrogram(tmp_path, waves):
+    provider = waves(30.0 * 70)
+    created = spectrogram.create_spectrogram(provider, tmp_path / "csa", [1])
+    cancelled = threading.Event()
+
+    def report(fraction: float) -> None:
+        cancelled.set()  # stop after the first block
+
+    with pytest.raises(JobCancelled):
+        spectrogram.build_spectrogram(
+            provider, created, report=report, cancelled=cancelled
+        )
+    assert created.filled == 0
+    assert not (tmp_path / "csa").exists()
+    assert spectrogram.Spectrogram.load(tmp_path / "csa") is None
+
+
+def test_a_different_channel_set_is_a_different_cache():
+    assert spectrogram.cache_key([1, 2]) != spectrogram.cache_key([1, 3])
+    assert spectrogram.cache_key([1, 2]) != spectrogram.cache_key([1, 2], 20.0)
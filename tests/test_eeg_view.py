@@ -7,6 +7,7 @@ offsets can then be asserted exactly.
 
 from __future__ import annotations
 
+import math
 from datetime import datetime
 
 import numpy as np
@@ -14,15 +15,20 @@ import pyqtgraph as pg
 import pytest
 from PyQt6 import QtCore, QtGui
 
-from smacc.eeg import dsp
+from smacc.eeg import annotations as ann
+from smacc.eeg import dsp, filtercache, quality, spectrogram
 from smacc.eeg.annotations import Annotation
 from smacc.eeg.staging import StageEpoch
 from smacc.eeg.view import (
     DEFAULT_TYPE_SCALES,
     HypnogramStrip,
+    QualityStrip,
     RaterOverlay,
+    SpectrogramStrip,
     TimeAxis,
     TraceView,
+    _fold_max,
+    _stage_runs,
 )
 
 SFREQ = 100.0
@@ -42,14 +48,17 @@ class FakeProvider:
 
     def __init__(self) -> None:
         self.calls: list[tuple[float, float]] = []
+        self.picks: list[list[int] | None] = []
 
-    def get_slice(self, start_s: float, stop_s: float):
+    def get_slice(self, start_s: float, stop_s: float, picks=None, cache=True):
         self.calls.append((start_s, stop_s))
+        self.picks.append(None if picks is None else list(picks))
         start = max(0, int(round(max(0.0, start_s) * SFREQ)))
         stop = min(int(DURATION * SFREQ), int(round(min(DURATION, stop_s) * SFREQ)))
         n = max(0, stop - start)
         times = (start + np.arange(n)) / SFREQ
-        return times, np.full((4, n), CONSTANT_VOLTS)
+        rows = len(self.ch_names) if picks is None else len(picks)
+        return times, np.full((rows, n), CONSTANT_VOLTS)
 
 
 @pytest.fixture
@@ -110,6 +119,79 @@ def test_filter_margin_is_fetched_but_trimmed(loaded):
     assert x0.max() <= 30.0
 
 
+def test_only_the_visible_channels_are_read(loaded):
+    view, provider = loaded
+    view.set_visible_channels([3, 1])
+    assert provider.picks[-1] == [3, 1]
+    _, y0 = view._curves[0].getData()
+    emg = CONSTANT_VOLTS * 1e6 / DEFAULT_TYPE_SCALES["emg"]
+    assert y0 == pytest.approx(emg)  # lane 0 is the EMG, on its own scale
+
+
+def test_only_the_lanes_on_screen_are_read_and_drawn(loaded):
+    view, provider = loaded
+    view.set_lanes_shown(2)
+    assert len(view._curves) == 2
+    assert view.on_screen_indices == [0, 1]
+    assert provider.picks[-1] == [0, 1]
+    view.set_lane_offset(2)
+    assert provider.picks[-1] == [2, 3]
+    # The lanes keep their places on screen; their labels follow the channels.
+    ticks = view.getPlotItem().getAxis("left")._tickLevels[0]
+    assert ticks == [(0, "EOG"), (-1, "EMG")]
+    _, y1 = view._curves[1].getData()
+    emg = CONSTANT_VOLTS * 1e6 / DEFAULT_TYPE_SCALES["emg"]
+    assert y1 == pytest.approx(-1 + emg)
+
+
+def test_lane_scrolling_reuses_the_curves_and_stays_in_range(loaded, qtbot):
+    view, _ = loaded
+    view.set_lanes_shown(3)
+    curves = list(view._curves)
+    with qtbot.waitSignal(view.lanesChanged):
+        view.scroll_lanes(5)
+    assert view.lane_offset == 1  # the last lane is at the bottom, no further
+    assert view._curves == curves
+    view.scroll_lanes(-5)
+    assert view.lane_offset == 0
+    view.set_visible_channels([3])  # fewer channels than lanes: all on screen
+    assert (view.lane_offset, view.on_screen_indices) == (0, [3])
+    view.set_lanes_shown(None)
+    assert len(view._curves) == 1
+
+
+def test_a_filtered_cache_serves_windows_without_reading(loaded, tmp_path):
+    view, provider = loaded
+    spec = dsp.FilterSpec(lowpass=10.0)
+    view.set_decimation_enabled(False)
+    view.set_spec(spec)
+    cache = filtercache.create_filtered_cache(
+        provider, tmp_path / "filtered", (0, 1, 2, 3), (spec,) * 4
+    )
+    view.set_filtered_cache(filtercache.build_filtered_cache(provider, cache))
+    calls = len(provider.calls)
+    view.set_window_start(10.0)
+    assert len(provider.calls) == calls  # a slice of the cache, no read
+    _, y0 = view._curves[0].getData()
+    assert y0 == pytest.approx(0.5, abs=1e-3)
+    view.set_spec(dsp.FilterSpec(lowpass=20.0))  # not what was cached: read it
+    assert len(provider.calls) > calls
+    view.set_provider(FakeProvider())  # a new recording drops the cache
+    assert view.filtered_cache is None
+
+
+def test_the_trace_pipeline_runs_in_float32_by_default(loaded):
+    view, _ = loaded
+    assert view.float32_enabled
+    _, lanes = view._lane_traces()
+    assert all(entry.values.dtype == np.float32 for entry in lanes)
+    view.set_float32_enabled(False)
+    _, lanes = view._lane_traces()
+    assert all(entry.values.dtype == np.float64 for entry in lanes)
+    _, y0 = view._curves[0].getData()
+    assert y0 == pytest.approx(0.5)  # the same picture either way
+
+
 # ----- windowing ------------------------------------------------------------------
 
 
@@ -158,9 +240,9 @@ def test_annotations_draw_regions_and_lines_in_window_only(loaded):
         ]
     )
     items = view._annotation_items
-    assert len(items) == 2
+    assert len(items) == 1
     assert isinstance(items[0], pg.LinearRegionItem)
-    assert isinstance(items[1], pg.InfiniteLine)
+    assert list(view._annotation_ticks.seconds) == [10.0]  # the point, batched
 
 
 def test_click_hit_testing_prefers_the_inner_annotation(loaded):
@@ -176,6 +258,21 @@ def test_click_hit_testing_prefers_the_inner_annotation(loaded):
     assert view._annotation_at(29.0) == -1
 
 
+def test_edits_update_the_time_index_in_place(loaded):
+    view, _ = loaded
+    marks = [Annotation(5.0, 2.0, "region"), Annotation(40.0, 0.0, "late")]
+    view.set_annotations(marks)
+    index = view._annotation_index
+    point = Annotation(10.0, 0.0, "point")
+    view.set_annotations(ann.insert(marks, point), selected=1)
+    assert view._annotation_index is index and len(index) == 3
+    assert view.annotations_between(0.0, 30.0) == [marks[0], point]
+    assert list(view._annotation_ticks._styles) == [1]  # the selected pen
+    view.set_annotations(ann.remove(view.annotations, 0))
+    assert view.annotations_between(0.0, 30.0) == [point]
+    assert len(index) == 2
+
+
 def test_point_annotations_get_click_tolerance(loaded):
     view, _ = loaded
     view.set_annotations([Annotation(10.0, 0.0, "mark")])
@@ -220,9 +317,10 @@ def test_overlays_redraw_on_scroll(loaded):
     view.set_overlays(
         [RaterOverlay("alice", [Annotation(40.0, 0.0, "late")], (230, 159, 0), True)]
     )
-    assert view._overlay_items == []  # 40 s mark is outside the 0–30 s window
+    assert view._overlay_ticks.seconds.size == 0  # 40 s is outside the 0–30 s window
     view.set_window_start(35.0)
-    assert len(view._overlay_items) == 1  # now in view
+    assert list(view._overlay_ticks.seconds) == [40.0]  # now in view
+    assert view._overlay_ticks.tooltip_at(40.0) == "alice: late"
 
 
 def test_set_provider_clears_overlays(loaded):
@@ -230,10 +328,34 @@ def test_set_provider_clears_overlays(loaded):
     view.set_overlays(
         [RaterOverlay("alice", [Annotation(5.0, 0.0, "x")], (230, 159, 0), True)]
     )
-    assert view._overlay_items
+    assert view._overlay_ticks.seconds.size
     view.set_provider(FakeProvider())
     assert view._overlays == []
+    assert view._overlay_ticks.seconds.size == 0
+
+
+def test_crowded_marks_switch_to_a_density_track_and_back(loaded):
+    view, _ = loaded
+    cues = [Annotation(i * 0.05, 0.0, "cue") for i in range(500)]  # 0–25 s
+    view.set_annotations([*cues, Annotation(40.0, 2.0, "late")])
+    view.set_overlays(
+        [RaterOverlay("alice", [Annotation(12.01, 1.0, "a")], (230, 159, 0), True)]
+    )
+    density = view._mark_density
+    assert [row.name for row in density.rows] == ["Annotations", "alice"]
+    assert density.rows[0].counts.size == view._plot_pixels()  # a column per pixel
+    assert density.rows[0].counts.sum() == 500
+    # Neither marks layer draws one item per mark under the track.
+    assert view._annotation_ticks.seconds.size == 0
     assert view._overlay_items == []
+    extent = density._extent()
+    assert extent is not None
+    assert density.tooltip_at(12.01, extent[0] + 1e-6) == "alice: 1 mark"
+    assert density.tooltip_at(27.0, extent[1] - 1e-6) == ""  # no cues after 25 s
+    view.grab()  # paints through the cached picture
+    view.set_window_start(30.0)  # past the crowd: one item per mark again
+    assert density.rows == []
+    assert len(view._annotation_items) == 1
 
 
 # ----- session-log overlay (#125) -------------------------------------------
@@ -249,16 +371,59 @@ def test_log_marks_draw_only_inside_the_window(loaded):
     view, _ = loaded
     view.set_log_marks([_log_mark(5.0), _log_mark(15.0), _log_mark(45.0, "WARNING")])
     # The 0–30 s window holds the first two; the 45 s mark is offscreen.
-    assert len(view._log_items) == 2
-    assert all(isinstance(item, pg.InfiniteLine) for item in view._log_items)
+    assert list(view._log_ticks.seconds) == [5.0, 15.0]
 
 
 def test_log_marks_redraw_on_scroll(loaded):
     view, _ = loaded
     view.set_log_marks([_log_mark(45.0)])
-    assert view._log_items == []  # outside the 0–30 s window
+    assert view._log_ticks.seconds.size == 0  # outside the 0–30 s window
     view.set_window_start(35.0)
-    assert len(view._log_items) == 1
+    assert list(view._log_ticks.seconds) == [45.0]
+
+
+def test_batched_ticks_find_their_tooltips_by_time(loaded):
+    view, _ = loaded
+    view.set_log_marks(
+        [
+            _log_mark(5.0, "INFO", "cue A"),
+            _log_mark(5.0, "WARNING", "late"),
+            _log_mark(15.0, "NOTICE", "odd level"),
+        ]
+    )
+    ticks = view._log_ticks
+    assert list(ticks._styles) == [1, 2, 5]  # INFO, WARNING, the default pen
+    assert ticks.tooltip_at(5.0) == "cue A\nlate"
+    assert ticks.tooltip_at(15.0 + 2 * ticks.pixelWidth()) == "odd level"
+    assert ticks.tooltip_at(10.0) == ""
+
+    class Hover:
+        def isExit(self):
+            return False
+
+        def pos(self):
+            return QtCore.QPointF(15.0, 0.0)
+
+    ticks.hoverEvent(Hover())
+    assert ticks.toolTip() == "odd level"
+    extent = ticks._extent()
+    assert extent is not None
+    view_rect = ticks.viewRect()
+    assert extent[0] == pytest.approx(view_rect.top() + 0.92 * view_rect.height())
+    view.grab()  # paints through the cached picture
+
+
+def test_a_crowded_log_is_counted_per_level(loaded):
+    view, _ = loaded
+    view.set_log_marks(
+        [_log_mark(i * 0.05, "WARNING" if i % 10 else "ERROR") for i in range(400)]
+    )
+    assert view._log_ticks.seconds.size == 0
+    rows = view._log_density.rows
+    assert [row.name for row in rows] == ["WARNING", "ERROR"]
+    assert [int(row.counts.sum()) for row in rows] == [360, 40]
+    view.set_window_start(30.0)  # an empty stretch: no track, no ticks
+    assert view._log_density.rows == []
 
 
 def test_log_marks_are_not_click_selectable(loaded):
@@ -282,10 +447,10 @@ def test_set_log_marks_arms_the_lane_slide(loaded):
 def test_set_provider_clears_log_marks(loaded):
     view, _ = loaded
     view.set_log_marks([_log_mark(5.0)])
-    assert view._log_items
+    assert view._log_ticks.seconds.size
     view.set_provider(FakeProvider())
     assert view._log_marks == []
-    assert view._log_items == []
+    assert view._log_ticks.seconds.size == 0
 
 
 def test_pick_mode_emits_time_instead_of_selecting(loaded):
@@ -410,12 +575,12 @@ class StimProvider(FakeProvider):
     ch_names = ["C3", "TRIG"]
     ch_types = ["eeg", "stim"]
 
-    def get_slice(self, start_s: float, stop_s: float):
+    def get_slice(self, start_s: float, stop_s: float, picks=None, cache=True):
         times, _data = super().get_slice(start_s, stop_s)
         data = np.vstack(
             [np.full(times.shape, CONSTANT_VOLTS), np.full(times.shape, 255.0)]
         )
-        return times, data
+        return times, data if picks is None else data[list(picks)]
 
 
 def test_stim_channels_are_fit_to_their_own_lane(view):
@@ -662,6 +827,96 @@ def test_epoch_grid_can_be_hidden(loaded):
     assert len(view._epoch_items) == 2
 
 
+def test_scrolling_reuses_the_overlay_items(loaded):
+    view, _ = loaded
+    view.set_window_seconds(10.0)
+    view.set_epoch_seconds(5.0)
+    view.set_annotations(
+        [Annotation(t, d, "m") for t in range(0, 60, 4) for d in (0.0, 1.0)]
+    )
+    view.set_window_start(0.0)
+    scene = view.scene()
+    before = set(scene.items())
+    for start in (10.0, 20.0, 35.0, 50.0, 0.0):
+        view.set_window_start(start)
+    assert set(scene.items()) == before  # moved and relabelled, none replaced
+    # A hidden line skips relabels, so a reused gridline is shown first.
+    view.set_epochs_visible(False)
+    view.set_window_start(20.0)
+    view.set_epochs_visible(True)
+    labels = sorted(view._epoch_items, key=lambda line: line.value())
+    assert [line.label.toPlainText() for line in labels] == ["5", "6", "7"]
+
+
+def test_a_bare_view_refreshes_on_every_change(loaded):
+    view, _ = loaded
+    requested, run = view.refresh_stats
+    view.set_window_start(10.0)
+    view.set_annotations([Annotation(12.0, 0.0, "m")])
+    assert view.refresh_stats == (requested + 2, run + 2)
+    assert view.getViewBox().viewRange()[0][0] == pytest.approx(10.0)
+
+
+def test_coalescing_draws_the_latest_state_once_per_frame(loaded, qtbot, caplog):
+    view, provider = loaded
+    view.set_refresh_coalescing(True)
+    requested, run = view.refresh_stats
+    calls = len(provider.calls)
+    x_range = view.getViewBox().viewRange
+    with caplog.at_level("DEBUG", logger="smacc"):
+        for _ in range(10):  # a held arrow key
+            view.scroll_by(0.1)
+        view.set_annotations([Annotation(45.0, 0.0, "m")])
+        assert view.window_start == pytest.approx(30.0)  # the state moved at once
+        assert len(provider.calls) == calls  # nothing read or drawn yet
+        assert view.refresh_pending
+        assert x_range()[0][0] == pytest.approx(0.0)
+        qtbot.waitUntil(lambda: view.refresh_stats[1] == run + 1)
+    assert view.refresh_stats[0] == requested + 11
+    assert x_range()[0][0] == pytest.approx(30.0)  # the latest window, in one go
+    assert list(view._annotation_ticks.seconds) == [45.0]
+    assert "11 refresh requests coalesced into one (10 frames dropped" in caplog.text
+    view.scroll_by(-0.1)
+    view.set_refresh_coalescing(False)  # draws what is pending
+    assert view.refresh_stats[1] == run + 2
+    assert view.window_start == pytest.approx(27.0)
+
+
+def test_fast_scrolling_previews_then_refines_once_idle(loaded, qtbot, caplog):
+    view, _ = loaded
+    view.set_spec(dsp.FilterSpec(highpass=0.5))  # full rate: nothing to decimate
+    view.set_refresh_coalescing(True)
+    view.set_progressive_refresh(True)
+
+    def points() -> int:
+        return len(view._curves[0].getData()[0])
+
+    full = points()
+    view._full_refresh_ms = 0.1  # measured well inside a frame: never a preview
+    for _ in range(2):
+        view.scroll_by(0.1)
+        view.flush_refresh()
+    assert points() == full
+    view._full_refresh_ms = 1e3  # measured far slower than a frame
+    with caplog.at_level("DEBUG", logger="smacc"):
+        view.scroll_by(0.1)
+        view.flush_refresh()  # right behind the last refresh: still scrolling
+        assert points() < full  # unfiltered, decimated to the screen
+        assert view._curves[0].getData()[1] == pytest.approx(0.0, abs=1e-6)  # centred
+        qtbot.waitUntil(lambda: points() == full, timeout=2000)
+    assert view.getViewBox().viewRange()[0][0] == pytest.approx(9.0)
+    assert "previews while scrolling: 1, refined" in caplog.text
+
+
+def test_a_wide_window_thins_the_grid_to_every_nth_epoch(loaded, monkeypatch):
+    view, _ = loaded
+    monkeypatch.setattr("smacc.eeg.view._MAX_EPOCH_LINES", 3)
+    view.set_epoch_seconds(5.0)  # 60 s file, 30 s window → 7 boundaries
+    view.set_window_start(0.0)
+    assert _epoch_boundaries(view) == pytest.approx([0.0, 15.0, 30.0])
+    assert _epoch_numbers(view) == ["1", "4", "7"]
+
+
 def test_new_recording_resets_the_anchor(loaded):
     view, provider = loaded
     view.set_epoch_anchor(12.0)
@@ -747,6 +1002,138 @@ def test_effective_spec_and_scale_fall_back_to_the_base(loaded):
     assert view.effective_spec("eog") == dsp.FilterSpec(notch=50.0)
 
 
+# ----- read-ahead ---------------------------------------------------------------
+
+
+@pytest.fixture
+def prefetching(loaded):
+    view, provider = loaded
+    view.set_prefetch_enabled(True)
+    yield view, provider
+    view.set_prefetch_enabled(False)
+
+
+def test_the_next_page_is_served_from_the_read_ahead_cache(prefetching):
+    view, provider = prefetching
+    view.step_epochs(1)  # 0 → 30 s: the worker reads ahead in that direction
+    assert view._prefetcher.wait_idle(timeout=5.0)
+    view.set_window_start(0.0)  # back a page: read ahead too
+    hits, _ = view.prefetch_stats
+    provider.calls.clear()
+    view.step_epochs(1)
+    assert provider.calls == []  # no read on the GUI thread
+    assert view.prefetch_stats[0] == hits + 1
+
+
+def test_a_filter_change_misses_instead_of_serving_stale_data(prefetching):
+    view, _ = prefetching
+    assert view._prefetcher.wait_idle(timeout=5.0)
+    _, misses = view.prefetch_stats
+    view.set_spec(dsp.FilterSpec(highpass=0.5))
+    assert view.prefetch_stats[1] == misses + 1
+
+
+def test_a_new_recording_starts_a_fresh_cache(prefetching):
+    view, _ = prefetching
+    old = view._window_cache
+    view.set_provider(FakeProvider())
+    assert view._window_cache is not old
+
+
+def test_read_ahead_is_off_by_default(loaded):
+    view, _ = loaded
+    assert view._prefetcher is None
+    assert view.prefetch_stats == (0, 0)
+
+
+def test_a_small_scroll_reads_only_the_new_edge(loaded):
+    view, provider = loaded
+    view.set_window_seconds(20.0)
+    provider.calls.clear()
+    view.scroll_by(0.1)  # 2 s of new data
+    (fetch_lo, fetch_hi) = provider.calls[-1]
+    assert fetch_hi - fetch_lo == pytest.approx(2.0 + 2 * 1.0, abs=0.05)  # + margin
+    x0, y0 = view._curves[0].getData()
+    assert y0 == pytest.approx(0.5)  # the same picture as a whole refetch
+    assert (x0[0], x0[-1]) == pytest.approx((2.0, 22.0))
+    assert np.all(np.diff(x0) > 0)  # no repeated or missing sample at the seam
+    assert x0.size == 2001
+
+
+def test_a_lowpassed_window_is_decimated_to_the_screen(loaded):
+    view, _ = loaded
+    view.resize(400, 500)
+    view.set_window_seconds(60.0)
+    full = view._curves[0].getData()[0].size
+    view.set_spec(dsp.FilterSpec(lowpass=10.0))
+    factor = view._decimation_factor()
+    assert factor > 1
+    x0, y0 = view._curves[0].getData()
+    assert x0.size == pytest.approx(full / factor, abs=2)
+    assert y0 == pytest.approx(0.5, abs=1e-3)  # a constant survives decimation
+    view.set_decimation_enabled(False)
+    assert view._curves[0].getData()[0].size == full
+
+
+def test_a_channel_without_lowpass_keeps_the_full_rate(loaded):
+    view, _ = loaded
+    view.set_window_seconds(60.0)
+    view.set_spec(dsp.FilterSpec(lowpass=10.0))
+    view.set_type_spec("emg", dsp.FilterSpec(highpass=10.0))
+    assert view._decimation_factor() == 1
+
+
+# ----- overview pyramid -----------------------------------------------------------
+
+
+@pytest.fixture
+def overview(loaded, tmp_path, monkeypatch):
+    """The loaded view with a pyramid and a 100 px plot (60 samples per pixel)."""
+    from smacc.eeg.pyramid import build_pyramid
+
+    view, provider = loaded
+    monkeypatch.setattr(view, "_plot_pixels", lambda: 100)
+    pyr = build_pyramid(provider, tmp_path / "pyramid")
+    view.set_window_seconds(60.0)
+    view.set_pyramid(pyr)
+    return view, provider
+
+
+def test_wide_windows_draw_from_the_pyramid_not_the_file(overview):
+    view, provider = overview
+    provider.calls.clear()
+    view.set_window_start(0.0)
+    assert provider.calls == []  # no full-rate read for a zoomed-out window
+    assert view._overview_factor() == 32  # coarsest level with ≥ 1 bucket/pixel
+    x, y = view._curves[0].getData()
+    assert x.size == 2 * math.ceil(6000 / 32)  # a min and a max per bucket
+    assert y == pytest.approx(0.5)  # same lane scaling as the full-rate path
+
+
+def test_narrow_windows_still_read_full_rate(overview):
+    view, provider = overview
+    provider.calls.clear()
+    view.set_window_seconds(1.0)  # 100 samples over 100 px: below the finest level
+    assert view._overview_factor() is None
+    assert provider.calls
+
+
+def test_a_pyramid_for_another_recording_is_ignored(loaded, tmp_path):
+    from smacc.eeg.pyramid import build_pyramid
+
+    view, _ = loaded
+    other = FakeProvider()
+    other.duration = 30.0  # a shorter night: a different recording's shape
+    view.set_pyramid(build_pyramid(other, tmp_path / "pyramid"))
+    assert view._pyramid is None
+
+
+def test_set_provider_drops_the_pyramid(overview):
+    view, _ = overview
+    view.set_provider(FakeProvider())
+    assert view._pyramid is None
+
+
 # ----- snapshot for figure export (#180) ------------------------------------------
 
 
@@ -773,6 +1160,21 @@ def test_build_snapshot_traces_match_the_visible_channels(loaded):
     assert np.allclose(snap.traces[0].values, 0.5)
     assert np.allclose(snap.traces[1].values, 0.25)
     assert (snap.traces[0].scale_uv, snap.traces[1].scale_uv) == (100.0, 200.0)
+    assert snap.traces[0].values.dtype == np.float32
+
+
+def test_build_snapshot_exports_every_visible_channel_not_just_those_on_screen(
+    loaded,
+):
+    view, provider = loaded
+    view.set_visible_channels([3, 0, 2])
+    view.set_lanes_shown(2)
+    view.set_lane_offset(1)
+    snap = view.build_snapshot(marks=[], show_epochs=False)
+    assert [t.name for t in snap.traces] == ["EMG", "C3", "EOG"]
+    assert [t.lane for t in snap.traces] == [0, 1, 2]
+    assert provider.picks[-1] == [3, 0, 2]
+    assert view.on_screen_indices == [0, 2]  # the screen itself is unchanged
 
 
 def test_build_snapshot_marks_are_window_relative_and_relabeled(loaded):
@@ -892,3 +1294,85 @@ def test_strip_paints_without_crashing(qtbot):
     strip.set_data(600.0, [StageEpoch(0.0, 30.0, "N2")], {"N2": (74, 144, 200)})
     strip.set_window(30.0, 30.0)
     strip.repaint()  # exercise paintEvent (cells + window marker)
+
+
+def test_strip_merges_back_to_back_epochs_of_one_stage():
+    epochs = [
+        StageEpoch(60.0, 30.0, "N3"),  # out of order: sorted first
+        StageEpoch(0.0, 30.0, "N2"),
+        StageEpoch(30.0, 30.0, "N2"),
+        StageEpoch(120.0, 30.0, "N3"),  # a gap at 90 s breaks the run
+    ]
+    assert _stage_runs(epochs) == [
+        (0.0, 60.0, "N2"),
+        (60.0, 90.0, "N3"),
+        (120.0, 150.0, "N3"),
+    ]
+
+
+def test_strip_reuses_its_cells_while_paging(qtbot):
+    strip = HypnogramStrip()
+    qtbot.addWidget(strip)
+    strip.resize(600, 30)
+    strip.set_data(600.0, [StageEpoch(0.0, 30.0, "N2")], {"N2": (74, 144, 200)})
+    strip.grab()  # paint offscreen
+    cells = strip._cells
+    assert cells is not None
+    strip.set_window(30.0, 30.0)
+    strip.grab()
+    assert strip._cells is cells  # only the bracket moved
+    strip.set_data(600.0, [StageEpoch(0.0, 30.0, "W")], {"W": (230, 230, 230)})
+    strip.grab()
+    assert strip._cells is not cells  # new scoring, new cells
+    cells = strip._cells
+    strip.resize(300, 30)
+    strip.grab()
+    assert strip._cells is not cells
+
+
+def test_spectrogram_strip_fills_in_as_the_build_advances(qtbot, tmp_path):
+    strip = SpectrogramStrip()
+    qtbot.addWidget(strip)
+    strip.resize(600, 48)
+    provider = FakeProvider()  # two 30 s epochs
+    csa = spectrogram.create_spectrogram(provider, tmp_path / "csa", [0, 1])
+    strip.set_spectrogram(DURATION, csa)
+    blank = strip.grab().toImage()
+    cells = strip._cells
+    strip.refresh()
+    assert strip._cells is cells  # nothing new computed: nothing redrawn
+    spectrogram.build_spectrogram(provider, csa)
+    strip.refresh()
+    assert strip._cells is None
+    filled = strip.grab().toImage()
+    assert filled.pixelColor(10, 24) != blank.pixelColor(10, 24)
+    strip.set_spectrogram(DURATION, None)
+    assert strip.grab().toImage().pixelColor(10, 24) == blank.pixelColor(10, 24)
+
+
+def test_quality_strip_folds_rows_without_losing_a_flag():
+    codes = np.zeros((256, 960), dtype=np.uint8)
+    codes[201, 17] = quality.CLIPPING
+    codes[5, 500] = quality.NOISY
+    folded = _fold_max(codes, 40, 1600)  # wide enough: columns kept
+    assert folded.shape == (40, 960)
+    assert folded[201 * 40 // 256, 17] == quality.CLIPPING
+    assert folded[0, 500] == quality.NOISY
+    assert np.count_nonzero(folded) == 2
+    assert _fold_max(codes, 40, 100).max() == quality.CLIPPING
+
+
+def test_quality_strip_names_the_flagged_cell_under_the_mouse(qtbot, tmp_path):
+    strip = QualityStrip()
+    qtbot.addWidget(strip)
+    strip.resize(600, 40)
+    provider = FakeProvider()  # constant: every channel flat in both epochs
+    qmap = quality.create_quality_map(provider, tmp_path / "q", [0, 2])
+    strip.set_quality(DURATION, qmap, provider.ch_names)
+    strip.grab()
+    assert strip.tooltip_at(450.0, 30.0) == ""  # nothing computed yet
+    quality.build_quality_map(provider, qmap)
+    strip.refresh()
+    strip.grab()
+    assert strip.tooltip_at(450.0, 30.0) == "EOG, epoch 2: flat"
+    assert strip.tooltip_at(10.0, 5.0) == "C3, epoch 1: flat"
@@ -27,9 +27,12 @@ from smacc.eeg import align, blind, dsp
 from smacc.eeg import window as window_mod
 from smacc.eeg.__main__ import (
     pick_blind_spec,
+    pick_detector_specs,
     pick_log_path,
     pick_rater_id,
     pick_recording_path,
+    pick_workers,
+    run_detection,
 )
 from smacc.eeg.annotations import (
     Annotation,
@@ -66,20 +69,37 @@ class FakeRecording:
     duration = DURATION
     meas_date = MEAS_DATE
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, **options: object) -> None:
         self.path = Path(path)
 
-    def get_slice(self, start_s: float, stop_s: float):
+    def get_slice(self, start_s: float, stop_s: float, picks=None, cache=True):
         start = max(0, int(round(max(0.0, start_s) * SFREQ)))
         stop = min(int(DURATION * SFREQ), int(round(min(DURATION, stop_s) * SFREQ)))
         n = max(0, stop - start)
-        return (start + np.arange(n)) / SFREQ, np.zeros((4, n))
+        rows = len(self.ch_names) if picks is None else len(picks)
+        return (start + np.arange(n)) / SFREQ, np.zeros((rows, n))
+
+
+def _run_jobs_inline(monkeypatch) -> None:
+    """Run background jobs synchronously, on the test's (GUI) thread.
+
+    A worker thread allocating Python objects can trigger a garbage collection
+    there, and collecting an earlier test's unreferenced Qt wrappers off the GUI
+    thread deletes scene items mid-paint (a native crash). Inline, the signals
+    fire as direct calls before ``start`` returns, so tests are deterministic too.
+    """
+    monkeypatch.setattr(
+        window_mod.jobs.BackgroundJob, "start", lambda self: self._run()
+    )
 
 
 @pytest.fixture
 def window(qtbot, tmp_path, monkeypatch):
     """An EegAnnotatorWindow over faked IO, isolated prefs, and silent dialogs."""
     monkeypatch.setattr(window_mod, "preferences_path", tmp_path / "prefs.yaml")
+    # Derived caches (the overview pyramid) go to a temp dir, never ~/SMACC.
+    monkeypatch.setattr(window_mod, "EEG_CACHE_DIR", tmp_path / "cache")
+    _run_jobs_inline(monkeypatch)
     monkeypatch.setattr(window_mod.io, "open_recording", FakeRecording)
     monkeypatch.setattr(window_mod.io, "embedded_annotations", lambda rec: [])
     # Auto-align (#125c) reads the recording's embedded triggers on every log
@@ -133,6 +153,132 @@ def test_loading_enables_the_window_and_shows_the_file(window, recording_path):
     assert window.scrollBar.maximum() == int((DURATION - 30) * 10)
 
 
+def test_loading_builds_the_overview_pyramid_in_the_background(window, recording_path):
+    window._load(recording_path)  # jobs run inline here (see _run_jobs_inline)
+    assert window.view._pyramid is not None
+    assert "pyramid" not in window._builds
+    # Reopening the same, unchanged file reuses the cached pyramid at once.
+    window._load(recording_path)
+    assert window.view._pyramid is not None
+    assert "pyramid" not in window._builds
+
+
+def test_a_replaced_builds_queued_signals_are_dropped(window, monkeypatch):
+    started: list = []
+    monkeypatch.setattr(
+        window_mod.jobs.BackgroundJob, "start", lambda job: started.append(job)
+    )
+    built: list[str] = []
+    for _ in range(2):
+        window._start_build(
+            "test",
+            lambda report, cancelled: None,
+            "Testing",
+            "test",
+            built=built.append,
+        )
+    stale, current = started
+    stale.progressed.emit(0.5)  # queued before it was replaced
+    stale.finished.emit("stale")
+    assert built == [] and window._builds["test"].job is current
+    current.progressed.emit(0.5)
+    assert window.statusBar().currentMessage() == "Testing… 50%"
+    current.failed.emit("disk full")
+    assert "test" not in window._builds
+    assert window.statusBar().currentMessage() == "Could not test: disk full"
+
+
+def test_the_filtered_cache_is_built_for_the_chosen_filter(window, recording_path):
+    window._load(recording_path)
+    window.lowpassSpin.setValue(30.0)
+    assert window.view.filtered_cache is None  # opt-in: off by default
+    window.filteredCacheCheck.setChecked(True)
+    assert window._filtered_cache_timer.isActive()  # debounced
+    window._filtered_cache_timer.stop()
+    window._start_filtered_cache()  # the job runs inline here
+    built = window.view.filtered_cache
+    assert built is not None and built.complete
+    assert "filtered-cache" not in window._builds
+    # Hiding a channel keeps the cache; a new filter builds another one.
+    window.view.set_visible_channels([0, 1])
+    window._start_filtered_cache()
+    assert window.view.filtered_cache is built
+    window.lowpassSpin.setValue(20.0)
+    window._filtered_cache_timer.stop()
+    window._start_filtered_cache()
+    assert window.view.filtered_cache is not built
+    assert window.view.filtered_cache.specs[0].lowpass == 20.0
+
+
+def test_the_spectrogram_strip_is_built_once_and_reused(window, recording_path):
+    window._load(recording_path)
+    assert window.spectrogramStrip.isHidden()  # opt-in: off by default
+    window.spectrogramCheck.setChecked(True)  # the job runs inline here
+    assert not window.spectrogramStrip.isHidden()
+    built = window.spectrogramStrip.spectrogram
+    assert built is not None and built.complete
+    assert built.channels == (0, 1)  # the recording's EEG channels
+    assert "spectrogram" not in window._builds
+    # Reopening the same, unchanged file loads the cached CSA at once.
+    window._load(recording_path)
+    assert "spectrogram" not in window._builds
+    reloaded = window.spectrogramStrip.spectrogram
+    assert reloaded is not None and reloaded is not built
+    assert reloaded.directory == built.directory
+    window.spectrogramCheck.setChecked(False)
+    assert window.spectrogramStrip.isHidden()
+    assert window.spectrogramStrip.spectrogram is None
+
+
+def test_the_quality_map_flags_epochs_to_step_through(window, recording_path):
+    window._load(recording_path)
+    assert window.qualityStrip.isHidden()  # opt-in: off by default
+    window.qualityCheck.setChecked(True)  # the job runs inline here
+    assert not window.qualityStrip.isHidden()
+    built = window.qualityStrip.quality
+    assert built is not None and built.complete
+    assert "quality" not in window._builds
+    # The fake recording is all zeros: every epoch is flat, so ] walks them all.
+    assert built.bad_epochs().tolist() == list(range(20))
+    window._jump_to_flagged_epoch(1)
+    assert window.view.window_start == pytest.approx(30.0)
+    window._jump_to_flagged_epoch(1)
+    assert window.view.window_start == pytest.approx(60.0)
+    window._jump_to_flagged_epoch(-1)
+    assert window.view.window_start == pytest.approx(30.0)
+    window.qualityCheck.setChecked(False)
+    assert window.qualityStrip.quality is None
+
+
+def test_detectors_run_in_the_background_into_an_overlay(
+    window, recording_path, monkeypatch
+):
+    monkeypatch.setattr(window_mod.detect, "default_workers", lambda: 1)
+    window._load(recording_path)
+    assert window.detectButton.isEnabled()
+    window._run_detectors([window_mod.detect.BUILTIN["spindles"]])  # inline here
+    assert window._detect_job is None
+    assert window.detectButton.text() == "Detect…"
+    tsv, _ = rater_sidecar_paths(recording_path, "auto-spindles")
+    assert tsv.is_file()
+    assert [layer[0] for layer in window._rater_layers] == ["auto-spindles"]
+
+
+def test_the_lane_scrollbar_pages_a_virtualized_montage(window, recording_path):
+    window._load(recording_path)
+    assert window.laneScrollBar.isHidden()  # every lane fits by default
+    total = len(window.view.visible_indices)
+    window.lanesSpin.setValue(1)
+    assert not window.laneScrollBar.isHidden()
+    assert window.laneScrollBar.maximum() == total - 1
+    window.laneScrollBar.setValue(1)
+    assert window.view.lane_offset == 1
+    window.view.scroll_lanes(-1)
+    assert window.laneScrollBar.value() == 0
+    window.lanesSpin.setValue(0)
+    assert window.laneScrollBar.isHidden()
+
+
 def test_fresh_review_seeds_from_embedded_events(window, recording_path, monkeypatch):
     embedded = [Annotation(1.0, 0.0, "Cue started: Piano")]
     monkeypatch.setattr(window_mod.io, "embedded_annotations", lambda rec: embedded)
@@ -159,6 +305,106 @@ def test_existing_sidecar_wins_over_embedded_events(
     assert window._annotations == saved
 
 
+def _hold_open_jobs(monkeypatch) -> list:
+    """Queue the open's jobs for the test to run by hand; run every other inline."""
+    started: list = []
+
+    def start(job) -> None:
+        if job._name.startswith("eeg-open"):
+            started.append(job)
+        else:
+            job._run()
+
+    monkeypatch.setattr(window_mod.jobs.BackgroundJob, "start", start)
+    return started
+
+
+def test_recording_shows_before_its_embedded_events_arrive(
+    window, recording_path, monkeypatch
+):
+    # The header job hands over the recording; the events, triggers and peer
+    # sidecars follow from a second job and merge in when it lands.
+    started = _hold_open_jobs(monkeypatch)
+    embedded = [Annotation(1.0, 0.0, "Cue started: Piano")]
+    monkeypatch.setattr(window_mod.io, "embedded_annotations", lambda rec: embedded)
+    window._load(recording_path)
+    assert window._recording is None
+    started.pop()._run()  # the header
+    assert window._recording is not None and window.saveButton.isEnabled()
+    assert window._annotations == [] and window._embedded_triggers is None
+    started.pop()._run()  # the events, triggers and peers
+    assert window._annotations == embedded
+    assert window._embedded_triggers == []
+    assert not window._dirty
+
+
+def test_a_new_open_drops_the_one_in_flight(window, tmp_path, monkeypatch):
+    started = _hold_open_jobs(monkeypatch)
+    first, second = tmp_path / "night1.edf", tmp_path / "night2.edf"
+    window._load(first)
+    window._load(second)
+    stale, current = started
+    started.clear()
+    current._run()
+    started.pop()._run()  # the second recording's markers
+    stale._run()  # lands late, after being cancelled
+    assert window._recording is not None and window._recording.path == second
+    assert not started  # the stale open started no markers job of its own
+
+
+def test_marks_made_while_an_open_is_in_flight_are_asked_about(
+    window, recording_path, tmp_path, monkeypatch
+):
+    window._load(recording_path)
+    started = _hold_open_jobs(monkeypatch)
+    window._load(tmp_path / "night2.edf")  # confirmed clean; still reading
+    _answer_label(monkeypatch, ("LRLR", False))
+    window._on_region_drawn(10.0, 14.0)  # the reviewer kept working meanwhile
+    asked: list[str] = []
+
+    def cancel(*args, **kwargs):
+        asked.append(args[1])
+        return QtWidgets.QMessageBox.StandardButton.Cancel
+
+    monkeypatch.setattr(QtWidgets.QMessageBox, "question", cancel)
+    started.pop()._run()
+    assert asked == ["Unsaved work"]
+    assert window._recording.path == recording_path  # kept, with the new mark
+    assert window._annotations == [Annotation(10.0, 4.0, "LRLR")]
+    assert window._dirty and not autosave_path(recording_path).is_file()
+    window._write_autosave()
+    assert read_annotations_tsv(autosave_path(recording_path)) == window._annotations
+    monkeypatch.setattr(
+        QtWidgets.QMessageBox,
+        "question",
+        lambda *a, **k: QtWidgets.QMessageBox.StandardButton.Save,
+    )
+    window._load(tmp_path / "night2.edf")
+    _answer_label(monkeypatch, ("Arousal", False))
+    window._on_region_drawn(20.0, 21.0)
+    started.pop()._run()
+    assert window._recording.path == tmp_path / "night2.edf"
+    saved = read_annotations_tsv(sidecar_paths(recording_path)[0])
+    assert Annotation(20.0, 1.0, "Arousal") in saved
+
+
+def test_recovery_is_read_before_the_seed_lands(window, recording_path, monkeypatch):
+    started = _hold_open_jobs(monkeypatch)
+    embedded = [Annotation(1.0, 0.0, "Cue started: Piano")]
+    monkeypatch.setattr(window_mod.io, "embedded_annotations", lambda rec: embedded)
+    crashed = [*embedded, Annotation(7.0, 0.0, "LRLR")]
+    write_annotations_tsv(crashed, autosave_path(recording_path))
+    window._load(recording_path)
+    started.pop()._run()  # the header: the banner is up before the events
+    assert window.recoveryBanner.isVisible()
+    _answer_label(monkeypatch, ("Arousal", False))
+    window._on_region_drawn(20.0, 21.0)
+    window._write_autosave()  # overwrites the file, not what was read from it
+    window._restore_autosave()
+    started.pop()._run()  # the seed lands after the restore: already in it
+    assert window._annotations == crashed
+
+
 def test_corrupt_sidecar_aborts_the_open(window, recording_path, silence_dialogs):
     # The sidecar is the reviewer's data: loading with an empty list would
     # overwrite it on the next save, so the open must refuse instead.
@@ -363,7 +609,7 @@ def test_time_axis_defaults_to_clock_when_the_file_has_a_start(window, recording
 def test_time_axis_defaults_to_elapsed_without_a_start(
     window, recording_path, monkeypatch
 ):
-    def no_date(path):
+    def no_date(path, **options):
         rec = FakeRecording(path)
         rec.meas_date = None  # anonymized: only elapsed/epoch time is meaningful
         return rec
@@ -839,7 +1085,7 @@ def test_open_file_respects_a_cancelled_discard_prompt(
     )
     monkeypatch.setattr(
         QtWidgets.QFileDialog,
-        "getOpenFileName",
+        "getOpenFileNames",
         lambda *a, **k: pytest.fail("the file dialog must not open"),
     )
     window.open_file()  # cancelled prompt: no dialog, annotations intact
@@ -854,13 +1100,57 @@ def test_open_dialog_starts_in_the_last_used_folder(
 
     def fake_dialog(parent, caption, directory, file_filter):
         seen_dirs.append(directory)
-        return "", ""
+        return [], ""
 
-    monkeypatch.setattr(QtWidgets.QFileDialog, "getOpenFileName", fake_dialog)
+    monkeypatch.setattr(QtWidgets.QFileDialog, "getOpenFileNames", fake_dialog)
     window.open_file()
     assert seen_dirs == [str(recording_path.parent)]
 
 
+def test_choosing_several_files_opens_them_as_one_night(window, tmp_path, monkeypatch):
+    parts = [tmp_path / "night1_b.edf", tmp_path / "night1_a.edf"]
+    joined: list[list[Path]] = []
+
+    def open_concatenated(paths, **options):
+        joined.append(list(paths))
+        return FakeRecording(tmp_path / "night1_a+1.edf")
+
+    monkeypatch.setattr(window_mod.io, "open_concatenated", open_concatenated)
+    monkeypatch.setattr(
+        QtWidgets.QFileDialog,
+        "getOpenFileNames",
+        lambda *a, **k: ([str(path) for path in parts], ""),
+    )
+    window.open_file()
+    assert joined == [sorted(parts)]
+    assert window._recording.path.name == "night1_a+1.edf"
+
+
+def test_a_joined_night_is_seeded_with_its_segments_reviews(tmp_path):
+    mne = pytest.importorskip("mne")
+    info = mne.create_info(["C3", "C4"], sfreq=SFREQ, ch_types="eeg", verbose="error")
+    paths = []
+    for index in range(2):
+        raw = mne.io.RawArray(np.zeros((2, 3000)), info, verbose="error")
+        raw.set_meas_date(MEAS_DATE + timedelta(seconds=40 * index))
+        raw.set_annotations(mne.Annotations([5.0], [1.0], ["Arousal"]))
+        paths.append(tmp_path / f"night1_{index}_raw.fif")
+        raw.save(paths[-1], verbose="error")
+    # The second segment was reviewed alone: its arousal moved, a mark added.
+    reviewed = [Annotation(6.0, 1.0, "Arousal"), Annotation(20.0, 0.0, "LRLR")]
+    write_annotations_tsv(reviewed, sidecar_paths(paths[1])[0])
+    night = window_mod.io.open_concatenated(paths)
+    seed = window_mod._seed_joined_night(
+        night, window_mod.io.embedded_annotations(night), sidecar_paths
+    )
+    assert seed == [
+        Annotation(5.0, 1.0, "Arousal"),
+        Annotation(30.0, 10.0, "Discontinuity"),
+        Annotation(46.0, 1.0, "Arousal"),
+        Annotation(60.0, 0.0, "LRLR"),
+    ]
+
+
 def test_trace_click_highlights_the_list_row(window, recording_path, monkeypatch):
     window._load(recording_path)
     _answer_label(monkeypatch, ("Arousal", False))
@@ -962,6 +1252,33 @@ def test_pick_log_path_reads_both_forms():
     assert pick_log_path(["exe", "--log"]) is None  # dangling flag, no value
 
 
+def test_pick_detector_specs_and_workers_read_their_flags():
+    args = ["exe", "--detect", "spindles, k-complexes", "--workers=3", "n.edf"]
+    assert pick_detector_specs(args) == ["spindles", "k-complexes"]
+    assert pick_workers(args) == 3
+    assert pick_recording_path(args) == "n.edf"
+    assert pick_detector_specs(["exe", "n.edf"]) is None
+    assert pick_workers(["exe", "n.edf"]) is None
+    with pytest.raises(ValueError):
+        pick_workers(["exe", "--workers", "0"])
+
+
+def test_detect_runs_headless_and_writes_sidecars(tmp_path, capsys):
+    mne = pytest.importorskip("mne")
+    info = mne.create_info(["C3", "C4"], sfreq=SFREQ, ch_types="eeg", verbose="error")
+    fif = tmp_path / "night_raw.fif"
+    raw = mne.io.RawArray(np.zeros((2, 6000)), info, verbose="error")
+    raw.save(fif, verbose="error")
+    args = ["exe", "--detect", "spindles", "--workers", "1", str(fif)]
+    assert run_detection(args) == 0
+    tsv, _ = rater_sidecar_paths(fif, "auto-spindles")
+    assert read_annotations_tsv(tsv) == []
+    assert "spindles: 0 events" in capsys.readouterr().out
+    assert run_detection(["exe", "--detect", "arousals", str(fif)]) == 2
+    assert run_detection(["exe", "--detect", "spindles"]) == 2  # no recording
+    assert run_detection(["exe", "--detect", "spindles", "missing.xyz"]) == 1
+
+
 def test_pick_rater_id_reads_both_forms():
     assert pick_rater_id(["exe", "--rater", "alice", "night1.edf"]) == "alice"
     assert pick_rater_id(["exe", "--rater=bob", "night1.edf"]) == "bob"
@@ -1062,6 +1379,9 @@ def make_window(qtbot, tmp_path, monkeypatch):
     """Build EegAnnotatorWindows (optionally with a rater id) over the faked IO,
     isolated prefs, and auto-answered dialogs the ``window`` fixture uses."""
     monkeypatch.setattr(window_mod, "preferences_path", tmp_path / "prefs.yaml")
+    # Derived caches (the overview pyramid) go to a temp dir, never ~/SMACC.
+    monkeypatch.setattr(window_mod, "EEG_CACHE_DIR", tmp_path / "cache")
+    _run_jobs_inline(monkeypatch)
     monkeypatch.setattr(window_mod.io, "open_recording", FakeRecording)
     monkeypatch.setattr(window_mod.io, "embedded_annotations", lambda rec: [])
     monkeypatch.setattr(window_mod.io, "recorded_trigger_events", lambda rec: [])
@@ -1071,10 +1391,16 @@ def make_window(qtbot, tmp_path, monkeypatch):
         lambda *a, **k: QtWidgets.QMessageBox.StandardButton.Discard,
     )
 
+    # qtbot only holds weak references; keep every built window alive until
+    # teardown, or a garbage collection right after the test body (mid-paint,
+    # in pytest-qt's event pump) can reap a still-shown window's wrappers.
+    built: list[EegAnnotatorWindow] = []
+
     def build(
         rater_id: str | None = None, blind_spec: str | None = None
     ) -> EegAnnotatorWindow:
         win = EegAnnotatorWindow(rater_id=rater_id, blind_spec=blind_spec)
+        built.append(win)
         qtbot.addWidget(win)
         win.show()
         win._prefs_path = tmp_path / "prefs.yaml"  # test convenience handle
@@ -1808,7 +2134,9 @@ def test_new_recording_re_reads_embedded_triggers(
     window, recording_path, monkeypatch, tmp_path
 ):
     monkeypatch.setattr(
-        window_mod.io, "recorded_trigger_events", lambda rec: ALIGN_TRIGGERS
+        window_mod.io,
+        "recorded_trigger_events",
+        lambda rec: ALIGN_TRIGGERS if rec.path == recording_path else [],
     )
     window._load(recording_path)
     _overlay_log(window, monkeypatch, tmp_path, ALIGN_LOG)
@@ -1816,7 +2144,7 @@ def test_new_recording_re_reads_embedded_triggers(
     other = tmp_path / "night2.edf"
     other.write_bytes(b"")
     window._load(other)
-    assert window._embedded_triggers is None  # invalidated for the new recording
+    assert window._embedded_triggers == []  # the new recording's, scanned on open
 
 
 # ----- standalone log view (#125d) -------------------------------------------
@@ -0,0 +1,94 @@
+# Benchmark EDF slice reads: the native memory-mapped path vs MNE's reader.
+#
+#   > uv run python tools/bench_eeg_io.py
+#
+# Writes a synthetic 8 h x 32 ch x 512 Hz EDF (~0.9 GB, 1 s records) to a temp
+# folder, opens it once through open_recording (which maps it natively) and once
+# with the native path disabled (every slice through MNE), then times the reads
+# the viewer makes: 30 s pages at random offsets, all channels and a 6-channel
+# montage. The file is written fresh each run, so the first reads come from the
+# OS page cache on both paths — this isolates decode/calibration cost, the part
+# the native path changes, not disk speed.
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from smacc.eeg import io  # noqa: E402
+
+SFREQ = 512
+N_CHANNELS = 32
+DURATION_S = 8 * 3600
+READS = 50
+
+
+def _pad(value, width: int) -> bytes:
+    return str(value).ljust(width)[:width].encode("latin-1")
+
+
+def write_edf(path: Path) -> None:
+    """A plain EDF of random 16-bit samples, ±500 µV, written a block at a time."""
+    n = N_CHANNELS
+    header = _pad(0, 8) + _pad("X", 80) + _pad("X", 80) + _pad("01.01.26", 8)
+    header += _pad("22.00.00", 8) + _pad(256 * (n + 1), 8) + _pad("", 44)
+    header += _pad(DURATION_S, 8) + _pad(1, 8) + _pad(n, 4)
+    header += b"".join(_pad(f"CH{i:02d}", 16) for i in range(n)) + _pad("", 80) * n
+    for value in ("uV", -500, 500, -32768, 32767):
+        header += _pad(value, 8) * n
+    header += _pad("", 80) * n + _pad(SFREQ, 8) * n + _pad("", 32) * n
+    rng = np.random.default_rng(0)
+    with open(path, "wb") as f:
+        f.write(header)
+        for _ in range(0, DURATION_S, 600):  # ten minutes of records per write
+            block = rng.integers(-3000, 3000, (600, n, SFREQ), dtype=np.int16)
+            f.write(block.astype("<i2").tobytes())
+
+
+def bench(recording: io.Recording, picks) -> tuple[float, float]:
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(0, DURATION_S - 30, READS)
+    laps = []
+    for start in starts:
+        t0 = time.perf_counter()
+        recording.get_slice(start, start + 30.0, picks)
+        laps.append((time.perf_counter() - t0) * 1000)
+    return float(np.mean(laps)), float(np.max(laps))
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "night.edf"
+        t0 = time.perf_counter()
+        write_edf(path)
+        size_gb = path.stat().st_size / 1e9
+        print(
+            f"{N_CHANNELS} ch x {SFREQ} Hz x {DURATION_S / 3600:.0f} h EDF "
+            f"({size_gb:.2f} GB) written in {time.perf_counter() - t0:.1f} s; "
+            f"{READS} random 30 s reads per row"
+        )
+        native = io.open_recording(path)
+        if native._native is None:
+            print("  native path declined the file")
+            return 1
+        fallback = io.Recording(native._raw, path)  # the same file, MNE only
+        for label, picks in (("all channels", None), ("6 channels", range(6))):
+            for name, recording in (("MNE", fallback), ("native", native)):
+                mean_ms, max_ms = bench(recording, picks)
+                print(
+                    f"  {label:12s} {name:6s}: mean {mean_ms:7.1f} ms  "
+                    f"max {max_ms:7.1f} ms"
+                )
+        # Release the memory map before the folder goes (Windows can't delete
+        # a mapped file).
+        del native, fallback
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
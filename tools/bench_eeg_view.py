@@ -8,20 +8,75 @@
 # slice fetch -> zero-phase filter -> per-curve setData -> a forced offscreen
 # render. Real-file I/O (MNE's memory-mapped read) is NOT measured here — this
 # isolates the render path, the part the view design controls.
+#
+# The overview rows then build the whole-night min/max pyramid once (timed) and
+# scroll hour-long and whole-night windows drawn from it.
+#
+# The 256-channel row pages a dense-array recording with six lanes shown; only
+# the visible channels are read and filtered (get_slice ``picks``). The next two
+# show all 256 at once and then 16 lanes at a time (lane virtualization).
+#
+# The key-repeat rows queue 30 scroll steps at once on 32 of the 256 channels,
+# as a held arrow key does behind a slow refresh, and time the drain to the last
+# window on screen: a refresh per step, then coalesced to one per frame.
+#
+# The drag rows move a filtered 120 s window of those 32 channels two windows
+# on every 30 ms (a scrollbar drag), refreshes coalesced, drawing each frame in
+# full and then as a quick unfiltered preview refined once the drag stops.
+#
+# The per-type rows give EEG, EOG and EMG their own filters (three groups to
+# filter) and scroll a 120 s window with the filtering and lane scaling run
+# serially and then on the shared thread pool, one worker per core.
+#
+# The wheel rows step a 2-minute window on a 64-channel night by a tenth of a
+# window at a time, once refiltering every window whole and once sliding the
+# previous window (only the exposed edge is fetched and filtered).
+#
+# The decimation rows scroll a 120 s window of a 2 kHz recording with the
+# lowpass set, at full rate and decimated to the screen width before filtering
+# (anti-aliased, then peak-preserving).
+#
+# The pipeline rows rerun the 30 s and 120 s windows in a fresh process per
+# sample dtype (float32, the default, and float64), reporting refresh time and
+# the process's peak RSS — a fresh process because the peak never goes down.
+#
+# The paging rows page 30 s epochs forward over a provider that sleeps per read
+# (a recording on a network share), with and without read-ahead, pausing between
+# pages the way a scorer does; they report the page-turn time and cache hits.
+#
+# The scene row scrolls 30 s pages with the overlays in play (marks, a peer
+# rater, a session log, the hypnogram bands and the staging bracket) and counts
+# the items added to or removed from the plot per scroll: the overlay layers
+# reuse their items, so the steady state is zero.
+#
+# The dense-log row scrolls 10-minute windows over a session log with a cue
+# every 3 s (200 ticks a window) and a detector's point mark every 10 s, on a
+# 4-channel 8 Hz recording so the ticks, not the traces, dominate; the ticks of
+# each layer are drawn as one batched item. The second row zooms out to 2 h
+# windows (2 400 cues, 720 marks; the recording at 1 Hz to keep the traces as
+# light), where both layers turn into per-pixel density tracks.
+#
+# The annotation row finds the marks in a 30 s window among 50 000 (a detector's
+# night), by scanning the list and by the interval index the view scrolls with.
 
 import os
+import subprocess
 import sys
+import tempfile
 import time
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
 import numpy as np
-from PyQt6 import QtWidgets
+from PyQt6 import QtCore, QtWidgets
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from smacc.eeg import dsp  # noqa: E402
-from smacc.eeg.view import TraceView  # noqa: E402
+from smacc.eeg import dsp, prefetch  # noqa: E402
+from smacc.eeg.annotations import Annotation, AnnotationIndex  # noqa: E402
+from smacc.eeg.pyramid import build_pyramid  # noqa: E402
+from smacc.eeg.staging import StageEpoch  # noqa: E402
+from smacc.eeg.view import LogMark, RaterOverlay, TraceView  # noqa: E402
 
 SFREQ = 512.0
 N_CHANNELS = 32
@@ -30,24 +85,77 @@ REFRESHES = 20
 
 
 class SyntheticProvider:
-    """EEG-shaped noise, generated per slice (deterministic per start sample)."""
+    """EEG-shaped noise, generated per slice (deterministic per start sample).
+
+    Only the picked rows are generated, the way a reader honouring ``picks``
+    only decodes the channels asked for.
+    """
 
-    ch_names = [f"CH{i:02d}" for i in range(N_CHANNELS)]
-    ch_types = ["eeg"] * (N_CHANNELS - 2) + ["eog", "emg"]
     sfreq = SFREQ
     duration = DURATION_S
 
-    def get_slice(self, start_s: float, stop_s: float):
-        start = max(0, int(round(max(0.0, start_s) * SFREQ)))
-        stop = min(int(DURATION_S * SFREQ), int(round(min(DURATION_S, stop_s) * SFREQ)))
+    def __init__(
+        self, n_channels: int = N_CHANNELS, dtype=np.float32, sfreq: float = SFREQ
+    ) -> None:
+        self.sfreq = sfreq
+        self.dtype = dtype  # what the Recording hands back in the same mode
+        self.ch_names = [f"CH{i:03d}" for i in range(n_channels)]
+        self.ch_types = ["eeg"] * (n_channels - 2) + ["eog", "emg"]
+
+    def get_slice(self, start_s: float, stop_s: float, picks=None):
+        sfreq = self.sfreq
+        start = max(0, int(round(max(0.0, start_s) * sfreq)))
+        stop = min(int(DURATION_S * sfreq), int(round(min(DURATION_S, stop_s) * sfreq)))
         n = max(0, stop - start)
-        times = (start + np.arange(n)) / SFREQ
+        rows = len(self.ch_names) if picks is None else len(picks)
+        times = (start + np.arange(n)) / sfreq
         rng = np.random.default_rng(start)  # deterministic, cheap
-        data = rng.standard_normal((N_CHANNELS, n)) * 20e-6
+        data = rng.standard_normal((rows, n), dtype=self.dtype) * 20e-6
         data += 50e-6 * np.sin(2 * np.pi * 1.0 * times)  # slow-wave-ish
         return times, data
 
 
+class SlowShareProvider(SyntheticProvider):
+    """The synthetic night behind a fixed per-read latency (a NAS-hosted file)."""
+
+    latency_s = 0.08
+
+    def get_slice(self, start_s: float, stop_s: float, picks=None):
+        time.sleep(self.latency_s)
+        return super().get_slice(start_s, stop_s, picks)
+
+
+def bench_paging(view: TraceView, prefetch: bool) -> tuple[float, float]:
+    view.set_provider(SlowShareProvider())
+    view.set_prefetch_enabled(prefetch)
+    view.set_window_seconds(30.0)
+    view.grab()
+    laps = []
+    for _ in range(REFRESHES):
+        if view._prefetcher is not None:  # the scorer reads the page meanwhile
+            view._prefetcher.wait_idle(timeout=5.0)
+        t0 = time.perf_counter()
+        view.step_epochs(1)
+        view.grab()
+        laps.append((time.perf_counter() - t0) * 1000)
+    return float(np.mean(laps)), float(np.max(laps))
+
+
+def bench_wheel(view: TraceView, slide: bool) -> tuple[float, float]:
+    view.set_window_seconds(120.0)
+    view.set_window_start(0.0)
+    view.grab()
+    laps = []
+    for _ in range(REFRESHES):
+        if not slide:
+            view._last_window = None  # forget it: the whole window refilters
+        t0 = time.perf_counter()
+        view.scroll_by(0.1)
+        view.grab()
+        laps.append((time.perf_counter() - t0) * 1000)
+    return float(np.mean(laps)), float(np.max(laps))
+
+
 def bench(view: TraceView, window_seconds: float) -> tuple[float, float]:
     view.set_window_seconds(window_seconds)
     view.set_window_start(0.0)
@@ -61,6 +169,195 @@ def bench(view: TraceView, window_seconds: float) -> tuple[float, float]:
     return float(np.mean(laps)), float(np.max(laps))
 
 
+def bench_scene_ops(view: TraceView) -> float:
+    """Mean plot items added or removed per 30 s scroll with every overlay on."""
+    marks = [
+        Annotation(t + offset, duration, "mark")
+        for t in range(0, int(DURATION_S), 20)
+        for offset, duration in ((0.0, 0.0), (5.0, 3.0))
+    ]
+    view.set_annotations(marks)
+    view.set_overlays([RaterOverlay("peer", marks[::3], (0, 158, 115))])
+    view.set_log_marks([LogMark(t + 2.0, "INFO", "cue") for t in range(0, 3600, 15)])
+    view.set_hypnogram(
+        [StageEpoch(t, 30.0, "N2") for t in range(0, 3600, 30)], {"N2": (0, 0, 255)}
+    )
+    view.set_stage_focus(True)
+    view.set_window_seconds(30.0)
+    view.set_window_start(0.0)
+    plot_item = view.getPlotItem()
+    ops = 0
+    add, remove = plot_item.addItem, plot_item.removeItem
+
+    def counted(call):
+        def wrapper(*args, **kwargs):
+            nonlocal ops
+            ops += 1
+            return call(*args, **kwargs)
+
+        return wrapper
+
+    plot_item.addItem, plot_item.removeItem = counted(add), counted(remove)
+    try:
+        for _ in range(3):  # warm-up: the pools grow to a page's worth
+            view.scroll_by(1.0)
+        ops = 0
+        for _ in range(REFRESHES):
+            view.scroll_by(1.0)
+    finally:
+        plot_item.addItem, plot_item.removeItem = add, remove
+        view.set_annotations([])
+        view.set_overlays([])
+        view.set_log_marks([])
+        view.set_hypnogram([], {})
+        view.set_stage_focus(False)
+    return ops / REFRESHES
+
+
+def bench_dense_log(view: TraceView, window_seconds: float) -> tuple[float, float]:
+    """Refresh ms for windows over a 3 s cue log and 10 s point marks."""
+    levels = ("INFO", "INFO", "INFO", "WARNING")
+    view.set_log_marks(
+        [
+            LogMark(float(t), levels[i % 4], f"cue {i}")
+            for i, t in enumerate(range(0, int(DURATION_S), 3))
+        ]
+    )
+    view.set_annotations(
+        [Annotation(float(t), 0.0, "spindle") for t in range(1, int(DURATION_S), 10)]
+    )
+    try:
+        return bench(view, window_seconds)
+    finally:
+        view.set_log_marks([])
+        view.set_annotations([])
+
+
+def bench_key_repeat(view: TraceView, coalesce: bool) -> tuple[float, int]:
+    """Ms from a burst of queued scroll keys to the last window drawn, and refreshes.
+
+    Thirty tenth-of-a-window scrolls are queued at once — a held arrow key's
+    repeats piling up behind a slow refresh — then the event loop runs until
+    every one is handled and nothing is left to draw.
+    """
+    app = QtWidgets.QApplication.instance()
+    assert app is not None
+    view.set_refresh_coalescing(coalesce)
+    view.set_window_seconds(30.0)
+    view.set_window_start(0.0)
+    view.grab()
+    handled: list[None] = []
+    _, runs = view.refresh_stats
+    t0 = time.perf_counter()
+    for _ in range(30):
+        QtCore.QTimer.singleShot(0, lambda: handled.append(view.scroll_by(0.1)))
+    while len(handled) < 30 or view.refresh_pending:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 5)
+    view.grab()
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    view.set_refresh_coalescing(False)
+    return elapsed_ms, view.refresh_stats[1] - runs
+
+
+def bench_scrollbar_drag(
+    view: TraceView, progressive: bool
+) -> tuple[float, int, float]:
+    """A scrollbar drag over 120 s windows, with or without previews meanwhile.
+
+    Thirty moves arrive 30 ms apart, each two windows on (a drag across the
+    night never lands where the last window was), the refreshes coalesced.
+    Returns the mean time a frame blocked the event loop during the drag, the
+    frames drawn, and how long after the last move the full filtered window
+    was on screen.
+    """
+    app = QtWidgets.QApplication.instance()
+    assert app is not None
+    view.set_refresh_coalescing(True)
+    view.set_progressive_refresh(progressive)
+    view.set_window_seconds(120.0)
+    view.set_window_start(0.0)
+    view.flush_refresh()  # a full render: the cost the previews are judged by
+    view.grab()
+    moved: list[float] = []
+    _, runs = view.refresh_stats
+    for step in range(30):
+        QtCore.QTimer.singleShot(
+            30 * step,
+            lambda step=step: moved.append(
+                view.set_window_start(240.0 * (step + 1)) or time.perf_counter()
+            ),
+        )
+    blocked: list[float] = []
+    while len(moved) < 30 or view.refresh_pending:
+        t0 = time.perf_counter()
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 5)
+        if len(moved) < 30:
+            blocked.append((time.perf_counter() - t0) * 1000)
+    view.grab()
+    settle_ms = (time.perf_counter() - moved[-1]) * 1000
+    frames = view.refresh_stats[1] - runs
+    view.set_progressive_refresh(False)
+    view.set_refresh_coalescing(False)
+    return sum(blocked) / max(1, frames), frames, settle_ms
+
+
+def bench_annotation_lookup(count: int) -> tuple[float, float]:
+    """Mean ms to find a 30 s window's marks among ``count``: scan, then index."""
+    rng = np.random.default_rng(0)
+    onsets = rng.uniform(0.0, DURATION_S, count)
+    durations = np.where(rng.random(count) < 0.5, 0.0, rng.uniform(0.0, 60.0, count))
+    marks = sorted(
+        Annotation(float(t), float(d), "spindle")
+        for t, d in zip(onsets, durations, strict=True)
+    )
+    index = AnnotationIndex(marks)
+    starts = rng.uniform(0.0, DURATION_S - 30.0, REFRESHES)
+    t0 = time.perf_counter()
+    for lo in starts:
+        [a for a in marks if not (a.onset + a.duration < lo or a.onset > lo + 30.0)]
+    scan_ms = (time.perf_counter() - t0) * 1000 / REFRESHES
+    t0 = time.perf_counter()
+    for lo in starts:
+        index.overlapping(lo, lo + 30.0)
+    index_ms = (time.perf_counter() - t0) * 1000 / REFRESHES
+    return scan_ms, index_ms
+
+
+def peak_rss_mb() -> float | None:
+    """This process's peak resident set size, or ``None`` where unavailable."""
+    try:  # Linux: VmHWM is per address space, so it starts over in a new process
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024  # kB
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss survives exec on Linux (hence VmHWM first); bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024**2
+
+
+def pipeline_row(dtype_name: str) -> int:
+    """One pipeline row, run in its own process (see the header comment)."""
+    app = QtWidgets.QApplication(sys.argv)  # noqa: F841 — Qt needs a live app
+    view = TraceView()
+    view.resize(1400, 900)
+    view.set_provider(SyntheticProvider(dtype=np.dtype(dtype_name)))
+    view.set_float32_enabled(dtype_name == "float32")
+    view.set_spec(dsp.FilterSpec(highpass=0.3, lowpass=35.0, notch=60.0))
+    means = [bench(view, seconds)[0] for seconds in (30.0, 120.0)]
+    rss = peak_rss_mb()
+    print(
+        f"  {dtype_name} pipeline: 30 s mean {means[0]:6.1f} ms, "
+        f"120 s mean {means[1]:6.1f} ms, peak RSS "
+        + (f"{rss:.0f} MB" if rss is not None else "n/a")
+    )
+    return 0
+
+
 def main() -> int:
     app = QtWidgets.QApplication(sys.argv)  # noqa: F841 — Qt needs a live app
     view = TraceView()
@@ -82,8 +379,145 @@ def main() -> int:
             f"  {window_seconds:5.0f} s window: mean {mean_ms:7.1f} ms  "
             f"max {max_ms:7.1f} ms  (budget {budget_ms:.0f} ms)  {verdict}"
         )
+    # A dense-array montage: reads and filtering follow the lanes on screen, so
+    # 6 of 256 channels page as fast as 6 of 32.
+    view.set_provider(SyntheticProvider(n_channels=256))
+    view.set_visible_channels([0, 1, 2, 3, 254, 255])
+    mean_ms, max_ms = bench(view, 30.0)
+    verdict = "ok" if mean_ms <= 100.0 else "TOO SLOW"
+    failed |= mean_ms > 100.0
+    print(
+        f"  256 ch, 6 shown, 30 s window: mean {mean_ms:7.1f} ms  "
+        f"max {max_ms:7.1f} ms  (budget 100 ms)  {verdict}"
+    )
+    # The whole 256-channel montage, all on screen vs 16 virtualized lanes: only
+    # the lanes on screen are read, filtered and drawn.
+    view.set_visible_channels(list(range(256)))
+    for lanes in (None, 16):
+        view.set_lanes_shown(lanes)
+        mean_ms, max_ms = bench(view, 30.0)
+        print(
+            f"  256 ch, {lanes or 'all'} lanes, 30 s window: mean {mean_ms:7.1f} ms  "
+            f"max {max_ms:7.1f} ms"
+        )
+    view.set_lanes_shown(None)
+    view.set_visible_channels(list(range(32)))
+    for coalesce in (False, True):
+        elapsed_ms, runs = bench_key_repeat(view, coalesce)
+        label = "coalesced" if coalesce else "one refresh each"
+        print(
+            f"  30 queued scroll keys, {label}: {elapsed_ms:7.1f} ms to the last "
+            f"window ({runs} refreshes)"
+        )
+    for progressive in (False, True):
+        frame_ms, frames, settle_ms = bench_scrollbar_drag(view, progressive)
+        label = "preview, then refine" if progressive else "full renders"
+        print(
+            f"  scrollbar drag, 120 s window, {label}: {frame_ms:6.1f} ms/frame  "
+            f"{frames} frames  full render {settle_ms:6.1f} ms after the drag"
+        )
+    # Three type specs: the EEG base, a slow-eye EOG, a high-passed EMG. The
+    # channel types are dealt out evenly so all three groups are substantial.
+    typed = SyntheticProvider()
+    typed.ch_types = [("eeg", "eog", "emg")[i % 3] for i in range(N_CHANNELS)]
+    view.set_provider(typed)
+    view.set_type_specs(
+        {
+            "eog": dsp.FilterSpec(highpass=0.3, lowpass=10.0),
+            "emg": dsp.FilterSpec(highpass=10.0, lowpass=100.0, notch=60.0),
+        }
+    )
+    for workers, label in ((1, "serial"), (None, f"{os.process_cpu_count()} cores")):
+        prefetch.set_compute_workers(workers)
+        mean_ms, max_ms = bench(view, 120.0)
+        print(
+            f"  3 type specs, 120 s window, {label}: mean {mean_ms:7.1f} ms  "
+            f"max {max_ms:7.1f} ms"
+        )
+    view.set_type_specs({})
+    view.set_provider(SyntheticProvider(n_channels=64))
+    for slide in (False, True):
+        mean_ms, max_ms = bench_wheel(view, slide)
+        label = "sliding" if slide else "whole refilter"
+        print(
+            f"  64 ch, 120 s window, wheel 0.1, {label}: mean {mean_ms:7.1f} ms  "
+            f"max {max_ms:7.1f} ms"
+        )
+    # A 2 kHz PSG: 240 000 samples a lane at 120 s, on a 1400 px screen. The
+    # 35 Hz lowpass lets the view keep ~105 Hz, a 19x cut before filtering.
+    view.set_provider(SyntheticProvider(sfreq=2000.0))
+    for label, enabled, peaks in (
+        ("full rate", False, False),
+        ("decimated", True, False),
+        ("decimated, peaks", True, True),
+    ):
+        view.set_decimation_enabled(enabled)
+        view.set_peak_decimation(peaks)
+        mean_ms, max_ms = bench(view, 120.0)
+        verdict = "ok" if mean_ms <= 250.0 else "TOO SLOW"
+        failed |= enabled and mean_ms > 250.0
+        print(
+            f"  2 kHz, 120 s window, {label}: mean {mean_ms:7.1f} ms  "
+            f"max {max_ms:7.1f} ms  (budget 250 ms)  {verdict}"
+        )
+    view.set_peak_decimation(False)
+    view.set_provider(SyntheticProvider())
+    with tempfile.TemporaryDirectory() as folder:
+        t0 = time.perf_counter()
+        pyramid = build_pyramid(view._provider, os.path.join(folder, "pyramid"))
+        print(f"  overview pyramid built in {time.perf_counter() - t0:.1f} s")
+        view.set_pyramid(pyramid)
+        # Zoomed out, a refresh reads a few thousand buckets per channel however
+        # long the window is, so even the whole night holds the 120 s budget.
+        for window_seconds, budget_ms in ((3600.0, 250.0), (DURATION_S, 250.0)):
+            mean_ms, max_ms = bench(view, window_seconds)
+            verdict = "ok" if mean_ms <= budget_ms else "TOO SLOW"
+            failed |= mean_ms > budget_ms
+            print(
+                f"  {window_seconds:5.0f} s overview: mean {mean_ms:7.1f} ms  "
+                f"max {max_ms:7.1f} ms  (budget {budget_ms:.0f} ms)  {verdict}"
+            )
+        # Back to a page before dropping the pyramid, or the view would read the
+        # whole night at full rate; then release the memory maps before the
+        # folder goes (Windows can't delete a mapped file).
+        view.set_window_seconds(30.0)
+        view.set_pyramid(None)
+        del pyramid
+    for read_ahead in (False, True):
+        mean_ms, max_ms = bench_paging(view, read_ahead)
+        hits, misses = view.prefetch_stats
+        label = "read-ahead" if read_ahead else "no read-ahead"
+        print(
+            f"  30 s paging, {SlowShareProvider.latency_s * 1000:.0f} ms/read, "
+            f"{label}: mean {mean_ms:7.1f} ms  max {max_ms:7.1f} ms  "
+            f"({hits} hits / {misses} misses)"
+        )
+    view.set_prefetch_enabled(False)
+    print(f"  30 s pages with overlays: {bench_scene_ops(view):.1f} scene ops/scroll")
+    for window_s, sfreq in ((600.0, 8.0), (7200.0, 1.0)):  # ticks, not traces
+        view.set_provider(SyntheticProvider(n_channels=4, sfreq=sfreq))
+        mean_ms, max_ms = bench_dense_log(view, window_s)
+        print(
+            f"  {window_s:.0f} s window, 3 s cue log + 10 s marks: "
+            f"mean {mean_ms:7.1f} ms  max {max_ms:7.1f} ms"
+        )
+    scan_ms, index_ms = bench_annotation_lookup(50_000)
+    print(
+        f"  30 s of 50 000 annotations: scan {scan_ms:7.2f} ms  "
+        f"index {index_ms:7.3f} ms"
+    )
+    for dtype_name in ("float32", "float64"):
+        row = subprocess.run(
+            [sys.executable, __file__, "--pipeline", dtype_name],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        print(row.stdout.rstrip() or row.stderr.rstrip())
     return 1 if failed else 0
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--pipeline"]:
+        raise SystemExit(pipeline_row(sys.argv[2]))
     raise SystemExit(main())